@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Cost of rebuilding an MDSContext from persisted state.
+
+Measures restoring a context with 1000 tool events and 500 conversation
+messages, before (full validation plus the recursive serializability walk on
+every construction) and after (validation with the walk deferred to
+persistence time, and the trusted ``from_trusted`` path for state the
+framework serialized itself).
+
+Usage:
+    python scripts/benchmarks/benchmark_context.py
+    python scripts/benchmarks/benchmark_context.py --events 5000 --iterations 20
+"""
+
+import argparse
+import logging
+import os
+import sys
+import timeit
+from pathlib import Path
+
+# Import packages the same way the app and tests do (src/ on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+os.environ.setdefault("SKIP_AUTO_INIT", "true")
+logging.disable(logging.CRITICAL)
+
+from pydantic_ai_integration.dependencies import MDSContext  # noqa: E402
+from pydantic_models.canonical.tool_session import ToolEvent  # noqa: E402
+
+USER_ID = "bench@example.com"
+SESSION_ID = "ts_251013_benchctx_abc123"
+
+
+def _measure(func, iterations: int) -> float:
+    """Milliseconds per call."""
+    return timeit.timeit(func, number=iterations) / iterations * 1_000
+
+
+def _persisted_state(events: int, messages: int) -> dict:
+    context = MDSContext(user_id=USER_ID, session_id=SESSION_ID)
+    context.tool_events = [
+        ToolEvent(
+            event_id=f"evt_{i:06d}",
+            event_type="tool_execution_completed",
+            tool_name=f"tool_{i % 20}",
+            parameters={"casefile_id": "cf_251013_abc123", "step": i, "filters": {"label": "inbox"}},
+            result_summary={"status": "success", "items": i % 7},
+            duration_ms=i % 300,
+            status="success",
+        )
+        for i in range(events)
+    ]
+    context.conversation_history = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "detail " * 20, "meta": {"seq": i}}
+        for i in range(messages)
+    ]
+    context.previous_tools = [{"tool_name": f"tool_{i % 20}", "event_id": f"evt_{i:06d}"} for i in range(events)]
+    context.persistent_state = {f"key_{i}": {"value": i, "tags": ["a", "b"]} for i in range(100)}
+    return context.model_dump(mode="json")
+
+
+def run(events: int, messages: int, iterations: int) -> None:
+    state = _persisted_state(events, messages)
+
+    paths = [
+        ("before: validate + walk", lambda: MDSContext.model_validate(state).ensure_serializable()),
+        ("after: validate (deferred)", lambda: MDSContext.model_validate(state)),
+        ("after: from_trusted", lambda: MDSContext.from_trusted(state)),
+    ]
+
+    print(f"Context construction ({events} events, {messages} messages, {iterations} iterations)")
+    print(f"{'path':<30} {'ms/context':>12}")
+    baseline = None
+    for name, build in paths:
+        ms = _measure(build, iterations)
+        baseline = baseline or ms
+        print(f"{name:<30} {ms:>12.2f}  ({baseline / ms:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1000, help="Tool events in the context (default: 1000)")
+    parser.add_argument("--messages", type=int, default=500, help="Conversation messages (default: 500)")
+    parser.add_argument("--iterations", type=int, default=50, help="Constructions per path (default: 50)")
+    args = parser.parse_args()
+    run(args.events, args.messages, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
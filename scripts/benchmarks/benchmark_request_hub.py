@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Per-request overhead of RequestHub dispatch.
+
+Measures a create_casefile request against an in-memory casefile service:
+calling the service directly, dispatching through the hub with no hooks, and
+dispatching with the metrics and audit hooks. The difference between the
+direct call and the dispatch paths is the hub's own cost (route lookup,
+policy plan, context preparation and hook execution).
+
+Usage:
+    python scripts/benchmarks/benchmark_request_hub.py
+    python scripts/benchmarks/benchmark_request_hub.py --iterations 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Import packages the same way the app and tests do (src/ on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+os.environ.setdefault("SKIP_AUTO_INIT", "true")
+logging.disable(logging.CRITICAL)
+
+from coreservice.request_hub import RequestHub  # noqa: E402
+from coreservice.service_container import ServiceContainer, ServiceManager  # noqa: E402
+from pydantic_models.base.types import RequestStatus  # noqa: E402
+from pydantic_models.operations.casefile_ops import (  # noqa: E402
+    CasefileCreatedPayload,
+    CreateCasefilePayload,
+    CreateCasefileRequest,
+    CreateCasefileResponse,
+)
+
+USER_ID = "bench@example.com"
+CREATED_AT = "2025-10-13T12:00:00"
+
+
+class _InMemoryCasefileService:
+    async def create_casefile(self, request: CreateCasefileRequest) -> CreateCasefileResponse:
+        return CreateCasefileResponse(
+            request_id=request.request_id,
+            status=RequestStatus.COMPLETED,
+            payload=CasefileCreatedPayload(
+                casefile_id="cf_251013_abc123",
+                title=request.payload.title,
+                created_at=CREATED_AT,
+                created_by=request.user_id,
+            ),
+        )
+
+
+async def _measure(func, iterations: int) -> float:
+    """Microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def run(iterations: int) -> None:
+    service = _InMemoryCasefileService()
+    container = ServiceContainer()
+    container.register_service("casefile_service", lambda: service)
+    hub = RequestHub(service_manager=ServiceManager(container))
+
+    plain = CreateCasefileRequest(user_id=USER_ID, payload=CreateCasefilePayload(title="Benchmark"))
+    hooked = CreateCasefileRequest(
+        user_id=USER_ID, hooks=["metrics", "audit"], payload=CreateCasefilePayload(title="Benchmark")
+    )
+
+    paths = [
+        ("service call (no hub)", lambda: service.create_casefile(plain)),
+        ("dispatch, no hooks", lambda: hub.dispatch(plain)),
+        ("dispatch, metrics + audit", lambda: hub.dispatch(hooked)),
+    ]
+
+    print(f"RequestHub dispatch ({iterations} iterations)")
+    print(f"{'path':<30} {'us/request':>12}")
+    baseline = None
+    for name, call in paths:
+        await _measure(call, min(iterations, 100))  # warm up
+        us = await _measure(call, iterations)
+        baseline = baseline or us
+        print(f"{name:<30} {us:>12.1f}  (+{us - baseline:.1f} us)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000, help="Requests per path (default: 5000)")
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Per-layer parameter validation cost for a single tool call.
+
+Measures what each layer of the tool pipeline spends on validation, before
+(every layer re-validates) and after (layers reuse the ValidatedParams token
+and the request DTO is built through a cached TypeAdapter).
+
+Usage:
+    python scripts/benchmarks/benchmark_validation.py
+    python scripts/benchmarks/benchmark_validation.py --iterations 20000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import timeit
+from pathlib import Path
+
+# Import packages the same way the app and tests do (src/ on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+os.environ.setdefault("SKIP_AUTO_INIT", "true")
+logging.disable(logging.CRITICAL)
+
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_tools_from_yaml  # noqa: E402
+from pydantic_ai_integration.validation import (  # noqa: E402
+    get_type_adapter,
+    take_validated,
+    validate_params,
+    validated_scope,
+)
+from pydantic_models.operations.casefile_ops import GetCasefileRequest  # noqa: E402
+from pydantic_models.operations.tool_execution_ops import ToolRequest  # noqa: E402
+
+TOOL_NAME = "get_casefile_tool"
+USER_ID = "bench@example.com"
+CASEFILE_ID = "cf_251013_abc123"
+
+
+def _measure(func, iterations: int) -> float:
+    """Microseconds per call."""
+    return timeit.timeit(func, number=iterations) / iterations * 1_000_000
+
+
+def run(iterations: int) -> None:
+    if TOOL_NAME not in MANAGED_TOOLS:
+        register_tools_from_yaml()
+    tool_def = MANAGED_TOOLS[TOOL_NAME]
+    params_model = tool_def.params_model
+    raw_params = {"casefile_id": CASEFILE_ID, "timeout_seconds": 30}
+
+    request = ToolRequest(
+        user_id=USER_ID,
+        session_id="ts_251013_benchxxx_abc123",
+        payload={"tool_name": TOOL_NAME, "parameters": raw_params},
+    )
+    token = tool_def.prepare_params(raw_params)
+    dto_data = {"user_id": USER_ID, "session_id": None, "casefile_id": CASEFILE_ID, "payload": {"casefile_id": CASEFILE_ID}}
+
+    def wrapper_token_reuse():
+        with validated_scope(token):
+            take_validated(params_model, token.values)
+
+    layers = [
+        (
+            "ToolSessionService request",
+            lambda: ToolRequest.model_validate(
+                request.model_dump(mode="json", exclude={"operation_key", "timestamp", "has_casefile_context"})
+            ),
+            lambda: request.model_copy(update={"event_ids": list(request.event_ids)}),
+        ),
+        (
+            "ToolSessionService params",
+            lambda: tool_def.params_model(**raw_params).model_dump(),
+            lambda: validate_params(params_model, raw_params),
+        ),
+        (
+            "validated_wrapper",
+            lambda: params_model(**token.values).model_dump(),
+            wrapper_token_reuse,
+        ),
+        (
+            "ChainExecutor (token input)",
+            lambda: params_model.model_validate(raw_params).model_dump(),
+            lambda: validate_params(params_model, token),
+        ),
+        (
+            "Request DTO build",
+            lambda: GetCasefileRequest(**dto_data),
+            lambda: get_type_adapter(GetCasefileRequest).validate_python(dto_data),
+        ),
+    ]
+
+    print(f"Validation cost per call ({iterations} iterations, {TOOL_NAME})")
+    print(f"{'layer':<30} {'before (us)':>12} {'after (us)':>12}")
+    total_before = total_after = 0.0
+    for name, before, after in layers:
+        before_us = _measure(before, iterations)
+        after_us = _measure(after, iterations)
+        total_before += before_us
+        total_after += after_us
+        print(f"{name:<30} {before_us:>12.2f} {after_us:>12.2f}")
+    print(f"{'total':<30} {total_before:>12.2f} {total_after:>12.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000, help="Calls per layer (default: 5000)")
+    args = parser.parse_args()
+    run(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
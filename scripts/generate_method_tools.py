@@ -221,6 +221,8 @@ def validate_tool_structure(tool_data: Dict[str, Any]) -> List[str]:
             errors.append("implementation missing 'type'")
         elif impl['type'] not in ['simple', 'api_call', 'data_transform', 'composite', 'method_wrapper']:
             errors.append(f"Invalid implementation type: {impl['type']}")
+        elif impl.get('execution', 'inline') not in ['inline', 'process_pool']:
+            errors.append(f"Invalid implementation execution: {impl['execution']}")
     
     return errors
 
@@ -396,8 +398,11 @@ def generate_tool_yaml(
             "method_wrapper": {
                 "method_name": f"{service_name}.{method_name}",
                 "parameter_mapping": parameter_mapping,
-            }
+            },
+            **({"execution": method_def["execution"]} if method_def.get("execution") else {}),
         },
+        **({"caching": method_def["caching"]} if method_def.get("caching") else {}),
+        **({"concurrency": method_def["concurrency"]} if method_def.get("concurrency") else {}),
         "business_rules": {
             "enabled": business_rules.get("enabled", True),
             "requires_auth": business_rules.get("requires_auth", True),
@@ -142,7 +142,8 @@ class CasefileRepository(BaseRepository[CasefileModel]):
             Whether deletion was successful
         """
         try:
-            await self.delete(casefile_id)
+            # Cascades to any subcollections stored below the casefile
+            await self.delete_tree(casefile_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting casefile {casefile_id}: {e}")
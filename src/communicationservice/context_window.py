@@ -0,0 +1,324 @@
+"""
+Token-budgeted conversation windows for chat context assembly.
+
+What reaches the model for a chat turn is a window of at most
+``token_budget`` tokens:
+
+- the most recent messages, verbatim, filling the recent share of the budget
+- summaries of the older messages, in fixed spans of ``span_size`` sequence
+  numbers (``[0, 20)``, ``[20, 40)``, ...); the newest spans are summarized
+  individually, everything older is folded into one rolling summary ``[0, n)``
+
+Summaries are cached by (session, start_seq, end_seq). Span boundaries are
+aligned to ``span_size``, so a summary stays valid until new messages push
+another whole span out of the verbatim part: a turn normally costs no
+summarizer calls, and at most one span summary plus one fold when the window
+moves. The previous window of each session is reused as-is when its span
+layout is unchanged.
+
+The summarizer is pluggable (``Summarizer``); ``ExtractiveSummarizer`` is a
+local, deterministic stand-in.
+"""
+
+import logging
+import math
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+
+from pydantic import BaseModel, Field
+
+from persistence.redis_cache import RedisCacheService
+
+logger = logging.getLogger(__name__)
+
+# Loads the messages with start_seq <= seq < end_seq (chronological)
+SpanLoader = Callable[[int, int], Awaitable[List[Dict[str, Any]]]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def message_role(message: Dict[str, Any]) -> str:
+    """Role of a stored chat message (``role`` or ``message_type``)."""
+    return str(message.get("role") or message.get("message_type") or "user")
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    """Tokens a message takes in the prompt, including per-message overhead."""
+    return estimate_tokens(str(message.get("content", ""))) + 4
+
+
+class Summarizer(Protocol):
+    """Turns message lines or earlier summaries into one shorter summary."""
+
+    async def summarize(self, texts: List[str], max_tokens: int) -> str:
+        ...
+
+
+class ExtractiveSummarizer:
+    """Deterministic summarizer: the first sentence of each text, within budget."""
+
+    async def summarize(self, texts: List[str], max_tokens: int) -> str:
+        if not texts:
+            return ""
+        max_chars = max_tokens * 4
+        per_text = max(16, max_chars // len(texts))
+        parts = []
+        for text in texts:
+            first = text.strip().split(". ", 1)[0]
+            parts.append(first if len(first) <= per_text else first[: per_text - 3] + "...")
+        return " ".join(parts)[:max_chars]
+
+
+class SpanSummary(BaseModel):
+    """Summary of the messages with start_seq <= seq < end_seq."""
+
+    start_seq: int
+    end_seq: int
+    text: str
+    tokens: int
+
+
+class ConversationWindow(BaseModel):
+    """Messages and summaries that fit a session's token budget."""
+
+    session_id: str
+    summaries: List[SpanSummary] = Field(default_factory=list, description="Oldest first; a rolling summary starts at 0")
+    messages: List[Dict[str, Any]] = Field(default_factory=list, description="Recent messages, verbatim")
+    verbatim_from_seq: int = Field(0, description="First sequence number kept verbatim")
+    tokens: int = 0
+
+    def to_prompt_messages(self) -> List[Dict[str, Any]]:
+        """Summaries as system messages followed by the recent messages."""
+        prompt = [
+            {
+                "role": "system",
+                "content": f"Summary of messages {summary.start_seq}-{summary.end_seq - 1}: {summary.text}",
+            }
+            for summary in self.summaries
+        ]
+        prompt.extend(
+            {"role": message_role(message), "content": message.get("content", ""), "message_id": message.get("message_id")}
+            for message in self.messages
+        )
+        return prompt
+
+
+class SummaryCache:
+    """Span and rolling summaries keyed by (session, start_seq, end_seq)."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        redis_cache: Optional[RedisCacheService] = None,
+        ttl_seconds: int = 86400,
+        key_prefix: str = "chat_summary",
+    ):
+        self.max_entries = max_entries
+        self.redis_cache = redis_cache
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self._entries: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+    async def get(self, session_id: str, start_seq: int, end_seq: int) -> Optional[str]:
+        key = (session_id, start_seq, end_seq)
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+            return text
+        if self.redis_cache:
+            text = await self.redis_cache.get(f"{self.key_prefix}:{session_id}:{start_seq}:{end_seq}")
+            if text is not None:
+                self._remember(key, text)
+                return text
+        return None
+
+    async def put(self, session_id: str, start_seq: int, end_seq: int, text: str) -> None:
+        self._remember((session_id, start_seq, end_seq), text)
+        if self.redis_cache:
+            await self.redis_cache.set(f"{self.key_prefix}:{session_id}:{start_seq}:{end_seq}", text, self.ttl_seconds)
+
+    def _remember(self, key: Tuple[str, int, int], text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (tests)."""
+        self._entries.clear()
+
+
+class ContextAssembler:
+    """Builds token-budgeted conversation windows, reusing summaries across turns."""
+
+    def __init__(
+        self,
+        summarizer: Optional[Summarizer] = None,
+        cache: Optional[SummaryCache] = None,
+        token_budget: int = 4000,
+        summary_share: float = 0.25,
+        span_size: int = 20,
+        max_sessions: int = 1000,
+    ):
+        """
+        Args:
+            summarizer: Summarizer for spans and folds (default: ExtractiveSummarizer)
+            cache: Summary cache (default: a private in-memory cache)
+            token_budget: Total tokens of the window
+            summary_share: Part of the budget reserved for summaries
+            span_size: Messages per summarized span
+            max_sessions: Previous windows kept for reuse
+        """
+        self.summarizer = summarizer or ExtractiveSummarizer()
+        self.cache = cache or SummaryCache()
+        self.token_budget = token_budget
+        self.summary_budget = int(token_budget * summary_share)
+        self.span_size = span_size
+        self.max_sessions = max_sessions
+        # Individual span summaries share the summary budget with one rolling summary
+        self.span_summary_tokens = max(16, self.summary_budget // 4)
+        self.rolling_summary_tokens = max(16, self.summary_budget - 2 * self.span_summary_tokens)
+        self.summarizer_calls = 0
+        self._windows: "OrderedDict[str, ConversationWindow]" = OrderedDict()
+
+    async def assemble(
+        self,
+        session_id: str,
+        recent: List[Dict[str, Any]],
+        load_span: Optional[SpanLoader] = None,
+    ) -> ConversationWindow:
+        """Build the window for a session.
+
+        Args:
+            session_id: Chat session
+            recent: The newest messages with ``seq`` (chronological); should cover
+                at least the verbatim part of the budget
+            load_span: Loads older messages when a span summary is not cached
+
+        Returns:
+            ConversationWindow within ``token_budget``
+        """
+        if not recent:
+            return ConversationWindow(session_id=session_id)
+
+        boundary = self._verbatim_boundary(recent)
+        verbatim = [message for message in recent if message["seq"] >= boundary]
+
+        previous = self._windows.get(session_id)
+        if previous is not None and previous.verbatim_from_seq == boundary:
+            summaries = previous.summaries
+        else:
+            summaries = await self._summaries(session_id, boundary, recent, load_span)
+
+        window = ConversationWindow(
+            session_id=session_id,
+            summaries=summaries,
+            messages=verbatim,
+            verbatim_from_seq=boundary,
+            tokens=sum(s.tokens for s in summaries) + sum(message_tokens(m) for m in verbatim),
+        )
+        self._windows[session_id] = window
+        self._windows.move_to_end(session_id)
+        while len(self._windows) > self.max_sessions:
+            self._windows.popitem(last=False)
+        return window
+
+    def _verbatim_boundary(self, recent: List[Dict[str, Any]]) -> int:
+        """First seq kept verbatim: fits the recent budget, aligned to a span start."""
+        recent_budget = self.token_budget - self.summary_budget
+        used = 0
+        cut = len(recent) - 1  # the newest message is always kept
+        for index in range(len(recent) - 1, -1, -1):
+            used += message_tokens(recent[index])
+            if used > recent_budget and index < len(recent) - 1:
+                break
+            cut = index
+        cut_seq = recent[cut]["seq"]
+        if cut == 0 and cut_seq == 0:
+            return 0
+        aligned = math.ceil(cut_seq / self.span_size) * self.span_size
+        # Aligning must not push out every message (very large recent messages)
+        return aligned if aligned <= recent[-1]["seq"] else cut_seq
+
+    def _spans(self, boundary: int) -> List[Tuple[int, int]]:
+        return [(start, min(start + self.span_size, boundary)) for start in range(0, boundary, self.span_size)]
+
+    async def _summaries(
+        self,
+        session_id: str,
+        boundary: int,
+        recent: List[Dict[str, Any]],
+        load_span: Optional[SpanLoader],
+    ) -> List[SpanSummary]:
+        spans = self._spans(boundary)
+        if not spans:
+            return []
+        keep = max(1, (self.summary_budget - self.rolling_summary_tokens) // self.span_summary_tokens)
+        individual, folded = spans[-keep:], spans[:-keep]
+
+        summaries = []
+        if folded:
+            rolling = await self._rolling_summary(session_id, folded[-1][1], recent, load_span)
+            summaries.append(SpanSummary(start_seq=0, end_seq=folded[-1][1], text=rolling, tokens=estimate_tokens(rolling)))
+        for start, end in individual:
+            text = await self._span_summary(session_id, start, end, recent, load_span)
+            summaries.append(SpanSummary(start_seq=start, end_seq=end, text=text, tokens=estimate_tokens(text)))
+        return summaries
+
+    async def _span_summary(
+        self,
+        session_id: str,
+        start: int,
+        end: int,
+        recent: List[Dict[str, Any]],
+        load_span: Optional[SpanLoader],
+    ) -> str:
+        cached = await self.cache.get(session_id, start, end)
+        if cached is not None:
+            return cached
+
+        messages = [message for message in recent if start <= message["seq"] < end]
+        if len(messages) < end - start and load_span is not None:
+            messages = await load_span(start, end)
+        lines = [f"{message_role(m)}: {m.get('content', '')}" for m in messages]
+        text = await self._summarize(lines, self.span_summary_tokens)
+        await self.cache.put(session_id, start, end, text)
+        return text
+
+    async def _rolling_summary(
+        self,
+        session_id: str,
+        end: int,
+        recent: List[Dict[str, Any]],
+        load_span: Optional[SpanLoader],
+    ) -> str:
+        """Summary of [0, end), folded onto the newest cached rolling summary."""
+        cached = await self.cache.get(session_id, 0, end)
+        if cached is not None:
+            return cached
+
+        base_end, base_text = 0, None
+        for candidate in range(end - self.span_size, 0, -self.span_size):
+            base_text = await self.cache.get(session_id, 0, candidate)
+            if base_text is not None:
+                base_end = candidate
+                break
+
+        texts = [base_text] if base_text else []
+        for start in range(base_end, end, self.span_size):
+            texts.append(await self._span_summary(session_id, start, min(start + self.span_size, end), recent, load_span))
+        text = await self._summarize(texts, self.rolling_summary_tokens)
+        await self.cache.put(session_id, 0, end, text)
+        logger.debug(f"Folded messages {base_end}-{end - 1} of {session_id} into its rolling summary")
+        return text
+
+    async def _summarize(self, texts: List[str], max_tokens: int) -> str:
+        self.summarizer_calls += 1
+        return await self.summarizer.summarize(texts, max_tokens)
+
+    def forget(self, session_id: str) -> None:
+        """Drop the previous window of a session."""
+        self._windows.pop(session_id, None)
@@ -1,18 +1,48 @@
 """
 Repository for chat sessions using base repository pattern.
+
+The session document holds metadata and counters only. Messages and events
+are append-only subcollection entries with monotonic sequence numbers:
+
+    /chat_sessions/{session_id}/messages/{seq:010d}
+    /chat_sessions/{session_id}/events/{seq:010d}
+
+so appending a turn writes the new entries and two counter increments,
+whatever the length of the conversation.
 """
 
 import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.api_core.exceptions import AlreadyExists
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+# Firestore imports for subcollections
+try:
+    from firebase_admin import firestore  # type: ignore
+except ImportError:  # pragma: no cover
+    from pydantic_ai_integration.execution import firebase_stub as firebase_admin  # type: ignore
+
+    firestore = firebase_admin.firestore
 
 from persistence.base_repository import BaseRepository
+from persistence.entity_versions import entity_versions
 from persistence.firestore_pool import FirestoreConnectionPool
 from persistence.redis_cache import RedisCacheService
-from typing import Dict, List, Optional
 
 from pydantic_models.canonical.chat_session import ChatSession
 
 logger = logging.getLogger(__name__)
 
+# Largest page of messages served at once
+MESSAGE_PAGE_SIZE = 100
+
+# Attempts to append when another writer took the same sequence numbers
+APPEND_ATTEMPTS = 3
+
+# Inline fields of legacy session documents
+_INLINE_HISTORY_FIELDS = ("messages", "events", "message_index", "request_index")
+
 
 class ChatSessionRepository(BaseRepository[ChatSession]):
     """Repository for chat sessions using Firestore storage."""
@@ -44,8 +74,14 @@ class ChatSessionRepository(BaseRepository[ChatSession]):
 
         Returns:
             Dictionary representation for Firestore
+
+        History and counters are left out: they are only written by
+        ``append_entries`` (subcollection entries and atomic increments).
         """
-        return model.model_dump(mode="json")
+        return model.model_dump(
+            mode="json",
+            exclude={"messages", "events", "message_count", "event_count"},
+        )
 
     def _from_dict(self, doc_id: str, data: dict[str, any]) -> ChatSession:
         """Convert Firestore document to ChatSession.
@@ -109,3 +145,175 @@ class ChatSessionRepository(BaseRepository[ChatSession]):
         else:
             # List all chat sessions
             return await self.list_by_field("session_id", "", limit=None)  # type: ignore
+
+    # ------------------------------------------------------------------
+    # Message and event log
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _seq_id(seq: int) -> str:
+        """Zero-padded document ID so document order matches sequence order."""
+        return f"{seq:010d}"
+
+    async def append_entries(
+        self,
+        session: ChatSession,
+        messages: List[Dict[str, Any]],
+        events: List[Dict[str, Any]],
+    ) -> None:
+        """Append messages and events to a session's log in one batch.
+
+        Entries get the next sequence numbers (``seq``) from the session
+        counters. Entry documents are created, never overwritten: if another
+        writer took the same numbers, the counters are re-read and the batch is
+        retried. Legacy inline history is moved to the log first.
+
+        Args:
+            session: Session to append to (counters are advanced in place)
+            messages: Message dicts in chronological order
+            events: Event dicts in chronological order
+        """
+        if session.messages or session.events:
+            await self._move_inline_history(session)
+
+        for attempt in range(APPEND_ATTEMPTS):
+            client = await self.firestore_pool.acquire()
+            try:
+                session_doc = client.collection(self.collection_name).document(session.session_id)
+                batch = client.batch()
+                for offset, message in enumerate(messages):
+                    seq = session.message_count + offset
+                    batch.create(session_doc.collection("messages").document(self._seq_id(seq)), {**message, "seq": seq})
+                for offset, event in enumerate(events):
+                    seq = session.event_count + offset
+                    batch.create(session_doc.collection("events").document(self._seq_id(seq)), {**event, "seq": seq})
+                batch.update(
+                    session_doc,
+                    {
+                        "message_count": firestore.Increment(len(messages)),
+                        "event_count": firestore.Increment(len(events)),
+                        "updated_at": session.updated_at,
+                    },
+                )
+                await batch.commit()
+                break
+            except AlreadyExists:
+                if attempt == APPEND_ATTEMPTS - 1:
+                    raise
+                logger.info(f"Sequence conflict appending to chat session {session.session_id}; retrying")
+                snapshot = await session_doc.get()
+                data = snapshot.to_dict() or {}
+                session.message_count = data.get("message_count", 0)
+                session.event_count = data.get("event_count", 0)
+            finally:
+                await self.firestore_pool.release(client)
+
+        session.message_count += len(messages)
+        session.event_count += len(events)
+        await self._session_document_changed(session.session_id)
+
+    async def _move_inline_history(self, session: ChatSession) -> None:
+        """Move a legacy session's inline messages/events into its log."""
+        client = await self.firestore_pool.acquire()
+        try:
+            session_doc = client.collection(self.collection_name).document(session.session_id)
+            entries = [
+                (session_doc.collection(name).document(self._seq_id(seq)), {**entry, "seq": seq})
+                for name, history in (("messages", session.messages), ("events", session.events))
+                for seq, entry in enumerate(history)
+            ]
+            # Firestore batches hold at most 500 writes; keep one slot for the session update
+            for start in range(0, len(entries), 499):
+                batch = client.batch()
+                for doc, data in entries[start:start + 499]:
+                    batch.set(doc, data)
+                if start + 499 >= len(entries):
+                    update: Dict[str, Any] = {field: firestore.DELETE_FIELD for field in _INLINE_HISTORY_FIELDS}
+                    update.update(message_count=len(session.messages), event_count=len(session.events))
+                    batch.update(session_doc, update)
+                await batch.commit()
+        finally:
+            await self.firestore_pool.release(client)
+
+        logger.info(
+            f"Moved {len(session.messages)} messages and {len(session.events)} events of chat session "
+            f"{session.session_id} to its log"
+        )
+        session.message_count, session.event_count = len(session.messages), len(session.events)
+        session.messages, session.events = [], []
+
+    async def list_messages(
+        self,
+        session: ChatSession,
+        limit: int = 50,
+        before_seq: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Return the most recent page of messages (older pages via ``before_seq``).
+
+        Args:
+            session: Session to read
+            limit: Page size (capped at MESSAGE_PAGE_SIZE)
+            before_seq: Cursor from the previous page (only older messages)
+
+        Returns:
+            Tuple of (messages in chronological order, cursor for older messages
+            or None when the page reaches the first message)
+        """
+        limit = max(1, min(limit, MESSAGE_PAGE_SIZE))
+        if session.messages:
+            # Legacy inline history
+            end = len(session.messages) if before_seq is None else max(0, min(before_seq, len(session.messages)))
+            start = max(0, end - limit)
+            page = [{**message, "seq": seq} for seq, message in enumerate(session.messages[start:end], start)]
+            return page, start or None
+
+        client = await self.firestore_pool.acquire()
+        try:
+            query = (
+                client.collection(self.collection_name)
+                .document(session.session_id)
+                .collection("messages")
+                .order_by("seq", direction="DESCENDING")
+            )
+            if before_seq is not None:
+                query = query.where(filter=FieldFilter("seq", "<", before_seq))
+            page = [doc.to_dict() async for doc in query.limit(limit).stream()]
+        finally:
+            await self.firestore_pool.release(client)
+
+        page.reverse()
+        oldest = page[0]["seq"] if page else 0
+        return page, oldest if oldest > 0 and len(page) == limit else None
+
+    async def find_messages(
+        self,
+        session: ChatSession,
+        message_id: Optional[str] = None,
+        session_request_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Look up messages by message ID or by client session request ID.
+
+        Replaces the inline message_index/request_index maps with queries.
+        """
+        field, value = ("message_id", message_id) if message_id else ("session_request_id", session_request_id)
+        if session.messages:
+            return [{**m, "seq": seq} for seq, m in enumerate(session.messages) if m.get(field) == value]
+
+        client = await self.firestore_pool.acquire()
+        try:
+            query = (
+                client.collection(self.collection_name)
+                .document(session.session_id)
+                .collection("messages")
+                .where(filter=FieldFilter(field, "==", value))
+            )
+            messages = [doc.to_dict() async for doc in query.stream()]
+        finally:
+            await self.firestore_pool.release(client)
+        return sorted(messages, key=lambda m: m["seq"])
+
+    async def _session_document_changed(self, session_id: str) -> None:
+        """Drop the cached session document after a partial (batched) write."""
+        entity_versions.bump(self.collection_name, session_id)
+        if self.redis_cache:
+            await self.redis_cache.delete(self._cache_key(session_id))
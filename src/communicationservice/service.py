@@ -1,14 +1,16 @@
 """Service for handling chat sessions and message processing."""
 
 import logging
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import uuid4
 
 # TODO: Re-enable when agents module is implemented
 # from pydantic_ai_integration.agents.base import import_tools
 from coreservice.id_service import get_id_service
 from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_models.base.lazy_result import LazyResult
 from pydantic_models.base.types import RequestStatus
 from pydantic_models.canonical.chat_session import ChatSession, MessageType
 from pydantic_models.operations.chat_session_ops import (
@@ -30,6 +32,7 @@ from pydantic_models.operations.tool_execution_ops import (
     ChatRequest,
     ChatResponse,
     ChatResultPayload,
+    ChatStreamEvent,
     ToolRequest,
     ToolRequestPayload,
 )
@@ -37,6 +40,7 @@ from pydantic_models.operations.tool_session_ops import CreateSessionRequest
 from pydantic_models.views.session_views import ChatSessionSummary
 from tool_sessionservice.service import ToolSessionService
 
+from .context_window import ContextAssembler, ConversationWindow
 from .repository import ChatSessionRepository
 from pydantic_ai_integration.method_decorator import register_service_method
 
@@ -45,15 +49,103 @@ from pydantic_ai_integration.method_decorator import register_service_method
 
 logger = logging.getLogger(__name__)
 
+# Words with their trailing whitespace, streamed as assistant tokens
+_ASSISTANT_TOKEN = re.compile(r"\S+\s*")
+
+
+class ChatTurn:
+    """State of one chat turn between begin_chat_turn and persist_chat_turn."""
+
+    def __init__(
+        self,
+        request: ChatRequest,
+        session: ChatSession,
+        context: MDSContext,
+        session_request_id: str,
+        client_session_request_id: str,
+    ) -> None:
+        self.request = request
+        self.session = session
+        self.context = context
+        self.session_request_id = session_request_id
+        self.client_session_request_id = client_session_request_id
+        self.user_message: Optional[ChatMessagePayload] = None
+        self.response: Optional[ChatResponse] = None
+        self.persisted = False
+        # New log entries for this turn, appended in one batch by persist_chat_turn
+        self.new_messages: List[Dict[str, Any]] = []
+        self.new_events: List[Dict[str, Any]] = []
+
+    def record_message(self, message: ChatMessagePayload, **event_fields: Any) -> None:
+        """Add a message and its event to the entries of this turn."""
+        message_id = str(uuid4())
+        timestamp = datetime.now().isoformat()
+        message_data = message.model_dump(mode="json")
+        message_data.update(
+            {
+                "message_id": message_id,
+                "request_id": self.session_request_id,
+                "session_request_id": self.client_session_request_id,
+                "timestamp": timestamp,
+            }
+        )
+        self.new_messages.append(message_data)
+        self.new_events.append(
+            {
+                "type": "message",
+                "message_type": message.message_type.value,
+                "timestamp": timestamp,
+                "message_id": message_id,
+                "request_id": self.session_request_id,
+                "session_request_id": self.client_session_request_id,
+                **event_fields,
+            }
+        )
+
 
 class CommunicationService:
     """Service for handling chat sessions and message processing (Firestore only)."""
 
-    def __init__(self, repository: ChatSessionRepository | None = None, tool_service: ToolSessionService | None = None, id_service=None) -> None:
+    def __init__(
+        self,
+        repository: ChatSessionRepository | None = None,
+        tool_service: ToolSessionService | None = None,
+        id_service=None,
+        context_assembler: ContextAssembler | None = None,
+    ) -> None:
         """Initialize the communication and tool session services."""
         self.repository = repository or ChatSessionRepository()
         self.tool_service = tool_service or ToolSessionService()
         self.id_service = id_service or get_id_service()
+        self.context_assembler = context_assembler or ContextAssembler()
+
+    async def assemble_context(
+        self,
+        session: ChatSession,
+        pending: List[Dict[str, Any]] | None = None,
+    ) -> ConversationWindow:
+        """Build the token-budgeted conversation window for a session.
+
+        Args:
+            session: Chat session
+            pending: Messages of the current turn not yet appended to the log
+
+        Returns:
+            Recent messages verbatim plus cached summaries of older spans
+        """
+        recent, _ = await self.repository.list_messages(session)
+        recent = recent + [
+            {**message, "seq": session.message_count + offset}
+            for offset, message in enumerate(pending or [])
+        ]
+
+        async def load_span(start_seq: int, end_seq: int) -> List[Dict[str, Any]]:
+            messages, _ = await self.repository.list_messages(
+                session, limit=end_seq - start_seq, before_seq=end_seq
+            )
+            return messages
+
+        return await self.context_assembler.assemble(session.session_id, recent, load_span)
 
     @register_service_method(
         name="create_session",
@@ -137,6 +229,14 @@ class CommunicationService:
     )
     async def process_chat_request(self, request: ChatRequest) -> ChatResponse:
         """Process a chat request and run any associated tool calls."""
+        turn = await self.begin_chat_turn(request)
+        async for _ in self.stream_chat_turn(turn):
+            pass
+        await self.persist_chat_turn(turn)
+        return turn.response
+
+    async def begin_chat_turn(self, request: ChatRequest) -> ChatTurn:
+        """Validate a chat request and record its user message; nothing is written yet."""
 
         request_data = request.model_dump(
             mode="json",
@@ -159,55 +259,74 @@ class CommunicationService:
             environment="development",
         )
 
-        session_request_id = context.create_session_request(client_session_request_id)
-
-        message_id = str(uuid4())
-        message_data = cleaned_request.payload.model_dump()
-        message_data.update(
-            {
-                "message_id": message_id,
-                "request_id": session_request_id,
-                "timestamp": datetime.now().isoformat(),
-            }
+        turn = ChatTurn(
+            request=cleaned_request,
+            session=session,
+            context=context,
+            session_request_id=context.create_session_request(client_session_request_id),
+            client_session_request_id=client_session_request_id,
         )
-
-        session.messages.append(message_data)
-        session.message_index[message_id] = len(session.messages) - 1
-        session.request_index.setdefault(client_session_request_id, []).append(message_id)
-        session.events.append(
-            {
-                "type": "message",
-                "message_type": cleaned_request.payload.message_type.value,
-                "timestamp": datetime.now().isoformat(),
-                "message_id": message_id,
-                "request_id": session_request_id,
+        turn.user_message = ChatMessagePayload(
+            content=cleaned_request.payload.message,
+            message_type=MessageType.USER,
+            tool_calls=cleaned_request.payload.tool_calls,
+            session_request_id=client_session_request_id,
+            casefile_id=session.casefile_id,
+        )
+        turn.record_message(turn.user_message)
+        return turn
+
+    async def stream_chat_turn(self, turn: ChatTurn) -> AsyncIterator[ChatStreamEvent]:
+        """Run a chat turn, yielding its events as they happen.
+
+        The last event is ``completed`` with the ChatResponse, which is also set
+        on ``turn.response``. Nothing is persisted here; call persist_chat_turn
+        once the events have been delivered.
+        """
+        session, context, user_message = turn.session, turn.context, turn.user_message
+        client_session_request_id = turn.client_session_request_id
+
+        yield ChatStreamEvent(
+            event="message_accepted",
+            data={
+                "session_id": session.session_id,
+                "message_id": turn.new_messages[0]["message_id"],
                 "session_request_id": client_session_request_id,
-            }
+            },
         )
 
+        # What reaches the model: a token-budgeted window, not the full history
+        window = await self.assemble_context(session, turn.new_messages)
+        context.conversation_history = window.to_prompt_messages()
+
         try:
             start_time = datetime.now()
             context.register_event(
                 "chat_message",
-                {"content_length": len(cleaned_request.payload.content)},
+                {"content_length": len(user_message.content)},
             )
 
             tool_calls: List[Dict[str, Any]] = []
-            for tool_call in cleaned_request.payload.tool_calls or []:
+            for index, tool_call in enumerate(user_message.tool_calls):
                 tool_name = tool_call.get("name")
                 tool_params = tool_call.get("arguments", {})
                 if not tool_name:
                     continue
 
+                yield ChatStreamEvent(event="tool_started", data={"index": index, "name": tool_name})
+
                 # Use tool service's session management - it will create session if needed
-                tool_response = await self.tool_service.process_tool_request_with_session_management(
+                tool_request = ToolRequest(
                     user_id=session.user_id,
-                    tool_name=tool_name,
-                    parameters=tool_params,
-                    casefile_id=session.casefile_id,
-                    client_request_id=client_session_request_id,
-                    auto_create_session=True
+                    payload=ToolRequestPayload(
+                        tool_name=tool_name,
+                        parameters=tool_params,
+                        casefile_id=session.casefile_id,
+                        # One id per call, so a retried turn replays each call's result
+                        session_request_id=f"{client_session_request_id}:{index}",
+                    ),
                 )
+                tool_response = await self.tool_service.process_tool_request_with_session_management(tool_request)
                 tool_calls.append(
                     {
                         "name": tool_name,
@@ -215,51 +334,41 @@ class CommunicationService:
                     }
                 )
 
+                yield ChatStreamEvent(
+                    event="tool_completed",
+                    data={
+                        "index": index,
+                        "name": tool_name,
+                        "status": tool_response.status.value,
+                        "result": LazyResult.wrap(tool_response.payload.result).to_json(),
+                    },
+                )
+
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
 
             assistant_message = ChatMessagePayload(
-                content=f"Received message: {cleaned_request.payload.content[:50]}...",
+                content=f"Received message: {user_message.content[:50]}...",
                 message_type=MessageType.ASSISTANT,
                 tool_calls=tool_calls,
                 session_request_id=client_session_request_id,
                 casefile_id=session.casefile_id,
             )
 
+            for token in _ASSISTANT_TOKEN.findall(assistant_message.content):
+                yield ChatStreamEvent(event="assistant_token", data={"token": token})
+
             response = ChatResponse(
-                request_id=cleaned_request.request_id,
+                request_id=turn.request.request_id,
                 status=RequestStatus.COMPLETED,
                 session_request_id=client_session_request_id,
-                payload=ChatResponsePayload(
+                payload=ChatResultPayload(
                     message=assistant_message,
                     related_messages=[],
                     events=[event.model_dump() for event in context.tool_events],
                 ),
             )
 
-            assistant_message_id = str(uuid4())
-            assistant_message_data = assistant_message.model_dump()
-            assistant_message_data.update(
-                {
-                    "message_id": assistant_message_id,
-                    "request_id": session_request_id,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
-            session.messages.append(assistant_message_data)
-            session.message_index[assistant_message_id] = len(session.messages) - 1
-            session.request_index.setdefault(client_session_request_id, []).append(
-                assistant_message_id
-            )
-            session.events.append(
-                {
-                    "type": "message",
-                    "message_type": MessageType.ASSISTANT.value,
-                    "timestamp": datetime.now().isoformat(),
-                    "message_id": assistant_message_id,
-                    "request_id": session_request_id,
-                    "session_request_id": client_session_request_id,
-                }
-            )
+            turn.record_message(assistant_message)
 
             if context.tool_events:
                 last_event = context.tool_events[-1]
@@ -277,49 +386,43 @@ class CommunicationService:
             )
 
             response = ChatResponse(
-                request_id=cleaned_request.request_id,
+                request_id=turn.request.request_id,
                 status=RequestStatus.FAILED,
                 session_request_id=client_session_request_id,
                 error=str(exc),
-                payload=ChatResponsePayload(
+                payload=ChatResultPayload(
                     message=error_message,
                     related_messages=[],
                     events=[event.model_dump() for event in context.tool_events],
                 ),
             )
 
-            error_message_id = str(uuid4())
-            error_message_data = error_message.model_dump()
-            error_message_data.update(
-                {
-                    "message_id": error_message_id,
-                    "request_id": session_request_id,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
-            session.messages.append(error_message_data)
-            session.message_index[error_message_id] = len(session.messages) - 1
-            session.request_index.setdefault(client_session_request_id, []).append(error_message_id)
-            session.events.append(
-                {
-                    "type": "message",
-                    "message_type": MessageType.ERROR.value,
-                    "timestamp": datetime.now().isoformat(),
-                    "message_id": error_message_id,
-                    "request_id": session_request_id,
-                    "session_request_id": client_session_request_id,
-                    "error": str(exc),
-                }
-            )
+            turn.record_message(error_message, error=str(exc))
 
             if context.tool_events:
                 last_event = context.tool_events[-1]
                 last_event.result_summary = {"status": "error", "message": str(exc)}
 
-        session.updated_at = datetime.now().isoformat()
-        await self.repository.update_session(session)
+        response.metadata["context_window"] = {
+            "tokens": window.tokens,
+            "verbatim_messages": len(window.messages),
+            "summarized_before_seq": window.verbatim_from_seq,
+        }
+        turn.response = response
+        # Context changes made during the turn are persisted once, here
+        await context.flush()
+
+        yield ChatStreamEvent(event="completed", data=response.model_dump(mode="json"))
 
-        return response
+    async def persist_chat_turn(self, turn: ChatTurn) -> None:
+        """Append the messages and events recorded by a turn (at most once)."""
+        if turn.persisted:
+            return
+        turn.persisted = True
+
+        # Append-only: only this turn's entries and the session counters are written
+        turn.session.updated_at = datetime.now().isoformat()
+        await self.repository.append_entries(turn.session, turn.new_messages, turn.new_events)
 
     @register_service_method(
         name="get_session",
@@ -379,11 +482,15 @@ class CommunicationService:
                 },
             )
 
-        # Calculate message count
-        message_count = len(session.messages)
-
-        # Get messages if requested
-        messages = session.messages if include_messages else None
+        # Counters live on the session document; messages are paged from the log
+        messages: List[Dict[str, Any]] = []
+        next_cursor = None
+        if include_messages:
+            messages, next_cursor = await self.repository.list_messages(
+                session,
+                limit=request.payload.message_limit,
+                before_seq=request.payload.before_seq,
+            )
 
         execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
 
@@ -397,9 +504,11 @@ class CommunicationService:
                 created_at=session.created_at,
                 updated_at=session.updated_at,
                 active=session.active,
-                message_count=message_count,
+                message_count=max(session.message_count, len(session.messages)),
+                event_count=max(session.event_count, len(session.events)),
                 messages=messages,
-                metadata=session.metadata,
+                next_cursor=next_cursor,
+                metadata=session.metadata or {},
             ),
             metadata={
                 "execution_time_ms": execution_time_ms,
@@ -456,7 +565,7 @@ class CommunicationService:
                 casefile_id=session.casefile_id,
                 created_at=session.created_at,
                 updated_at=session.updated_at,
-                message_count=len(session.messages),
+                message_count=max(session.message_count, len(session.messages)),
                 active=session.active,
             )
             for session in paginated_sessions
@@ -539,8 +648,8 @@ class CommunicationService:
             )
 
         # Calculate statistics before closing
-        message_count = len(session.messages)
-        event_count = len(session.events)
+        message_count = max(session.message_count, len(session.messages))
+        event_count = max(session.event_count, len(session.events))
         created_at_dt = (
             datetime.fromisoformat(session.created_at)
             if isinstance(session.created_at, str)
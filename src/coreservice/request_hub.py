@@ -1,12 +1,15 @@
 """RequestHub orchestrates Request-Action-Response workflows with hook support."""
 
+import asyncio
 import logging
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 from pydantic_ai_integration.method_decorator import register_service_method
 from coreservice.service_container import ServiceManager
+from persistence.identity_map import identity_scope
 from pydantic_models.base.envelopes import BaseRequest, BaseResponse
 from pydantic_models.base.types import RequestStatus
 
@@ -14,44 +17,9 @@ from pydantic_models.base.types import RequestStatus
 from pydantic_models.operations.casefile_ops import (
     AddSessionToCasefilePayload,
     AddSessionToCasefileRequest,
-    AddSessionToCasefileResponse,
-    CheckPermissionRequest,
-    CheckPermissionResponse,
     CreateCasefilePayload,
     CreateCasefileRequest,
     CreateCasefileResponse,
-    DeleteCasefileRequest,
-    DeleteCasefileResponse,
-    GetCasefileRequest,
-    GetCasefileResponse,
-    GrantPermissionRequest,
-    GrantPermissionResponse,
-    ListCasefilesRequest,
-    ListCasefilesResponse,
-    ListPermissionsRequest,
-    ListPermissionsResponse,
-    RevokePermissionRequest,
-    RevokePermissionResponse,
-    StoreDriveFilesRequest,
-    StoreDriveFilesResponse,
-    StoreGmailMessagesRequest,
-    StoreGmailMessagesResponse,
-    StoreSheetDataRequest,
-    StoreSheetDataResponse,
-    UpdateCasefileRequest,
-    UpdateCasefileResponse,
-)
-
-# Chat session operations
-from pydantic_models.operations.chat_session_ops import (
-    CloseChatSessionRequest,
-    CloseChatSessionResponse,
-    CreateChatSessionRequest,
-    CreateChatSessionResponse,
-    GetChatSessionRequest,
-    GetChatSessionResponse,
-    ListChatSessionsRequest,
-    ListChatSessionsResponse,
 )
 
 # RequestHub composite operations
@@ -65,22 +33,10 @@ from pydantic_models.operations.request_hub_ops import (
 )
 
 # Tool session operations
-from pydantic_models.operations.tool_execution_ops import (
-    ChatRequest,
-    ChatResponse,
-    ToolRequest,
-    ToolResponse,
-)
 from pydantic_models.operations.tool_session_ops import (
-    CloseSessionRequest,
-    CloseSessionResponse,
     CreateSessionPayload,
     CreateSessionRequest,
     CreateSessionResponse,
-    GetSessionRequest,
-    GetSessionResponse,
-    ListSessionsRequest,
-    ListSessionsResponse,
 )
 
 from .policy_patterns import PolicyPatternLoader
@@ -91,463 +47,227 @@ HookHandler = Callable[
     [str, BaseRequest[Any], dict[str, Any], BaseResponse[Any] | None], Awaitable[None]
 ]
 
+# Reads a value for the hook context from the request and the service response
+ContextField = Callable[[BaseRequest[Any], BaseResponse[Any]], Any]
 
-class RequestHub:
-    """Central orchestrator bridging Tool Engineering and R-A-R management."""
-
-    def __init__(
-        self,
-        service_manager: ServiceManager | None = None,
-        policy_loader: PolicyPatternLoader | None = None,
-        hook_handlers: dict[str, HookHandler] | None = None,
-    ) -> None:
-        self.service_manager = service_manager or ServiceManager()
-        self.policy_loader = policy_loader or PolicyPatternLoader()
-        self.hook_handlers = hook_handlers or {
-            "metrics": self._metrics_hook,
-            "audit": self._audit_hook,
-            "session_lifecycle": self._session_lifecycle_hook,
-        }
-
-    async def dispatch(self, request: BaseRequest[Any]) -> BaseResponse[Any]:
-        """Dispatch request to the appropriate workflow based on operation name."""
-
-        # Map operation to handler method
-        handlers = {
-            # Casefile CRUD operations (5)
-            "create_casefile": self._execute_casefile_create,
-            "workspace.casefile.create_casefile": self._execute_casefile_create,
-            "get_casefile": self._execute_casefile_get,
-            "update_casefile": self._execute_casefile_update,
-            "list_casefiles": self._execute_casefile_list,
-            "delete_casefile": self._execute_casefile_delete,
-            # Casefile session management (1)
-            "add_session_to_casefile": self._execute_casefile_add_session,
-            # Casefile ACL operations (4)
-            "grant_permission": self._execute_casefile_grant_permission,
-            "revoke_permission": self._execute_casefile_revoke_permission,
-            "list_permissions": self._execute_casefile_list_permissions,
-            "check_permission": self._execute_casefile_check_permission,
-            # Casefile workspace sync operations (3)
-            "store_gmail_messages": self._execute_casefile_store_gmail,
-            "store_drive_files": self._execute_casefile_store_drive,
-            "store_sheet_data": self._execute_casefile_store_sheet,
-            # Tool session lifecycle (4)
-            "create_session": self._execute_session_create,
-            "get_session": self._execute_session_get,
-            "list_sessions": self._execute_session_list,
-            "close_session": self._execute_session_close,
-            # Tool execution (1)
-            "tool_execution": self._execute_tool_request,
-            "process_tool_request": self._execute_tool_request,
-            # Chat session lifecycle (4)
-            "create_chat_session": self._execute_chat_create,
-            "get_chat_session": self._execute_chat_get,
-            "list_chat_sessions": self._execute_chat_list,
-            "close_chat_session": self._execute_chat_close,
-            # Chat message processing (1)
-            "chat": self._execute_chat_process,
-            "process_chat_request": self._execute_chat_process,
-            # Composite workflows (1)
-            "workspace.casefile.create_casefile_with_session": self._execute_casefile_with_session,
-            "workspace.session.create_session_with_casefile": self._execute_session_with_casefile,
-        }
-
-        handler = handlers.get(request.operation)
-        if not handler:
-            raise ValueError(
-                f"RequestHub does not handle operation '{request.operation}'. "
-                f"Available operations: {list(handlers.keys())}"
-            )
-
-        return await handler(request)
-
-    async def _execute_casefile_create(
-        self,
-        request: CreateCasefileRequest,
-    ) -> CreateCasefileResponse:
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.create_casefile(request)
-
-        context["casefile_id"] = response.payload.casefile_id
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_get(
-        self,
-        request: GetCasefileRequest,
-    ) -> GetCasefileResponse:
-        """Handler for get_casefile operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.get_casefile(request)
-
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_update(
-        self,
-        request: UpdateCasefileRequest,
-    ) -> UpdateCasefileResponse:
-        """Handler for update_casefile operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.update_casefile(request)
-
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_list(
-        self,
-        request: ListCasefilesRequest,
-    ) -> ListCasefilesResponse:
-        """Handler for list_casefiles operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.list_casefiles(request)
-
-        context["status"] = response.status.value
-        context["count"] = len(response.payload.casefiles)
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_delete(
-        self,
-        request: DeleteCasefileRequest,
-    ) -> DeleteCasefileResponse:
-        """Handler for delete_casefile operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.delete_casefile(request)
-
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_add_session(
-        self,
-        request: AddSessionToCasefileRequest,
-    ) -> AddSessionToCasefileResponse:
-        """Handler for add_session_to_casefile operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.add_session_to_casefile(request)
-
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_grant_permission(
-        self,
-        request: GrantPermissionRequest,
-    ) -> GrantPermissionResponse:
-        """Handler for grant_permission operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.grant_permission(request)
-
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_revoke_permission(
-        self,
-        request: RevokePermissionRequest,
-    ) -> RevokePermissionResponse:
-        """Handler for revoke_permission operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.revoke_permission(request)
-
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_list_permissions(
-        self,
-        request: ListPermissionsRequest,
-    ) -> ListPermissionsResponse:
-        """Handler for list_permissions operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.list_permissions(request)
-
-        context["status"] = response.status.value
-        context["permission_count"] = len(response.payload.permissions)
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_check_permission(
-        self,
-        request: CheckPermissionRequest,
-    ) -> CheckPermissionResponse:
-        """Handler for check_permission operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.check_permission(request)
-
-        context["status"] = response.status.value
-        context["has_permission"] = response.payload.has_permission
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_store_gmail(
-        self,
-        request: StoreGmailMessagesRequest,
-    ) -> StoreGmailMessagesResponse:
-        """Handler for store_gmail_messages operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.store_gmail_messages(request)
-
-        context["status"] = response.status.value
-        context["messages_stored"] = response.payload.messages_stored
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_store_drive(
-        self,
-        request: StoreDriveFilesRequest,
-    ) -> StoreDriveFilesResponse:
-        """Handler for store_drive_files operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.store_drive_files(request)
-
-        context["status"] = response.status.value
-        context["files_stored"] = response.payload.files_stored
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_casefile_store_sheet(
-        self,
-        request: StoreSheetDataRequest,
-    ) -> StoreSheetDataResponse:
-        """Handler for store_sheet_data operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.casefile_service.store_sheet_data(request)
-
-        context["status"] = response.status.value
-        context["rows_stored"] = response.payload.rows_stored
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_session_create(
-        self,
-        request: CreateSessionRequest,
-    ) -> CreateSessionResponse:
-        """Handler for create_session operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.tool_session_service.create_session(request)
-
-        context["session_id"] = response.payload.session_id
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
-
-    async def _execute_session_get(
-        self,
-        request: GetSessionRequest,
-    ) -> GetSessionResponse:
-        """Handler for get_session operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.tool_session_service.get_session(request)
-
-        context["status"] = response.status.value
-
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
 
-    async def _execute_session_list(
-        self,
-        request: ListSessionsRequest,
-    ) -> ListSessionsResponse:
-        """Handler for list_sessions operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        response = await self.service_manager.tool_session_service.list_sessions(request)
+@dataclass(frozen=True)
+class OperationRoute:
+    """Compiled dispatch entry for one operation.
 
-        context["status"] = response.status.value
-        context["count"] = len(response.payload.sessions)
+    Service routes run the standard pipeline (prepare context, pre-hooks,
+    service call, context fields, post-hooks, attach hook metadata). Workflow
+    routes point at a RequestHub method that runs its own pipeline.
+    """
 
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
+    service: str | None = None
+    method: str | None = None
+    context_fields: tuple[tuple[str, ContextField], ...] = ()
+    call_kwargs: Callable[[BaseRequest[Any]], dict[str, Any]] | None = None
+    workflow: Callable[..., Awaitable[BaseResponse[Any]]] | None = None
 
-    async def _execute_session_close(
-        self,
-        request: CloseSessionRequest,
-    ) -> CloseSessionResponse:
-        """Handler for close_session operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
 
-        response = await self.service_manager.tool_session_service.close_session(request)
+# Operation name -> route, filled once at import time
+OPERATION_ROUTES: dict[str, OperationRoute] = {}
 
-        context["status"] = response.status.value
 
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
+def register_operation(
+    *operations: str,
+    service: str,
+    method: str,
+    context: dict[str, ContextField] | None = None,
+    call_kwargs: Callable[[BaseRequest[Any]], dict[str, Any]] | None = None,
+) -> OperationRoute:
+    """Route operations to ``service_manager.<service>.<method>(request)``.
 
-    async def _execute_chat_create(
-        self,
-        request: CreateChatSessionRequest,
-    ) -> CreateChatSessionResponse:
-        """Handler for create_chat_session operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
+    Args:
+        *operations: Operation names (aliases share the route)
+        service: ServiceManager attribute of the target service
+        method: Service method called with the request
+        context: Hook context keys read from (request, response) after the
+            call; ``None`` values are not recorded
+        call_kwargs: Extra keyword arguments for the call, built from the request
+    """
+    route = OperationRoute(
+        service=service,
+        method=method,
+        context_fields=tuple((context or {}).items()),
+        call_kwargs=call_kwargs,
+    )
+    for operation in operations:
+        if operation in OPERATION_ROUTES:
+            raise ValueError(f"Operation '{operation}' is already registered")
+        OPERATION_ROUTES[operation] = route
+    return route
 
-        response = await self.service_manager.communication_service.create_session(request)
 
-        context["chat_session_id"] = response.payload.session_id
-        context["status"] = response.status.value
+def workflow_operation(*operations: str):
+    """Decorator routing operations to a RequestHub workflow method."""
 
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
+    def decorate(method):
+        route = OperationRoute(workflow=method)
+        for operation in operations:
+            if operation in OPERATION_ROUTES:
+                raise ValueError(f"Operation '{operation}' is already registered")
+            OPERATION_ROUTES[operation] = route
+        return method
 
-    async def _execute_chat_get(
-        self,
-        request: GetChatSessionRequest,
-    ) -> GetChatSessionResponse:
-        """Handler for get_chat_session operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
+    return decorate
 
-        response = await self.service_manager.communication_service.get_session(request)
 
-        context["status"] = response.status.value
+def _payload(attribute: str) -> ContextField:
+    return lambda request, response: getattr(response.payload, attribute)
 
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
 
-    async def _execute_chat_list(
-        self,
-        request: ListChatSessionsRequest,
-    ) -> ListChatSessionsResponse:
-        """Handler for list_chat_sessions operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
+def _payload_count(attribute: str) -> ContextField:
+    return lambda request, response: len(getattr(response.payload, attribute))
 
-        response = await self.service_manager.communication_service.list_sessions(request)
 
-        context["status"] = response.status.value
-        context["count"] = len(response.payload.sessions)
+# Casefile CRUD operations
+register_operation(
+    "create_casefile", "workspace.casefile.create_casefile",
+    service="casefile_service", method="create_casefile",
+    context={"casefile_id": _payload("casefile_id")},
+)
+register_operation("get_casefile", service="casefile_service", method="get_casefile")
+register_operation("update_casefile", service="casefile_service", method="update_casefile")
+register_operation(
+    "list_casefiles", service="casefile_service", method="list_casefiles",
+    context={"count": _payload_count("casefiles")},
+)
+register_operation("delete_casefile", service="casefile_service", method="delete_casefile")
+# Casefile session management
+register_operation("add_session_to_casefile", service="casefile_service", method="add_session_to_casefile")
+# Casefile ACL operations
+register_operation("grant_permission", service="casefile_service", method="grant_permission")
+register_operation("revoke_permission", service="casefile_service", method="revoke_permission")
+register_operation(
+    "list_permissions", service="casefile_service", method="list_permissions",
+    context={"permission_count": _payload_count("permissions")},
+)
+register_operation(
+    "check_permission", service="casefile_service", method="check_permission",
+    context={"has_permission": _payload("has_permission")},
+)
+# Casefile workspace sync operations
+register_operation(
+    "store_gmail_messages", service="casefile_service", method="store_gmail_messages",
+    context={"messages_stored": _payload("messages_stored")},
+)
+register_operation(
+    "store_drive_files", service="casefile_service", method="store_drive_files",
+    context={"files_stored": _payload("files_stored")},
+)
+register_operation(
+    "store_sheet_data", service="casefile_service", method="store_sheet_data",
+    context={"rows_stored": _payload("rows_stored")},
+)
+# Tool session lifecycle
+register_operation(
+    "create_session", service="tool_session_service", method="create_session",
+    context={"session_id": _payload("session_id")},
+)
+register_operation("get_session", service="tool_session_service", method="get_session")
+register_operation(
+    "list_sessions", service="tool_session_service", method="list_sessions",
+    context={"count": _payload_count("sessions")},
+)
+register_operation("close_session", service="tool_session_service", method="close_session")
+# Tool execution
+register_operation(
+    "tool_execution", "process_tool_request",
+    service="tool_session_service", method="process_tool_request",
+    context={"session_id": lambda request, response: request.session_id},
+    call_kwargs=lambda request: {
+        "auth_context": request.metadata.get("auth_context") if request.metadata else None
+    },
+)
+# Chat session lifecycle
+register_operation(
+    "create_chat_session", service="communication_service", method="create_session",
+    context={"chat_session_id": _payload("session_id")},
+)
+register_operation("get_chat_session", service="communication_service", method="get_session")
+register_operation(
+    "list_chat_sessions", service="communication_service", method="list_sessions",
+    context={"count": _payload_count("sessions")},
+)
+register_operation("close_chat_session", service="communication_service", method="close_session")
+# Chat message processing
+register_operation(
+    "chat", "process_chat_request",
+    service="communication_service", method="process_chat_request",
+    context={"chat_session_id": lambda request, response: request.payload.session_id},
+)
 
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
 
-    async def _execute_chat_close(
-        self,
-        request: CloseChatSessionRequest,
-    ) -> CloseChatSessionResponse:
-        """Handler for close_chat_session operation."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
+@dataclass(frozen=True)
+class _PolicyPlan:
+    """Policy defaults with their requirement and hook lists, merged once per pattern."""
 
-        response = await self.service_manager.communication_service.close_session(request)
+    policy: dict[str, Any]
+    requirements: tuple[str, ...]
+    hooks: tuple[str, ...]
 
-        context["status"] = response.status.value
 
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
+class RequestHub:
+    """Central orchestrator bridging Tool Engineering and R-A-R management."""
 
-    async def _execute_tool_request(
+    def __init__(
         self,
-        request: ToolRequest,
-    ) -> ToolResponse:
-        """Handler for tool_execution and process_tool_request operations."""
-        context = await self._prepare_context(request)
-        await self._run_hooks("pre", request, context)
-
-        # Extract auth_context from request metadata if available
-        auth_context = request.metadata.get("auth_context") if request.metadata else None
-
-        response = await self.service_manager.tool_session_service.process_tool_request(
-            request, auth_context=auth_context
-        )
+        service_manager: ServiceManager | None = None,
+        policy_loader: PolicyPatternLoader | None = None,
+        hook_handlers: dict[str, HookHandler] | None = None,
+    ) -> None:
+        self.service_manager = service_manager or ServiceManager()
+        self.policy_loader = policy_loader or PolicyPatternLoader()
+        self.hook_handlers = hook_handlers or {
+            "metrics": self._metrics_hook,
+            "audit": self._audit_hook,
+            "session_lifecycle": self._session_lifecycle_hook,
+        }
+        self._policy_plans: dict[str | None, _PolicyPlan] = {}
 
-        context["status"] = response.status.value
-        if request.session_id:
-            context["session_id"] = request.session_id
+    async def dispatch(self, request: BaseRequest[Any]) -> BaseResponse[Any]:
+        """Dispatch request to the appropriate workflow based on operation name.
 
-        await self._run_hooks("post", request, context, response)
-        self._attach_hook_metadata(response, context)
-        return response
+        The request runs in an identity scope: context hydration, the service
+        handler and every step of a composite workflow share the documents
+        loaded through the repositories, reading each at most once.
+        """
+        route = OPERATION_ROUTES.get(request.operation)
+        if not route:
+            raise ValueError(
+                f"RequestHub does not handle operation '{request.operation}'. "
+                f"Available operations: {list(OPERATION_ROUTES)}"
+            )
+        with identity_scope():
+            if route.workflow is not None:
+                return await route.workflow(self, request)
+            return await self._execute_route(route, request)
 
-    async def _execute_chat_process(
-        self,
-        request: ChatRequest,
-    ) -> ChatResponse:
-        """Handler for chat and process_chat_request operations."""
+    async def _execute_route(self, route: OperationRoute, request: BaseRequest[Any]) -> BaseResponse[Any]:
+        """Standard pipeline of a service route."""
         context = await self._prepare_context(request)
         await self._run_hooks("pre", request, context)
 
-        response = await self.service_manager.communication_service.process_chat_request(request)
+        service_method = getattr(getattr(self.service_manager, route.service), route.method)
+        if route.call_kwargs is not None:
+            response = await service_method(request, **route.call_kwargs(request))
+        else:
+            response = await service_method(request)
 
         context["status"] = response.status.value
-        context["chat_session_id"] = request.payload.session_id
+        for key, read in route.context_fields:
+            value = read(request, response)
+            if value is not None:
+                context[key] = value
 
         await self._run_hooks("post", request, context, response)
         self._attach_hook_metadata(response, context)
         return response
 
+    @workflow_operation("workspace.casefile.create_casefile_with_session")
     async def _execute_casefile_with_session(
         self,
         request: CreateCasefileWithSessionRequest,
@@ -642,6 +362,7 @@ class RequestHub:
         self._attach_hook_metadata(composite_response, context)
         return composite_response
 
+    @workflow_operation("workspace.session.create_session_with_casefile")
     async def _execute_session_with_casefile(
         self,
         request: CreateSessionWithCasefileRequest,
@@ -723,6 +444,8 @@ class RequestHub:
         2. Merge requirements and hooks from policy + request
         3. Hydrate session data if session_id present and required
         4. Hydrate casefile data if casefile_id present and required
+           (3 and 4 load concurrently; within dispatch the loaded models stay
+           in the request's identity map for the service handler)
         5. Extract auth_context from request metadata for routing
         
         The prepared context flows through:
@@ -736,28 +459,18 @@ class RequestHub:
         Returns:
             Context dict with policy, requirements, hooks, hook_events, and hydrated data
         """
-        policy_defaults = (
-            self.policy_loader.load(request.policy_hints.get("pattern"))
-            if request.policy_hints
-            else self.policy_loader.load(None)
-        )
-
-        combined_requirements = list(
-            dict.fromkeys(
-                [
-                    *policy_defaults.get("context_requirements", []),
-                    *request.context_requirements,
-                ]
-            )
-        )
-        combined_hooks = list(
-            dict.fromkeys(
-                [
-                    *policy_defaults.get("hooks", []),
-                    *request.hooks,
-                ]
-            )
-        )
+        plan = self._policy_plan(request.policy_hints.get("pattern") if request.policy_hints else None)
+        policy_defaults = dict(plan.policy)
+
+        # Common case: nothing to merge into the precomputed policy lists
+        if request.context_requirements:
+            combined_requirements = list(dict.fromkeys([*plan.requirements, *request.context_requirements]))
+        else:
+            combined_requirements = list(plan.requirements)
+        if request.hooks:
+            combined_hooks = list(dict.fromkeys([*plan.hooks, *request.hooks]))
+        else:
+            combined_hooks = list(plan.hooks)
 
         context: dict[str, Any] = {
             "policy": policy_defaults,
@@ -777,26 +490,39 @@ class RequestHub:
                 context["session_request_id"] = session_request_id
                 logger.debug(f"Context prepared with session_request_id: {session_request_id}")
 
-        # Hydrate session data if required
+        # Hydrate session and casefile data if required (independent reads, run concurrently)
+        loads: dict[str, Awaitable[Any]] = {}
         if "session" in combined_requirements and request.session_id:
-            session = await self.service_manager.tool_session_service.repository.get_session(request.session_id)  # type: ignore[attr-defined]
-            context["session"] = session.model_dump() if session else None
-            if session:
-                logger.debug(f"Context hydrated with session: {request.session_id}")
-
-        # Hydrate casefile data if required
+            loads["session"] = self.service_manager.tool_session_service.repository.get_session(request.session_id)  # type: ignore[attr-defined]
         if "casefile" in combined_requirements:
             casefile_id = request.metadata.get("casefile_id")
             if not casefile_id and hasattr(request.payload, "casefile_id"):
                 casefile_id = request.payload.casefile_id  # type: ignore[attr-defined]
             if casefile_id:
-                casefile = await self.service_manager.casefile_service.repository.get_casefile(casefile_id)  # type: ignore[attr-defined]
-                context["casefile"] = casefile.model_dump() if casefile else None
-                if casefile:
-                    logger.debug(f"Context hydrated with casefile: {casefile_id}")
+                loads["casefile"] = self.service_manager.casefile_service.repository.get_casefile(casefile_id)  # type: ignore[attr-defined]
+
+        if loads:
+            loaded = await asyncio.gather(*loads.values())
+            for key, model in zip(loads, loaded):
+                context[key] = model.model_dump() if model else None
+                if model:
+                    logger.debug(f"Context hydrated with {key}")
 
         return context
 
+    def _policy_plan(self, pattern: str | None) -> _PolicyPlan:
+        """Policy defaults for a pattern, loaded and split once per hub."""
+        plan = self._policy_plans.get(pattern)
+        if plan is None:
+            policy = self.policy_loader.load(pattern)
+            plan = _PolicyPlan(
+                policy=policy,
+                requirements=tuple(dict.fromkeys(policy.get("context_requirements", []))),
+                hooks=tuple(dict.fromkeys(policy.get("hooks", []))),
+            )
+            self._policy_plans[pattern] = plan
+        return plan
+
     async def _run_hooks(
         self,
         stage: str,
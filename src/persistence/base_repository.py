@@ -7,6 +7,7 @@ Provides consistent interface for all persistence operations with:
 - Metrics collection
 - Error handling
 - Transaction support
+- Request-scoped identity map (see ``persistence.identity_map``)
 """
 
 import logging
@@ -17,7 +18,10 @@ from datetime import datetime, UTC
 from google.cloud.firestore import AsyncClient, AsyncTransaction
 from pydantic import BaseModel
 
+from persistence.entity_versions import entity_versions
 from persistence.firestore_pool import FirestoreConnectionPool
+from persistence.identity_map import current_identity_map
+from persistence.recursive_delete import DeleteProgress, RecursiveDeleter, SubcollectionTree
 from persistence.redis_cache import RedisCacheService
 
 logger = logging.getLogger(__name__)
@@ -65,6 +69,7 @@ class BaseRepository(ABC, Generic[T]):
             "cache_hits": 0,
             "cache_misses": 0,
         }
+        self.deleter = RecursiveDeleter()
         logger.info(f"Initialized {self.__class__.__name__} for collection '{collection_name}'")
 
     @abstractmethod
@@ -81,6 +86,18 @@ class BaseRepository(ABC, Generic[T]):
         """Generate cache key for document."""
         return f"{self.collection_name}:{doc_id}"
 
+    def _remember(self, doc_id: str, model: Optional[T]) -> None:
+        """Record a write in the current request's identity map, if any."""
+        identity = current_identity_map()
+        if identity is not None:
+            identity.put(self.collection_name, doc_id, model)
+
+    def _forget(self, doc_id: str) -> None:
+        """Drop a document from the current request's identity map after a partial write."""
+        identity = current_identity_map()
+        if identity is not None:
+            identity.discard(self.collection_name, doc_id)
+
     async def get_by_id(self, doc_id: str, use_cache: bool = True) -> Optional[T]:
         """
         Get document by ID with caching.
@@ -91,7 +108,19 @@ class BaseRepository(ABC, Generic[T]):
 
         Returns:
             Domain model or None if not found
+
+        Inside ``identity_scope()`` a document is read once per request; later
+        calls return the same model instance.
         """
+        identity = current_identity_map()
+        if identity is not None:
+            return await identity.load(
+                self.collection_name, doc_id, lambda: self._fetch_by_id(doc_id, use_cache)
+            )
+        return await self._fetch_by_id(doc_id, use_cache)
+
+    async def _fetch_by_id(self, doc_id: str, use_cache: bool) -> Optional[T]:
+        """Read a document from the cache or Firestore."""
         # Try cache first
         if use_cache and self.redis_cache:
             cache_key = self._cache_key(doc_id)
@@ -148,6 +177,7 @@ class BaseRepository(ABC, Generic[T]):
 
             await doc_ref.set(data)
             self._metrics["writes"] += 1
+            entity_versions.bump(self.collection_name, doc_id)
             logger.info(f"Created document {doc_id}")
 
             # Invalidate/update cache
@@ -155,7 +185,9 @@ class BaseRepository(ABC, Generic[T]):
                 cache_key = self._cache_key(doc_id)
                 await self.redis_cache.set(cache_key, data, self.cache_ttl)
 
-            return self._from_dict(doc_id, data)
+            created = self._from_dict(doc_id, data)
+            self._remember(doc_id, created)
+            return created
 
         except Exception as e:
             logger.error(f"Error creating document {doc_id}: {e}")
@@ -182,6 +214,7 @@ class BaseRepository(ABC, Generic[T]):
 
             await doc_ref.update(data)
             self._metrics["writes"] += 1
+            entity_versions.bump(self.collection_name, doc_id)
             logger.info(f"Updated document {doc_id}")
 
             # Invalidate cache
@@ -189,6 +222,7 @@ class BaseRepository(ABC, Generic[T]):
                 cache_key = self._cache_key(doc_id)
                 await self.redis_cache.delete(cache_key)
 
+            self._remember(doc_id, model)
             return model
 
         except Exception as e:
@@ -212,6 +246,7 @@ class BaseRepository(ABC, Generic[T]):
             doc_ref = client.collection(self.collection_name).document(doc_id)
             await doc_ref.delete()
             self._metrics["deletes"] += 1
+            entity_versions.bump(self.collection_name, doc_id)
             logger.info(f"Deleted document {doc_id}")
 
             # Invalidate cache
@@ -219,6 +254,7 @@ class BaseRepository(ABC, Generic[T]):
                 cache_key = self._cache_key(doc_id)
                 await self.redis_cache.delete(cache_key)
 
+            self._remember(doc_id, None)
             return True
 
         except Exception as e:
@@ -227,6 +263,32 @@ class BaseRepository(ABC, Generic[T]):
         finally:
             await self.firestore_pool.release(client)
 
+    async def delete_tree(self, doc_id: str, subcollections: SubcollectionTree = None) -> DeleteProgress:
+        """
+        Delete a document and all documents in its subcollections.
+
+        Subcollection documents are deleted in concurrent batches (see
+        ``persistence.recursive_delete``), then the document itself via delete().
+
+        Args:
+            doc_id: Document ID
+            subcollections: Subcollection tree, e.g. {"requests": {"events": {}}};
+                None discovers subcollections per document
+
+        Returns:
+            Totals of the delete, including the document
+        """
+        client = await self.firestore_pool.acquire()
+        try:
+            doc_ref = client.collection(self.collection_name).document(doc_id)
+            progress = await self.deleter.delete_subcollections(client, doc_ref, subcollections)
+        finally:
+            await self.firestore_pool.release(client)
+
+        await self.delete(doc_id)
+        progress.documents_deleted += 1
+        return progress
+
     async def list_by_field(
         self,
         field: str,
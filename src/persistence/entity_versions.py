@@ -0,0 +1,57 @@
+"""
+Entity Version Tracking
+
+In-process version counters for persisted documents. Repositories bump the
+version of a document (and of its collection) on every write, so read-side
+caches can include the current version in their keys and never serve results
+computed against an older state of the same entity.
+
+Versions are process-local; caches that rely on them should also use a TTL to
+bound staleness for writes made by other instances.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+
+class EntityVersionTracker:
+    """Monotonic per-document and per-collection write counters."""
+
+    def __init__(self) -> None:
+        self._documents: Dict[Tuple[str, str], int] = {}
+        self._collections: Dict[str, int] = {}
+
+    def bump(self, collection: str, doc_id: str) -> int:
+        """Record a write to ``collection/doc_id`` and return its new version."""
+        key = (collection, doc_id)
+        version = self._documents.get(key, 0) + 1
+        self._documents[key] = version
+        self._collections[collection] = self._collections.get(collection, 0) + 1
+        return version
+
+    def get(self, collection: str, doc_id: str) -> int:
+        """Current version of a document (0 if never written by this process)."""
+        return self._documents.get((collection, doc_id), 0)
+
+    def get_collection(self, collection: str) -> int:
+        """Current version of a collection (bumped by any write to it)."""
+        return self._collections.get(collection, 0)
+
+    def snapshot(self, documents: Iterable[Tuple[str, str]] = (), collections: Iterable[str] = ()) -> Tuple:
+        """Versions for a set of documents and collections, usable as a cache key part."""
+        return (
+            tuple((collection, doc_id, self.get(collection, doc_id)) for collection, doc_id in documents),
+            tuple((collection, self.get_collection(collection)) for collection in collections),
+        )
+
+    def documents(self) -> Dict[Tuple[str, str], int]:
+        """Copy of the current version of every document written by this process."""
+        return dict(self._documents)
+
+    def reset(self) -> None:
+        """Forget all versions (tests)."""
+        self._documents.clear()
+        self._collections.clear()
+
+
+# Global tracker shared by repositories and read caches
+entity_versions = EntityVersionTracker()
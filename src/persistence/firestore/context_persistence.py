@@ -1,307 +1,582 @@
 """
 Firestore implementation of context persistence.
+
+Contexts are stored in ``mds_contexts/{session_id}`` through the async
+client from a ``FirestoreConnectionPool``, so saves and loads never block the
+event loop:
+
+- every top-level field is JSON-encoded once (off the event loop) and its
+  encoded size decides where it goes
+- each field larger than ``inline_limit`` - and then the largest remaining
+  fields until the main document fits ``document_budget`` - is split into
+  byte-bounded chunks (cut at list item boundaries where possible) stored in
+  the ``chunks`` subcollection
+- append-only list fields (tool events, conversation history, related
+  documents) are stored as a log of segments: a save writes only the items
+  past the field's high-water mark as a new segment, and after
+  ``max_segments`` segments the field is compacted into a single snapshot
+- chunks are written in parallel batches; the main document holds the
+  manifest of segments per chunked field, so chunks that are no longer
+  referenced are deleted by id once the new document is in place
+- loads fetch chunks concurrently and concatenate the segments;
+  ``stream_field`` yields the items of a list field lazily while later
+  chunks are prefetched
+
+Documents written by the previous provider (``{field}_chunked`` flags with
+one item per ``{field}_chunks`` document) can still be loaded.
 """
 
+import asyncio
+import codecs
+import hashlib
+import json
 import logging
-import os
 import traceback
+from bisect import bisect_right
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
 
 from google.cloud.firestore_v1.base_query import FieldFilter
 
-from ...pydantic_ai_integration.persistence import ContextPersistenceProvider
-from ..firestore import DEFAULT_DATABASE, get_firestore_client
+from ..firestore_pool import FirestoreConnectionPool
+from ..recursive_delete import MAX_BATCH_SIZE, RecursiveDeleter
 
 logger = logging.getLogger(__name__)
 
 # Constants
 CONTEXT_COLLECTION = "mds_contexts"
+CHUNK_COLLECTION = "chunks"
 MAX_LIST_LIMIT = 100
-CHUNK_SIZE = 1000000  # ~1MB
 MAX_DOCUMENT_SIZE = 1048576  # Firestore's 1MB limit
+CHUNK_SIZE = 900000  # Encoded bytes per chunk document
+INLINE_FIELD_LIMIT = 256 * 1024  # Larger fields are always chunked
+DOCUMENT_BUDGET = 800000  # Encoded bytes kept in the main document
+MAX_BATCH_BYTES = 8000000  # Below Firestore's 10MiB request limit
+
+# Main-document key holding {field: {"segments", "items", "tail"}}
+CHUNK_MANIFEST = "_chunks"
+
+# List fields that only ever grow by appending; persisted as deltas
+APPEND_ONLY_FIELDS = ("tool_events", "conversation_history", "related_documents")
+
+# Fields chunked by the previous provider (one item per document)
+LEGACY_CHUNKED_FIELDS = ("tool_events", "conversation_history", "related_documents")
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _fingerprint(item: Any) -> str:
+    return hashlib.blake2b(_dumps(item), digest_size=8).hexdigest()
+
+
+def encode_field(value: Any) -> Tuple[bytes, List[int]]:
+    """JSON-encode a field once.
+
+    Returns:
+        Encoded bytes and, for lists, the offset just after each item
+    """
+    if not isinstance(value, list):
+        return _dumps(value), []
+    parts = [_dumps(item) for item in value]
+    boundaries, offset = [], 1
+    for part in parts:
+        offset += len(part)
+        boundaries.append(offset)
+        offset += 1
+    return b"[" + b",".join(parts) + b"]", boundaries
+
+
+def split_encoded(encoded: bytes, boundaries: List[int], chunk_size: int) -> List[bytes]:
+    """Split encoded bytes into chunks of at most ``chunk_size`` bytes.
+
+    Chunks end on an item boundary when one falls inside the chunk; items
+    larger than a chunk are cut wherever the limit falls.
+    """
+    chunks, start = [], 0
+    while start < len(encoded):
+        end = start + chunk_size
+        if end >= len(encoded):
+            end = len(encoded)
+        else:
+            last = bisect_right(boundaries, end) - 1
+            if last >= 0 and boundaries[last] > start:
+                end = boundaries[last]
+        chunks.append(encoded[start:end])
+        start = end
+    return chunks
+
+
+class _ListItemDecoder:
+    """Decodes the items of an encoded JSON list fed in arbitrary byte slices."""
 
-class FirestorePersistenceProvider(ContextPersistenceProvider):
-    """Persistence provider that uses Firestore."""
-    
     def __init__(self):
-        """Initialize the provider."""
-        self.db = None
-        try:
-            self.db = get_firestore_client()
-            database_id = os.environ.get("FIRESTORE_DATABASE", DEFAULT_DATABASE)
-            logger.info(f"Firestore persistence provider initialized with database: {database_id}")
-        except Exception as e:
-            logger.error(f"Failed to initialize Firestore persistence provider: {e}")
-            logger.debug(traceback.format_exc())
-    
-    def _get_context_ref(self, session_id: str):
-        """Get the document reference for a session context.
-        
-        Args:
-            session_id: The session identifier
-            
-        Returns:
-            Firestore document reference
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        buffer = self._buffer + self._text.decode(data, final)
+        if not self._started:
+            if not buffer:
+                return []
+            if buffer[0] != "[":
+                raise ValueError("Chunked field is not a list")
+            buffer, self._started = buffer[1:], True
+
+        items, pos = [], 0
+        while pos < len(buffer):
+            if buffer[pos] == ",":
+                pos += 1
+            if pos >= len(buffer) or buffer[pos] == "]":
+                break
+            try:
+                item, end = self._json.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            # A scalar at the very end may still be cut off (e.g. a number)
+            if end >= len(buffer) and not final:
+                break
+            items.append(item)
+            pos = end
+        self._buffer = buffer[pos:]
+        return items
+
+
+class FirestorePersistenceProvider:
+    """Async persistence provider for MDSContext state in Firestore."""
+
+    def __init__(
+        self,
+        firestore_pool: FirestoreConnectionPool,
+        chunk_size: int = CHUNK_SIZE,
+        inline_limit: int = INLINE_FIELD_LIMIT,
+        document_budget: int = DOCUMENT_BUDGET,
+        max_concurrency: int = 4,
+        append_only_fields: Tuple[str, ...] = APPEND_ONLY_FIELDS,
+        max_segments: int = 32,
+    ):
         """
-        return self.db.collection(CONTEXT_COLLECTION).document(session_id)
-    
-    def _split_large_context(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Split large context data into chunks if needed.
-        
         Args:
-            data: The context data to potentially split
-            
-        Returns:
-            Potentially modified context with chunked data
+            firestore_pool: Connection pool for Firestore
+            chunk_size: Encoded bytes per chunk document (below 1MB)
+            inline_limit: Fields larger than this are always chunked
+            document_budget: Encoded bytes allowed in the main document
+            max_concurrency: Batch commits or chunk reads in flight at once
+            append_only_fields: List fields persisted as appended segments
+            max_segments: Segments per field before it is compacted
         """
-        # Check if we need to chunk any large collections
-        for field_name in ["tool_events", "conversation_history", "related_documents"]:
-            if field_name in data and len(str(data[field_name])) > CHUNK_SIZE:
-                # Create reference to chunked data
-                chunk_collection = f"{field_name}_chunks"
-                data[f"{field_name}_chunked"] = True
-                
-                # Store the count but remove the actual data
-                data[f"{field_name}_count"] = len(data[field_name])
-                chunks = data.pop(field_name)
-                
-                # Return the chunks separately
-                return data, field_name, chunks
-        
-        # No chunking needed
-        return data, None, None
-    
-    def _store_chunks(self, session_id: str, field_name: str, chunks: List[Any]):
-        """Store large data chunks in separate documents.
-        
-        Args:
-            session_id: The session identifier
-            field_name: The field name for the chunks
-            chunks: The data chunks to store
-        """
-        chunk_collection = self.db.collection(CONTEXT_COLLECTION).document(session_id).collection(f"{field_name}_chunks")
-        
-        # Clear existing chunks
-        existing = chunk_collection.limit(100).stream()
-        for doc in existing:
-            doc.reference.delete()
-        
-        # Store in batches of 500 (Firestore batch limit)
-        batch_size = 500
-        for i in range(0, len(chunks), batch_size):
-            batch = self.db.batch()
-            batch_chunks = chunks[i:i+batch_size]
-            
-            for j, chunk in enumerate(batch_chunks):
-                chunk_id = f"{i+j:08d}"  # Pad with zeros for correct ordering
-                chunk_ref = chunk_collection.document(chunk_id)
-                batch.set(chunk_ref, {"data": chunk, "index": i+j})
-            
-            batch.commit()
-            logger.debug(f"Stored {len(batch_chunks)} chunks for {session_id}/{field_name}")
-    
-    def _retrieve_chunks(self, session_id: str, field_name: str) -> List[Any]:
-        """Retrieve chunked data from separate documents.
-        
+        if not 0 < chunk_size < MAX_DOCUMENT_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_DOCUMENT_SIZE - 1}")
+        self.firestore_pool = firestore_pool
+        self.chunk_size = chunk_size
+        self.inline_limit = inline_limit
+        self.document_budget = document_budget
+        self.max_concurrency = max_concurrency
+        self.append_only_fields = append_only_fields
+        self.max_segments = max_segments
+        self.chunks_per_batch = max(1, min(MAX_BATCH_SIZE, MAX_BATCH_BYTES // chunk_size))
+
+    def _get_context_ref(self, client: Any, session_id: str):
+        """Get the document reference for a session context."""
+        return client.collection(CONTEXT_COLLECTION).document(session_id)
+
+    def _chunk_id(self, field_name: str, generation: str, index: int) -> str:
+        return f"{field_name}.{generation}.{index:05d}"
+
+    def _plan(
+        self,
+        data: Dict[str, Any],
+        previous: Dict[str, Any],
+        compact: bool = False,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], List[Tuple[str, Dict[str, Any], List[bytes]]]]:
+        """Split context data into the main document, the chunk manifest and new segments.
+
         Args:
-            session_id: The session identifier
-            field_name: The field name for the chunks
-            
+            data: Serialized context data
+            previous: Chunk manifest of the stored context
+            compact: Rewrite append-only fields as a single snapshot
+
         Returns:
-            The reassembled data
+            Main document fields, new manifest, and (field, segment, chunks)
+            for every segment to write
         """
-        chunk_collection = self.db.collection(CONTEXT_COLLECTION).document(session_id).collection(f"{field_name}_chunks")
-        chunks = []
-        
-        # Query chunks ordered by ID (which we padded with zeros)
-        query = chunk_collection.order_by("index").stream()
-        
-        for doc in query:
-            chunk_data = doc.to_dict().get("data")
-            if chunk_data:
-                chunks.append(chunk_data)
-        
-        logger.debug(f"Retrieved {len(chunks)} chunks for {session_id}/{field_name}")
-        return chunks
-    
-    def save_context(self, session_id: str, data: Dict[str, Any]) -> bool:
+        manifest: Dict[str, Any] = {}
+        writes: List[Tuple[str, Dict[str, Any], List[bytes]]] = []
+
+        def add_segment(name: str, value: Any, items: Optional[int]) -> Dict[str, Any]:
+            encoded, boundaries = encode_field(value)
+            parts = split_encoded(encoded, boundaries, self.chunk_size)
+            segment = {"generation": uuid4().hex[:8], "count": len(parts), "bytes": len(encoded), "items": items}
+            writes.append((name, segment, parts))
+            return segment
+
+        rest: Dict[str, Any] = {}
+        for name, value in data.items():
+            if name not in self.append_only_fields or not isinstance(value, list):
+                rest[name] = value
+                continue
+
+            # Append past the high-water mark if the stored items are still a prefix
+            old = previous.get(name) or {}
+            mark = old.get("items")
+            appendable = (
+                not compact
+                and mark is not None
+                and mark <= len(value)
+                and len(old["segments"]) < self.max_segments
+                and (mark == 0 or _fingerprint(value[mark - 1]) == old["tail"])
+            )
+            segments = list(old["segments"]) if appendable else []
+            start = mark if appendable else 0
+            if len(value) > start:
+                segments.append(add_segment(name, value[start:], len(value) - start))
+            manifest[name] = {
+                "segments": segments,
+                "items": len(value),
+                "tail": _fingerprint(value[-1]) if value else None,
+            }
+
+        encoded = {name: encode_field(value) for name, value in rest.items()}
+        sizes = {name: len(value[0]) for name, value in encoded.items()}
+        chunked = {name for name, size in sizes.items() if size > self.inline_limit}
+        remaining = sum(size for name, size in sizes.items() if name not in chunked)
+        for name in sorted(sizes, key=sizes.get, reverse=True):
+            if remaining <= self.document_budget:
+                break
+            if name not in chunked:
+                chunked.add(name)
+                remaining -= sizes[name]
+
+        for name in chunked:
+            parts = split_encoded(*encoded[name], self.chunk_size)
+            segment = {"generation": uuid4().hex[:8], "count": len(parts), "bytes": sizes[name], "items": None}
+            writes.append((name, segment, parts))
+            manifest[name] = {"segments": [segment], "items": None, "tail": None}
+
+        main = {name: value for name, value in rest.items() if name not in chunked}
+        return main, manifest, writes
+
+    async def save_context(self, session_id: str, data: Dict[str, Any], compact: bool = False) -> bool:
         """Save context data to Firestore.
-        
+
+        Append-only fields write only the items added since the last save.
+
         Args:
             session_id: The session identifier
             data: Serialized context data
-            
+            compact: Fold the segments of append-only fields into a snapshot
+
         Returns:
             Whether save was successful
         """
-        if not self.db:
-            logger.error("Cannot save: Firestore client not initialized")
-            return False
-            
         try:
-            # Add metadata
-            data["_persistence"] = {
-                "saved_at": datetime.now().isoformat(),
-                "provider": "firestore"
-            }
-            
-            # Check if we need to split large collections
-            main_data, chunk_field, chunks = self._split_large_context(data)
-            
-            # Save main context document
-            self._get_context_ref(session_id).set(main_data)
-            
-            # Store chunks if needed
-            if chunk_field and chunks:
-                self._store_chunks(session_id, chunk_field, chunks)
-                
-            logger.debug(f"Saved context for session {session_id} to Firestore")
+            client = await self.firestore_pool.acquire()
+            try:
+                ref = self._get_context_ref(client, session_id)
+                stored = await ref.get(field_paths=[CHUNK_MANIFEST])
+                previous = (stored.to_dict() or {}).get(CHUNK_MANIFEST, {}) if stored.exists else {}
+
+                main, manifest, writes = await asyncio.to_thread(self._plan, data, previous, compact)
+                main["_persistence"] = {
+                    "saved_at": datetime.now().isoformat(),
+                    "provider": "firestore",
+                }
+                main[CHUNK_MANIFEST] = manifest
+
+                await self._write_chunks(client, ref, writes)
+                # Readers switch to the new segments with this write
+                await ref.set(main)
+
+                referenced = {
+                    (name, segment["generation"])
+                    for name, entry in manifest.items()
+                    for segment in entry["segments"]
+                }
+                stale = [
+                    (ref.collection(CHUNK_COLLECTION).document(self._chunk_id(name, segment["generation"], index)), None)
+                    for name, entry in previous.items()
+                    for segment in entry["segments"]
+                    if (name, segment["generation"]) not in referenced
+                    for index in range(segment["count"])
+                ]
+                await self._commit_batches(client, stale, MAX_BATCH_SIZE)
+            finally:
+                await self.firestore_pool.release(client)
+
+            logger.debug(
+                f"Saved context for session {session_id} to Firestore "
+                f"({sum(len(parts) for _, _, parts in writes)} chunks written, {len(stale)} deleted)"
+            )
             return True
         except Exception as e:
             logger.error(f"Failed to save context for session {session_id}: {e}")
             logger.debug(traceback.format_exc())
             return False
-        
-    def load_context(self, session_id: str) -> Optional[Dict[str, Any]]:
+
+    async def compact_context(self, session_id: str) -> bool:
+        """Fold the appended segments of a stored context into snapshots.
+
+        Args:
+            session_id: The session identifier
+
+        Returns:
+            Whether compaction was successful
+        """
+        data = await self.load_context(session_id)
+        if data is None:
+            return False
+        data.pop("_persistence", None)
+        return await self.save_context(session_id, data, compact=True)
+
+    async def _write_chunks(self, client: Any, ref: Any, writes: List[Tuple[str, Dict[str, Any], List[bytes]]]) -> None:
+        chunk_collection = ref.collection(CHUNK_COLLECTION)
+        sets = [
+            (
+                chunk_collection.document(self._chunk_id(name, segment["generation"], index)),
+                {"field": name, "index": index, "data": part},
+            )
+            for name, segment, parts in writes
+            for index, part in enumerate(parts)
+        ]
+        await self._commit_batches(client, sets, self.chunks_per_batch)
+
+    async def _commit_batches(self, client: Any, writes: List[Tuple[Any, Optional[Dict[str, Any]]]], size: int) -> None:
+        """Commit sets (or deletes, for ``None`` data) in concurrent batches."""
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def commit(group):
+            async with slots:
+                batch = client.batch()
+                for doc_ref, doc_data in group:
+                    if doc_data is None:
+                        batch.delete(doc_ref)
+                    else:
+                        batch.set(doc_ref, doc_data)
+                await batch.commit()
+
+        await asyncio.gather(*(commit(writes[i:i + size]) for i in range(0, len(writes), size)))
+
+    async def _read_chunk(self, ref: Any, field_name: str, segment: Dict[str, Any], index: int) -> bytes:
+        chunk_id = self._chunk_id(field_name, segment["generation"], index)
+        doc = await ref.collection(CHUNK_COLLECTION).document(chunk_id).get()
+        if not doc.exists:
+            raise ValueError(f"Missing chunk {chunk_id}")
+        return doc.to_dict()["data"]
+
+    async def _load_field(self, ref: Any, field_name: str, entry: Dict[str, Any], slots: asyncio.Semaphore) -> Any:
+        async def read(segment: Dict[str, Any], index: int) -> bytes:
+            async with slots:
+                return await self._read_chunk(ref, field_name, segment, index)
+
+        segments = entry["segments"]
+        chunks = await asyncio.gather(*(
+            asyncio.gather(*(read(segment, index) for index in range(segment["count"])))
+            for segment in segments
+        ))
+        values = await asyncio.to_thread(lambda: [json.loads(b"".join(parts)) for parts in chunks])
+        if entry["items"] is None:
+            return values[0]
+        return [item for value in values for item in value]
+
+    async def _legacy_items(self, ref: Any, field_name: str) -> AsyncIterator[Any]:
+        query = ref.collection(f"{field_name}_chunks").order_by("index")
+        async for doc in query.stream():
+            chunk_data = doc.to_dict().get("data")
+            if chunk_data:
+                yield chunk_data
+
+    async def load_context(self, session_id: str, include_chunked: bool = True) -> Optional[Dict[str, Any]]:
         """Load context data from Firestore.
-        
+
+        Chunked fields are read concurrently; append-only fields are the
+        concatenation of their snapshot and appended segments.
+
         Args:
             session_id: The session identifier
-            
+            include_chunked: Also load chunked fields; when False they are
+                left out (see ``stream_field``) and listed under ``_chunks``
+
         Returns:
             The loaded context data or None if not found
         """
-        if not self.db:
-            logger.error("Cannot load: Firestore client not initialized")
-            return None
-            
         try:
-            # Get main document
-            doc = self._get_context_ref(session_id).get()
-            if not doc.exists:
-                logger.warning(f"No saved context found for session {session_id}")
-                return None
-                
-            data = doc.to_dict()
-            
-            # Check for chunked fields and retrieve if needed
-            for field_name in ["tool_events", "conversation_history", "related_documents"]:
-                if data.get(f"{field_name}_chunked"):
-                    chunks = self._retrieve_chunks(session_id, field_name)
-                    data[field_name] = chunks
-                    
-                    # Clean up chunk metadata
-                    data.pop(f"{field_name}_chunked", None)
-                    data.pop(f"{field_name}_count", None)
-            
+            client = await self.firestore_pool.acquire()
+            try:
+                ref = self._get_context_ref(client, session_id)
+                doc = await ref.get()
+                if not doc.exists:
+                    logger.warning(f"No saved context found for session {session_id}")
+                    return None
+
+                data = doc.to_dict()
+                if not include_chunked:
+                    return data
+
+                manifest = data.pop(CHUNK_MANIFEST, {})
+                slots = asyncio.Semaphore(self.max_concurrency)
+                names = list(manifest)
+                values = await asyncio.gather(*(self._load_field(ref, name, manifest[name], slots) for name in names))
+                data.update(zip(names, values))
+
+                for field_name in LEGACY_CHUNKED_FIELDS:
+                    if data.pop(f"{field_name}_chunked", None):
+                        data.pop(f"{field_name}_count", None)
+                        data[field_name] = [item async for item in self._legacy_items(ref, field_name)]
+            finally:
+                await self.firestore_pool.release(client)
+
             logger.debug(f"Loaded context for session {session_id} from Firestore")
             return data
         except Exception as e:
             logger.error(f"Failed to load context for session {session_id}: {e}")
             logger.debug(traceback.format_exc())
             return None
-        
-    def delete_context(self, session_id: str) -> bool:
-        """Delete context data from Firestore.
-        
+
+    async def stream_field(self, session_id: str, field_name: str) -> AsyncIterator[Any]:
+        """Yield the items of a list field, reading chunks lazily.
+
+        Up to ``max_concurrency`` chunks are prefetched ahead of the consumer.
+
         Args:
             session_id: The session identifier
-            
+            field_name: List field of the context (e.g. ``tool_events``)
+
+        Raises:
+            ValueError: If the context or chunk is missing or the field is not a list
+        """
+        client = await self.firestore_pool.acquire()
+        pending: deque = deque()
+        try:
+            ref = self._get_context_ref(client, session_id)
+            doc = await ref.get()
+            if not doc.exists:
+                raise ValueError(f"No saved context found for session {session_id}")
+            data = doc.to_dict()
+            entry = data.get(CHUNK_MANIFEST, {}).get(field_name)
+
+            if entry is None:
+                if data.get(f"{field_name}_chunked"):
+                    async for item in self._legacy_items(ref, field_name):
+                        yield item
+                    return
+                value = data.get(field_name, [])
+                if not isinstance(value, list):
+                    raise ValueError(f"Field {field_name} is not a list")
+                for item in value:
+                    yield item
+                return
+            if entry["items"] is None:
+                raise ValueError(f"Field {field_name} is not a list")
+
+            reads = iter([(segment, index) for segment in entry["segments"] for index in range(segment["count"])])
+
+            def prefetch(count: int) -> None:
+                for segment, index in islice(reads, count):
+                    pending.append((segment, index, asyncio.ensure_future(self._read_chunk(ref, field_name, segment, index))))
+
+            prefetch(self.max_concurrency)
+            decoder = _ListItemDecoder()
+            while pending:
+                segment, index, task = pending.popleft()
+                prefetch(1)
+                # Each segment is an encoded list of its own
+                if index == 0:
+                    decoder = _ListItemDecoder()
+                for item in decoder.feed(await task, final=index == segment["count"] - 1):
+                    yield item
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+            await self.firestore_pool.release(client)
+
+    def handler(self, session_id: str) -> Callable[[Dict[str, Any]], Awaitable[bool]]:
+        """Persistence handler for ``MDSContext.set_persistence_handler``."""
+
+        async def save(data: Dict[str, Any]) -> bool:
+            if not await self.save_context(session_id, data):
+                raise RuntimeError(f"Failed to save context for session {session_id}")
+            return True
+
+        return save
+
+    async def delete_context(self, session_id: str) -> bool:
+        """Delete context data, chunks included, from Firestore.
+
+        Args:
+            session_id: The session identifier
+
         Returns:
             Whether deletion was successful
         """
-        if not self.db:
-            logger.error("Cannot delete: Firestore client not initialized")
-            return False
-            
         try:
-            # Check for chunked collections and delete those first
-            doc = self._get_context_ref(session_id).get()
-            if doc.exists:
-                data = doc.to_dict()
-                
-                # Delete any chunk collections
-                for field_name in ["tool_events", "conversation_history", "related_documents"]:
-                    if data.get(f"{field_name}_chunked"):
-                        chunk_collection = self._get_context_ref(session_id).collection(f"{field_name}_chunks")
-                        self._delete_collection(chunk_collection)
-            
-            # Delete the main document
-            self._get_context_ref(session_id).delete()
-            
+            client = await self.firestore_pool.acquire()
+            try:
+                # Discovers chunk subcollections of this and the previous layout
+                await RecursiveDeleter(max_concurrency=self.max_concurrency).delete_document(
+                    client, self._get_context_ref(client, session_id)
+                )
+            finally:
+                await self.firestore_pool.release(client)
+
             logger.debug(f"Deleted context for session {session_id}")
             return True
         except Exception as e:
             logger.error(f"Failed to delete context for session {session_id}: {e}")
             return False
-    
-    def _delete_collection(self, collection, batch_size=50):
-        """Delete a collection in batches to avoid timeout.
-        
-        Args:
-            collection: The collection reference
-            batch_size: The batch size
-        """
-        docs = collection.limit(batch_size).stream()
-        deleted = 0
-        
-        for doc in docs:
-            doc.reference.delete()
-            deleted += 1
-            
-        if deleted >= batch_size:
-            # Recursive call to delete more
-            self._delete_collection(collection, batch_size)
-        
-    def list_sessions(self) -> List[str]:
-        """List all available session IDs.
-        
+
+    async def list_sessions(self) -> List[str]:
+        """List available session IDs (at most ``MAX_LIST_LIMIT``).
+
         Returns:
             List of session IDs
         """
-        if not self.db:
-            logger.error("Cannot list: Firestore client not initialized")
-            return []
-            
         try:
-            query = self.db.collection(CONTEXT_COLLECTION).limit(MAX_LIST_LIMIT).stream()
-            session_ids = [doc.id for doc in query]
-            return session_ids
+            client = await self.firestore_pool.acquire()
+            try:
+                query = client.collection(CONTEXT_COLLECTION).select([]).limit(MAX_LIST_LIMIT)
+                return [doc.id async for doc in query.stream()]
+            finally:
+                await self.firestore_pool.release(client)
         except Exception as e:
             logger.error(f"Failed to list sessions: {e}")
             return []
-    
-    def list_sessions_for_user(self, user_id: str) -> List[Dict[str, Any]]:
+
+    async def list_sessions_for_user(self, user_id: str) -> List[Dict[str, Any]]:
         """List sessions for a specific user.
-        
+
         Args:
             user_id: The user ID to filter by
-            
+
         Returns:
             List of session metadata
         """
-        if not self.db:
-            logger.error("Cannot list: Firestore client not initialized")
-            return []
-            
         try:
-            query = (self.db.collection(CONTEXT_COLLECTION)
+            client = await self.firestore_pool.acquire()
+            try:
+                query = (
+                    client.collection(CONTEXT_COLLECTION)
                     .where(filter=FieldFilter("user_id", "==", user_id))
+                    .select(["created_at", "updated_at", "casefile_id"])
                     .limit(MAX_LIST_LIMIT)
-                    .stream())
-                    
-            sessions = []
-            for doc in query:
-                data = doc.to_dict()
-                sessions.append({
-                    "session_id": doc.id,
-                    "created_at": data.get("created_at"),
-                    "updated_at": data.get("updated_at"),
-                    "casefile_id": data.get("casefile_id")
-                })
-                
-            return sessions
+                )
+                sessions = []
+                async for doc in query.stream():
+                    data = doc.to_dict()
+                    sessions.append({
+                        "session_id": doc.id,
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "casefile_id": data.get("casefile_id"),
+                    })
+                return sessions
+            finally:
+                await self.firestore_pool.release(client)
         except Exception as e:
             logger.error(f"Failed to list sessions for user {user_id}: {e}")
-            return []
\ No newline at end of file
+            return []
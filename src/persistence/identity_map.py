@@ -0,0 +1,121 @@
+"""
+Request-Scoped Identity Map
+
+One request often reads the same document several times: RequestHub hydrates
+the session and casefile into the hook context, then the service handler (and
+every step of a composite operation) loads them again. Inside
+``identity_scope()`` repositories consult an ``IdentityMap`` first, so each
+document is read at most once per request and every reader gets the same
+model instance.
+
+- Concurrent loads of the same document share one read.
+- Writes made through a repository replace the entry (deletes record the
+  document as missing), so later reads in the request see them.
+- Entries never outlive the scope; writes by other requests or instances are
+  not seen until the next request.
+
+Outside a scope ``current_identity_map()`` returns None and repositories read
+as before.
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+# (collection, doc_id)
+EntityKey = Tuple[str, str]
+
+
+class IdentityMap:
+    """Documents loaded (or written) during one request, by collection and ID."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[EntityKey, Optional[Any]] = {}
+        self._loading: Dict[EntityKey, "asyncio.Future[Optional[Any]]"] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def __contains__(self, key: EntityKey) -> bool:
+        return key in self._entries
+
+    def get(self, collection: str, doc_id: str) -> Optional[Any]:
+        """Mapped model, or None if missing or not loaded."""
+        return self._entries.get((collection, doc_id))
+
+    def put(self, collection: str, doc_id: str, model: Optional[Any]) -> None:
+        """Record the current state of a document (None: known not to exist)."""
+        self._entries[(collection, doc_id)] = model
+
+    def discard(self, collection: str, doc_id: str) -> None:
+        """Forget a document, so the next read goes to the repository."""
+        self._entries.pop((collection, doc_id), None)
+
+    async def load(
+        self,
+        collection: str,
+        doc_id: str,
+        loader: Callable[[], Awaitable[Optional[Any]]],
+    ) -> Optional[Any]:
+        """Mapped model, calling ``loader`` only on the first read of the document.
+
+        Failed loads are not remembered; the error goes to every waiting reader.
+        """
+        key = (collection, doc_id)
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        pending = self._loading.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._loading[key] = pending
+        self.loads += 1
+        try:
+            model = await loader()
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as exc:
+            pending.set_exception(exc)
+            # Retrieved here so an unawaited failure is not logged as such
+            pending.exception()
+            raise
+        else:
+            # A write during the load wins over what was read
+            if key not in self._entries:
+                self._entries[key] = model
+            model = self._entries[key]
+            pending.set_result(model)
+            return model
+        finally:
+            del self._loading[key]
+
+
+_current: ContextVar[Optional[IdentityMap]] = ContextVar("request_identity_map", default=None)
+
+
+def current_identity_map() -> Optional[IdentityMap]:
+    """Identity map of the current request, or None outside ``identity_scope``."""
+    return _current.get()
+
+
+@contextmanager
+def identity_scope() -> Iterator[IdentityMap]:
+    """Run the block with a request-scoped identity map.
+
+    Nested scopes (e.g. a composite operation dispatching its steps) share the
+    outer map.
+    """
+    identity = _current.get()
+    if identity is not None:
+        yield identity
+        return
+    identity = IdentityMap()
+    token = _current.set(identity)
+    try:
+        yield identity
+    finally:
+        _current.reset(token)
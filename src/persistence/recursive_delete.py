@@ -0,0 +1,215 @@
+"""
+Recursive delete of Firestore documents and their subcollections.
+
+Document references are streamed in pages (``select([])`` so only names are
+read) and deleted in write batches of up to 500 documents. Several batches
+are committed concurrently, bounded by ``max_concurrency``; subcollections of
+a page are listed concurrently as well. Child documents are queued before
+their parents, so an interrupted delete can be re-run and still finds every
+document. The first failed commit or listing stops the walk, and commits
+still in flight are cancelled before the error is raised.
+
+Subcollections are either given as a tree (``{"requests": {"events": {}}}``),
+which costs no extra reads, or discovered per document with
+``collections()`` when the tree is ``None``.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Firestore limit on writes per batch commit
+MAX_BATCH_SIZE = 500
+
+# Subcollection name -> subcollections of its documents (None = discover)
+SubcollectionTree = Optional[Dict[str, Any]]
+
+
+@dataclass
+class DeleteProgress:
+    """Running totals of a recursive delete."""
+
+    documents_deleted: int = 0
+    batches_committed: int = 0
+    collections_scanned: int = 0
+
+
+class RecursiveDeleter:
+    """Deletes a document tree with paged listing and concurrent batch commits."""
+
+    def __init__(
+        self,
+        batch_size: int = MAX_BATCH_SIZE,
+        page_size: int = MAX_BATCH_SIZE,
+        max_concurrency: int = 4,
+        on_progress: Optional[Callable[[DeleteProgress], None]] = None,
+    ):
+        """
+        Args:
+            batch_size: Deletes per batch commit (at most 500)
+            page_size: Document references read per listing query
+            max_concurrency: Batch commits (and listings) in flight at once
+            on_progress: Called with the running totals after every commit
+        """
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.on_progress = on_progress
+
+    async def delete_document(
+        self,
+        client: Any,
+        document: Any,
+        subcollections: SubcollectionTree = None,
+    ) -> DeleteProgress:
+        """Delete a document and everything below it.
+
+        Args:
+            client: Firestore async client (for write batches)
+            document: Document reference to delete
+            subcollections: Subcollection tree below the document (None = discover)
+
+        Returns:
+            Totals of the delete
+        """
+        run = _DeleteRun(self, client)
+        try:
+            await run.walk_document(document, subcollections)
+            await run.queue([document])
+            return await run.finish()
+        finally:
+            await run.close()
+
+    async def delete_subcollections(
+        self,
+        client: Any,
+        document: Any,
+        subcollections: SubcollectionTree = None,
+    ) -> DeleteProgress:
+        """Delete everything below a document, keeping the document itself."""
+        run = _DeleteRun(self, client)
+        try:
+            await run.walk_document(document, subcollections)
+            return await run.finish()
+        finally:
+            await run.close()
+
+
+class _DeleteRun:
+    """State of one recursive delete: the open batch and the commits in flight."""
+
+    def __init__(self, deleter: RecursiveDeleter, client: Any):
+        self.deleter = deleter
+        self.client = client
+        self.progress = DeleteProgress()
+        self.pending: List[Any] = []
+        self.commits: List[asyncio.Task] = []
+        self.failure: Optional[BaseException] = None
+        self.commit_slots = asyncio.Semaphore(deleter.max_concurrency)
+        self.list_slots = asyncio.Semaphore(deleter.max_concurrency)
+
+    async def walk_document(self, document: Any, subcollections: SubcollectionTree) -> None:
+        """Queue the contents of a document's subcollections (not the document)."""
+        if subcollections is None:
+            async with self.list_slots:
+                collections = [collection async for collection in document.collections()]
+            await asyncio.gather(*(self.walk_collection(collection, None) for collection in collections))
+        else:
+            await asyncio.gather(
+                *(
+                    self.walk_collection(document.collection(name), children)
+                    for name, children in subcollections.items()
+                )
+            )
+
+    async def walk_collection(self, collection: Any, subcollections: SubcollectionTree) -> None:
+        """Queue every document of a collection, children first, page by page."""
+        self.progress.collections_scanned += 1
+        cursor = None
+        while True:
+            self._check()
+            query = collection.select([]).limit(self.deleter.page_size)
+            if cursor is not None:
+                query = query.start_after(cursor)
+            try:
+                async with self.list_slots:
+                    page = [snapshot async for snapshot in query.stream()]
+            except Exception as e:
+                self._fail(e)
+                raise
+            if not page:
+                return
+
+            references = [snapshot.reference for snapshot in page]
+            if subcollections != {}:
+                await asyncio.gather(*(self.walk_document(reference, subcollections) for reference in references))
+            await self.queue(references)
+
+            if len(page) < self.deleter.page_size:
+                return
+            cursor = page[-1]
+
+    async def queue(self, references: List[Any]) -> None:
+        """Add deletes to the open batch, committing full batches in the background."""
+        self.pending.extend(references)
+        while len(self.pending) >= self.deleter.batch_size:
+            chunk = self.pending[: self.deleter.batch_size]
+            del self.pending[: self.deleter.batch_size]
+            await self._start_commit(chunk)
+
+    async def finish(self) -> DeleteProgress:
+        """Commit the last partial batch and wait for all commits."""
+        if self.pending:
+            chunk, self.pending = self.pending, []
+            await self._start_commit(chunk)
+        if self.commits:
+            await asyncio.gather(*self.commits)
+        logger.info(
+            f"Recursive delete removed {self.progress.documents_deleted} documents "
+            f"in {self.progress.batches_committed} batches"
+        )
+        return self.progress
+
+    async def close(self) -> None:
+        """Cancel commits still in flight (after a failure) and wait for them."""
+        for commit in self.commits:
+            commit.cancel()
+        await asyncio.gather(*self.commits, return_exceptions=True)
+
+    def _fail(self, error: BaseException) -> None:
+        if self.failure is None:
+            self.failure = error
+
+    def _check(self) -> None:
+        """Stop the walk once a commit or listing has failed."""
+        if self.failure is not None:
+            raise self.failure
+
+    async def _start_commit(self, chunk: List[Any]) -> None:
+        # Waiting for a slot here keeps the listing from running far ahead of the commits
+        await self.commit_slots.acquire()
+        if self.failure is not None:
+            self.commit_slots.release()
+            raise self.failure
+        self.commits.append(asyncio.create_task(self._commit(chunk)))
+
+    async def _commit(self, chunk: List[Any]) -> None:
+        try:
+            batch = self.client.batch()
+            for reference in chunk:
+                batch.delete(reference)
+            await batch.commit()
+        except Exception as e:
+            self._fail(e)
+            raise
+        finally:
+            self.commit_slots.release()
+        self.progress.documents_deleted += len(chunk)
+        self.progress.batches_committed += 1
+        if self.deleter.on_progress:
+            self.deleter.on_progress(self.progress)
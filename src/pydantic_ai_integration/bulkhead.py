@@ -0,0 +1,271 @@
+"""
+Per-tool and per-user bulkheads for the tool runtime.
+
+Tools declare limits in their metadata (``register_mds_tool(max_concurrency=...,
+per_user_max_concurrency=..., max_queue_depth=...)`` or the ``concurrency:``
+block of the YAML tool config). Every execution path is admitted through
+``tool_bulkheads.admit``:
+
+- a call takes a slot at the per-user limit first, then at the tool limit
+- when no slot is free it waits in a FIFO queue of at most ``max_queue_depth``
+- anything beyond the queue depth (or waiting past ``queue_timeout_seconds``)
+  is rejected with ``BulkheadRejected`` carrying a retry-after hint
+
+Queue wait time is exported as the ``tool_bulkhead_queue_wait_seconds``
+histogram and rejections as ``tool_bulkhead_rejections_total``.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, FrozenSet, Optional, Tuple
+
+from prometheus_client import REGISTRY, Counter, Histogram
+
+from .tool_definition import ToolConcurrencyPolicy
+
+logger = logging.getLogger(__name__)
+
+
+def _metric(factory: Callable[..., Any], name: str, documentation: str, labels: Tuple[str, ...]) -> Any:
+    # The package can be imported under two names (``src.`` prefix); reuse the collector
+    try:
+        return factory(name, documentation, labels)
+    except ValueError:
+        return REGISTRY._names_to_collectors[name]
+
+
+tool_bulkhead_queue_wait_seconds = _metric(
+    Histogram,
+    "tool_bulkhead_queue_wait_seconds",
+    "Time tool calls waited for a bulkhead slot",
+    ("tool",),
+)
+
+tool_bulkhead_rejections_total = _metric(
+    Counter,
+    "tool_bulkhead_rejections_total",
+    "Tool calls rejected by a bulkhead",
+    ("tool", "scope"),
+)
+
+
+class BulkheadRejected(Exception):
+    """A tool call was rejected because its bulkhead queue is full."""
+
+    def __init__(self, tool_name: str, scope: str, retry_after_seconds: int):
+        self.tool_name = tool_name
+        self.scope = scope
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(
+            f"Tool '{tool_name}' is at its {scope} concurrency limit; retry after {retry_after_seconds}s"
+        )
+
+
+class _Limiter:
+    """FIFO counting limiter with a bounded wait queue (not bound to an event loop)."""
+
+    def __init__(self, limit: int, max_queue: int):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.avg_hold_seconds = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def idle(self) -> bool:
+        return self.in_flight == 0 and not self._waiters
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the average hold time."""
+        estimate = max(self.avg_hold_seconds, 0.1) * (self.queued + 1) / self.limit
+        return max(1, math.ceil(estimate))
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot; False if the queue is full or the wait timed out."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over as we gave up
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            return False
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            elif waiter in self._waiters:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, held_seconds: Optional[float] = None) -> None:
+        """Free a slot, handing it straight to the oldest waiter."""
+        if held_seconds is not None:
+            self.avg_hold_seconds = 0.8 * self.avg_hold_seconds + 0.2 * held_seconds
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+# Tools admitted in the current task (inner layers do not take a second slot)
+_admitted: ContextVar[FrozenSet[str]] = ContextVar("bulkhead_admitted_tools", default=frozenset())
+
+
+class ToolBulkheads:
+    """Registry of per-tool and per-user limiters."""
+
+    def __init__(self):
+        self._tool_limiters: Dict[str, _Limiter] = {}
+        self._user_limiters: Dict[Tuple[str, str], _Limiter] = {}
+        self.rejections: Dict[str, int] = {}
+
+    def _tool_limiter(self, tool_name: str, policy: ToolConcurrencyPolicy) -> Optional[_Limiter]:
+        if policy.max_concurrency is None:
+            return None
+        limiter = self._tool_limiters.get(tool_name)
+        if limiter is None:
+            limiter = _Limiter(policy.max_concurrency, policy.max_queue_depth)
+            self._tool_limiters[tool_name] = limiter
+        return limiter
+
+    def _user_limiter(self, tool_name: str, policy: ToolConcurrencyPolicy, user_id: Optional[str]) -> Optional[_Limiter]:
+        if policy.per_user_max_concurrency is None:
+            return None
+        key = (tool_name, user_id or "anonymous")
+        limiter = self._user_limiters.get(key)
+        if limiter is None:
+            limiter = _Limiter(policy.per_user_max_concurrency, policy.max_queue_depth)
+            self._user_limiters[key] = limiter
+        return limiter
+
+    def _reject(self, tool_name: str, scope: str, limiter: _Limiter) -> BulkheadRejected:
+        self.rejections[tool_name] = self.rejections.get(tool_name, 0) + 1
+        tool_bulkhead_rejections_total.labels(tool=tool_name, scope=scope).inc()
+        logger.warning(f"Bulkhead rejected '{tool_name}' ({scope}: {limiter.in_flight} in flight, {limiter.queued} queued)")
+        return BulkheadRejected(tool_name, scope, limiter.retry_after())
+
+    def _discard_idle(self, tool_name: str, user_id: Optional[str]) -> None:
+        key = (tool_name, user_id or "anonymous")
+        limiter = self._user_limiters.get(key)
+        if limiter is not None and limiter.idle:
+            del self._user_limiters[key]
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        tool_name: str,
+        policy: Optional[ToolConcurrencyPolicy],
+        user_id: Optional[str],
+    ) -> AsyncIterator[None]:
+        """Hold a slot for ``tool_name`` (and ``user_id``) for the duration of the block.
+
+        Raises:
+            BulkheadRejected: If the queue is full or the wait timed out
+        """
+        held = _admitted.get()
+        if policy is None or tool_name in held:
+            yield
+            return
+
+        started = time.monotonic()
+        acquired = []
+        try:
+            for scope, limiter in (
+                ("user", self._user_limiter(tool_name, policy, user_id)),
+                ("tool", self._tool_limiter(tool_name, policy)),
+            ):
+                if limiter is None:
+                    continue
+                remaining = policy.queue_timeout_seconds - (time.monotonic() - started)
+                if remaining <= 0 or not await limiter.acquire(remaining):
+                    raise self._reject(tool_name, scope, limiter)
+                acquired.append(limiter)
+        except BaseException:
+            for limiter in acquired:
+                limiter.release()
+            self._discard_idle(tool_name, user_id)
+            raise
+
+        admitted_at = time.monotonic()
+        tool_bulkhead_queue_wait_seconds.labels(tool=tool_name).observe(admitted_at - started)
+        reset = _admitted.set(held | {tool_name})
+        try:
+            yield
+        finally:
+            _admitted.reset(reset)
+            held_seconds = time.monotonic() - admitted_at
+            for limiter in reversed(acquired):
+                limiter.release(held_seconds)
+            self._discard_idle(tool_name, user_id)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """In-flight, queued and rejected counts per tool."""
+        stats: Dict[str, Dict[str, Any]] = {}
+        for tool_name, limiter in self._tool_limiters.items():
+            stats[tool_name] = {
+                "in_flight": limiter.in_flight,
+                "queued": limiter.queued,
+                "limit": limiter.limit,
+                "avg_hold_seconds": round(limiter.avg_hold_seconds, 4),
+            }
+        for tool_name, count in self.rejections.items():
+            stats.setdefault(tool_name, {})["rejections"] = count
+        return stats
+
+    def reset(self) -> None:
+        """Drop all limiters and counters (tests)."""
+        self._tool_limiters.clear()
+        self._user_limiters.clear()
+        self.rejections.clear()
+
+
+# Global bulkheads shared by every execution path in this process
+tool_bulkheads = ToolBulkheads()
+
+
+def bulkhead_tool(
+    tool_name: str,
+    func: Callable[..., Awaitable[Any]],
+    policy: ToolConcurrencyPolicy,
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a tool implementation so every call is admitted through its bulkhead.
+
+    Args:
+        tool_name: Registered tool name
+        func: Tool implementation ``(ctx, **params)``
+        policy: Concurrency limits
+
+    Returns:
+        Implementation with the same signature
+    """
+
+    @wraps(func)
+    async def guarded(ctx, **params):
+        async with tool_bulkheads.admit(tool_name, policy, getattr(ctx, "user_id", None)):
+            return await func(ctx, **params)
+
+    return guarded
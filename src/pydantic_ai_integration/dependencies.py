@@ -2,34 +2,45 @@
 Core dependency types for the MDS Objects framework.
 """
 
+import asyncio
+import inspect
 import json
 import logging
 from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 logger = logging.getLogger(__name__)
 
 from coreservice.id_service import get_id_service
 from pydantic_models.canonical.tool_session import ToolEvent
 
+from .event_index import ToolEventIndex
+from .knowledge_graph import EntityKey, KnowledgeGraph
 
-def with_persistence(method):
-    """Decorator to automatically persist context after method execution."""
-    @wraps(method)
-    def wrapper(self, *args, **kwargs):
-        result = method(self, *args, **kwargs)
-        # Persist after method call if persistence is enabled
-        if getattr(self, '_auto_persist', False) and hasattr(self, 'persist'):
-            try:
-                self.persist()
-            except Exception as e:
-                logger.warning(f"Auto-persistence failed after {method.__name__}: {e}")
-        return result
-    return wrapper
+# State fields that may hold arbitrary values; made JSON-safe before persisting
+_DICT_STATE_FIELDS = ("transaction_context", "persistent_state", "user_preferences", "knowledge_graph")
+_LIST_STATE_FIELDS = ("conversation_history", "previous_tools", "next_planned_tools", "related_documents")
+_STATE_FIELDS = _DICT_STATE_FIELDS + _LIST_STATE_FIELDS
+
+
+def with_persistence(*fields: str):
+    """Decorator marking ``fields`` dirty after a state-changing method.
+
+    With auto-persistence enabled this schedules a debounced flush, so a burst
+    of mutations is written once (see ``MDSContext.mark_dirty``).
+    """
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self.mark_dirty(*fields)
+            return result
+        return wrapper
+    return decorate
 
 class MDSContext(BaseModel):
     """Unified context for MDS operations across tools and sessions."""
@@ -66,6 +77,13 @@ class MDSContext(BaseModel):
     # Persistence configuration
     _auto_persist: bool = False
     _persistence_handler: Optional[Callable] = None
+    _persist_delay: float = 0.5
+    _dirty: Set[str] = PrivateAttr(default_factory=set)
+    _unchecked: Set[str] = PrivateAttr(default_factory=set)
+    _event_index: ToolEventIndex = PrivateAttr(default_factory=ToolEventIndex)
+    _graph: KnowledgeGraph = PrivateAttr(default_factory=KnowledgeGraph)
+    _persist_task: Optional[asyncio.Task] = None
+    _persist_lock: Optional[asyncio.Lock] = None
     
     # Metadata
     created_at: str = Field(default_factory=lambda: datetime.now().isoformat(), description="When this context was created")
@@ -73,35 +91,59 @@ class MDSContext(BaseModel):
     version: str = Field(default="1.0.0", description="Schema version for backward compatibility")
     
     @model_validator(mode='after')
-    def ensure_serializable(self) -> 'MDSContext':
-        """Ensure all fields are serializable for storage."""
-        self.transaction_context = self._ensure_serializable_dict(self.transaction_context)
-        self.persistent_state = self._ensure_serializable_dict(self.persistent_state)
-        self.user_preferences = self._ensure_serializable_dict(self.user_preferences)
-        self.knowledge_graph = self._ensure_serializable_dict(self.knowledge_graph)
-        
-        # Ensure conversation history is serializable
-        self.conversation_history = [
-            self._ensure_serializable_dict(msg) if isinstance(msg, dict) else msg.model_dump() 
-            for msg in self.conversation_history
-        ]
+    def defer_serializable_check(self) -> 'MDSContext':
+        """Note non-empty state fields; they are made JSON-safe when first persisted."""
+        self._unchecked = {name for name in _STATE_FIELDS if getattr(self, name)}
+        return self
+    
+    @classmethod
+    def from_trusted(cls, data: Dict[str, Any]) -> 'MDSContext':
+        """Build a context from state this framework serialized itself.
         
-        # Ensure tool chain entries are serializable
-        self.previous_tools = [
-            self._ensure_serializable_dict(tool) if isinstance(tool, dict) else tool.model_dump() 
-            for tool in self.previous_tools
-        ]
-        self.next_planned_tools = [
-            self._ensure_serializable_dict(tool) if isinstance(tool, dict) else tool.model_dump() 
-            for tool in self.next_planned_tools
-        ]
+        Skips validation (including the per-event validators) and the
+        serializability walk: the data came out of ``model_dump(mode='json')``.
+        Use ``model_validate`` for anything else.
         
-        # Ensure related documents are serializable
-        self.related_documents = [
-            self._ensure_serializable_dict(doc) if isinstance(doc, dict) else doc.model_dump() 
-            for doc in self.related_documents
+        Args:
+            data: Serialized context (as passed to the persistence handler)
+            
+        Returns:
+            New MDSContext instance
+        """
+        fields = {name: data[name] for name in cls.model_fields if name in data}
+        fields["tool_events"] = [
+            event if isinstance(event, ToolEvent) else ToolEvent.model_construct(**event)
+            for event in data.get("tool_events", [])
         ]
+        return cls.model_construct(**fields)
+    
+    def ensure_serializable(self, fields: Optional[Set[str]] = None) -> 'MDSContext':
+        """Make state fields JSON-safe for storage.
+        
+        Runs at persistence time over the fields changed since the last
+        persist and those not checked since construction.
         
+        Args:
+            fields: Fields to check (default: all state fields)
+            
+        Returns:
+            Self for chaining
+        """
+        names = [name for name in _STATE_FIELDS if fields is None or name in fields]
+        for name in names:
+            value = self.__dict__[name]
+            if name in _DICT_STATE_FIELDS:
+                value = self._ensure_serializable_dict(value)
+            else:
+                value = [
+                    self._ensure_serializable_dict(item) if isinstance(item, dict) else item.model_dump()
+                    for item in value
+                ]
+            # Normalizing is not a change: bypass dirty tracking
+            if name == "knowledge_graph" and self._graph.to_dict() is self.__dict__[name]:
+                self._graph.rebind(value)
+            self.__dict__[name] = value
+        self._unchecked.difference_update(names)
         return self
     
     def _ensure_serializable_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -130,19 +172,111 @@ class MDSContext(BaseModel):
         
         return result
     
-    def set_persistence_handler(self, handler: Callable, auto_persist: bool = False) -> None:
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Whole-field assignments count as changes (private state not set up yet during validation)
+        if name in type(self).model_fields and name != "updated_at" and self.__pydantic_private__ is not None:
+            self.mark_dirty(name)
+
+    @property
+    def event_index(self) -> ToolEventIndex:
+        """Indexes over ``tool_events``, brought up to date with the list."""
+        return self._event_index.sync(self.tool_events)
+    
+    @property
+    def graph(self) -> KnowledgeGraph:
+        """Indexed view of ``knowledge_graph`` (neighbors, attribute lookups, k-hop expansion)."""
+        return self._graph.sync(self.knowledge_graph)
+    
+    @property
+    def dirty_fields(self) -> Set[str]:
+        """Fields changed since the last successful persist."""
+        return set(self._dirty)
+
+    def mark_dirty(self, *fields: str) -> None:
+        """Record changed fields and, with auto-persist, schedule a debounced flush."""
+        self._dirty.update(fields)
+        if self._auto_persist and self._persistence_handler:
+            self._schedule_persist()
+
+    def set_persistence_handler(
+        self,
+        handler: Callable,
+        auto_persist: bool = False,
+        debounce_seconds: float = 0.5,
+    ) -> None:
         """Set a function to handle persistence of the context.
-        
+
         Args:
-            handler: Function that takes a serialized context and persists it
-            auto_persist: Whether to automatically persist after state-changing operations
+            handler: Function or coroutine function that takes a serialized
+                context and persists it; plain functions run in a worker thread
+            auto_persist: Whether to persist automatically after state-changing operations
+            debounce_seconds: Mutations within this window are persisted together
         """
         self._persistence_handler = handler
         self._auto_persist = auto_persist
+        self._persist_delay = debounce_seconds
         logger.info(f"Persistence handler set with auto_persist={auto_persist}")
-    
+
+    def _schedule_persist(self) -> None:
+        if self._persist_task is not None and not self._persist_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (sync caller): persist right away
+            self.persist()
+            return
+        self._persist_task = loop.create_task(self._persist_later())
+
+    async def _persist_later(self) -> None:
+        # Mutations made while a write is in flight find this task still
+        # running and schedule nothing, so keep going until the context is clean
+        while True:
+            await asyncio.sleep(self._persist_delay)
+            if not await self.flush() or not self._dirty:
+                return
+
+    async def flush(self) -> bool:
+        """Persist pending changes now (call at the end of a request).
+
+        The context is serialized on the event loop; a plain handler then runs
+        in a worker thread, a coroutine handler is awaited. Nothing is written
+        when no field changed since the last persist.
+
+        Returns:
+            Whether the context is persisted (also True when nothing was pending)
+        """
+        if not self._persistence_handler:
+            return False
+        if self._persist_lock is None:
+            self._persist_lock = asyncio.Lock()
+
+        # One write at a time, so an older snapshot never lands after a newer one
+        async with self._persist_lock:
+            if not self._dirty:
+                return True
+            dirty, self._dirty = self._dirty, set()
+            try:
+                self.updated_at = datetime.now().isoformat()
+                self.ensure_serializable(dirty | self._unchecked)
+                serialized = self.model_dump(mode='json')
+                if inspect.iscoroutinefunction(self._persistence_handler):
+                    await self._persistence_handler(serialized)
+                else:
+                    await asyncio.to_thread(self._persistence_handler, serialized)
+                logger.debug(f"Context persisted for session {self.session_id} ({', '.join(sorted(dirty))})")
+                return True
+            except Exception as e:
+                self._dirty |= dirty
+                logger.error(f"Failed to persist context: {e}")
+                return False
+
     def persist(self) -> bool:
-        """Persist the current state of the context.
+        """Persist the current state of the context synchronously.
+        
+        Prefer ``await flush()`` in async code; it skips clean contexts and
+        keeps the handler off the event loop.
         
         Returns:
             Whether persistence was successful
@@ -156,10 +290,14 @@ class MDSContext(BaseModel):
             self.updated_at = datetime.now().isoformat()
             
             # Serialize context ensuring all data is JSON compatible
+            self.ensure_serializable(self._dirty | self._unchecked)
             serialized = self.model_dump(mode='json')
             
             # Call persistence handler
-            self._persistence_handler(serialized)
+            result = self._persistence_handler(serialized)
+            if inspect.isawaitable(result):
+                asyncio.run(result)
+            self._dirty.clear()
             logger.debug(f"Context persisted for session {self.session_id}")
             return True
         except Exception as e:
@@ -175,18 +313,19 @@ class MDSContext(BaseModel):
         Returns:
             Self for chaining
         """
-        # We use model_validate to ensure proper type conversion
-        updated = self.__class__.model_validate(state)
+        # Our own serialized state: no need to validate it again
+        updated = self.__class__.from_trusted(state)
         
         # Update all fields from the persisted state
-        for field_name, field_value in updated.model_dump().items():
-            if field_name not in ('_persistence_handler', '_auto_persist'):
-                setattr(self, field_name, field_value)
+        for field_name in type(self).model_fields:
+            setattr(self, field_name, getattr(updated, field_name))
+        # Restored state matches what is stored
+        self._dirty.clear()
         
         logger.info(f"Context restored for session {self.session_id} with {len(self.tool_events)} events")
         return self
     
-    @with_persistence
+    @with_persistence("tool_events", "previous_tools", "active_chains")
     def register_event(self, tool_name: str, parameters: Dict[str, Any], 
                       result_summary: Optional[Dict[str, Any]] = None,
                       duration_ms: Optional[int] = None,
@@ -234,9 +373,7 @@ class MDSContext(BaseModel):
         chain_position = None
         if chain_id:
             # Find existing chain
-            chain_events = [event for event in self.tool_events 
-                           if event.chain_id == chain_id]
-            chain_position = len(chain_events) + 1
+            chain_position = self.event_index.chain_length(chain_id) + 1
         
         # Create the event
         event = ToolEvent(
@@ -286,7 +423,7 @@ class MDSContext(BaseModel):
         
         return event.event_id
     
-    @with_persistence
+    @with_persistence("session_request_id", "transaction_context")
     def create_session_request(self, client_request_id: Optional[str] = None) -> str:
         """Create a new session request ID.
         
@@ -305,7 +442,7 @@ class MDSContext(BaseModel):
         self.transaction_context["request_created_at"] = datetime.now().isoformat()
         return self.session_request_id
     
-    @with_persistence    
+    @with_persistence("next_planned_tools", "transaction_context", "active_chains")
     def plan_tool_chain(self, tools: List[Dict[str, Any]], reasoning: str = None, chain_name: str = None) -> str:
         """Plan a sequence of tools to be executed.
         
@@ -350,7 +487,7 @@ class MDSContext(BaseModel):
         
         return chain_id
     
-    @with_persistence
+    @with_persistence("conversation_history")
     def add_conversation_message(self, message: Dict[str, Any]) -> str:
         """Add a message to the conversation history.
         
@@ -403,21 +540,9 @@ class MDSContext(BaseModel):
         
         # For tool events    
         if tool_name or chain_id:
-            # Start with all events
-            filtered_events = self.tool_events
-            
-            # Filter by tool name if provided
-            if tool_name:
-                filtered_events = [event for event in filtered_events 
-                                 if event.tool_name == tool_name]
-                
-            # Filter by chain ID if provided
-            if chain_id:
-                filtered_events = [event for event in filtered_events 
-                                 if event.chain_id == chain_id]
+            events = self.event_index.find(tool_name=tool_name or None, chain_id=chain_id or None, limit=limit)
             
-            # Limit and convert to dict
-            events = filtered_events[-limit:]
+            # Convert to dict
             if include_metadata:
                 return [event.model_dump() for event in events]
             else:
@@ -428,7 +553,7 @@ class MDSContext(BaseModel):
         
         return []
     
-    @with_persistence    
+    @with_persistence("related_documents")
     def link_related_document(self, document: Dict[str, Any]) -> str:
         """Link a document to the current context.
         
@@ -452,7 +577,7 @@ class MDSContext(BaseModel):
         self.related_documents.append(document)
         return document["id"]
     
-    @with_persistence
+    @with_persistence("persistent_state")
     def store_persistent_state(self, key: str, value: Any) -> None:
         """Store a value in persistent state that survives across sessions.
         
@@ -475,7 +600,7 @@ class MDSContext(BaseModel):
         """
         return self.persistent_state.get(key, default)
     
-    @with_persistence
+    @with_persistence("knowledge_graph")
     def add_to_knowledge_graph(self, entity_type: str, entity_id: str, data: Dict[str, Any]) -> None:
         """Add or update entity in the knowledge graph.
         
@@ -484,19 +609,31 @@ class MDSContext(BaseModel):
             entity_id: Unique identifier for this entity
             data: Entity data and properties
         """
-        # Initialize type if not exist
-        if entity_type not in self.knowledge_graph:
-            self.knowledge_graph[entity_type] = {}
-            
         # Add timestamp
         if "created_at" not in data:
             data["created_at"] = datetime.now().isoformat()
         data["updated_at"] = datetime.now().isoformat()
         
-        # Store entity
-        self.knowledge_graph[entity_type][entity_id] = data
+        # Store entity (relations recorded earlier are kept)
+        self.graph.add_entity(entity_type, entity_id, data)
+    
+    @with_persistence("knowledge_graph")
+    def add_knowledge_relation(self, source: EntityKey, relation: str, target: EntityKey,
+                               properties: Optional[Dict[str, Any]] = None) -> bool:
+        """Relate two knowledge graph entities.
+        
+        Args:
+            source: (entity_type, entity_id) of the source entity
+            relation: Relation name (e.g. "works_on", "mentions")
+            target: (entity_type, entity_id) of the target entity
+            properties: Optional relation properties
+            
+        Returns:
+            False if the relation already existed
+        """
+        return self.graph.add_relation(tuple(source), relation, tuple(target), properties)
     
-    @with_persistence    
+    @with_persistence("transaction_context", "active_chains")
     def complete_chain(self, chain_id: str = None, chain_name: str = None,
                      success: bool = True, summary: Dict[str, Any] = None) -> None:
         """Mark a chain as completed.
@@ -558,8 +695,7 @@ class MDSContext(BaseModel):
                     return chain
                     
             # Look through tool events
-            chain_events = [event for event in self.tool_events 
-                           if event.chain_id == chain_id]
+            chain_events = self.event_index.find(chain_id=chain_id)
                            
             if chain_events:
                 return {
@@ -575,6 +711,18 @@ class MDSContext(BaseModel):
         
         return {"error": "Chain not found"}
     
+    def get_events_between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[ToolEvent]:
+        """Get tool events recorded in a time range.
+        
+        Args:
+            start: ISO timestamp of the first event to include (default: oldest)
+            end: ISO timestamp before which events are included (default: newest)
+            
+        Returns:
+            Matching events, oldest first
+        """
+        return self.event_index.between(start, end)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format for storage or transmission.
         
@@ -582,6 +730,7 @@ class MDSContext(BaseModel):
             Dictionary representation of the context
         """
         # Convert context to dict with special handling
+        self.ensure_serializable(self._dirty | self._unchecked)
         data = self.model_dump(mode='json')
         
         # Convert tool events to dicts
@@ -0,0 +1,101 @@
+"""
+Secondary indexes over an MDSContext's tool events.
+
+``MDSContext.tool_events`` stays a plain list of ``ToolEvent`` (so it
+serializes unchanged), treated as append-only. ``ToolEventIndex`` keeps, next
+to it, positions per ``chain_id`` and per ``tool_name`` plus the event
+timestamps, so chain positions, filtered history and chain status no longer
+scan every event.
+
+The index follows the list lazily: ``sync`` indexes events appended since the
+last call (including ones appended directly, e.g. events merged back from a
+worker process) and rebuilds from scratch when the list was replaced or
+shrank. Events edited in place are not re-indexed.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence
+
+from pydantic_models.canonical.tool_session import ToolEvent
+
+
+class ToolEventIndex:
+    """Positions of tool events by chain, tool name and time."""
+
+    def __init__(self):
+        self._reset(None)
+
+    def _reset(self, events: Optional[List[ToolEvent]]) -> None:
+        self._events = events
+        self._by_chain: Dict[str, List[int]] = {}
+        self._by_tool: Dict[str, List[int]] = {}
+        self._timestamps: List[str] = []
+        # False once an event is older than its predecessor (bisect no longer valid)
+        self._in_time_order = True
+
+    def sync(self, events: List[ToolEvent]) -> "ToolEventIndex":
+        """Index events added to ``events`` since the last sync."""
+        if events is not self._events or len(events) < len(self._timestamps):
+            self._reset(events)
+        for position in range(len(self._timestamps), len(events)):
+            self._add(position, events[position])
+        return self
+
+    def _add(self, position: int, event: ToolEvent) -> None:
+        if event.chain_id:
+            self._by_chain.setdefault(event.chain_id, []).append(position)
+        self._by_tool.setdefault(event.tool_name, []).append(position)
+        if self._timestamps and event.timestamp < self._timestamps[-1]:
+            self._in_time_order = False
+        self._timestamps.append(event.timestamp)
+
+    def chain_length(self, chain_id: str) -> int:
+        """Number of events recorded for a chain."""
+        return len(self._by_chain.get(chain_id, ()))
+
+    def find(
+        self,
+        tool_name: Optional[str] = None,
+        chain_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[ToolEvent]:
+        """Events matching every given filter, oldest first.
+
+        Args:
+            tool_name: Only events of this tool
+            chain_id: Only events of this chain
+            limit: Keep only the most recent ``limit`` matches
+
+        Returns:
+            Matching events
+        """
+        candidates = []
+        if tool_name is not None:
+            candidates.append(self._by_tool.get(tool_name, []))
+        if chain_id is not None:
+            candidates.append(self._by_chain.get(chain_id, []))
+        if not candidates:
+            positions: Sequence[int] = range(len(self._timestamps))
+        else:
+            # Walk the shortest list, checking the others via the events
+            positions = min(candidates, key=len)
+            if len(candidates) > 1:
+                positions = [
+                    p for p in positions
+                    if (tool_name is None or self._events[p].tool_name == tool_name)
+                    and (chain_id is None or self._events[p].chain_id == chain_id)
+                ]
+        if limit is not None:
+            positions = positions[-limit:]
+        return [self._events[p] for p in positions]
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[ToolEvent]:
+        """Events with ``start <= timestamp < end`` (ISO strings), oldest first."""
+        if not self._in_time_order:
+            return [
+                event for event in self._events[:len(self._timestamps)]
+                if (start is None or event.timestamp >= start) and (end is None or event.timestamp < end)
+            ]
+        low = 0 if start is None else bisect_left(self._timestamps, start)
+        high = len(self._timestamps) if end is None else bisect_left(self._timestamps, end, lo=low)
+        return self._events[low:high]
@@ -2,6 +2,26 @@
 Execution infrastructure for tool composition and chaining.
 """
 
-from .chain_executor import ChainExecutionError, ChainExecutor
+from .chain_executor import ChainDeadlineExceeded, ChainExecutionError, ChainExecutor
+from .chain_plan import (
+    ChainCompilationError,
+    ChainPlan,
+    CompiledStep,
+    RetryPolicy,
+    TemplateAccessor,
+    clear_chain_plan_cache,
+    compile_chain,
+)
 
-__all__ = ['ChainExecutor', 'ChainExecutionError']
+__all__ = [
+    'ChainExecutor',
+    'ChainExecutionError',
+    'ChainDeadlineExceeded',
+    'ChainCompilationError',
+    'ChainPlan',
+    'CompiledStep',
+    'RetryPolicy',
+    'TemplateAccessor',
+    'clear_chain_plan_cache',
+    'compile_chain',
+]
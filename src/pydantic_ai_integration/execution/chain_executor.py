@@ -4,11 +4,13 @@ Executes sequences of tools with conditional branching, error recovery,
 and state management for tool composition workflows.
 """
 import asyncio
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from ..dependencies import MDSContext
-from ..tool_decorator import MANAGED_TOOLS
+from ..validation import validated_scope
+from .chain_plan import ChainPlan, CompiledStep, compile_chain
 
 
 class ChainExecutionError(Exception):
@@ -21,6 +23,10 @@ class ChainExecutionError(Exception):
         super().__init__(self.message)
 
 
+class ChainDeadlineExceeded(ChainExecutionError):
+    """Raised when a chain runs out of its deadline budget."""
+
+
 class ChainExecutor:
     """Executes chains of tools with conditional logic and error handling.
     
@@ -28,7 +34,8 @@ class ChainExecutor:
     - Sequential tool execution
     - Conditional branching (on_success, on_failure)
     - State passing between steps
-    - Error recovery strategies
+    - Error recovery strategies (retry with exponential backoff and jitter)
+    - Chain-level deadline budgets with cooperative cancellation
     - Audit trail integration
     """
     
@@ -43,27 +50,39 @@ class ChainExecutor:
         
     async def execute_chain(
         self,
-        steps: List[Dict[str, Any]],
+        steps: Union[List[Dict[str, Any]], ChainPlan],
         initial_state: Optional[Dict[str, Any]] = None,
-        chain_name: Optional[str] = None
+        chain_name: Optional[str] = None,
+        deadline_seconds: Optional[float] = None
     ) -> Dict[str, Any]:
         """Execute a chain of tool steps.
         
         Args:
-            steps: List of step definitions with tool, inputs, on_success, on_failure
+            steps: List of step definitions with tool, inputs, on_success, on_failure,
+                or a ChainPlan returned by compile_chain()
             initial_state: Initial state dict available to all steps
             chain_name: Optional name for this chain execution
+            deadline_seconds: Optional budget for the whole chain. Each step's
+                ``timeout_seconds`` is capped to the remaining budget and the
+                running step is cancelled once it is spent.
             
         Returns:
             Dict with chain execution results
             
+        Raises:
+            ChainCompilationError: If the step definitions do not compile
+            ChainExecutionError: If a step fails and its policy stops the chain
+            ChainDeadlineExceeded: If the deadline budget is spent
+            
         Example step structure:
             {
                 "tool": "gmail_search_messages",
                 "inputs": {
                     "query": "{{ state.search_query }}",
+                    "label": "{{ state.labels[0].name }}",
                     "max_results": 10
                 },
+                "timeout_seconds": 20,  # optional per-step cap
                 "on_success": {
                     "next": "drive_upload_file",
                     "map_outputs": {
@@ -71,13 +90,21 @@ class ChainExecutor:
                     }
                 },
                 "on_failure": {
-                    "action": "continue",  # or "stop", "retry"
+                    "action": "retry",  # or "stop", "continue"
+                    "max_retries": 3,
+                    "backoff": {"initial_seconds": 0.5, "max_seconds": 10, "multiplier": 2, "jitter": 1.0},
+                    "retry_on": ["TimeoutError", "ConnectionError"],
                     "next": "notify_failure"
                 }
             }
         """
+        plan = steps if isinstance(steps, ChainPlan) else compile_chain(steps, chain_name=chain_name)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + deadline_seconds if deadline_seconds is not None else None
+
         chain_id = self.ctx.plan_tool_chain(
-            tools=[{"tool_name": step.get("tool"), "parameters": step.get("inputs", {})} for step in steps],
+            tools=[{"tool_name": step.tool_name, "parameters": step.raw_inputs} for step in plan.steps],
             reasoning=f"Executing composite tool chain: {chain_name or 'unnamed'}",
             chain_name=chain_name
         )
@@ -89,21 +116,31 @@ class ChainExecutor:
         state["started_at"] = datetime.now().isoformat()
         
         results = []
+        # Failed attempts per step index (kept out of the user-visible state)
+        attempts: Dict[int, int] = {}
         current_step_index = 0
         
-        while current_step_index < len(steps):
-            step = steps[current_step_index]
-            step_name = step.get("tool", f"step_{current_step_index}")
+        while current_step_index < len(plan.steps):
+            step = plan.steps[current_step_index]
+            step_name = step.tool_name
+            remaining = self._remaining(deadline, loop)
+            if remaining is not None and remaining <= 0:
+                raise ChainDeadlineExceeded(
+                    f"Chain deadline exceeded before step {current_step_index}: {step_name}",
+                    current_step_index,
+                    step_name
+                )
             
             try:
                 # Execute step
-                step_result = await self._execute_step(step, state)
+                step_result = await self._execute_step(step, state, remaining)
                 
                 # Record success
                 self.execution_history.append({
                     "step_index": current_step_index,
                     "step_name": step_name,
                     "status": "success",
+                    "attempt": attempts.get(current_step_index, 0) + 1,
                     "result": step_result,
                     "timestamp": datetime.now().isoformat()
                 })
@@ -115,45 +152,27 @@ class ChainExecutor:
                 })
                 
                 # Update state with outputs
-                if step.get("on_success", {}).get("map_outputs"):
-                    for source_key, dest_key in step["on_success"]["map_outputs"].items():
-                        if source_key in step_result.get("data", {}):
-                            state[dest_key] = step_result["data"][source_key]
+                if step.map_outputs:
+                    data = step_result.get("data", {})
+                    for source_key, dest_key in step.map_outputs.items():
+                        if source_key in data:
+                            state[dest_key] = data[source_key]
                 
-                # Determine next step
-                on_success = step.get("on_success", {})
-                if on_success.get("next"):
-                    # Find named step
-                    next_step_name = on_success["next"]
-                    next_index = self._find_step_by_name(steps, next_step_name)
-                    if next_index is not None:
-                        current_step_index = next_index
-                    else:
-                        # Step not found, continue to next
-                        current_step_index += 1
-                else:
-                    # No explicit next, continue sequentially
-                    current_step_index += 1
+                # Determine next step (named targets resolved at compile time)
+                current_step_index = step.success_next
                     
+            except ChainDeadlineExceeded as e:
+                self._record_failure(results, current_step_index, step_name, e)
+                raise
             except Exception as e:
-                # Record failure
-                self.execution_history.append({
-                    "step_index": current_step_index,
-                    "step_name": step_name,
-                    "status": "failure",
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat()
-                })
+                attempt = attempts.get(current_step_index, 0) + 1
+                attempts[current_step_index] = attempt
                 
-                results.append({
-                    "step": step_name,
-                    "status": "failure",
-                    "error": str(e)
-                })
+                # Record failure
+                self._record_failure(results, current_step_index, step_name, e, attempt)
                 
                 # Handle failure according to on_failure policy
-                on_failure = step.get("on_failure", {})
-                action = on_failure.get("action", "stop")
+                action = step.on_failure.get("action", "stop")
                 
                 if action == "stop":
                     # Stop chain execution
@@ -164,33 +183,35 @@ class ChainExecutor:
                         e
                     )
                 elif action == "retry":
-                    # Retry the same step (with max retries check)
-                    max_retries = on_failure.get("max_retries", 3)
-                    retry_count = state.get(f"{step_name}_retry_count", 0)
-                    
-                    if retry_count < max_retries:
-                        state[f"{step_name}_retry_count"] = retry_count + 1
-                        # Stay on same step
-                        continue
-                    else:
-                        # Max retries exceeded, stop
+                    policy = step.retry_policy
+                    if not policy.should_retry(e, attempt):
+                        reason = (
+                            f"Max retries ({policy.max_retries}) exceeded"
+                            if attempt > policy.max_retries
+                            else f"Non-retryable error {type(e).__name__}"
+                        )
                         raise ChainExecutionError(
-                            f"Max retries ({max_retries}) exceeded for step {step_name}",
+                            f"{reason} for step {step_name}",
                             current_step_index,
                             step_name,
                             e
                         )
+                    
+                    # Back off before retrying the same step, within the deadline budget
+                    # (never sooner than a retry-after hint, e.g. from a bulkhead rejection)
+                    delay = max(policy.delay_for(attempt), getattr(e, "retry_after_seconds", 0) or 0)
+                    remaining = self._remaining(deadline, loop)
+                    if remaining is not None and delay >= remaining:
+                        raise ChainDeadlineExceeded(
+                            f"Chain deadline exceeded while backing off step {step_name}",
+                            current_step_index,
+                            step_name,
+                            e
+                        )
+                    await asyncio.sleep(delay)
                 elif action == "continue":
                     # Continue to next step despite failure
-                    if on_failure.get("next"):
-                        next_step_name = on_failure["next"]
-                        next_index = self._find_step_by_name(steps, next_step_name)
-                        if next_index is not None:
-                            current_step_index = next_index
-                        else:
-                            current_step_index += 1
-                    else:
-                        current_step_index += 1
+                    current_step_index = step.failure_next
                 else:
                     # Unknown action, stop
                     raise ChainExecutionError(
@@ -214,39 +235,68 @@ class ChainExecutor:
             "completed_at": datetime.now().isoformat()
         }
     
-    async def _execute_step(self, step: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a single step in the chain.
+    @staticmethod
+    def _remaining(deadline: Optional[float], loop: asyncio.AbstractEventLoop) -> Optional[float]:
+        """Seconds left in the chain budget (None = no deadline)."""
+        if deadline is None:
+            return None
+        return deadline - loop.time()
+    
+    def _record_failure(
+        self,
+        results: List[Dict[str, Any]],
+        step_index: int,
+        step_name: str,
+        error: Exception,
+        attempt: int = 1
+    ) -> None:
+        """Record a failed step attempt in the history and results."""
+        self.execution_history.append({
+            "step_index": step_index,
+            "step_name": step_name,
+            "status": "failure",
+            "attempt": attempt,
+            "error": str(error),
+            "timestamp": datetime.now().isoformat()
+        })
+        
+        results.append({
+            "step": step_name,
+            "status": "failure",
+            "error": str(error)
+        })
+    
+    async def _execute_step(
+        self,
+        step: CompiledStep,
+        state: Dict[str, Any],
+        budget_seconds: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Execute a single compiled step in the chain.
         
         Args:
-            step: Step definition with tool name and inputs
+            step: Compiled step with resolved tool definition and templates
             state: Current chain state
+            budget_seconds: Remaining chain budget (None = no deadline)
             
         Returns:
             Step execution result
+            
+        Raises:
+            ChainDeadlineExceeded: If the step is cancelled by the chain deadline
         """
-        tool_name = step.get("tool")
-        if not tool_name:
-            raise ValueError("Step must have 'tool' field")
+        timeout = step.timeout_seconds
+        if budget_seconds is not None:
+            timeout = budget_seconds if timeout is None else min(timeout, budget_seconds)
         
-        # Get tool function from registry
-        tool_def = MANAGED_TOOLS.get(tool_name)
-        if not tool_def:
-            raise ValueError(f"Tool not found in registry: {tool_name}")
-        
-        implementation = getattr(tool_def, "implementation", None)
-        if implementation is None:
-            raise ValueError(f"Tool '{tool_name}' does not have an implementation registered")
-
-        # Resolve and validate inputs
-        inputs = self._resolve_inputs(step.get("inputs", {}), state)
-        if getattr(tool_def, "params_model", None) is not None:
-            validated = tool_def.validate_params(inputs)
-            call_kwargs = validated.model_dump()
-        else:
-            call_kwargs = inputs
+        # Resolve and validate inputs (tool timeout capped to the remaining budget)
+        inputs = step.resolve_inputs(state, budget_seconds)
+        validated = step.validate(inputs)
+        call_kwargs = validated.values if validated is not None else inputs
 
-        # Execute tool implementation
-        result = await implementation(self.ctx, **call_kwargs)
+        # Execute tool implementation (inner layers reuse the validated params)
+        with validated_scope(validated) if validated is not None else nullcontext():
+            result = await self._call_step(step, call_kwargs, timeout, budget_seconds)
 
         # Normalize result payload for downstream chain handling
         if isinstance(result, dict):
@@ -262,50 +312,29 @@ class ChainExecutor:
             status = result.get("status", status)
 
         return {
-            "tool": tool_name,
+            "tool": step.tool_name,
             "status": status,
             "data": payload,
         }
     
-    def _resolve_inputs(self, inputs: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
-        """Resolve input parameters using template substitution from state.
-        
-        Args:
-            inputs: Input specification with possible {{ state.variable }} templates
-            state: Current state dict
-            
-        Returns:
-            Resolved inputs dict
-        """
-        resolved = {}
-        
-        for key, value in inputs.items():
-            if isinstance(value, str) and value.startswith("{{ state.") and value.endswith(" }}"):
-                # Template substitution: {{ state.variable }}
-                var_name = value[10:-3].strip()  # Extract variable name
-                resolved[key] = state.get(var_name, value)
-            elif isinstance(value, str) and value.startswith("{{") and value.endswith("}}"):
-                # Generic template: {{ expression }}
-                # For now, just look up in state
-                var_name = value[2:-2].strip()
-                resolved[key] = state.get(var_name, value)
-            else:
-                # Literal value
-                resolved[key] = value
-        
-        return resolved
-    
-    def _find_step_by_name(self, steps: List[Dict[str, Any]], name: str) -> Optional[int]:
-        """Find step index by tool name.
-        
-        Args:
-            steps: List of step definitions
-            name: Tool name to find
-            
-        Returns:
-            Step index or None if not found
-        """
-        for i, step in enumerate(steps):
-            if step.get("tool") == name:
-                return i
-        return None
+    async def _call_step(
+        self,
+        step: CompiledStep,
+        call_kwargs: Dict[str, Any],
+        timeout: Optional[float],
+        budget_seconds: Optional[float]
+    ) -> Any:
+        """Call the step implementation, enforcing its timeout and the chain budget."""
+        if timeout is None:
+            return await step.implementation(self.ctx, **call_kwargs)
+        try:
+            return await asyncio.wait_for(step.implementation(self.ctx, **call_kwargs), timeout)
+        except asyncio.TimeoutError as e:
+            if budget_seconds is not None and timeout >= budget_seconds:
+                raise ChainDeadlineExceeded(
+                    f"Chain deadline exceeded during step {step.index}: {step.tool_name}",
+                    step.index,
+                    step.tool_name,
+                    e
+                ) from e
+            raise
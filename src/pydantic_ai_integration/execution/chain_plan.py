@@ -0,0 +1,393 @@
+"""Compiled chain plans for the ChainExecutor.
+
+``compile_chain`` validates a list of step definitions once and turns it into a
+reusable ``ChainPlan``:
+
+- step name -> index map (O(1) branch lookup instead of scanning the step list)
+- pre-parsed ``{{ state.a.b[0] }}`` templates (no string slicing per execution)
+- resolved tool definitions, implementations and params models
+- retry policies (exponential backoff with jitter, retryable exceptions)
+
+Plans compiled with a ``chain_name`` are cached, so recurring chains only pay
+the parse cost once. A cached plan is reused as long as the step definitions
+are unchanged and the referenced tools are still the registered ones.
+"""
+
+import copy
+import math
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type, Union
+
+from annotated_types import Ge, Gt
+from pydantic import BaseModel
+
+from ..tool_decorator import MANAGED_TOOLS
+from ..tool_definition import ManagedToolDefinition
+from ..validation import ValidatedParams, validate_params
+
+# Sentinel for "path did not resolve" (None is a legitimate state value)
+_MISSING = object()
+
+_TEMPLATE_PATTERN = re.compile(r"^\{\{\s*(.+?)\s*\}\}$")
+_PATH_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<key>[A-Za-z_][\w\-]*)            # bare key: state, a, search_query
+        | \[\s*(?P<index>-?\d+)\s*\]          # list index: [0], [-1]
+        | \[\s*(?P<quote>['"])(?P<qkey>.*?)(?P=quote)\s*\]   # quoted key: ['a b']
+    )\s*(?:\.|(?=\[)|$)""",
+    re.VERBOSE,
+)
+
+
+class ChainCompilationError(ValueError):
+    """Raised when a chain definition cannot be compiled into a plan."""
+
+    def __init__(self, message: str, step_index: Optional[int] = None, step_name: Optional[str] = None):
+        self.message = message
+        self.step_index = step_index
+        self.step_name = step_name
+        super().__init__(self.message)
+
+
+def _parse_path(expression: str) -> Tuple[Union[str, int], ...]:
+    """Parse ``a.b[0]['c d']`` into ``("a", "b", 0, "c d")``.
+
+    Raises:
+        ValueError: If the expression is not a valid path
+    """
+    tokens: List[Union[str, int]] = []
+    position = 0
+    while position < len(expression):
+        match = _PATH_TOKEN_PATTERN.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Invalid template path: '{expression}'")
+        if match.group("key") is not None:
+            tokens.append(match.group("key"))
+        elif match.group("index") is not None:
+            tokens.append(int(match.group("index")))
+        else:
+            tokens.append(match.group("qkey"))
+        position = match.end()
+    if not tokens:
+        raise ValueError(f"Empty template path: '{expression}'")
+    return tuple(tokens)
+
+
+@dataclass(frozen=True)
+class TemplateAccessor:
+    """Pre-parsed ``{{ ... }}`` template that reads a (nested) value from chain state.
+
+    ``{{ state.a.b[0] }}`` and ``{{ a.b[0] }}`` both resolve against the state
+    dict. Unresolvable paths fall back to the raw template string, matching the
+    executor's historical behaviour.
+    """
+
+    raw: str
+    path: Tuple[Union[str, int], ...]
+
+    @classmethod
+    def parse(cls, value: str) -> Optional["TemplateAccessor"]:
+        """Return an accessor for ``value`` or None if it is not a template."""
+        match = _TEMPLATE_PATTERN.match(value)
+        if not match:
+            return None
+        path = _parse_path(match.group(1))
+        if len(path) > 1 and path[0] == "state":
+            path = path[1:]
+        return cls(raw=value, path=path)
+
+    def resolve(self, state: Dict[str, Any]) -> Any:
+        """Read the value at ``path`` from ``state``."""
+        current: Any = state
+        for token in self.path:
+            if isinstance(token, int):
+                if isinstance(current, (list, tuple)) and -len(current) <= token < len(current):
+                    current = current[token]
+                    continue
+                return self.raw
+            if isinstance(current, Mapping):
+                current = current.get(token, _MISSING)
+            elif isinstance(current, BaseModel):
+                current = getattr(current, token, _MISSING)
+            else:
+                return self.raw
+            if current is _MISSING:
+                return self.raw
+        return current
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff policy for steps whose ``on_failure.action`` is ``retry``.
+
+    Configured on the step's ``on_failure`` block::
+
+        {"action": "retry", "max_retries": 3,
+         "backoff": {"initial_seconds": 0.5, "max_seconds": 10, "multiplier": 2, "jitter": 1.0},
+         "retry_on": ["TimeoutError", "ConnectionError"]}
+
+    ``jitter`` is the fraction of each delay that is randomized (1.0 = full
+    jitter). ``retry_on`` lists exception class names (matched against the
+    exception's MRO); an empty list retries every exception.
+    """
+
+    max_retries: int = 3
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 1.0
+    retry_on: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, on_failure: Dict[str, Any]) -> "RetryPolicy":
+        """Build a policy from an ``on_failure`` block."""
+        backoff = on_failure.get("backoff") or {}
+        policy = cls(
+            max_retries=int(on_failure.get("max_retries", cls.max_retries)),
+            initial_delay=float(backoff.get("initial_seconds", cls.initial_delay)),
+            max_delay=float(backoff.get("max_seconds", cls.max_delay)),
+            multiplier=float(backoff.get("multiplier", cls.multiplier)),
+            jitter=float(backoff.get("jitter", cls.jitter)),
+            retry_on=tuple(on_failure.get("retry_on") or ()),
+        )
+        if policy.max_retries < 0 or policy.initial_delay < 0 or policy.max_delay < 0:
+            raise ValueError("Retry policy values must not be negative")
+        if policy.multiplier < 1 or not 0 <= policy.jitter <= 1:
+            raise ValueError("Retry backoff needs multiplier >= 1 and 0 <= jitter <= 1")
+        return policy
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Whether failed attempt number ``attempt`` (1-based) may be retried."""
+        if attempt > self.max_retries:
+            return False
+        if not self.retry_on:
+            return True
+        return any(klass.__name__ in self.retry_on for klass in type(error).__mro__)
+
+    def delay_for(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """Delay before retry number ``attempt`` (1-based)."""
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        return delay * (1 - self.jitter * rng())
+
+
+def _timeout_floor(params_model: Optional[Type[BaseModel]]) -> Optional[int]:
+    """Lowest ``timeout_seconds`` the params model accepts (None if it has no such field)."""
+    if params_model is None or "timeout_seconds" not in params_model.model_fields:
+        return None
+    floor = 1
+    for constraint in params_model.model_fields["timeout_seconds"].metadata:
+        if isinstance(constraint, Ge):
+            floor = max(floor, int(constraint.ge))
+        elif isinstance(constraint, Gt):
+            floor = max(floor, int(constraint.gt) + 1)
+    return floor
+
+
+def _compile_inputs(value: Any) -> Any:
+    """Replace template strings with accessors, recursing into dicts and lists."""
+    if isinstance(value, str):
+        return TemplateAccessor.parse(value) or value
+    if isinstance(value, dict):
+        return {key: _compile_inputs(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_compile_inputs(item) for item in value]
+    return value
+
+
+def _has_templates(value: Any) -> bool:
+    if isinstance(value, TemplateAccessor):
+        return True
+    if isinstance(value, dict):
+        return any(_has_templates(item) for item in value.values())
+    if isinstance(value, list):
+        return any(_has_templates(item) for item in value)
+    return False
+
+
+def _render(value: Any, state: Dict[str, Any]) -> Any:
+    if isinstance(value, TemplateAccessor):
+        return value.resolve(state)
+    if isinstance(value, dict):
+        return {key: _render(item, state) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_render(item, state) for item in value]
+    return value
+
+
+@dataclass
+class CompiledStep:
+    """A single chain step with its tool and templates resolved up front."""
+
+    index: int
+    tool_name: str
+    tool_def: ManagedToolDefinition
+    implementation: Callable[..., Any]
+    params_model: Optional[Type[BaseModel]]
+    raw_inputs: Dict[str, Any]
+    inputs: Dict[str, Any]
+    has_templates: bool
+    on_success: Dict[str, Any] = field(default_factory=dict)
+    on_failure: Dict[str, Any] = field(default_factory=dict)
+    map_outputs: Dict[str, str] = field(default_factory=dict)
+    success_next: int = 0
+    failure_next: int = 0
+    retry_policy: Optional[RetryPolicy] = None
+    timeout_seconds: Optional[float] = None
+    timeout_floor: Optional[int] = None
+
+    def resolve_inputs(self, state: Dict[str, Any], budget_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Render the step inputs against the current chain state.
+
+        When ``budget_seconds`` is given and the tool accepts ``timeout_seconds``,
+        the tool timeout is capped to the remaining budget.
+        """
+        inputs = dict(self.inputs) if not self.has_templates else _render(self.inputs, state)
+        if budget_seconds is not None and self.timeout_floor is not None:
+            requested = inputs.get("timeout_seconds")
+            capped = max(self.timeout_floor, math.ceil(budget_seconds))
+            if not isinstance(requested, (int, float)) or requested > capped:
+                inputs["timeout_seconds"] = capped
+        return inputs
+
+    def validate(self, inputs: Dict[str, Any]) -> Optional[ValidatedParams]:
+        """Validate inputs with the tool's params model (None if the tool has none)."""
+        if self.params_model is None:
+            return None
+        return validate_params(self.params_model, inputs)
+
+
+@dataclass
+class ChainPlan:
+    """Reusable, validated execution plan for a chain of tool steps."""
+
+    steps: Tuple[CompiledStep, ...]
+    index_by_name: Dict[str, int]
+    chain_name: Optional[str] = None
+    source_steps: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def find_step(self, name: str) -> Optional[int]:
+        """Return the index of the first step using tool ``name``."""
+        return self.index_by_name.get(name)
+
+    def is_current(self, steps: List[Dict[str, Any]]) -> bool:
+        """Whether this plan still matches ``steps`` and the live tool registry."""
+        if steps is not self.source_steps and steps != self.source_steps:
+            return False
+        return all(MANAGED_TOOLS.get(step.tool_name) is step.tool_def for step in self.steps)
+
+
+def _resolve_next(target: Optional[str], index: int, index_by_name: Dict[str, int]) -> int:
+    """Resolve a ``next`` step name to an index (unknown/absent -> sequential)."""
+    if target:
+        return index_by_name.get(target, index + 1)
+    return index + 1
+
+
+def compile_chain(steps: List[Dict[str, Any]], chain_name: Optional[str] = None) -> ChainPlan:
+    """Validate a chain definition and compile it into a ``ChainPlan``.
+
+    Args:
+        steps: Step definitions (tool, inputs, on_success, on_failure)
+        chain_name: Optional chain name; when given, the plan is cached under it
+
+    Returns:
+        Compiled ChainPlan
+
+    Raises:
+        ChainCompilationError: If a step has no tool, the tool is not
+            registered, has no implementation, a template is malformed or a
+            retry policy is invalid
+    """
+    if chain_name:
+        cached = _PLAN_CACHE.get(chain_name)
+        if cached is not None and cached.is_current(steps):
+            return cached
+
+    index_by_name: Dict[str, int] = {}
+    for index, step in enumerate(steps):
+        tool_name = step.get("tool")
+        if not tool_name:
+            raise ChainCompilationError("Step must have 'tool' field", index, f"step_{index}")
+        index_by_name.setdefault(tool_name, index)
+
+    compiled: List[CompiledStep] = []
+    for index, step in enumerate(steps):
+        tool_name = step["tool"]
+        tool_def = MANAGED_TOOLS.get(tool_name)
+        if not tool_def:
+            raise ChainCompilationError(f"Tool not found in registry: {tool_name}", index, tool_name)
+
+        implementation = getattr(tool_def, "implementation", None)
+        if implementation is None:
+            raise ChainCompilationError(
+                f"Tool '{tool_name}' does not have an implementation registered", index, tool_name
+            )
+
+        raw_inputs = step.get("inputs", {}) or {}
+        try:
+            inputs = _compile_inputs(raw_inputs)
+        except ValueError as e:
+            raise ChainCompilationError(str(e), index, tool_name) from e
+
+        on_success = step.get("on_success", {}) or {}
+        on_failure = step.get("on_failure", {}) or {}
+        retry_policy = None
+        if on_failure.get("action") == "retry":
+            try:
+                retry_policy = RetryPolicy.from_config(on_failure)
+            except (TypeError, ValueError) as e:
+                raise ChainCompilationError(f"Invalid retry policy: {e}", index, tool_name) from e
+
+        params_model = getattr(tool_def, "params_model", None)
+        compiled.append(
+            CompiledStep(
+                index=index,
+                tool_name=tool_name,
+                tool_def=tool_def,
+                implementation=implementation,
+                params_model=params_model,
+                raw_inputs=raw_inputs,
+                inputs=inputs,
+                has_templates=_has_templates(inputs),
+                on_success=on_success,
+                on_failure=on_failure,
+                map_outputs=on_success.get("map_outputs") or {},
+                success_next=_resolve_next(on_success.get("next"), index, index_by_name),
+                failure_next=_resolve_next(on_failure.get("next"), index, index_by_name),
+                retry_policy=retry_policy,
+                timeout_seconds=step.get("timeout_seconds"),
+                timeout_floor=_timeout_floor(params_model),
+            )
+        )
+
+    plan = ChainPlan(
+        steps=tuple(compiled),
+        index_by_name=index_by_name,
+        chain_name=chain_name,
+        source_steps=copy.deepcopy(steps),
+    )
+    if chain_name:
+        _PLAN_CACHE[chain_name] = plan
+    return plan
+
+
+# Compiled plans keyed by chain name
+_PLAN_CACHE: Dict[str, ChainPlan] = {}
+
+
+def get_cached_plan(chain_name: str) -> Optional[ChainPlan]:
+    """Return the cached plan for ``chain_name`` if one exists."""
+    return _PLAN_CACHE.get(chain_name)
+
+
+def clear_chain_plan_cache(chain_name: Optional[str] = None) -> None:
+    """Drop one cached plan, or all of them when ``chain_name`` is None."""
+    if chain_name is None:
+        _PLAN_CACHE.clear()
+    else:
+        _PLAN_CACHE.pop(chain_name, None)
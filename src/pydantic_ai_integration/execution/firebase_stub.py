@@ -90,6 +90,13 @@ class firestore:  # mimic firebase_admin.firestore module
         def __init__(self, values: List[Any]):
             super().__init__(values)
 
+    class ArrayRemove(list):
+        def __init__(self, values: List[Any]):
+            super().__init__(values)
+
+    class Increment(int):
+        pass
+
 
 _app_instance: object | None = None
 
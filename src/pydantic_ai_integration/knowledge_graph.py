@@ -0,0 +1,270 @@
+"""
+Indexed view of an MDSContext knowledge graph.
+
+``MDSContext.knowledge_graph`` keeps its stored shape,
+``{entity_type: {entity_id: data}}``; relations live in each source entity's
+data under ``"_relations"`` as ``{"relation", "target_type", "target_id"}``
+entries (plus optional ``"properties"``). ``KnowledgeGraph`` wraps that dict
+without copying it and keeps alongside:
+
+- outgoing and incoming adjacency per entity, grouped by relation
+- an edge index per relation
+- attribute indexes (value -> entity ids), built per (type, attribute) on the
+  first query that needs them and maintained from then on
+
+so neighbors, attribute lookups and k-hop expansion no longer scan the graph.
+Entities are addressed as ``(entity_type, entity_id)`` keys. Changes must go
+through ``add_entity``/``add_relation``; the indexes are rebuilt when the
+wrapped dict is replaced.
+"""
+
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# (entity_type, entity_id)
+EntityKey = Tuple[str, str]
+
+RELATIONS_KEY = "_relations"
+
+_DIRECTIONS = ("out", "in", "both")
+
+
+class KnowledgeGraph:
+    """Entity, relation and attribute indexes over a knowledge graph dict."""
+
+    def __init__(self, data: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        self._reset({} if data is None else data)
+
+    def _reset(self, data: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        self._data = data
+        # Dicts with None values serve as insertion-ordered sets
+        self._out: Dict[EntityKey, Dict[str, Dict[EntityKey, None]]] = {}
+        self._in: Dict[EntityKey, Dict[str, Dict[EntityKey, None]]] = {}
+        self._edges: Dict[str, Dict[Tuple[EntityKey, EntityKey], None]] = {}
+        self._attributes: Dict[str, Dict[str, Dict[Hashable, Set[str]]]] = {}
+        for entity_type, entities in data.items():
+            for entity_id, entity in entities.items():
+                self._index_relations((entity_type, entity_id), entity)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, Dict[str, Any]]]) -> "KnowledgeGraph":
+        """Wrap a knowledge graph dict (used as is, not copied)."""
+        return cls(data)
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """The wrapped dict, in the stored shape."""
+        return self._data
+
+    def sync(self, data: Dict[str, Dict[str, Dict[str, Any]]]) -> "KnowledgeGraph":
+        """Follow ``data``, rebuilding the indexes if it is a different dict."""
+        if data is not self._data:
+            self._reset(data)
+        return self
+
+    def rebind(self, data: Dict[str, Dict[str, Dict[str, Any]]]) -> None:
+        """Switch to an equivalent copy of the wrapped dict, keeping adjacency.
+
+        Attribute indexes are dropped, as values may have been normalized.
+        """
+        self._data = data
+        self._attributes = {}
+
+    def __len__(self) -> int:
+        return sum(len(entities) for entities in self._data.values())
+
+    def __contains__(self, key: EntityKey) -> bool:
+        return key[1] in self._data.get(key[0], {})
+
+    def get(self, key: EntityKey) -> Optional[Dict[str, Any]]:
+        """Data of an entity, or None."""
+        return self._data.get(key[0], {}).get(key[1])
+
+    # ------------------------------------------------------------------ updates
+
+    def add_entity(self, entity_type: str, entity_id: str, data: Dict[str, Any]) -> EntityKey:
+        """Add or replace an entity, keeping its relations if ``data`` has none."""
+        key = (entity_type, entity_id)
+        entities = self._data.setdefault(entity_type, {})
+        previous = entities.get(entity_id)
+        if previous is not None:
+            if RELATIONS_KEY not in data and previous.get(RELATIONS_KEY):
+                data[RELATIONS_KEY] = previous[RELATIONS_KEY]
+            self._unindex_relations(key, previous)
+            self._unindex_attributes(entity_type, entity_id, previous)
+        entities[entity_id] = data
+        self._index_relations(key, data)
+        self._index_attributes(entity_type, entity_id, data)
+        return key
+
+    def add_relation(
+        self,
+        source: EntityKey,
+        relation: str,
+        target: EntityKey,
+        properties: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Record ``source -[relation]-> target``.
+
+        The source entity is created (empty) if missing; the target need not
+        exist yet.
+
+        Returns:
+            False if the relation was already recorded
+        """
+        if (source, target) in self._edges.get(relation, {}):
+            return False
+        entity = self.get(source)
+        if entity is None:
+            entity = {}
+            self._data.setdefault(source[0], {})[source[1]] = entity
+        entry = {"relation": relation, "target_type": target[0], "target_id": target[1]}
+        if properties:
+            entry["properties"] = properties
+        entity.setdefault(RELATIONS_KEY, []).append(entry)
+        self._link(source, relation, target)
+        return True
+
+    def _index_relations(self, key: EntityKey, entity: Dict[str, Any]) -> None:
+        for entry in entity.get(RELATIONS_KEY) or ():
+            self._link(key, entry["relation"], (entry["target_type"], entry["target_id"]))
+
+    def _unindex_relations(self, key: EntityKey, entity: Dict[str, Any]) -> None:
+        for entry in entity.get(RELATIONS_KEY) or ():
+            relation, target = entry["relation"], (entry["target_type"], entry["target_id"])
+            self._out.get(key, {}).get(relation, {}).pop(target, None)
+            self._in.get(target, {}).get(relation, {}).pop(key, None)
+            self._edges.get(relation, {}).pop((key, target), None)
+
+    def _link(self, source: EntityKey, relation: str, target: EntityKey) -> None:
+        self._out.setdefault(source, {}).setdefault(relation, {})[target] = None
+        self._in.setdefault(target, {}).setdefault(relation, {})[source] = None
+        self._edges.setdefault(relation, {})[(source, target)] = None
+
+    def _index_attributes(self, entity_type: str, entity_id: str, entity: Dict[str, Any]) -> None:
+        for attribute, index in self._attributes.get(entity_type, {}).items():
+            value = entity.get(attribute)
+            if isinstance(value, Hashable):
+                index.setdefault(value, set()).add(entity_id)
+
+    def _unindex_attributes(self, entity_type: str, entity_id: str, entity: Dict[str, Any]) -> None:
+        for attribute, index in self._attributes.get(entity_type, {}).items():
+            value = entity.get(attribute)
+            if isinstance(value, Hashable):
+                index.get(value, set()).discard(entity_id)
+
+    def _attribute_index(self, entity_type: str, attribute: str) -> Dict[Hashable, Set[str]]:
+        by_attribute = self._attributes.setdefault(entity_type, {})
+        if attribute not in by_attribute:
+            index: Dict[Hashable, Set[str]] = {}
+            for entity_id, entity in self._data.get(entity_type, {}).items():
+                value = entity.get(attribute)
+                if isinstance(value, Hashable):
+                    index.setdefault(value, set()).add(entity_id)
+            by_attribute[attribute] = index
+        return by_attribute[attribute]
+
+    # ------------------------------------------------------------------ queries
+
+    def entities(self, entity_type: str, limit: Optional[int] = None, **attributes: Any) -> List[EntityKey]:
+        """Entities of a type whose attributes equal the given values.
+
+        Args:
+            entity_type: Entity type to search
+            limit: Maximum number of results
+            **attributes: Attribute values to match (all must match)
+
+        Returns:
+            Matching entity keys
+        """
+        entities = self._data.get(entity_type, {})
+        if not attributes:
+            ids: Iterable[str] = entities
+        else:
+            # Intersect the indexed candidates, smallest set first
+            candidates = sorted(
+                (self._attribute_index(entity_type, name).get(value, set()) if isinstance(value, Hashable) else None
+                 for name, value in attributes.items()),
+                key=lambda found: len(found) if found is not None else float("inf"),
+            )
+            if candidates[0] is None:
+                ids = (
+                    entity_id for entity_id, entity in entities.items()
+                    if all(entity.get(name) == value for name, value in attributes.items())
+                )
+            else:
+                ids = (
+                    entity_id for entity_id in candidates[0]
+                    if all(entities[entity_id].get(name) == value for name, value in attributes.items())
+                )
+        found = []
+        for entity_id in ids:
+            if limit is not None and len(found) >= limit:
+                break
+            found.append((entity_type, entity_id))
+        return found
+
+    def neighbors(
+        self,
+        key: EntityKey,
+        relation: Optional[str] = None,
+        direction: str = "out",
+    ) -> List[EntityKey]:
+        """Entities directly related to ``key``.
+
+        Args:
+            key: Entity to start from
+            relation: Only follow this relation (default: all)
+            direction: "out" (key is the source), "in" (key is the target) or "both"
+
+        Returns:
+            Related entity keys, without duplicates
+        """
+        if direction not in _DIRECTIONS:
+            raise ValueError(f"direction must be one of {_DIRECTIONS}")
+        adjacencies = {"out": (self._out,), "in": (self._in,), "both": (self._out, self._in)}[direction]
+        found: Dict[EntityKey, None] = {}
+        for adjacency in adjacencies:
+            by_relation = adjacency.get(key, {})
+            groups = by_relation.values() if relation is None else [by_relation.get(relation, {})]
+            for group in groups:
+                found.update(group)
+        return list(found)
+
+    def expand(
+        self,
+        start: EntityKey,
+        hops: int = 1,
+        relation: Optional[str] = None,
+        direction: str = "out",
+        limit: Optional[int] = None,
+    ) -> Dict[EntityKey, int]:
+        """Entities within ``hops`` relations of ``start`` (breadth first).
+
+        Args:
+            start: Entity to start from
+            hops: Maximum number of relations to follow
+            relation: Only follow this relation (default: all)
+            direction: "out", "in" or "both"
+            limit: Maximum number of entities returned (start included)
+
+        Returns:
+            Entity key -> distance from ``start`` (0 for ``start``), nearest first
+        """
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            key = queue.popleft()
+            if distances[key] >= hops:
+                continue
+            for neighbor in self.neighbors(key, relation, direction):
+                if neighbor in distances:
+                    continue
+                if limit is not None and len(distances) >= limit:
+                    return distances
+                distances[neighbor] = distances[key] + 1
+                queue.append(neighbor)
+        return distances
+
+    def edges(self, relation: str) -> List[Tuple[EntityKey, EntityKey]]:
+        """All (source, target) pairs of a relation."""
+        return list(self._edges.get(relation, {}))
@@ -0,0 +1,310 @@
+"""
+Process-pool execution tier for CPU-heavy tools.
+
+Tools normally run on the event loop. A tool registered with
+``execution="process_pool"`` (or ``implementation.execution: process_pool`` in
+the YAML tool config) runs its body in a worker of a shared, warm
+``ProcessPoolExecutor`` instead, so parsing a large sheet range or computing
+casefile analytics does not stall other requests.
+
+- Callables are sent by reference (module + qualified name) and resolved in
+  the worker, so only importable module-level functions can be offloaded.
+- The context is sent as a pickle-safe snapshot of its identifiers; events the
+  tool records in the worker are copied back onto the caller's context.
+- Documents the call writes in the worker are bumped in the caller's
+  ``entity_versions`` (and dropped from its request identity map), so
+  memoized read-only results keyed on them are not served stale.
+- A timeout or cancellation cancels a queued call. A call already running is
+  stopped by recycling the pool; calls that were running next to it on the
+  recycled pool are resubmitted once.
+
+Pool size: ``TOOL_PROCESS_POOL_SIZE`` (default: CPU count - 1, at least 1).
+"""
+
+import asyncio
+import importlib
+import inspect
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from persistence.entity_versions import entity_versions
+from persistence.identity_map import current_identity_map
+
+logger = logging.getLogger(__name__)
+
+# Context fields copied into worker processes
+SNAPSHOT_FIELDS = frozenset({
+    "user_id",
+    "session_id",
+    "casefile_id",
+    "session_request_id",
+    "environment",
+    "transaction_context",
+})
+
+
+class ToolTarget(NamedTuple):
+    """Importable reference to a function, resolved inside the worker."""
+
+    module: str
+    qualname: str
+
+    @classmethod
+    def from_function(cls, func: Callable[..., Any]) -> "ToolTarget":
+        """Reference ``func`` by module and qualified name.
+
+        Raises:
+            ValueError: If ``func`` is a closure, lambda or otherwise not importable
+        """
+        func = inspect.unwrap(func)
+        qualname = getattr(func, "__qualname__", "")
+        if not qualname or "<" in qualname:
+            raise ValueError(
+                f"Function '{qualname or func!r}' is not importable; process-pool tools must be "
+                "defined at module level"
+            )
+        return cls(module=func.__module__, qualname=qualname)
+
+    def resolve(self) -> Callable[..., Any]:
+        """Import the referenced function (unwrapping decorators such as validated_wrapper)."""
+        target: Any = importlib.import_module(self.module)
+        for part in self.qualname.split("."):
+            target = getattr(target, part)
+        return inspect.unwrap(target)
+
+
+def snapshot_context(ctx: Any) -> Dict[str, Any]:
+    """Pickle-safe copy of the context identifiers a tool body needs."""
+    if hasattr(ctx, "model_dump"):
+        return ctx.model_dump(mode="json", include=set(SNAPSHOT_FIELDS))
+    return {name: getattr(ctx, name) for name in SNAPSHOT_FIELDS if hasattr(ctx, name)}
+
+
+def _restore_context(snapshot: Dict[str, Any]) -> Any:
+    from .dependencies import MDSContext
+
+    return MDSContext.model_validate(snapshot)
+
+
+def _written_since(before: Dict[Tuple[str, str], int]) -> List[Tuple[str, str]]:
+    """Documents whose version moved past ``before`` (a worker runs one call at a time)."""
+    return [key for key, version in entity_versions.documents().items() if version != before.get(key)]
+
+
+def _run_tool(
+    target: ToolTarget, snapshot: Dict[str, Any], params: Dict[str, Any]
+) -> Tuple[Any, List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """Worker entry point: run a tool body against a restored context."""
+    before = entity_versions.documents()
+    func = target.resolve()
+    ctx = _restore_context(snapshot)
+    result = func(ctx, **params)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    events = [event.model_dump(mode="json") for event in ctx.tool_events]
+    return result, events, _written_since(before)
+
+
+def _run_callable(target: ToolTarget, args: Tuple[Any, ...]) -> Tuple[Any, List[Tuple[str, str]]]:
+    """Worker entry point: call a function (sync or async) with positional args."""
+    before = entity_versions.documents()
+    result = target.resolve()(*args)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    return result, _written_since(before)
+
+
+def _record_writes(writes: List[Tuple[str, str]]) -> None:
+    """Apply documents written in a worker to this process's version tracker."""
+    identity = current_identity_map()
+    for collection, doc_id in writes:
+        entity_versions.bump(collection, doc_id)
+        if identity is not None:
+            identity.discard(collection, doc_id)
+
+
+def _preload(modules: Tuple[str, ...]) -> None:
+    """Worker initializer: import modules once so calls start warm."""
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def default_pool_size() -> int:
+    """Pool size from ``TOOL_PROCESS_POOL_SIZE``, else CPU count - 1."""
+    configured = os.environ.get("TOOL_PROCESS_POOL_SIZE")
+    if configured:
+        return max(1, int(configured))
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+class ToolProcessPool:
+    """Warm, self-healing process pool shared by process-pool tools."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        preload: Iterable[str] = (),
+        start_method: str = "spawn",
+    ):
+        self.max_workers = max_workers or default_pool_size()
+        self.preload = tuple(preload)
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self.restarts = 0
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self, warm: bool = True) -> None:
+        """Create the pool; with ``warm`` every worker is spawned up front."""
+        executor = self._ensure_executor()
+        if warm:
+            for _ in range(self.max_workers):
+                executor.submit(_ping)
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_preload,
+                initargs=(self.preload,),
+            )
+            logger.info(f"Started tool process pool ({self.max_workers} workers, generation {self._generation})")
+        return self._executor
+
+    def _recycle(self, generation: int) -> None:
+        """Kill the workers of ``generation`` (no-op if it was already replaced)."""
+        if generation != self._generation or self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        self._generation += 1
+        self.restarts += 1
+        terminate = getattr(executor, "terminate_workers", None)
+        if terminate is not None:
+            terminate()
+        else:
+            for process in list((getattr(executor, "_processes", None) or {}).values()):
+                process.terminate()
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Recycled tool process pool to stop a timed-out or cancelled call")
+
+    async def submit(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run ``fn(*args)`` in a worker.
+
+        Args:
+            fn: Module-level function (worker entry point)
+            args: Picklable arguments
+            timeout: Seconds before the call is abandoned (None = no limit)
+
+        Raises:
+            asyncio.TimeoutError: If ``timeout`` elapsed
+            BrokenProcessPool: If a worker died while running this call
+        """
+        resubmitted = False
+        while True:
+            executor = self._ensure_executor()
+            generation = self._generation
+            future = None
+            try:
+                future = executor.submit(fn, *args)
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                # A queued call is cancelled by wait_for; a running one needs its worker killed
+                if future is not None and not future.cancel() and not future.done():
+                    self._recycle(generation)
+                raise
+            except BrokenProcessPool:
+                if future is None and not resubmitted:
+                    # Pool was already broken (a worker died earlier) - replace it and retry once
+                    self._recycle(generation)
+                    resubmitted = True
+                    continue
+                if generation != self._generation and not resubmitted:
+                    # Broken by a recycle triggered by another call - run it again once
+                    resubmitted = True
+                    continue
+                self._recycle(generation)
+                raise
+
+    async def run_tool(
+        self,
+        target: ToolTarget,
+        ctx: Any,
+        params: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run a tool body in a worker and copy its events back onto ``ctx``."""
+        result, events, writes = await self.submit(_run_tool, target, snapshot_context(ctx), params, timeout=timeout)
+        _record_writes(writes)
+        tool_events = getattr(ctx, "tool_events", None)
+        if events and isinstance(tool_events, list):
+            from pydantic_models.canonical.tool_session import ToolEvent
+
+            tool_events.extend(ToolEvent.model_validate(event) for event in events)
+        return result
+
+    async def run_callable(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run an importable function (sync or async) with picklable args in a worker."""
+        result, writes = await self.submit(_run_callable, ToolTarget.from_function(func), args, timeout=timeout)
+        _record_writes(writes)
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            self._generation += 1
+
+
+# Global pool shared by all process-pool tools in this process
+_tool_process_pool: Optional[ToolProcessPool] = None
+
+
+def get_tool_process_pool() -> ToolProcessPool:
+    """Get the global tool process pool (created lazily, not started)."""
+    global _tool_process_pool
+    if _tool_process_pool is None:
+        _tool_process_pool = ToolProcessPool()
+    return _tool_process_pool
+
+
+def offload_tool(
+    tool_name: str,
+    func: Callable[..., Awaitable[Any]],
+    timeout_seconds: Optional[float] = None,
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a tool implementation so its body runs in the tool process pool.
+
+    Args:
+        tool_name: Registered tool name
+        func: Module-level tool implementation ``(ctx, **params)``
+        timeout_seconds: Default timeout; a ``timeout_seconds`` param overrides it
+
+    Returns:
+        Implementation with the same signature
+
+    Raises:
+        ValueError: If ``func`` cannot be referenced from a worker process
+    """
+    target = ToolTarget.from_function(func)
+
+    @wraps(func)
+    async def offloaded(ctx, **params):
+        timeout = params.get("timeout_seconds") or timeout_seconds
+        logger.debug(f"Running tool '{tool_name}' in process pool (timeout: {timeout})")
+        return await get_tool_process_pool().run_tool(target, ctx, params, timeout=timeout)
+
+    return offloaded
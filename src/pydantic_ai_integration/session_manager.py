@@ -12,7 +12,8 @@ from typing import Any, Dict, Optional, Tuple
 
 from pydantic_ai_integration.dependencies import MDSContext
 from pydantic_models.base.types import RequestStatus
-from pydantic_models.operations.tool_session_ops import CreateSessionRequest, GetSessionRequest, ListSessionsRequest
+from pydantic_models.canonical.tool_session import ToolSession
+from pydantic_models.operations.tool_session_ops import CreateSessionRequest, GetSessionRequest
 from tool_sessionservice.service import ToolSessionService
 
 logger = logging.getLogger(__name__)
@@ -21,8 +22,8 @@ logger = logging.getLogger(__name__)
 class SessionManager:
     """Manages automatic session creation and resumption for tool execution."""
 
-    def __init__(self):
-        self.session_service = ToolSessionService()
+    def __init__(self, session_service: Optional[ToolSessionService] = None):
+        self.session_service = session_service or ToolSessionService()
 
     async def ensure_session_context(
         self,
@@ -101,59 +102,8 @@ class SessionManager:
             Most recent active ToolSession if found, None otherwise
         """
         try:
-            # List sessions for this user
-            list_request = ListSessionsRequest(
-                user_id=user_id,
-                payload={
-                    "user_id": user_id,
-                    "casefile_id": casefile_id,
-                    "active_only": True,
-                    "limit": 50,  # Get recent sessions
-                    "offset": 0
-                }
-            )
-
-            response = await self.session_service.list_sessions(list_request)
-
-            if response.status != RequestStatus.COMPLETED or not response.payload.sessions:
-                return None
-
-            # Find sessions that match the casefile_id (if provided)
-            matching_sessions = []
-            for session_summary in response.payload.sessions:
-                # If casefile_id specified, only match sessions with that casefile
-                if casefile_id and session_summary.casefile_id != casefile_id:
-                    continue
-                # If no casefile_id specified, match sessions with no casefile (user-only sessions)
-                if not casefile_id and session_summary.casefile_id:
-                    continue
-                matching_sessions.append(session_summary)
-
-            if not matching_sessions:
-                return None
-
-            # Return the most recent session (first in list, assuming sorted by creation date)
-            most_recent = matching_sessions[0]
-
-            # Get full session details to return ToolSession object
-            get_request = GetSessionRequest(
-                user_id=user_id,
-                payload={"session_id": most_recent.session_id}
-            )
-
-            get_response = await self.session_service.get_session(get_request)
-            if get_response.status == RequestStatus.COMPLETED:
-                # Convert payload to ToolSession-like object
-                class SessionResult:
-                    def __init__(self, payload):
-                        self.session_id = payload.session_id
-                        self.user_id = payload.user_id
-                        self.casefile_id = payload.casefile_id
-                        self.active = payload.active
-
-                return SessionResult(get_response.payload)
-
-            return None
+            # O(1) lookup in the active session index (maintained on create/close)
+            return await self.session_service.find_active_session(user_id, casefile_id)
 
         except Exception as e:
             logger.warning(f"Failed to find existing session for user {user_id}/casefile {casefile_id}: {e}")
@@ -40,8 +40,15 @@ from pydantic import BaseModel, ValidationError
 from .tool_definition import (
     ManagedToolDefinition,
     ParameterType,
+    ToolCachePolicy,
+    ToolConcurrencyPolicy,
+    ToolExecutionMode,
     ToolParameterDef,
 )
+from .bulkhead import BulkheadRejected, bulkhead_tool
+from .process_pool import get_tool_process_pool, offload_tool
+from .tool_result_cache import memoize_tool
+from .validation import get_type_adapter, take_validated, validate_params, validated_scope
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +66,16 @@ def register_mds_tool(
     version: str = "1.0.0",
     tags: Optional[List[str]] = None,
     method_name: Optional[str] = None,
+    cacheable: bool = False,
+    cache_ttl_seconds: int = 60,
+    cache_key_fields: Optional[List[str]] = None,
+    cache_collections: Optional[List[str]] = None,
+    execution: str = "inline",
+    process_timeout_seconds: Optional[float] = None,
+    max_concurrency: Optional[int] = None,
+    per_user_max_concurrency: Optional[int] = None,
+    max_queue_depth: int = 0,
+    queue_timeout_seconds: float = 30.0,
 ) -> Callable:
     """
     Unified tool registration decorator - SLIM VERSION.
@@ -76,6 +93,16 @@ def register_mds_tool(
         version: Tool version
         tags: List of tags for discovery
         method_name: Optional reference to method in MANAGED_METHODS (for parameter inheritance)
+        cacheable: Memoize results per user (read-only tools only)
+        cache_ttl_seconds: TTL for memoized results
+        cache_key_fields: Params that identify a result (default: all non-execution params)
+        cache_collections: Collections whose writes invalidate results (list/search tools)
+        execution: "inline" (event loop) or "process_pool" (CPU-heavy, module-level tools)
+        process_timeout_seconds: Default timeout for process-pool calls
+        max_concurrency: In-flight calls allowed across all users (None = unlimited)
+        per_user_max_concurrency: In-flight calls allowed per user (None = unlimited)
+        max_queue_depth: Calls allowed to wait for a slot before new ones are rejected
+        queue_timeout_seconds: Longest a queued call waits for a slot
         
     Returns:
         Decorated function with validation and registration
@@ -86,6 +113,33 @@ def register_mds_tool(
         # Extract parameter definitions from Pydantic model
         parameters = _extract_parameter_definitions(params_model)
         
+        # CPU-heavy tools run their body in the tool process pool
+        execution_mode = ToolExecutionMode(execution)
+        implementation = func
+        if execution_mode is ToolExecutionMode.PROCESS_POOL:
+            implementation = offload_tool(name, func, process_timeout_seconds)
+        
+        # Bulkheads: cap in-flight calls per tool and per user
+        concurrency_policy = None
+        if max_concurrency is not None or per_user_max_concurrency is not None:
+            concurrency_policy = ToolConcurrencyPolicy(
+                max_concurrency=max_concurrency,
+                per_user_max_concurrency=per_user_max_concurrency,
+                max_queue_depth=max_queue_depth,
+                queue_timeout_seconds=queue_timeout_seconds,
+            )
+            implementation = bulkhead_tool(name, implementation, concurrency_policy)
+        
+        # Read-only tools can opt into result memoization (cache hits skip the bulkhead)
+        cache_policy = None
+        if cacheable:
+            cache_policy = ToolCachePolicy(
+                ttl_seconds=cache_ttl_seconds,
+                key_fields=cache_key_fields or [],
+                collections=cache_collections or [],
+            )
+            implementation = memoize_tool(name, implementation, cache_policy)
+        
         # Create slim tool definition
         tool_def = ManagedToolDefinition(
             name=name,
@@ -95,8 +149,11 @@ def register_mds_tool(
             tags=tags or [],
             method_name=method_name,
             parameters=parameters,
-            implementation=func,
+            implementation=implementation,
             params_model=params_model,
+            cache_policy=cache_policy,
+            concurrency_policy=concurrency_policy,
+            execution=execution_mode,
         )
         
         # Store in global registry
@@ -116,7 +173,8 @@ def register_mds_tool(
             between service layer and tool execution.
             
             The wrapper:
-            1. Validates params using Pydantic model (guardrails!)
+            1. Validates params using Pydantic model (guardrails!), unless an
+               outer layer already validated the same kwargs (ValidatedParams)
             2. Tracks execution time
             3. Calls original function with validated params
             4. Wraps result in ToolResponse envelope (standard structure!)
@@ -125,6 +183,7 @@ def register_mds_tool(
             from datetime import datetime
             from uuid import uuid4
 
+            from src.pydantic_models.base.lazy_result import LazyResult
             from src.pydantic_models.base.types import RequestStatus
             from src.pydantic_models.operations.tool_execution_ops import (
                 ToolResponse,
@@ -138,12 +197,12 @@ def register_mds_tool(
             request_id = getattr(ctx, 'request_id', None) or uuid4()
             
             try:
-                # Validate using Pydantic model
-                validated = params_model(**kwargs)
+                # Validate using Pydantic model (skipped if an outer layer already did)
+                validated = take_validated(params_model, kwargs) or validate_params(params_model, kwargs)
                 
-                # Call original function with validated params
-                # The .model_dump() ensures we pass plain dict/primitives
-                raw_result = await func(ctx, **validated.model_dump())
+                # Call original function with validated params (plain dict/primitives)
+                with validated_scope(validated):
+                    raw_result = await implementation(ctx, **validated.values)
                 
                 # Calculate execution time
                 execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -162,7 +221,7 @@ def register_mds_tool(
                 
                 # Wrap raw Dict result in ToolResponsePayload
                 response_payload = ToolResponsePayload(
-                    result=raw_result if isinstance(raw_result, dict) else {"value": raw_result},
+                    result=LazyResult.wrap(raw_result),
                     events=serialized_events,
                     session_request_id=getattr(ctx, 'session_request_id', None)
                 )
@@ -214,6 +273,29 @@ def register_mds_tool(
                 
                 return error_response.model_dump()
                 
+            except BulkheadRejected as e:
+                # Over the tool's concurrency limits - tell the caller when to retry
+                execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
+                
+                return ToolResponse(
+                    request_id=request_id,
+                    status=RequestStatus.FAILED,
+                    payload=ToolResponsePayload(
+                        result={},
+                        events=[],
+                        session_request_id=getattr(ctx, 'session_request_id', None)
+                    ),
+                    error=str(e),
+                    metadata={
+                        "tool_name": name,
+                        "execution_time_ms": execution_time_ms,
+                        "error_type": type(e).__name__,
+                        "retry_after_seconds": e.retry_after_seconds,
+                        "user_id": getattr(ctx, 'user_id', None),
+                        "session_id": getattr(ctx, 'session_id', None)
+                    }
+                ).model_dump()
+                
             except Exception as e:
                 # Tool execution failed - return error wrapped in ToolResponse
                 logger.error(f"Tool '{name}' execution failed: {e}", exc_info=True)
@@ -869,6 +951,12 @@ def _instantiate_service(service_name: str, method_name: str):
         raise ValueError(f"Failed to instantiate '{service_name}': {e}")
 
 
+async def _call_service_method(service_name: str, method_name: str, request_dto: Any) -> Any:
+    """Instantiate a service and call one of its methods (process-pool worker entry point)."""
+    service_instance = _instantiate_service(service_name, method_name)
+    return await getattr(service_instance, method_name)(request_dto)
+
+
 def _build_request_dto(service_name: str, method_name: str, method_params: Dict[str, Any], ctx):
     """
     Build Request DTO from method parameters.
@@ -924,12 +1012,13 @@ def _build_request_dto(service_name: str, method_name: str, method_params: Dict[
         logger.info(f"│ payload: {json.dumps(method_params, default=str)}")
         logger.info(f"└────────────────────────────────────────")
         
-        request_dto = request_model_class(
-            user_id=ctx.user_id,
-            session_id=ctx.session_id,
-            casefile_id=ctx.casefile_id,
-            payload=method_params  # Pydantic will validate and build PayloadT
-        )
+        # Tool params -> Request DTO is the one unavoidable conversion; use a cached adapter
+        request_dto = get_type_adapter(request_model_class).validate_python({
+            "user_id": ctx.user_id,
+            "session_id": ctx.session_id,
+            "casefile_id": ctx.casefile_id,
+            "payload": method_params,  # Pydantic will validate and build PayloadT
+        })
         
         logger.info(f"✓ Successfully built {request_model_class.__name__}")
         
@@ -985,6 +1074,8 @@ def register_tools_from_yaml(yaml_path: Optional[str] = None) -> None:
             category = tool_config.get('category', 'general')
             version = tool_config.get('version', '1.0.0')
             tags = tool_config.get('tags', [])
+            caching = tool_config.get('caching') or {}
+            concurrency = tool_config.get('concurrency') or {}
 
             # Get method reference for routing
             method_ref = tool_config.get('method_reference', {})
@@ -1061,6 +1152,7 @@ def register_tools_from_yaml(yaml_path: Optional[str] = None) -> None:
 
             # Set default values for execution fields based on YAML
             implementation = tool_config.get('implementation', {})
+            execution_mode = ToolExecutionMode(implementation.get('execution', 'inline'))
             class_attrs['execution_type'] = Field(default=implementation.get('type', 'method_wrapper'), description="How the tool should execute")
             class_attrs['method_name'] = Field(default=method_name, description="Method to execute")
             class_attrs['parameter_mapping'] = Field(default=implementation.get('method_wrapper', {}).get('parameter_mapping', {}), description="How to map parameters to method calls")
@@ -1075,7 +1167,14 @@ def register_tools_from_yaml(yaml_path: Optional[str] = None) -> None:
             )
 
             # Create the tool function that actually executes based on execution metadata
-            async def tool_function(ctx, tool_name=tool_name, method_name=method_name, method_ref_copy=method_ref, **kwargs):
+            async def tool_function(
+                ctx,
+                tool_name=tool_name,
+                method_name=method_name,
+                method_ref_copy=method_ref,
+                _execution_mode=execution_mode,
+                **kwargs,
+            ):
                 """
                 Enhanced tool function that executes based on YAML configuration.
 
@@ -1231,41 +1330,43 @@ def register_tools_from_yaml(yaml_path: Optional[str] = None) -> None:
                             
                             import asyncio
                             from datetime import datetime
+
+                            from pydantic_models.base.lazy_result import LazyResult
                             start_time = datetime.now()
                             
-                            # Execute with timeout
-                            result = await asyncio.wait_for(
-                                method_callable(request_dto),
-                                timeout=timeout_seconds
-                            )
+                            # Execute with timeout (CPU-heavy tools run in the process pool).
+                            # The mode comes from the registered YAML config, never from params.
+                            if _execution_mode is ToolExecutionMode.PROCESS_POOL:
+                                result = await get_tool_process_pool().run_callable(
+                                    _call_service_method,
+                                    service_name,
+                                    method_part,
+                                    request_dto,
+                                    timeout=timeout_seconds
+                                )
+                            else:
+                                result = await asyncio.wait_for(
+                                    method_callable(request_dto),
+                                    timeout=timeout_seconds
+                                )
                             
                             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
                             logger.info(f"✓ Method executed successfully in {duration_ms}ms")
 
-                            # STEP 6: Extract result payload
-                            # Services return BaseResponse[PayloadT] objects
-                            if hasattr(result, 'model_dump'):
-                                result_dict = result.model_dump()
-                            elif isinstance(result, dict):
-                                result_dict = result
-                            else:
-                                result_dict = {"value": str(result)}
+                            # STEP 6: Keep the service response as-is; it is serialized
+                            # once, when the response envelope is dumped at the edge
+                            result_view = LazyResult.wrap(result)
                             
-                            # Log service response structure
-                            logger.info(f"┌─ SERVICE RESPONSE ──────────────────────")
-                            logger.info(f"│ Response Type: {type(result).__name__}")
-                            for key, value in result_dict.items():
-                                if key == 'payload' and isinstance(value, dict):
-                                    logger.info(f"│ {key}:")
-                                    for pk, pv in value.items():
-                                        val_str = json.dumps(pv) if not isinstance(pv, (str, int, float, bool, type(None))) else str(pv)
-                                        logger.info(f"│   {pk}: {val_str}")
-                                elif key == 'audit' and isinstance(value, dict):
-                                    logger.info(f"│ {key}: [audit data - {len(value)} fields]")
-                                else:
-                                    val_str = json.dumps(value) if not isinstance(value, (str, int, float, bool, type(None))) else str(value)
-                                    logger.info(f"│ {key}: {val_str}")
-                            logger.info(f"└────────────────────────────────────────")
+                            # Log service response structure (debug only - forces a dump)
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug(f"┌─ SERVICE RESPONSE ──────────────────────")
+                                logger.debug(f"│ Response Type: {type(result).__name__}")
+                                for key, value in result_view.to_json().items():
+                                    if key == 'audit' and isinstance(value, dict):
+                                        logger.debug(f"│ {key}: [audit data - {len(value)} fields]")
+                                    else:
+                                        logger.debug(f"│ {key}: {json.dumps(value, default=str)}")
+                                logger.debug(f"└────────────────────────────────────────")
                             
                             logger.info(f"═══ Tool Execution Complete: {tool_name} ═══")
                             
@@ -1274,7 +1375,7 @@ def register_tools_from_yaml(yaml_path: Optional[str] = None) -> None:
                                 "method_name": method_name_param,
                                 "execution_type": execution_type,
                                 "status": "success",
-                                "result": result_dict,
+                                "result": result_view,
                                 "duration_ms": duration_ms,
                                 "tool_params": tool_params,
                                 "message": f"Successfully executed {tool_name}"
@@ -1336,9 +1437,21 @@ def register_tools_from_yaml(yaml_path: Optional[str] = None) -> None:
                 category=category,
                 version=version,
                 tags=tags,
-                method_name=method_name
+                method_name=method_name,
+                cacheable=caching.get('cacheable', False),
+                cache_ttl_seconds=caching.get('ttl_seconds', 60),
+                cache_key_fields=caching.get('key_fields'),
+                cache_collections=caching.get('collections'),
+                max_concurrency=concurrency.get('max_concurrency'),
+                per_user_max_concurrency=concurrency.get('per_user_max_concurrency'),
+                max_queue_depth=concurrency.get('max_queue_depth', 0),
+                queue_timeout_seconds=concurrency.get('queue_timeout_seconds', 30.0),
             )(tool_function)
 
+            # The YAML wrapper offloads the service call itself (its closure cannot be
+            # sent to a worker), so the mode is recorded after registration
+            MANAGED_TOOLS[tool_name].execution = execution_mode
+
             registered_count += 1
             logger.info(f"Registered YAML tool: {tool_name} -> {method_name}")
 
@@ -20,6 +20,8 @@ from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from .validation import ValidatedParams, validate_params
+
 
 class ParameterType(str, Enum):
     """Parameter types that map to both Pydantic and OpenAPI."""
@@ -31,6 +33,12 @@ class ParameterType(str, Enum):
     ARRAY = "array"
 
 
+class ToolExecutionMode(str, Enum):
+    """Where a tool body runs."""
+    INLINE = "inline"  # on the event loop
+    PROCESS_POOL = "process_pool"  # in a worker of the tool process pool (CPU-heavy tools)
+
+
 class ToolParameterDef(BaseModel):
     """
     Definition of a single tool parameter.
@@ -64,6 +72,35 @@ class ToolParameterDef(BaseModel):
     )
 
 
+class ToolCachePolicy(BaseModel):
+    """
+    Opt-in result memoization for read-only tools.
+    Results are scoped per user and keyed on the validated params plus the
+    current version of every entity the call reads.
+    """
+    ttl_seconds: int = Field(60, ge=1, description="How long a cached result stays valid")
+    key_fields: List[str] = Field(
+        default_factory=list,
+        description="Params that identify a result (empty = all non-execution params)"
+    )
+    collections: List[str] = Field(
+        default_factory=list,
+        description="Collections whose writes invalidate results (for list/search tools)"
+    )
+
+
+class ToolConcurrencyPolicy(BaseModel):
+    """
+    Bulkhead limits for one tool.
+    Calls over a limit wait in a bounded queue; calls beyond the queue depth
+    are rejected immediately with a retry-after hint.
+    """
+    max_concurrency: Optional[int] = Field(None, ge=1, description="In-flight calls across all users (None = unlimited)")
+    per_user_max_concurrency: Optional[int] = Field(None, ge=1, description="In-flight calls per user (None = unlimited)")
+    max_queue_depth: int = Field(0, ge=0, description="Calls allowed to wait for a slot at each limit")
+    queue_timeout_seconds: float = Field(30.0, gt=0, description="Longest a queued call waits before it is rejected")
+
+
 class ManagedToolDefinition(BaseModel):
     """
     SLIM tool definition for MANAGED_TOOLS registry.
@@ -103,6 +140,24 @@ class ManagedToolDefinition(BaseModel):
         exclude=True
     )
     
+    # Result memoization (None = never cached)
+    cache_policy: Optional[ToolCachePolicy] = Field(
+        None,
+        description="Memoization policy for read-only tools"
+    )
+    
+    # Bulkhead limits (None = unlimited)
+    concurrency_policy: Optional[ToolConcurrencyPolicy] = Field(
+        None,
+        description="Concurrency limits enforced by the tool runtime"
+    )
+    
+    # Execution tier
+    execution: ToolExecutionMode = Field(
+        ToolExecutionMode.INLINE,
+        description="Where the tool body runs (inline or process_pool)"
+    )
+    
     # Registration tracking
     registered_at: datetime = Field(
         default_factory=datetime.now,
@@ -127,9 +182,19 @@ class ManagedToolDefinition(BaseModel):
     def validate_params(self, params: Dict[str, Any]) -> BaseModel:
         """Validate parameters using the Pydantic model."""
         if self.params_model:
-            return self.params_model(**params)
+            return self.prepare_params(params).model
         return params
     
+    def prepare_params(self, params: Any) -> ValidatedParams:
+        """Validate parameters once and return a token later layers can reuse.
+        
+        Raw dicts are validated; model instances and tokens for this tool's
+        params model pass through without re-validation.
+        """
+        if self.params_model is None:
+            raise ValueError(f"Tool '{self.name}' has no params model")
+        return validate_params(self.params_model, params)
+    
     def get_openapi_schema(self) -> Dict[str, Any]:
         """Generate OpenAPI parameter schema from Pydantic model."""
         if self.params_model:
@@ -158,6 +223,7 @@ class ManagedToolDefinition(BaseModel):
             "version": self.version,
             "tags": self.tags,
             "method_name": self.method_name,
+            "execution": self.execution.value,
             "parameters": [
                 {
                     "name": p.name,
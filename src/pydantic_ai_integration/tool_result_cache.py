@@ -0,0 +1,161 @@
+"""
+Result memoization for read-only tools.
+
+Tools registered with ``cacheable=True`` (or ``caching.cacheable: true`` in the
+YAML tool config) have their implementation wrapped by ``memoize_tool``. A result
+is keyed on:
+
+- the tool name and the calling user (ACL safety - users never share entries)
+- the session/casefile the call runs in
+- the normalized validated params (optionally restricted to ``key_fields``)
+- the current version of every entity the call reads, taken from
+  ``persistence.entity_versions`` which repositories bump on each write
+
+Any write to the same casefile/session therefore makes older entries
+unreachable; the TTL bounds staleness for writes made by other processes. The
+request log, counters and activity that ``ToolSessionService`` records around
+every call are not session state and leave entries valid, so repeated reads
+in one session are hits.
+"""
+
+import copy
+import json
+import logging
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from coreservice.service_caching import Cache, CacheStrategy
+from persistence.entity_versions import entity_versions
+
+from .tool_definition import ToolCachePolicy
+
+logger = logging.getLogger(__name__)
+
+# Params that carry entity ids, and the collections those ids live in
+ENTITY_PARAM_COLLECTIONS: Dict[str, Tuple[str, ...]] = {
+    "casefile_id": ("casefiles",),
+    "session_id": ("sessions", "chat_sessions"),
+}
+
+# Execution metadata added to YAML tool params; never part of a result key
+EXECUTION_FIELDS = frozenset({
+    "execution_type",
+    "method_name",
+    "parameter_mapping",
+    "implementation_config",
+    "dry_run",
+    "timeout_seconds",
+})
+
+# Result statuses that must not be memoized
+_UNCACHEABLE_STATUSES = frozenset({"error", "dry_run", "not_implemented"})
+
+
+class ToolResultCache:
+    """Per-user TTL cache for read-only tool results."""
+
+    def __init__(self, max_size: int = 2000):
+        self._cache: Cache[Any] = Cache(max_size=max_size, strategy=CacheStrategy.TTL)
+        self.hits = 0
+        self.misses = 0
+
+    def build_key(
+        self,
+        tool_name: str,
+        policy: ToolCachePolicy,
+        ctx: Any,
+        params: Dict[str, Any],
+    ) -> str:
+        """Build the cache key for one tool invocation."""
+        key_params = {
+            name: value
+            for name, value in params.items()
+            if name not in EXECUTION_FIELDS and (not policy.key_fields or name in policy.key_fields)
+        }
+
+        documents: List[Tuple[str, str]] = []
+        for param_name, collections in ENTITY_PARAM_COLLECTIONS.items():
+            entity_ids = {params.get(param_name), getattr(ctx, param_name, None)}
+            for entity_id in sorted(str(value) for value in entity_ids if value):
+                documents.extend((collection, entity_id) for collection in collections)
+
+        return json.dumps(
+            [
+                tool_name,
+                getattr(ctx, "user_id", None),
+                getattr(ctx, "session_id", None),
+                getattr(ctx, "casefile_id", None),
+                key_params,
+                entity_versions.snapshot(documents, policy.collections),
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return a copy of the cached result, or None on a miss."""
+        value = await self._cache.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    async def put(self, key: str, value: Any, ttl_seconds: float) -> None:
+        """Store a copy of ``value`` for ``ttl_seconds``."""
+        await self._cache.put(key, copy.deepcopy(value), ttl=ttl_seconds)
+
+    async def clear(self) -> None:
+        """Drop all cached results and reset counters."""
+        await self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+# Global cache shared by all memoized tools
+tool_result_cache = ToolResultCache()
+
+
+def _is_cacheable_result(result: Any) -> bool:
+    if isinstance(result, dict) and result.get("status") in _UNCACHEABLE_STATUSES:
+        return False
+    return result is not None
+
+
+def memoize_tool(
+    tool_name: str,
+    func: Callable[..., Awaitable[Any]],
+    policy: ToolCachePolicy,
+) -> Callable[..., Awaitable[Any]]:
+    """Wrap a tool implementation so repeated reads are served from the cache.
+
+    Args:
+        tool_name: Registered tool name
+        func: Tool implementation ``(ctx, **params)``
+        policy: Memoization policy
+
+    Returns:
+        Implementation with the same signature
+    """
+
+    @wraps(func)
+    async def memoized(ctx, **params):
+        if params.get("dry_run"):
+            return await func(ctx, **params)
+
+        key = tool_result_cache.build_key(tool_name, policy, ctx, params)
+        cached = await tool_result_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Tool result cache hit for '{tool_name}'")
+            return cached
+
+        result = await func(ctx, **params)
+        if _is_cacheable_result(result):
+            await tool_result_cache.put(key, result, policy.ttl_seconds)
+        return result
+
+    return memoized
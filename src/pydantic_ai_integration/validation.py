@@ -0,0 +1,88 @@
+"""
+Single-pass parameter validation for the tool pipeline.
+
+A tool call passes through several layers (ToolSessionService, ChainExecutor,
+the ``validated_wrapper`` registered with the agent, the YAML method wrapper).
+The first layer that validates the parameters produces a ``ValidatedParams``
+token and runs the rest of the call inside ``validated_scope(token)``. Inner
+layers call ``take_validated`` and reuse the token instead of validating the
+same kwargs again.
+
+Conversions that cannot be skipped (e.g. tool params -> service request DTO)
+use ``get_type_adapter``, which caches one ``TypeAdapter`` per type.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Mapping, Optional, Type
+
+from pydantic import BaseModel, TypeAdapter
+
+
+@dataclass(frozen=True)
+class ValidatedParams:
+    """Parameters already validated against ``params_model``."""
+
+    params_model: Type[BaseModel]
+    model: BaseModel
+    values: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "ValidatedParams":
+        """Wrap an already validated model instance."""
+        return cls(params_model=type(model), model=model, values=model.model_dump())
+
+    def as_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for the tool implementation."""
+        return dict(self.values)
+
+
+_current: ContextVar[Optional[ValidatedParams]] = ContextVar("validated_tool_params", default=None)
+
+
+def validate_params(params_model: Type[BaseModel], params: Any) -> ValidatedParams:
+    """Validate ``params`` once, passing through anything already validated.
+
+    Args:
+        params_model: Pydantic model for the tool parameters
+        params: Raw dict, model instance or ValidatedParams token
+
+    Returns:
+        ValidatedParams token
+
+    Raises:
+        ValidationError: If raw params do not validate
+    """
+    if isinstance(params, ValidatedParams) and params.params_model is params_model:
+        return params
+    if isinstance(params, params_model):
+        return ValidatedParams.from_model(params)
+    if isinstance(params, ValidatedParams):
+        params = params.values
+    return ValidatedParams.from_model(params_model.model_validate(params))
+
+
+@contextmanager
+def validated_scope(token: ValidatedParams) -> Iterator[ValidatedParams]:
+    """Mark ``token`` as the validated params for calls made inside the block."""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def take_validated(params_model: Type[BaseModel], kwargs: Mapping[str, Any]) -> Optional[ValidatedParams]:
+    """Return the in-scope token if it already covers ``kwargs`` for ``params_model``."""
+    token = _current.get()
+    if token is None or token.params_model is not params_model:
+        return None
+    return token if kwargs == token.values else None
+
+
+@lru_cache(maxsize=512)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """Cached ``TypeAdapter`` for ``tp`` (building one compiles a schema)."""
+    return TypeAdapter(tp)
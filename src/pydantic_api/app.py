@@ -16,6 +16,13 @@ from authservice.routes import router as auth_router
 from coreservice.config import get_environment
 from persistence.firestore_pool import FirestoreConnectionPool
 from persistence.redis_cache import RedisCacheService
+from pydantic_ai_integration.process_pool import get_tool_process_pool
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS
+from pydantic_ai_integration.tool_definition import ToolExecutionMode
+from tool_sessionservice.active_sessions import configure_active_session_index
+from tool_sessionservice.activity import flush_session_activity
+from tool_sessionservice.expiry import SessionExpirySweeper
+from tool_sessionservice.repository import ToolSessionRepository
 
 from .middleware import (
     ErrorHandlingMiddleware,
@@ -74,14 +81,41 @@ def create_app() -> FastAPI:
         else:
             app.state.redis_cache = None
 
+        # Share the session resume index between workers through Redis
+        app.state.active_sessions = configure_active_session_index(app.state.redis_cache)
+
+        # Close idle tool sessions in the background
+        if app.state.firestore_pool:
+            sweeper = SessionExpirySweeper(
+                ToolSessionRepository(firestore_pool=app.state.firestore_pool, redis_cache=app.state.redis_cache),
+                active_sessions=app.state.active_sessions,
+                idle_ttl_seconds=float(os.getenv("SESSION_IDLE_TTL_SECONDS", "3600")),
+                interval_seconds=float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "300")),
+                max_closes_per_second=float(os.getenv("SESSION_SWEEP_MAX_CLOSES_PER_SECOND", "50")),
+            )
+            sweeper.start()
+            app.state.session_sweeper = sweeper
+        else:
+            app.state.session_sweeper = None
+
+        # Spawn process-pool workers up front so the first heavy tool call starts warm
+        if any(tool.execution is ToolExecutionMode.PROCESS_POOL for tool in MANAGED_TOOLS.values()):
+            get_tool_process_pool().start(warm=True)
+
     # Cleanup connection pool on shutdown
     @app.on_event("shutdown")
     async def shutdown_event() -> None:
         """Cleanup resources on application shutdown."""
+        if getattr(app.state, "session_sweeper", None):
+            await app.state.session_sweeper.stop()
+        # Write batched session activity while Firestore is still available
+        await flush_session_activity()
         if hasattr(app.state, "firestore_pool") and app.state.firestore_pool:
             await app.state.firestore_pool.close_all()
         if hasattr(app.state, "redis_cache") and app.state.redis_cache:
             await app.state.redis_cache.close()
+        if get_tool_process_pool().started:
+            get_tool_process_pool().shutdown(wait=False)
 
     # Add middleware stack (order matters: first added = outermost)
     app.add_middleware(PrometheusMiddleware)
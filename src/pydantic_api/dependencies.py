@@ -10,12 +10,13 @@ from fastapi import Depends
 from authservice import get_current_user
 from coreservice.request_hub import RequestHub
 from tool_sessionservice import ToolSessionService
+from tool_sessionservice.active_sessions import get_active_session_index
 
 
 @lru_cache()
 def get_tool_session_service() -> ToolSessionService:
-    """Get an instance of the ToolSessionService."""
-    return ToolSessionService()
+    """Get an instance of the ToolSessionService (using the index configured at startup)."""
+    return ToolSessionService(active_sessions=get_active_session_index())
 
 
 @lru_cache()
@@ -2,12 +2,16 @@
 Router for chat API endpoints.
 """
 
+import asyncio
+import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from authservice import get_current_user
-from communicationservice.service import CommunicationService
+from communicationservice.service import ChatTurn, CommunicationService
 from coreservice.request_hub import RequestHub
 from pydantic_models.base.envelopes import RequestEnvelope
 from pydantic_models.operations.chat_session_ops import (
@@ -20,10 +24,14 @@ from pydantic_models.operations.chat_session_ops import (
     ListChatSessionsRequest,
     ListChatSessionsResponse,
 )
+from pydantic_models.operations.tool_execution_ops import ChatRequest, ChatRequestPayload
 
 from ..dependencies import get_request_hub
 
-router = APIRouter(prefix="/api/chat", tags=["chat"])
+logger = logging.getLogger(__name__)
+
+# Persist tasks of streams closed early (referenced until they finish)
+_abandoned_turns: set[asyncio.Task] = set()
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
@@ -67,19 +75,8 @@ async def create_session(
     return response
 
 
-@router.post("/sessions/{session_id}/messages")
-async def send_message(
-    session_id: str,
-    request: RequestEnvelope,
-    service: CommunicationService = Depends(get_communication_service),
-    current_user: dict[str, Any] = Depends(get_current_user),
-):
-    """Send a message in a chat session."""
-
-    # Extract user_id from JWT
-    user_id = current_user["user_id"]
-
-    # Verify session ownership before processing message
+async def _verify_session_owner(service: CommunicationService, session_id: str, user_id: str) -> None:
+    """Raise 404/403 unless the session exists and belongs to the user."""
     get_request = GetChatSessionRequest(
         user_id=user_id,
         operation="get_chat_session",
@@ -95,35 +92,41 @@ async def send_message(
     if get_response.payload.user_id != user_id:
         raise HTTPException(status_code=403, detail="You do not have access to this session")
 
-    # Extract request data and create ChatRequest
-    message_data = request.request
-    message_data["session_id"] = session_id
 
-    from src.pydantic_models.canonical.chat_session import MessageType
-    from src.pydantic_models.operations.tool_execution_ops import ChatMessagePayload, ChatRequest
+def _chat_request(session_id: str, user_id: str, message_data: dict[str, Any]) -> ChatRequest:
+    """Build a ChatRequest from the request body with the JWT-validated user_id."""
+    return ChatRequest(
+        session_id=session_id,
+        user_id=user_id,
+        operation="chat",
+        payload=ChatRequestPayload(
+            message=message_data.get("content", ""),
+            session_id=session_id,
+            casefile_id=message_data.get("casefile_id"),
+            session_request_id=message_data.get("session_request_id"),
+            tool_calls=message_data.get("tool_calls", []),
+        ),
+    )
+
+
+@router.post("/sessions/{session_id}/messages")
+async def send_message(
+    session_id: str,
+    request: RequestEnvelope,
+    service: CommunicationService = Depends(get_communication_service),
+    current_user: dict[str, Any] = Depends(get_current_user),
+):
+    """Send a message in a chat session."""
+
+    # Extract user_id from JWT
+    user_id = current_user["user_id"]
+
+    # Verify session ownership before processing message
+    await _verify_session_owner(service, session_id, user_id)
 
     try:
-        # Construct the chat request
         # The user message comes in the request payload
-        content = message_data.get("content", "")
-        message_type = message_data.get("message_type", MessageType.USER)
-        tool_calls = message_data.get("tool_calls", [])
-        session_request_id = message_data.get("session_request_id")
-        casefile_id = message_data.get("casefile_id")
-
-        # Create the message payload
-        chat_payload = ChatMessagePayload(
-            content=content,
-            message_type=message_type,
-            tool_calls=tool_calls,
-            session_request_id=session_request_id,
-            casefile_id=casefile_id,
-        )
-
-        # Create the request with JWT-validated user_id
-        chat_request = ChatRequest(
-            session_id=session_id, user_id=user_id, operation="chat_message", payload=chat_payload
-        )
+        chat_request = _chat_request(session_id, user_id, request.request)
 
         # Process the request
         response = await service.process_chat_request(chat_request)
@@ -140,14 +143,76 @@ async def send_message(
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
 
+@router.post("/sessions/{session_id}/messages/stream")
+async def stream_message(
+    session_id: str,
+    request: RequestEnvelope,
+    accept: str | None = Header(None),
+    service: CommunicationService = Depends(get_communication_service),
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> StreamingResponse:
+    """Send a message and stream the turn as it runs.
+
+    Emits message_accepted, tool_started, tool_completed and assistant_token
+    events, then completed with the full response. Server-sent events by
+    default; NDJSON when the client accepts application/x-ndjson. The turn is
+    persisted after the stream has been sent.
+    """
+
+    # Extract user_id from JWT
+    user_id = current_user["user_id"]
+
+    await _verify_session_owner(service, session_id, user_id)
+
+    try:
+        turn = await service.begin_chat_turn(_chat_request(session_id, user_id, request.request))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    ndjson = "application/x-ndjson" in (accept or "")
+
+    async def body():
+        finished = False
+        try:
+            async for event in service.stream_chat_turn(turn):
+                if event.event == "completed":
+                    event.data["trace_id"] = request.trace_id
+                yield event.to_ndjson() if ndjson else event.to_sse()
+            finished = True
+        finally:
+            if not finished:
+                # Client went away mid-turn: the background task will not run,
+                # keep what was recorded so far
+                task = asyncio.create_task(_persist_quietly(service, turn))
+                _abandoned_turns.add(task)
+                task.add_done_callback(_abandoned_turns.discard)
+
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson" if ndjson else "text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(_persist_quietly, service, turn),
+    )
+
+
+async def _persist_quietly(service: CommunicationService, turn: ChatTurn) -> None:
+    """Persist a streamed turn; the response is already sent, so only log failures."""
+    try:
+        await service.persist_chat_turn(turn)
+    except Exception:
+        logger.exception("Failed to persist chat turn for session %s", turn.session.session_id)
+
+
 @router.get("/sessions/{session_id}", response_model=GetChatSessionResponse)
 async def get_session(
     session_id: str,
     include_messages: bool = True,
+    message_limit: int = 50,
+    before_seq: int | None = None,
     hub: RequestHub = Depends(get_request_hub),
     current_user: dict[str, Any] = Depends(get_current_user),
 ) -> GetChatSessionResponse:
-    """Get a chat session."""
+    """Get a chat session with its most recent messages (page older ones with before_seq)."""
 
     # Extract user_id from JWT
     user_id = current_user["user_id"]
@@ -156,7 +221,12 @@ async def get_session(
     get_request = GetChatSessionRequest(
         user_id=user_id,
         operation="get_chat_session",
-        payload={"session_id": session_id, "include_messages": include_messages},
+        payload={
+            "session_id": session_id,
+            "include_messages": include_messages,
+            "message_limit": message_limit,
+            "before_seq": before_seq,
+        },
         hooks=["metrics", "audit"],
         context_requirements=["session"],
     )
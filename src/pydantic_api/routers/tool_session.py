@@ -9,6 +9,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from authservice import get_current_user
 from casefileservice import CasefileService
 from coreservice.request_hub import RequestHub
+from pydantic_ai_integration.bulkhead import BulkheadRejected
 from pydantic_ai_integration.tool_decorator import (
     get_registered_tools,
     get_tool_definition,
@@ -108,6 +109,12 @@ async def execute_tool(
         return await service.process_tool_request(request)
     except HTTPException:
         raise
+    except BulkheadRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Tool execution failed: {str(e)}")
 
@@ -298,3 +305,31 @@ async def get_tool_parameter_schema(tool_name: str) -> dict[str, Any]:
         raise HTTPException(status_code=404, detail=f"Tool '{tool_name}' not found")
 
     return {"tool_name": tool_name, "schema": tool.get_openapi_schema()}
+
+
+@router.get("/{session_id}/requests", response_model=dict[str, Any])
+async def list_session_requests(
+    session_id: str,
+    limit: int = 50,
+    before: str | None = None,
+    service: ToolSessionService = Depends(get_tool_session_service),
+    current_user: dict[str, Any] = Depends(get_current_user),
+) -> dict[str, Any]:
+    """
+    Page a session's request history, newest first.
+
+    Query params:
+    - limit: Page size (at most 100)
+    - before: ``next_cursor`` from the previous page
+
+    Returns:
+        Dictionary with requests, next_cursor and total_requests
+    """
+    try:
+        return await service.list_session_requests(
+            user_id=current_user["user_id"], session_id=session_id, limit=limit, before=before
+        )
+    except ValueError as e:
+        if str(e).startswith("Access denied"):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You do not have access to this session")
+        raise HTTPException(status_code=404, detail=str(e))
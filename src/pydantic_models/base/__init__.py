@@ -3,6 +3,7 @@ Base infrastructure models for the pydantic_models layer.
 
 This package contains the fundamental building blocks used across all domain models:
 - envelopes.py: Request/response wrapper models (BaseRequest, BaseResponse, RequestEnvelope)
+- lazy_result.py: LazyResult, a tool result envelope that serializes once on demand
 - types.py: Common enums and types (RequestStatus, etc.)
 - custom_types.py: Reusable Annotated types with validation (CasefileId, PositiveInt, etc.)
 - validators.py: Reusable validation functions (validate_timestamp_order, etc.)
@@ -11,6 +12,7 @@ These models provide the infrastructure for type-safe operations throughout the
 """
 
 from .envelopes import BaseRequest, BaseResponse, RequestEnvelope
+from .lazy_result import LazyResult
 from .types import RequestStatus
 from .custom_types import (
     CasefileId,
@@ -49,6 +51,7 @@ __all__ = [
     "BaseRequest",
     "BaseResponse",
     "RequestEnvelope",
+    "LazyResult",
     "RequestStatus",
     # Custom types
     "CasefileId",
@@ -0,0 +1,117 @@
+"""
+Lazy result envelope for tool responses.
+
+A tool result used to be dumped at every layer it passed through: the YAML
+method wrapper dumped the service ``BaseResponse``, ``validated_wrapper``
+dumped its ``ToolResponse`` again, and ``ToolSessionService`` dumped its own
+``ToolResponse`` with ``mode="json"`` for persistence.
+
+``LazyResult`` holds the original object instead. It is read like a dict
+(``Mapping``), and is serialized only when something at the edge (HTTP
+response, Firestore write) dumps the model it is part of. Both serialized
+forms are cached, so the same result written to several places is only
+converted once.
+
+A ``LazyResult`` is read-only: shallow copies share the source and the
+cached forms, deep copies get their own source.
+"""
+
+import copy
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from pydantic import BaseModel
+from pydantic_core import SchemaSerializer, core_schema, to_jsonable_python
+
+
+class LazyResult(Mapping[str, Any]):
+    """Read-only view over a tool result that serializes on demand."""
+
+    __slots__ = ("source", "_python", "_json")
+
+    def __init__(self, source: Any):
+        self.source = source
+        self._python: Optional[Dict[str, Any]] = None
+        self._json: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def wrap(cls, value: Any) -> "LazyResult":
+        """Return ``value`` unchanged if it is already a LazyResult, else wrap it."""
+        if isinstance(value, cls):
+            return value
+        if value is None:
+            return cls({})
+        return cls(value)
+
+    def to_python(self) -> Dict[str, Any]:
+        """Python-mode dict of the result (computed once)."""
+        if self._python is None:
+            source = self.source
+            if isinstance(source, BaseModel):
+                self._python = source.model_dump()
+            elif isinstance(source, dict):
+                self._python = source
+            elif isinstance(source, Mapping):
+                self._python = dict(source)
+            else:
+                self._python = {"value": source}
+        return self._python
+
+    def to_json(self) -> Dict[str, Any]:
+        """JSON-safe dict of the result (computed once)."""
+        if self._json is None:
+            if isinstance(self.source, BaseModel):
+                self._json = self.source.model_dump(mode="json")
+            else:
+                self._json = to_jsonable_python(self.to_python())
+        return self._json
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_python()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_python())
+
+    def __len__(self) -> int:
+        return len(self.to_python())
+
+    def __repr__(self) -> str:
+        return f"LazyResult({type(self.source).__name__})"
+
+    def __copy__(self) -> "LazyResult":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LazyResult":
+        # The source may be mutated by whoever holds it (ToolResultCache hands
+        # out deep copies for exactly that reason), so only the serialized
+        # forms are shared; a dict source is its own python form
+        clone = LazyResult(copy.deepcopy(self.source, memo))
+        clone._json = self._json
+        if self._python is not self.source:
+            clone._python = self._python
+        return clone
+
+    @staticmethod
+    def _serialize(value: Any, info: core_schema.SerializationInfo) -> Any:
+        if not isinstance(value, LazyResult):
+            return value
+        return value.to_json() if info.mode_is_json() else value.to_python()
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: Any) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls.wrap,
+            serialization=core_schema.plain_serializer_function_ser_schema(cls._serialize, info_arg=True),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema: core_schema.CoreSchema, handler: Any) -> Dict[str, Any]:
+        return {"type": "object"}
+
+
+# Lets LazyResult values nested in ``Dict[str, Any]`` fields (or passed to
+# ``to_jsonable_python``) serialize through the cached forms as well.
+LazyResult.__pydantic_serializer__ = SchemaSerializer(
+    core_schema.any_schema(
+        serialization=core_schema.plain_serializer_function_ser_schema(LazyResult._serialize, info_arg=True)
+    )
+)
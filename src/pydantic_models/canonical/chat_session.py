@@ -61,21 +61,24 @@ class ChatSession(BaseModel):
         description="Last update timestamp (ISO 8601)",
         json_schema_extra={"example": "2025-10-13T12:30:00"}
     )
-    messages: List[Dict[str, Any]] = Field(
-        default_factory=list,
-        description="Messages in chronological order"
+    message_count: NonNegativeInt = Field(
+        default=0,
+        description="Number of messages; also the next message sequence number"
     )
-    message_index: Dict[str, int] = Field(
-        default_factory=dict,
-        description="Index to map message IDs to positions"
+    event_count: NonNegativeInt = Field(
+        default=0,
+        description="Number of events; also the next event sequence number"
     )
-    request_index: Dict[str, List[str]] = Field(
-        default_factory=dict,
-        description="Index to map session request IDs to message IDs"
+    messages: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description=(
+            "Legacy inline message history (chronological). New messages are appended to the "
+            "session's messages subcollection; inline history is moved there on the next write"
+        )
     )
     events: List[Dict[str, Any]] = Field(
         default_factory=list,
-        description="Chronological list of all events in the session"
+        description="Legacy inline event history (chronological), moved like messages"
     )
     active: bool = Field(
         default=True,
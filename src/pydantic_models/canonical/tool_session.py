@@ -19,9 +19,13 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field, model_validator
 
+from ..base.lazy_result import LazyResult
 from ..base.custom_types import ToolSessionId, CasefileId, IsoTimestamp, PositiveInt, NonNegativeInt, UserId, EventId
 from ..base.validators import validate_timestamp_order as validate_ts_order
 
+# Request ids kept on the session document; older history is paged from the request index
+RECENT_REQUEST_IDS_LIMIT = 20
+
 
 class AuthToken(BaseModel):
     """JWT authentication token structure."""
@@ -147,6 +151,9 @@ class ToolEvent(BaseModel):
         for k, v in data.items():
             if isinstance(v, dict):
                 result[k] = self._ensure_serializable_dict(v)
+            elif isinstance(v, LazyResult):
+                # Reuse the cached JSON form shared with the response
+                result[k] = v.to_json()
             elif isinstance(v, list):
                 result[k] = [self._ensure_serializable_dict(item) if isinstance(item, dict) else item for item in v]
             elif hasattr(v, 'model_dump'):
@@ -198,7 +205,18 @@ class ToolSession(BaseModel):
     )
     request_ids: List[str] = Field(
         default_factory=list,
-        description="List of request IDs (UUIDs) in this session"
+        description=(
+            f"Most recent request IDs (UUIDs, oldest first, at most {RECENT_REQUEST_IDS_LIMIT}); "
+            "the full history is the session's request index"
+        )
+    )
+    request_count: NonNegativeInt = Field(
+        default=0,
+        description="Number of requests, incremented atomically when a request is stored"
+    )
+    event_count: NonNegativeInt = Field(
+        default=0,
+        description="Number of events, incremented atomically when an event is stored"
     )
     active: bool = Field(
         default=True,
@@ -210,3 +228,8 @@ class ToolSession(BaseModel):
         """Ensure created_at <= updated_at."""
         validate_ts_order(self.created_at, self.updated_at, 'created_at', 'updated_at')
         return self
+
+    def record_request(self, request_id: str) -> None:
+        """Count a new request and keep it in the bounded recent-ids window."""
+        self.request_ids = [*self.request_ids, request_id][-RECENT_REQUEST_IDS_LIMIT:]
+        self.request_count += 1
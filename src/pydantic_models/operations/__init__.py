@@ -138,6 +138,7 @@ __all__ = [
     "ToolResponse",
     "ChatRequest",
     "ChatResponse",
+    "ChatStreamEvent",
     # Discriminated unions
     "OperationRequestUnion",
     "OperationResponseUnion",
@@ -90,9 +90,21 @@ class GetChatSessionPayload(BaseModel):
     )
     include_messages: bool = Field(
         default=False,
-        description="Include full message history",
+        description="Include the most recent messages",
         json_schema_extra={"examples": [True, False]}
     )
+    message_limit: PositiveInt = Field(
+        default=50,
+        ge=1,
+        le=100,
+        description="Number of messages to include",
+        json_schema_extra={"examples": [20, 50]}
+    )
+    before_seq: Optional[NonNegativeInt] = Field(
+        None,
+        description="Cursor from a previous page: only include messages older than this sequence number",
+        json_schema_extra={"examples": [None, 120]}
+    )
 
 
 class GetChatSessionRequest(BaseRequest[GetChatSessionPayload]):
@@ -144,7 +156,11 @@ class ChatSessionDataPayload(BaseModel):
     )
     messages: List[dict] = Field(
         default_factory=list,
-        description="Message history if requested"
+        description="Most recent messages (chronological) if requested"
+    )
+    next_cursor: Optional[NonNegativeInt] = Field(
+        None,
+        description="Pass as before_seq to page older messages (None when there are none)"
     )
     metadata: dict = Field(
         default_factory=dict,
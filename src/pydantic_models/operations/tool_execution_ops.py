@@ -4,10 +4,12 @@ Tool and chat message execution operation models.
 This module contains request/response models for tool and chat message execution:
 - ToolRequest, ToolResponse: Tool execution operations
 - ChatRequest, ChatResponse: Chat message operations
+- ChatStreamEvent: Incremental events of a streamed chat turn
 
 For canonical session entities, see pydantic_models.canonical.tool_session and canonical.chat_session
 """
 
+import json
 from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, computed_field, field_validator
@@ -19,6 +21,7 @@ from ..base.custom_types import (
     EventId,
 )
 from ..base.envelopes import BaseRequest, BaseResponse
+from ..base.lazy_result import LazyResult
 from ..canonical.chat_session import MessageType
 
 # ============================================================================
@@ -76,9 +79,9 @@ class ToolRequestPayload(BaseModel):
 
 class ToolResponsePayload(BaseModel):
     """Payload for a tool execution response."""
-    result: Dict[str, Any] = Field(
+    result: LazyResult = Field(
         ...,
-        description="Result of the tool execution",
+        description="Result of the tool execution (serialized once, when the response is dumped)",
         json_schema_extra={"examples": [{"casefile_id": "cf_251013_abc123", "status": "created"}, {"messages": [], "count": 0}]}
     )
     events: List[Dict[str, Any]] = Field(
@@ -164,6 +167,11 @@ class ChatRequestPayload(BaseModel):
         description="Client-provided session request ID for tracking",
         json_schema_extra={"examples": ["req_001"]}
     )
+    tool_calls: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Tool calls requested with this message",
+        json_schema_extra={"examples": [[{"name": "create_casefile_tool", "arguments": {"title": "New Case"}}]]}
+    )
 
 
 class ChatResultPayload(BaseModel):
@@ -191,3 +199,30 @@ class ChatRequest(BaseRequest[ChatRequestPayload]):
 class ChatResponse(BaseResponse[ChatResultPayload]):
     """Response to a chat message."""
     pass
+
+
+class ChatStreamEvent(BaseModel):
+    """One event of a streamed chat turn (SSE event or NDJSON line)."""
+    event: Literal[
+        "message_accepted",
+        "tool_started",
+        "tool_completed",
+        "assistant_token",
+        "completed",
+    ] = Field(
+        ...,
+        description="Event type; 'completed' carries the final ChatResponse",
+    )
+    data: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Event data",
+        json_schema_extra={"examples": [{"token": "Found "}, {"name": "gmail_list_messages", "index": 0}]}
+    )
+
+    def to_sse(self) -> str:
+        """Encode as a server-sent event."""
+        return f"event: {self.event}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+    def to_ndjson(self) -> str:
+        """Encode as one line of newline-delimited JSON."""
+        return json.dumps({"event": self.event, "data": self.data}, default=str) + "\n"
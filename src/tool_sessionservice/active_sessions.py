@@ -0,0 +1,104 @@
+"""
+Index of active tool sessions.
+
+Tool calls made without a session token resume the most recent active session
+of the same user and casefile. Instead of listing and filtering the user's
+sessions on every such call, the service keeps an index
+
+    (user_id, casefile_id) -> session_id
+
+that is written when a session is created and cleared when it is closed, so
+resuming is a single lookup followed by one session read.
+
+Without a RedisCacheService entries live in process memory. With one, Redis
+is the only store, so every worker (and the expiry sweeper) sees the same
+entries; the app configures the global index from its Redis cache at startup
+(``configure_active_session_index``).
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+from persistence.redis_cache import RedisCacheService
+
+logger = logging.getLogger(__name__)
+
+
+class ActiveSessionIndex:
+    """Most recent active session id per (user, casefile)."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = 86400,
+        redis_cache: Optional[RedisCacheService] = None,
+        key_prefix: str = "active_session",
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.redis_cache = redis_cache
+        self.key_prefix = key_prefix
+        self._entries: Dict[Tuple[str, str], str] = {}
+
+    @staticmethod
+    def make_key(user_id: str, casefile_id: Optional[str]) -> Tuple[str, str]:
+        """Index key; user-only sessions (no casefile) share the empty casefile id."""
+        return user_id, casefile_id or ""
+
+    def _redis_key(self, key: Tuple[str, str]) -> str:
+        return f"{self.key_prefix}:{key[0]}:{key[1]}"
+
+    async def get(self, user_id: str, casefile_id: Optional[str]) -> Optional[str]:
+        """Return the indexed session id, if any."""
+        key = self.make_key(user_id, casefile_id)
+        if self.redis_cache:
+            return await self.redis_cache.get(self._redis_key(key)) or None
+        return self._entries.get(key)
+
+    async def put(self, user_id: str, casefile_id: Optional[str], session_id: str) -> None:
+        """Record ``session_id`` as the active session for the user/casefile."""
+        key = self.make_key(user_id, casefile_id)
+        if self.redis_cache:
+            await self.redis_cache.set(self._redis_key(key), session_id, self.ttl_seconds)
+        else:
+            self._entries[key] = session_id
+
+    async def discard(self, user_id: str, casefile_id: Optional[str], session_id: str) -> None:
+        """Remove the entry if it still points at ``session_id``.
+
+        A newer session created for the same user/casefile is left in place.
+        """
+        key = self.make_key(user_id, casefile_id)
+        if self.redis_cache:
+            redis_key = self._redis_key(key)
+            if await self.redis_cache.get(redis_key) == session_id:
+                await self.redis_cache.delete(redis_key)
+        elif self._entries.get(key) == session_id:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (tests)."""
+        self._entries.clear()
+
+
+# Global index shared by ToolSessionService instances in this process
+_active_session_index: Optional[ActiveSessionIndex] = None
+
+
+def get_active_session_index() -> ActiveSessionIndex:
+    """Get the global active session index (in memory unless configured)."""
+    global _active_session_index
+    if _active_session_index is None:
+        _active_session_index = ActiveSessionIndex()
+    return _active_session_index
+
+
+def configure_active_session_index(
+    redis_cache: Optional[RedisCacheService],
+    ttl_seconds: int = 86400,
+) -> ActiveSessionIndex:
+    """Replace the global index with one backed by ``redis_cache`` (None: in memory).
+
+    Called at application startup, before services are created.
+    """
+    global _active_session_index
+    _active_session_index = ActiveSessionIndex(ttl_seconds=ttl_seconds, redis_cache=redis_cache)
+    return _active_session_index
@@ -0,0 +1,128 @@
+"""
+Debounced session activity tracking.
+
+Every tool call and RequestHub request marks its session as active. Writing
+``updated_at`` to the session document each time costs one Firestore write per
+call, so activity is recorded in memory instead and flushed in batches:
+
+- ``touch`` only stores the last-seen time (no I/O)
+- a background task flushes pending times every ``interval_seconds``, so a
+  session gets at most one activity write per interval however chatty it is
+- ``flush_session_activity()`` writes whatever is still pending (app shutdown)
+
+Failed flushes are re-queued and retried on the next interval. Sessions that
+no longer exist are dropped by the writer rather than failing the batch.
+"""
+
+import asyncio
+import logging
+import weakref
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Live trackers, flushed together on shutdown
+_trackers: "weakref.WeakSet[SessionActivityTracker]" = weakref.WeakSet()
+
+
+class SessionActivityTracker:
+    """Coalesces session last-seen times and writes them in periodic batches."""
+
+    def __init__(
+        self,
+        write: Callable[[Dict[str, str]], Awaitable[None]],
+        interval_seconds: float = 5.0,
+    ):
+        """
+        Args:
+            write: Coroutine persisting ``{session_id: updated_at}`` in one batch
+            interval_seconds: Minimum time between flushes
+        """
+        self.write = write
+        self.interval_seconds = interval_seconds
+        self.writes = 0
+        self._pending: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        _trackers.add(self)
+
+    @property
+    def pending(self) -> Dict[str, str]:
+        """Last-seen times not yet written."""
+        return dict(self._pending)
+
+    def touch(self, session_id: str, at: Optional[str] = None) -> None:
+        """Record activity on ``session_id`` (ISO timestamp, default now)."""
+        at = at or datetime.now().isoformat()
+        if at > self._pending.get(session_id, ""):
+            self._pending[session_id] = at
+        self._schedule()
+
+    def last_seen(self, session_id: str) -> Optional[str]:
+        """Pending last-seen time for ``session_id``, if any."""
+        return self._pending.get(session_id)
+
+    def discard(self, session_id: str, up_to: Optional[str] = None) -> None:
+        """Drop pending activity already covered by a write at ``up_to``."""
+        at = self._pending.get(session_id)
+        if at is not None and (up_to is None or at <= up_to):
+            del self._pending[session_id]
+
+    def _schedule(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (sync caller) - the next flush_session_activity() writes it
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.interval_seconds)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all pending activity now.
+
+        Returns:
+            Number of sessions written
+        """
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        try:
+            await self.write(batch)
+        except Exception as e:
+            logger.warning(f"Failed to flush activity for {len(batch)} sessions: {e}")
+            for session_id, at in batch.items():
+                if at > self._pending.get(session_id, ""):
+                    self._pending[session_id] = at
+            return 0
+        self.writes += len(batch)
+        logger.debug(f"Flushed activity for {len(batch)} sessions")
+        return len(batch)
+
+    async def close(self) -> None:
+        """Stop the background flush and write what is pending."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self.flush()
+
+
+async def flush_session_activity() -> None:
+    """Write pending activity of every tracker (call on shutdown)."""
+    for tracker in list(_trackers):
+        await tracker.close()
+
+
+def pending_last_seen(session_id: str) -> Optional[str]:
+    """Latest not-yet-written activity of a session across all trackers."""
+    times = [at for tracker in list(_trackers) if (at := tracker.last_seen(session_id))]
+    return max(times) if times else None
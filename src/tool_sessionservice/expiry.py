@@ -0,0 +1,129 @@
+"""
+Background expiry of idle tool sessions.
+
+Without a sweep, a session is only found to be inactive when a request
+touches it, so abandoned sessions stay ``active`` and keep being resumed and
+scanned. ``SessionExpirySweeper`` periodically closes active sessions whose
+``updated_at`` is older than ``idle_ttl_seconds``:
+
+- idle sessions are read oldest first in pages of ``batch_size`` (projection
+  of user_id/casefile_id/updated_at only), continuing after the last session
+  of the previous page, and closed in batched writes
+- a close only applies if the session was not written since it was listed,
+  so a request that touches it in between keeps it open
+- their entries in the active-session index are dropped, so auto-resume
+  starts a new session instead of reviving an expired one
+- sessions with activity still pending in a tracker are skipped, and the
+  sweep pages on past them
+- closes are paced to ``max_closes_per_second`` so a large backlog does not
+  compete with foreground traffic
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from .active_sessions import ActiveSessionIndex, get_active_session_index
+from .activity import pending_last_seen
+from .repository import ToolSessionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SessionExpirySweeper:
+    """Closes idle active sessions in the background."""
+
+    def __init__(
+        self,
+        repository: ToolSessionRepository,
+        active_sessions: Optional[ActiveSessionIndex] = None,
+        idle_ttl_seconds: float = 3600,
+        interval_seconds: float = 300,
+        batch_size: int = 500,
+        max_closes_per_second: float = 50.0,
+    ):
+        """
+        Args:
+            repository: Tool session repository
+            active_sessions: Resume index to update (default: the global index)
+            idle_ttl_seconds: Inactivity after which a session is closed
+            interval_seconds: Time between sweeps
+            batch_size: Sessions read and closed per batch (at most 500)
+            max_closes_per_second: Pace of closes within a sweep
+        """
+        if not 0 < batch_size <= 500:
+            raise ValueError("batch_size must be between 1 and 500")
+        self.repository = repository
+        self.active_sessions = active_sessions or get_active_session_index()
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_closes_per_second = max_closes_per_second
+        self.closed = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep_once(self) -> int:
+        """Close every session idle for longer than the TTL.
+
+        Returns:
+            Number of sessions closed
+        """
+        idle_before = datetime.now(UTC) - timedelta(seconds=self.idle_ttl_seconds)
+        # Pending activity is kept as naive local ISO strings
+        pending_cutoff = idle_before.astimezone().replace(tzinfo=None).isoformat()
+
+        total = 0
+        cursor = None
+        while True:
+            idle = await self.repository.list_idle_sessions(idle_before, limit=self.batch_size, after=cursor)
+            if not idle:
+                break
+            # Page on past sessions that are skipped, not just closed ones
+            cursor = (idle[-1]["updated_at"], idle[-1]["session_id"])
+            expired = [
+                session for session in idle
+                if (pending_last_seen(session["session_id"]) or "") <= pending_cutoff
+            ]
+
+            if expired:
+                closed = set(await self.repository.close_sessions(expired))
+                for session in expired:
+                    if session["session_id"] in closed:
+                        await self.active_sessions.discard(
+                            session["user_id"], session["casefile_id"], session["session_id"]
+                        )
+                total += len(closed)
+
+            if len(idle) < self.batch_size:
+                break
+            if expired and self.max_closes_per_second > 0:
+                await asyncio.sleep(len(expired) / self.max_closes_per_second)
+
+        if total:
+            logger.info(f"Closed {total} sessions idle for more than {self.idle_ttl_seconds}s")
+        self.closed += total
+        return total
+
+    def start(self) -> None:
+        """Start sweeping in the background (no-op if already running)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background sweep."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sweep_once()
+            except Exception as e:
+                logger.warning(f"Session expiry sweep failed: {e}")
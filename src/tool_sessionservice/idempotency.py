@@ -0,0 +1,152 @@
+"""
+Idempotency store for tool execution.
+
+Clients retry tool requests after timeouts. A retry carrying the same client
+request id within the same session must not execute the tool (and write to
+casefiles) a second time:
+
+- completed responses are kept for a short TTL per (session, client request id)
+  and returned as-is for duplicates
+- duplicates that arrive while the first execution is still running wait on the
+  same future (single-flight) instead of starting a second execution
+
+Records live in process memory; pass a RedisCacheService to share completed
+responses between instances.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from persistence.redis_cache import RedisCacheService
+from pydantic_models.base.types import RequestStatus
+from pydantic_models.operations.tool_execution_ops import ToolResponse
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyStore:
+    """Short-lived record of tool responses keyed by (session, client request id)."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = 300,
+        redis_cache: Optional[RedisCacheService] = None,
+        key_prefix: str = "tool_idempotency",
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.redis_cache = redis_cache
+        self.key_prefix = key_prefix
+        self._records: Dict[str, Tuple[float, ToolResponse]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(session_id: str, client_request_id: str) -> str:
+        """Idempotency key for a client request within a session."""
+        return f"{session_id}:{client_request_id}"
+
+    async def get(self, key: str) -> Optional[ToolResponse]:
+        """Return the stored response for ``key`` if it has not expired."""
+        record = self._records.get(key)
+        if record is not None:
+            expires_at, response = record
+            if expires_at > time.monotonic():
+                return response.model_copy(deep=True)
+            del self._records[key]
+
+        if self.redis_cache:
+            data = await self.redis_cache.get(f"{self.key_prefix}:{key}")
+            if data:
+                response = ToolResponse.model_validate(data)
+                self._records[key] = (time.monotonic() + self.ttl_seconds, response)
+                return response.model_copy(deep=True)
+        return None
+
+    async def put(self, key: str, response: ToolResponse) -> None:
+        """Record a completed response for ``key``."""
+        self._purge_expired()
+        self._records[key] = (time.monotonic() + self.ttl_seconds, response.model_copy(deep=True))
+        if self.redis_cache:
+            await self.redis_cache.set(
+                f"{self.key_prefix}:{key}",
+                response.model_dump(mode="json"),
+                self.ttl_seconds,
+            )
+
+    async def run(
+        self,
+        key: str,
+        execute: Callable[[], Awaitable[ToolResponse]],
+    ) -> Tuple[ToolResponse, bool]:
+        """Execute once per key.
+
+        Args:
+            key: Idempotency key (see ``make_key``)
+            execute: Coroutine factory performing the actual execution
+
+        Returns:
+            Tuple of (response, replayed) where replayed is True when the
+            response came from an earlier or concurrent execution
+        """
+        while True:
+            stored = await self.get(key)
+            if stored is not None:
+                return stored, True
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+
+            # Single-flight: wait for the running execution instead of starting another
+            try:
+                response = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if inflight.cancelled():
+                    # Leader was cancelled - try to take over
+                    continue
+                raise
+            return response.model_copy(deep=True), True
+
+        future = asyncio.get_running_loop().create_future()
+        # Followers may never await a failed future; mark the exception retrieved
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            response = await execute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            # Only successful executions are replayed; failures may be retried
+            if response.status == RequestStatus.COMPLETED:
+                await self.put(key, response)
+            future.set_result(response)
+            return response, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._records.items() if expires_at <= now]
+        for key in expired:
+            del self._records[key]
+
+    def clear(self) -> None:
+        """Drop all in-memory records (tests)."""
+        self._records.clear()
+
+
+# Global store shared by ToolSessionService instances in this process
+_idempotency_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get the global idempotency store."""
+    global _idempotency_store
+    if _idempotency_store is None:
+        _idempotency_store = IdempotencyStore()
+    return _idempotency_store
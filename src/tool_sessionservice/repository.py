@@ -1,7 +1,8 @@
 """Repository for tool session data persistence using base repository pattern."""
 
+import asyncio
 import logging
-from datetime import datetime
+from datetime import UTC, datetime
 
 # Firestore imports for subcollections
 try:
@@ -11,14 +12,37 @@ except ImportError:  # pragma: no cover
 
     firestore = firebase_admin.firestore
 
+from google.api_core.exceptions import FailedPrecondition, NotFound
+from google.cloud.firestore_v1.base_query import FieldFilter
+
 from persistence.base_repository import BaseRepository
+from persistence.entity_versions import entity_versions
 from persistence.firestore_pool import FirestoreConnectionPool
+from persistence.recursive_delete import DeleteProgress
 from persistence.redis_cache import RedisCacheService
-from pydantic_models.canonical.tool_session import ToolEvent, ToolSession
+from pydantic_models.canonical.tool_session import RECENT_REQUEST_IDS_LIMIT, ToolEvent, ToolSession
 from pydantic_models.operations.tool_execution_ops import ToolRequest, ToolResponse
 
+from .activity import SessionActivityTracker
+
 logger = logging.getLogger(__name__)
 
+# Largest page served from a session's request index
+REQUEST_PAGE_SIZE = 100
+
+# Subcollections below a session document
+SESSION_SUBCOLLECTIONS = {"requests": {"events": {}}}
+
+
+def _iso(value: datetime | str | None) -> str:
+    """Naive local ISO timestamp, like the model defaults.
+
+    BaseRepository stamps created_at/updated_at as aware UTC datetimes.
+    """
+    if isinstance(value, datetime):
+        return value.astimezone().replace(tzinfo=None).isoformat() if value.tzinfo else value.isoformat()
+    return value or datetime.now().isoformat()
+
 
 class ToolSessionRepository(BaseRepository[ToolSession]):
     """Repository for tool session data persistence with subcollection support."""
@@ -27,12 +51,14 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
         self,
         firestore_pool: FirestoreConnectionPool,
         redis_cache: RedisCacheService | None = None,
+        activity_flush_seconds: float = 5.0,
     ):
         """Initialize the repository.
 
         Args:
             firestore_pool: Firestore connection pool
             redis_cache: Optional Redis cache service
+            activity_flush_seconds: Interval between batched activity writes
         """
         super().__init__(
             collection_name="sessions",
@@ -40,6 +66,7 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
             redis_cache=redis_cache,
             cache_ttl=1800,  # 30 minutes cache for sessions
         )
+        self.activity = SessionActivityTracker(self._write_activity, interval_seconds=activity_flush_seconds)
         logger.info("ToolSessionRepository initialized with base repository pattern")
 
     def _to_dict(self, model: ToolSession) -> dict[str, any]:
@@ -50,6 +77,9 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
 
         Returns:
             Dictionary representation for Firestore
+
+        request_count/event_count are left out: they are only written with
+        atomic increments, so whole-document updates never overwrite them.
         """
         return {
             "session_id": model.session_id,
@@ -75,10 +105,12 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
             session_id=data.get("session_id", doc_id),
             user_id=data["user_id"],
             casefile_id=data.get("casefile_id"),
-            created_at=data.get("created_at", datetime.now().isoformat()),
-            updated_at=data.get("updated_at", datetime.now().isoformat()),
+            created_at=_iso(data.get("created_at")),
+            updated_at=_iso(data.get("updated_at")),
             request_ids=data.get("request_ids", []),
             active=data.get("active", True),
+            request_count=data.get("request_count", 0),
+            event_count=data.get("event_count", 0),
         )
 
     # ------------------------------------------------------------------
@@ -90,12 +122,180 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
         await self.create(session.session_id, session)
 
     async def get_session(self, session_id: str) -> ToolSession | None:
-        """Get session by ID with caching."""
-        return await self.get_by_id(session_id, use_cache=True)
+        """Get session by ID with caching (and activity not yet flushed)."""
+        session = await self.get_by_id(session_id, use_cache=True)
+        last_seen = self.activity.last_seen(session_id)
+        if session and last_seen and last_seen > session.updated_at:
+            session.updated_at = last_seen
+        return session
 
     async def update_session(self, session: ToolSession) -> None:
         """Update session metadata."""
+        written_at = datetime.now().isoformat()
         await self.update(session.session_id, session)
+        # The write stamped updated_at; older pending activity is redundant
+        self.activity.discard(session.session_id, up_to=written_at)
+
+    async def update_activity(self, session_id: str) -> None:
+        """Mark a session as active now.
+
+        Only recorded in memory; ``activity`` writes it with the next batch.
+        """
+        self.activity.touch(session_id)
+
+    async def _write_activity(self, updates: dict[str, str]) -> None:
+        """Write ``{session_id: updated_at}`` in Firestore batches.
+
+        A batch fails as a whole if one of its sessions no longer exists
+        (e.g. deleted by a casefile cascade); the missing sessions are then
+        dropped and the rest of the batch written again.
+        """
+        session_ids = list(updates)
+        written: list[str] = []
+        client = await self.firestore_pool.acquire()
+        try:
+            collection = client.collection(self.collection_name)
+            # Firestore batches hold at most 500 writes
+            for start in range(0, len(session_ids), 500):
+                chunk = session_ids[start:start + 500]
+                try:
+                    await self._commit_activity(client, collection, chunk, updates)
+                except NotFound:
+                    snapshots = await asyncio.gather(*(collection.document(session_id).get() for session_id in chunk))
+                    missing = {snapshot.id for snapshot in snapshots if not snapshot.exists}
+                    if not missing:
+                        raise
+                    logger.info(f"Dropping activity for {len(missing)} deleted sessions")
+                    chunk = [session_id for session_id in chunk if session_id not in missing]
+                    if chunk:
+                        await self._commit_activity(client, collection, chunk, updates)
+                written.extend(chunk)
+            self._metrics["writes"] += len(written)
+        finally:
+            await self.firestore_pool.release(client)
+
+        for session_id in written:
+            await self._session_document_changed(session_id, state_changed=False)
+
+    @staticmethod
+    async def _commit_activity(client, collection, session_ids: list[str], updates: dict[str, str]) -> None:
+        batch = client.batch()
+        for session_id in session_ids:
+            # Same type as the updated_at stamped by BaseRepository, so
+            # range queries on updated_at (expiry sweep) see every session
+            updated_at = datetime.fromisoformat(updates[session_id]).astimezone(UTC)
+            batch.update(collection.document(session_id), {"updated_at": updated_at})
+        await batch.commit()
+
+    async def list_idle_sessions(
+        self,
+        idle_before: datetime,
+        limit: int = 500,
+        after: tuple[datetime, str] | None = None,
+    ) -> list[dict]:
+        """Active sessions last updated before ``idle_before``, oldest first.
+
+        Only ``user_id``, ``casefile_id`` and ``updated_at`` are read. Needs
+        the composite index (active, updated_at).
+
+        Args:
+            idle_before: Upper bound on ``updated_at``
+            limit: Maximum sessions returned
+            after: ``(updated_at, session_id)`` of the last session of the
+                previous page, to continue past it
+
+        Returns:
+            ``[{"session_id", "user_id", "casefile_id", "updated_at", "update_time"}]``
+            where ``update_time`` is the document's write time, for
+            ``close_sessions``
+        """
+        client = await self.firestore_pool.acquire()
+        try:
+            query = (
+                client.collection(self.collection_name)
+                .where(filter=FieldFilter("active", "==", True))
+                .where(filter=FieldFilter("updated_at", "<", idle_before))
+                .order_by("updated_at")
+                .order_by("__name__")
+                .select(["user_id", "casefile_id", "updated_at"])
+            )
+            if after is not None:
+                updated_at, session_id = after
+                query = query.start_after({"updated_at": updated_at, "__name__": session_id})
+            sessions = []
+            async for doc in query.limit(limit).stream():
+                data = doc.to_dict() or {}
+                sessions.append(
+                    {
+                        "session_id": doc.id,
+                        "user_id": data.get("user_id"),
+                        "casefile_id": data.get("casefile_id"),
+                        "updated_at": data.get("updated_at"),
+                        "update_time": doc.update_time,
+                    }
+                )
+            self._metrics["reads"] += len(sessions)
+            return sessions
+        finally:
+            await self.firestore_pool.release(client)
+
+    async def close_sessions(self, sessions: list[dict]) -> list[str]:
+        """Mark sessions listed by ``list_idle_sessions`` inactive.
+
+        Writes go in batches of up to 500, each update conditional on the
+        document's ``update_time`` from the listing. If a session was written
+        in between (new activity, or already closed), its batch fails; the
+        batch is then re-read and committed again without the changed
+        sessions, which stay open.
+
+        Returns:
+            IDs of the sessions closed
+        """
+        if not sessions:
+            return []
+        closed_at = datetime.now(UTC)
+        closed: list[str] = []
+        client = await self.firestore_pool.acquire()
+        try:
+            collection = client.collection(self.collection_name)
+            for start in range(0, len(sessions), 500):
+                pending = sessions[start:start + 500]
+                while pending:
+                    batch = client.batch()
+                    for session in pending:
+                        batch.update(
+                            collection.document(session["session_id"]),
+                            {"active": False, "updated_at": closed_at},
+                            option=client.write_option(last_update_time=session["update_time"]),
+                        )
+                    try:
+                        await batch.commit()
+                    except FailedPrecondition:
+                        snapshots = await asyncio.gather(
+                            *(collection.document(session["session_id"]).get(field_paths=["active"])
+                              for session in pending)
+                        )
+                        self._metrics["reads"] += len(snapshots)
+                        unchanged = [
+                            session for session, snapshot in zip(pending, snapshots)
+                            if snapshot.exists
+                            and (snapshot.to_dict() or {}).get("active")
+                            and snapshot.update_time == session["update_time"]
+                        ]
+                        if len(unchanged) == len(pending):
+                            raise
+                        pending = unchanged
+                        continue
+                    closed.extend(session["session_id"] for session in pending)
+                    self._metrics["writes"] += len(pending)
+                    break
+        finally:
+            await self.firestore_pool.release(client)
+
+        for session_id in closed:
+            self.activity.discard(session_id)
+            await self._session_document_changed(session_id)
+        return closed
 
     async def list_sessions(
         self,
@@ -111,27 +311,10 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
             # List all sessions (use empty field filter)
             return await self.list_by_field("active", True)
 
-    async def delete_session(self, session_id: str) -> None:
-        """Delete a session and all its subcollections."""
-        # First delete subcollections (requests and events)
-        client = await self.firestore_pool.acquire()
-        try:
-            session_doc = client.collection(self.collection_name).document(session_id)
-
-            # Delete all requests and their events
-            requests_collection = session_doc.collection("requests")
-            async for request_doc in requests_collection.stream():
-                # Delete events subcollection
-                events_collection = request_doc.reference.collection("events")
-                async for event_doc in events_collection.stream():
-                    await event_doc.reference.delete()
-                # Delete request
-                await request_doc.reference.delete()
-        finally:
-            await self.firestore_pool.release(client)
-
-        # Then delete the session itself using BaseRepository
-        await self.delete(session_id)
+    async def delete_session(self, session_id: str) -> DeleteProgress:
+        """Delete a session and all its subcollections (requests and their events)."""
+        self.activity.discard(session_id)
+        return await self.delete_tree(session_id, SESSION_SUBCOLLECTIONS)
 
     # ------------------------------------------------------------------
     # Subcollection operations (requests and events)
@@ -142,19 +325,30 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
         session_id: str,
         request: ToolRequest,
         response: ToolResponse | None = None,
+        trim_request_ids: bool = False,
     ) -> None:
-        """Add a request (and optional response) to a session."""
+        """Add a request (and optional response) to a session.
+
+        The request document joins the session's request index (the
+        ``requests`` subcollection, ordered by created_at). It is written in one
+        batch with the session's request_count increment and an atomic append
+        of the id to ``request_ids``, so concurrent requests never drop each
+        other's ids.
+
+        Args:
+            session_id: Session the request belongs to
+            request: The tool request
+            response: Optional response stored with it
+            trim_request_ids: The append may push ``request_ids`` past
+                RECENT_REQUEST_IDS_LIMIT; trim the oldest ids afterwards
+        """
         request_id = str(request.request_id)
 
         client = await self.firestore_pool.acquire()
         try:
+            session_doc = client.collection(self.collection_name).document(session_id)
             # Store in /sessions/{session_id}/requests/{request_id}
-            request_doc = (
-                client.collection(self.collection_name)
-                .document(session_id)
-                .collection("requests")
-                .document(request_id)
-            )
+            request_doc = session_doc.collection("requests").document(request_id)
             request_data = {
                 "request": request.model_dump(mode="json"),
                 "response": response.model_dump(mode="json") if response else None,
@@ -162,10 +356,92 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
                 "created_at": request.timestamp,
                 "updated_at": datetime.now().isoformat(),
             }
-            await request_doc.set(request_data)
+            batch = client.batch()
+            batch.set(request_doc, request_data)
+            batch.update(
+                session_doc,
+                {"request_count": firestore.Increment(1), "request_ids": firestore.ArrayUnion([request_id])},
+            )
+            await batch.commit()
+            if trim_request_ids:
+                await self._trim_request_ids(session_doc)
         finally:
             await self.firestore_pool.release(client)
 
+        await self._session_document_changed(session_id, state_changed=False)
+
+    async def _trim_request_ids(self, session_doc) -> None:
+        """Drop the oldest ids beyond RECENT_REQUEST_IDS_LIMIT from a session's window.
+
+        Only the ids read as overflowing are removed (ArrayRemove), so ids
+        appended concurrently are kept; a window left slightly over the limit
+        by a racing append is trimmed by the next request.
+        """
+        snapshot = await session_doc.get()
+        request_ids = (snapshot.to_dict() or {}).get("request_ids", []) if snapshot.exists else []
+        overflow = request_ids[:-RECENT_REQUEST_IDS_LIMIT]
+        if overflow:
+            await session_doc.update({"request_ids": firestore.ArrayRemove(overflow)})
+
+    async def list_requests(
+        self,
+        session_id: str,
+        limit: int = REQUEST_PAGE_SIZE,
+        before: str | None = None,
+    ) -> tuple[list[dict[str, any]], str | None]:
+        """Page through a session's request index, newest first.
+
+        Only summary fields are read (no request/response payloads). Entries
+        are ordered by created_at, then request id, so requests sharing a
+        timestamp are neither skipped nor repeated across pages.
+
+        Args:
+            session_id: Session to page
+            limit: Page size (capped at REQUEST_PAGE_SIZE)
+            before: Cursor from the previous page ("<created_at>|<request_id>"
+                of its last entry)
+
+        Returns:
+            Tuple of (summaries, next_cursor); next_cursor is None on the last page
+        """
+        limit = max(1, min(limit, REQUEST_PAGE_SIZE))
+        client = await self.firestore_pool.acquire()
+        try:
+            query = (
+                client.collection(self.collection_name)
+                .document(session_id)
+                .collection("requests")
+                .select(["created_at", "request.payload.tool_name", "response.status"])
+                .order_by("created_at", direction="DESCENDING")
+                .order_by("__name__", direction="DESCENDING")
+            )
+            if before:
+                created_at, _, request_id = before.rpartition("|")
+                if created_at:
+                    query = query.start_after({"created_at": created_at, "__name__": request_id})
+                else:
+                    # Cursor issued before request ids were part of it
+                    query = query.start_after({"created_at": request_id})
+
+            summaries = []
+            async for doc in query.limit(limit).stream():
+                data = doc.to_dict()
+                summaries.append(
+                    {
+                        "request_id": doc.id,
+                        "tool_name": ((data.get("request") or {}).get("payload") or {}).get("tool_name"),
+                        "status": (data.get("response") or {}).get("status"),
+                        "created_at": data.get("created_at"),
+                    }
+                )
+        finally:
+            await self.firestore_pool.release(client)
+
+        next_cursor = None
+        if len(summaries) == limit:
+            next_cursor = f"{summaries[-1]['created_at']}|{summaries[-1]['request_id']}"
+        return summaries, next_cursor
+
     async def update_request_response(
         self, session_id: str, request_id: str, response: ToolResponse
     ) -> None:
@@ -191,31 +467,87 @@ class ToolSessionRepository(BaseRepository[ToolSession]):
     async def add_event_to_request(
         self, session_id: str, request_id: str, event: ToolEvent
     ) -> None:
-        """Add a ToolEvent to a request's events subcollection."""
+        """Add a ToolEvent to a request's events subcollection.
+
+        The event document, the request's event_ids and the session's
+        event_count increment are written in one batch.
+        """
         client = await self.firestore_pool.acquire()
         try:
+            session_doc = client.collection(self.collection_name).document(session_id)
+            request_doc = session_doc.collection("requests").document(request_id)
             # Store in /sessions/{session_id}/requests/{request_id}/events/{event_id}
-            event_doc = (
-                client.collection(self.collection_name)
-                .document(session_id)
-                .collection("requests")
-                .document(request_id)
-                .collection("events")
-                .document(event.event_id)
-            )
-            await event_doc.set(event.model_dump(mode="json"))
+            event_doc = request_doc.collection("events").document(event.event_id)
 
+            batch = client.batch()
+            batch.set(event_doc, event.model_dump(mode="json"))
             # Update request's event_ids list
-            request_doc = (
-                client.collection(self.collection_name)
-                .document(session_id)
-                .collection("requests")
-                .document(request_id)
+            batch.set(request_doc, {"event_ids": firestore.ArrayUnion([event.event_id])}, merge=True)
+            batch.update(session_doc, {"event_count": firestore.Increment(1)})
+            await batch.commit()
+        finally:
+            await self.firestore_pool.release(client)
+
+        await self._session_document_changed(session_id, state_changed=False)
+
+    async def _session_document_changed(self, session_id: str, state_changed: bool = True) -> None:
+        """Drop the cached session document after a partial (batched) write.
+
+        Bookkeeping written around every tool call (request log, counters,
+        activity) passes ``state_changed=False``: it does not bump the entity
+        version, so memoized tool results keyed on the session stay valid.
+        """
+        if state_changed:
+            entity_versions.bump(self.collection_name, session_id)
+        self._forget(session_id)
+        if self.redis_cache:
+            await self.redis_cache.delete(self._cache_key(session_id))
+
+    async def get_session_counts(self, session: ToolSession) -> tuple[int, int]:
+        """Return (request_count, event_count) for a session.
+
+        Sessions written since the counters were introduced answer from the
+        session document itself (request_ids is only a recent window, never
+        longer than the count). Legacy sessions (counter behind request_ids)
+        are counted once with count aggregations and the counters backfilled.
+        """
+        if session.request_count >= len(session.request_ids):
+            return session.request_count, session.event_count
+        return await self._backfill_session_counts(session)
+
+    async def _backfill_session_counts(self, session: ToolSession) -> tuple[int, int]:
+        session_id = session.session_id
+        client = await self.firestore_pool.acquire()
+        try:
+            session_doc = client.collection(self.collection_name).document(session_id)
+            requests_collection = session_doc.collection("requests")
+
+            request_count, *event_counts = await asyncio.gather(
+                self._count(requests_collection),
+                *(
+                    self._count(requests_collection.document(request_id).collection("events"))
+                    for request_id in session.request_ids
+                ),
             )
-            await request_doc.set({"event_ids": firestore.ArrayUnion([event.event_id])}, merge=True)
+            event_count = sum(event_counts)
+
+            # Increments racing with this backfill are overwritten; the next
+            # mismatch against request_ids triggers another backfill
+            await session_doc.update({"request_count": request_count, "event_count": event_count})
+            logger.info(f"Backfilled counters for legacy session {session_id}: {request_count} requests, {event_count} events")
         finally:
             await self.firestore_pool.release(client)
 
+        await self._session_document_changed(session_id, state_changed=False)
+        session.request_count, session.event_count = request_count, event_count
+        return request_count, event_count
+
+    @staticmethod
+    async def _count(query) -> int:
+        """Server-side count aggregation (no documents are streamed)."""
+        results = await query.count(alias="count").get()
+        return int(results[0][0].value) if results and results[0] else 0
+
     async def get_request(self, session_id: str, request_id: str) -> dict[str, any] | None:
         """Get a request with its response."""
         client = await self.firestore_pool.acquire()
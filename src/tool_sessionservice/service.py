@@ -9,14 +9,17 @@ from typing import Any, Dict, List, Optional
 from pydantic import ValidationError
 
 from coreservice.id_service import get_id_service
+from pydantic_ai_integration.bulkhead import BulkheadRejected
 from pydantic_ai_integration.dependencies import MDSContext
 from pydantic_ai_integration.tool_decorator import (
     get_tool_definition,
     get_tool_names,
     validate_tool_exists,
 )
+from pydantic_ai_integration.validation import ValidatedParams, validated_scope
+from pydantic_models.base.lazy_result import LazyResult
 from pydantic_models.base.types import RequestStatus
-from pydantic_models.canonical.tool_session import ToolEvent, ToolSession
+from pydantic_models.canonical.tool_session import RECENT_REQUEST_IDS_LIMIT, ToolEvent, ToolSession
 from pydantic_models.operations.tool_execution_ops import (
     ToolRequest,
     ToolRequestPayload,
@@ -39,6 +42,8 @@ from pydantic_models.operations.tool_session_ops import (
 )
 from pydantic_models.views.session_views import SessionSummary
 
+from .active_sessions import ActiveSessionIndex, get_active_session_index
+from .idempotency import IdempotencyStore, get_idempotency_store
 from .repository import ToolSessionRepository
 from pydantic_ai_integration.method_decorator import register_service_method
 
@@ -47,9 +52,17 @@ logger = logging.getLogger(__name__)
 class ToolSessionService:
     """Service for handling tool sessions and tool execution (Firestore only)."""
 
-    def __init__(self, repository: ToolSessionRepository | None = None, id_service=None):
+    def __init__(
+        self,
+        repository: ToolSessionRepository | None = None,
+        id_service=None,
+        idempotency_store: IdempotencyStore | None = None,
+        active_sessions: ActiveSessionIndex | None = None,
+    ):
         self.repository = repository or ToolSessionRepository()
         self.id_service = id_service or get_id_service()
+        self.idempotency_store = idempotency_store or get_idempotency_store()
+        self.active_sessions = active_sessions or get_active_session_index()
 
     @register_service_method(
         name="create_session",
@@ -95,6 +108,7 @@ class ToolSessionService:
         
         # Store in repository
         await self.repository.create_session(session)
+        await self.active_sessions.put(user_id, casefile_id, session_id)
         
         # If this session is linked to a casefile, update the casefile to include this session
         if casefile_id:
@@ -134,6 +148,11 @@ class ToolSessionService:
         4. Executes the tool with validated parameters
         5. Records audit events throughout
         
+        Requests carrying a client request id (payload.session_request_id or
+        metadata["client_request_id"]) are idempotent per session: a duplicate
+        returns the stored response, and a duplicate arriving while the first
+        execution is still running waits for it instead of executing again.
+        
         Args:
             request: The tool request to process
             auth_context: Optional authentication context from token (user_id, session_id, casefile_id, session_request_id)
@@ -143,13 +162,15 @@ class ToolSessionService:
             
         Raises:
             ValueError: If token/session validation fails
+            BulkheadRejected: If the tool is at its concurrency limits
         """
-        # Clean computed fields before revalidation
-        request_data = request.model_dump(
-            mode="json",
-            exclude={"operation_key", "timestamp", "has_casefile_context"}
-        )
-        cleaned_request = ToolRequest.model_validate(request_data)
+        # Already-validated requests only need a private copy (event_ids are appended below)
+        if isinstance(request, ToolRequest):
+            cleaned_request = request.model_copy(
+                update={"event_ids": list(request.event_ids), "timestamp": datetime.now().isoformat()}
+            )
+        else:
+            cleaned_request = ToolRequest.model_validate(request)
         
         # Get the session
         session_id = cleaned_request.session_id
@@ -181,7 +202,6 @@ class ToolSessionService:
             
             logger.info(f"Token/session validation passed for session {session_id}")
             
-        request_id = str(cleaned_request.request_id)
         tool_name = cleaned_request.payload.tool_name
         
         # Validate tool is registered in MANAGED_TOOLS
@@ -192,19 +212,57 @@ class ToolSessionService:
         # Get tool definition (single source of truth)
         tool_def = get_tool_definition(tool_name)
         
-        # Validate parameters using tool's Pydantic model
+        # Validate parameters using tool's Pydantic model (once - inner layers reuse the token)
         try:
-            validated_params = tool_def.validate_params(cleaned_request.payload.parameters)
+            validated_params = tool_def.prepare_params(cleaned_request.payload.parameters)
         except ValidationError as e:
             raise ValueError(f"Invalid parameters for {tool_name}: {e}")
         
-        # Add request to session
-        session.request_ids.append(request_id)
-        session.updated_at = datetime.now().isoformat()
-        await self.repository.update_session(session)
+        client_request_id = (
+            cleaned_request.payload.session_request_id
+            or cleaned_request.metadata.get("client_request_id")
+        )
+        if not client_request_id:
+            return await self._execute_tool_request(cleaned_request, session, tool_def, validated_params)
+        
+        idempotency_key = IdempotencyStore.make_key(session_id, str(client_request_id))
+        response, replayed = await self.idempotency_store.run(
+            idempotency_key,
+            lambda: self._execute_tool_request(cleaned_request, session, tool_def, validated_params),
+        )
+        if replayed:
+            logger.info(f"Duplicate tool request {client_request_id} in session {session_id}; returning stored response")
+            response.metadata["idempotent_replay"] = True
+        return response
+    
+    async def _execute_tool_request(
+        self,
+        cleaned_request: ToolRequest,
+        session: ToolSession,
+        tool_def: Any,
+        validated_params: ValidatedParams,
+    ) -> ToolResponse:
+        """Execute a validated tool request and persist its request, events and response.
+        
+        Only the tool body holds a bulkhead slot (the implementation admits
+        itself, after the memoization lookup); a rejected call is recorded as
+        failed and BulkheadRejected re-raised once the response is persisted.
+        """
+        session_id = session.session_id
+        request_id = str(cleaned_request.request_id)
+        tool_name = cleaned_request.payload.tool_name
+        
+        if session.request_count < len(session.request_ids):
+            # Legacy session: settle its counters while request_ids still holds the full history
+            await self.repository.get_session_counts(session)
         
-        # Store request in subcollection
-        await self.repository.add_request_to_session(session_id, cleaned_request)
+        # Store request in the session's request index; the session keeps counters and recent ids
+        session.record_request(request_id)
+        await self.repository.add_request_to_session(
+            session_id,
+            cleaned_request,
+            trim_request_ids=len(session.request_ids) >= RECENT_REQUEST_IDS_LIMIT,
+        )
         
         # Create context for tool execution
         context = MDSContext(
@@ -228,6 +286,7 @@ class ToolSessionService:
         await self.repository.add_event_to_request(session_id, request_id, request_received_event)
         cleaned_request.event_ids.append(request_received_event.event_id)
         
+        rejected: BulkheadRejected | None = None
         try:
             # Create tool_execution_started event
             start_time = datetime.now()
@@ -243,20 +302,24 @@ class ToolSessionService:
             logger.info(f"Executing tool {tool_name} with validated parameters: {validated_params}")
             
             # Execute tool via tool definition (parameters already validated)
-            result_data = await tool_def.implementation(
-                context,
-                **validated_params.model_dump()
-            )
+            with validated_scope(validated_params):
+                result_data = await tool_def.implementation(
+                    context,
+                    **validated_params.values
+                )
             
             # Calculate duration
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
             
+            # Wrap once; the event and the persisted response share one JSON dump
+            result = LazyResult.wrap(result_data)
+            
             # Create tool_execution_completed event
             execution_completed_event = ToolEvent(
                 event_type="tool_execution_completed",
                 tool_name=tool_name,
                 parameters=cleaned_request.payload.parameters,
-                result_summary=result_data,
+                result_summary=result.to_json(),
                 duration_ms=duration_ms,
                 status="success"
             )
@@ -268,7 +331,7 @@ class ToolSessionService:
                 request_id=cleaned_request.request_id,
                 status=RequestStatus.COMPLETED,
                 payload=ToolResponsePayload(
-                    result=result_data,
+                    result=result,
                     events=[],
                     session_request_id=session_request_id
                 ),
@@ -276,7 +339,11 @@ class ToolSessionService:
             )
             
         except Exception as e:
-            logger.exception(f"Error executing tool {tool_name}: {e}")
+            if isinstance(e, BulkheadRejected):
+                rejected = e
+                logger.warning(f"Tool {tool_name} rejected by its bulkhead: {e}")
+            else:
+                logger.exception(f"Error executing tool {tool_name}: {e}")
             
             # Calculate duration
             duration_ms = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -320,10 +387,14 @@ class ToolSessionService:
         # Update response in repository
         await self.repository.update_request_response(session_id, request_id, response)
         
-        # Update session timestamp
-        session.updated_at = datetime.now().isoformat()
-        await self.repository.update_session(session)
+        # Session activity is batched; no session document write per call
+        await self.repository.update_activity(session_id)
+        
+        # Context changes made during the call are persisted once, here
+        await context.flush()
         
+        if rejected is not None:
+            raise rejected
         return response
     
     @register_service_method(
@@ -400,11 +471,8 @@ class ToolSessionService:
                 }
             )
         
-        # Count events across all requests
-        event_count = 0
-        for req_id in session.request_ids:
-            events = await self.repository.get_request_events(session_id, req_id)
-            event_count += len(events)
+        # Counters are maintained on the session document (no per-request reads)
+        request_count, event_count = await self.repository.get_session_counts(session)
         
         execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         
@@ -419,7 +487,7 @@ class ToolSessionService:
                 updated_at=session.updated_at,
                 active=session.active,
                 title=None,
-                request_count=len(session.request_ids),
+                request_count=request_count,
                 event_count=event_count,
                 metadata={}
             ),
@@ -486,7 +554,7 @@ class ToolSessionService:
                 created_at=session.created_at,
                 updated_at=session.updated_at,
                 active=session.active,
-                request_count=len(session.request_ids)
+                request_count=max(session.request_count, len(session.request_ids))
             )
             for session in paginated_sessions
         ]
@@ -512,7 +580,82 @@ class ToolSessionService:
                 }
             }
         )
-    
+
+    async def list_session_requests(
+        self,
+        user_id: str,
+        session_id: str,
+        limit: int = 50,
+        before: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Page a session's request history, newest first.
+
+        Args:
+            user_id: Requesting user (must own the session)
+            session_id: Session to page
+            limit: Page size
+            before: Cursor returned with the previous page
+
+        Returns:
+            Dict with ``requests`` (summaries), ``next_cursor`` and ``total_requests``
+
+        Raises:
+            ValueError: If the session does not exist or belongs to another user
+        """
+        session = await self.repository.get_session(session_id)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+        if session.user_id != user_id:
+            raise ValueError(f"Access denied: Session {session_id} does not belong to user {user_id}")
+
+        requests, next_cursor = await self.repository.list_requests(session_id, limit=limit, before=before)
+        total_requests, _ = await self.repository.get_session_counts(session)
+        return {
+            "requests": requests,
+            "next_cursor": next_cursor,
+            "total_requests": total_requests,
+        }
+
+    async def find_active_session(self, user_id: str, casefile_id: Optional[str] = None) -> ToolSession | None:
+        """Find the most recent active session for a user/casefile combination.
+
+        Uses the active session index (one lookup and one session read). Only when
+        the index has no usable entry - e.g. sessions created before a restart
+        without a shared Redis index, or an indexed session closed elsewhere - are
+        the user's sessions scanned, and the result is written back to the index.
+
+        Args:
+            user_id: Session owner
+            casefile_id: Casefile the session is linked to (None for user-only sessions)
+
+        Returns:
+            The active ToolSession, or None
+        """
+        session_id = await self.active_sessions.get(user_id, casefile_id)
+        if session_id:
+            session = await self.repository.get_session(session_id)
+            if (
+                session
+                and session.active
+                and session.user_id == user_id
+                and (session.casefile_id or None) == (casefile_id or None)
+            ):
+                return session
+            # Closed or deleted elsewhere - drop the stale entry; an older
+            # session may still be active, so scan like on a miss
+            await self.active_sessions.discard(user_id, casefile_id, session_id)
+
+        candidates = [
+            session
+            for session in await self.repository.list_sessions(user_id=user_id)
+            if session.active and (session.casefile_id or None) == (casefile_id or None)
+        ]
+        if not candidates:
+            return None
+        session = max(candidates, key=lambda s: s.created_at)
+        await self.active_sessions.put(user_id, casefile_id, session.session_id)
+        return session
+
     @register_service_method(
         name="close_session",
         description="Close tool execution session",
@@ -579,12 +722,8 @@ class ToolSessionService:
                 }
             )
         
-        # Calculate statistics
-        total_requests = len(session.request_ids)
-        total_events = 0
-        for req_id in session.request_ids:
-            events = await self.repository.get_request_events(session_id, req_id)
-            total_events += len(events)
+        # Calculate statistics from the session counters
+        total_requests, total_events = await self.repository.get_session_counts(session)
         
         # Calculate duration
         created_time = datetime.fromisoformat(session.created_at.replace('Z', '+00:00'))
@@ -595,6 +734,7 @@ class ToolSessionService:
         session.active = False
         session.updated_at = closed_time.isoformat()
         await self.repository.update_session(session)
+        await self.active_sessions.discard(session.user_id, session.casefile_id, session.session_id)
         
         execution_time_ms = int((datetime.now() - start_time).total_seconds() * 1000)
         
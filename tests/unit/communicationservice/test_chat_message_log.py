@@ -0,0 +1,120 @@
+from typing import Any, List
+
+import pytest
+
+from communicationservice.repository import ChatSessionRepository
+from communicationservice.service import CommunicationService
+from pydantic_models.canonical.chat_session import ChatSession
+from pydantic_models.operations.chat_session_ops import GetChatSessionRequest
+from pydantic_models.operations.tool_execution_ops import ChatRequest
+from tool_sessionservice.repository import ToolSessionRepository
+from tool_sessionservice.service import ToolSessionService
+
+USER_ID = "user@example.com"
+SESSION_ID = "cs_251013_chat001"
+
+
+@pytest.fixture
+def repository(db, firestore_pool) -> ChatSessionRepository:
+    repository = ChatSessionRepository(firestore_pool=firestore_pool)
+    db.docs[f"chat_sessions/{SESSION_ID}"] = repository._to_dict(ChatSession(session_id=SESSION_ID, user_id=USER_ID))
+    return repository
+
+
+@pytest.fixture
+def service(repository, firestore_pool) -> CommunicationService:
+    tool_service = ToolSessionService(repository=ToolSessionRepository(firestore_pool=firestore_pool))
+    return CommunicationService(repository=repository, tool_service=tool_service)
+
+
+def _chat(message: str) -> ChatRequest:
+    return ChatRequest(user_id=USER_ID, session_id=SESSION_ID, payload={"message": message, "session_id": SESSION_ID})
+
+
+def _session_bytes_written(db) -> int:
+    path = f"chat_sessions/{SESSION_ID}"
+    return sum(len(repr(data)) for kind, written, data in db.writes if kind == "update" and written == path)
+
+
+def _get(**payload: Any) -> GetChatSessionRequest:
+    return GetChatSessionRequest(user_id=USER_ID, payload={"session_id": SESSION_ID, "include_messages": True, **payload})
+
+
+async def test_turns_append_entries_without_rewriting_history(service, db):
+    written: List[int] = []
+    for turn in range(30):
+        before = _session_bytes_written(db)
+        await service.process_chat_request(_chat(f"message {turn}"))
+        written.append(_session_bytes_written(db) - before)
+
+    session_doc = db.docs[f"chat_sessions/{SESSION_ID}"]
+    assert session_doc["message_count"] == 60
+    assert session_doc["event_count"] == 60
+    assert "messages" not in session_doc
+    # The session document write does not grow with the conversation
+    assert written[-1] == written[1]
+    seqs = [data["seq"] for path, data in sorted(db.docs.items()) if "/messages/" in path]
+    assert seqs == list(range(60))
+
+
+async def test_get_session_returns_last_messages_with_cursor(service, db):
+    for turn in range(30):
+        await service.process_chat_request(_chat(f"message {turn}"))
+
+    db.reads.clear()
+    response = await service.get_session(_get(message_limit=10))
+
+    assert response.payload.message_count == 60
+    assert [m["seq"] for m in response.payload.messages] == list(range(50, 60))
+    assert response.payload.messages[-1]["message_type"] == "assistant"
+    assert response.payload.next_cursor == 50
+    assert len([path for path in db.reads if "/messages/" in path]) == 10
+
+    older = await service.get_session(_get(message_limit=50, before_seq=response.payload.next_cursor))
+    assert [m["seq"] for m in older.payload.messages] == list(range(0, 50))
+    assert older.payload.next_cursor is None
+
+
+async def test_messages_are_found_by_request_id(service, repository):
+    await service.process_chat_request(_chat("first"))
+    second = _chat("second")
+    second.payload.session_request_id = "req_002"
+    await service.process_chat_request(second)
+
+    session = await repository.get_session(SESSION_ID)
+    found = await repository.find_messages(session, session_request_id="req_002")
+
+    assert [m["message_type"] for m in found] == ["user", "assistant"]
+    assert found[0]["content"] == "second"
+    by_id = await repository.find_messages(session, message_id=found[1]["message_id"])
+    assert by_id == [found[1]]
+
+
+async def test_sequence_conflict_reloads_counters(repository, db):
+    stale = await repository.get_session(SESSION_ID)
+    current = await repository.get_session(SESSION_ID)
+    await repository.append_entries(current, [{"content": "a"}], [])
+
+    await repository.append_entries(stale, [{"content": "b"}], [])
+
+    assert stale.message_count == 2
+    assert db.docs[f"chat_sessions/{SESSION_ID}/messages/0000000001"]["content"] == "b"
+
+
+async def test_legacy_inline_history_is_moved_on_next_write(repository, db):
+    db.docs[f"chat_sessions/{SESSION_ID}"].update(
+        messages=[{"message_id": "m0", "content": "old"}],
+        events=[{"type": "message", "message_id": "m0"}],
+        message_index={"m0": 0},
+    )
+    legacy = await repository.get_session(SESSION_ID)
+    page, cursor = await repository.list_messages(legacy)
+    assert [m["content"] for m in page] == ["old"] and cursor is None
+
+    await repository.append_entries(legacy, [{"message_id": "m1", "content": "new"}], [])
+
+    session_doc = db.docs[f"chat_sessions/{SESSION_ID}"]
+    assert "messages" not in session_doc and "message_index" not in session_doc
+    assert session_doc["message_count"] == 2
+    page, _ = await repository.list_messages(await repository.get_session(SESSION_ID))
+    assert [(m["seq"], m["content"]) for m in page] == [(0, "old"), (1, "new")]
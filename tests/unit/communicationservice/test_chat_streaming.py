@@ -0,0 +1,155 @@
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from authservice import get_current_user
+from communicationservice.service import CommunicationService
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool
+from pydantic_api.routers import chat as chat_router
+from pydantic_models.base.types import RequestStatus
+from pydantic_models.canonical.chat_session import ChatSession
+from pydantic_models.operations.tool_execution_ops import ChatRequest, ToolRequest
+
+USER_ID = "user@example.com"
+SESSION_ID = "cs_251013_chat001"
+TRACE_ID = "6f1c2a8e-0b7d-4c55-9a51-2d3e4f5a6b7c"
+
+
+class _Repository:
+    def __init__(self):
+        self.session = ChatSession(session_id=SESSION_ID, user_id=USER_ID)
+        self.appended: List[List[Dict[str, Any]]] = []
+
+    async def get_session(self, session_id: str):
+        return self.session if session_id == SESSION_ID else None
+
+    async def list_messages(self, session, limit: int = 50, before_seq=None):
+        return [], None
+
+    async def append_entries(self, session, messages, events) -> None:
+        self.appended.append(messages)
+
+
+class _ToolService:
+    def __init__(self):
+        self.requests: List[ToolRequest] = []
+
+    async def process_tool_request_with_session_management(self, request: ToolRequest):
+        self.requests.append(request)
+        return SimpleNamespace(status=RequestStatus.COMPLETED, payload=SimpleNamespace(result={"count": 3}))
+
+
+class _ListParams(BaseModel):
+    label: str = "INBOX"
+
+
+@pytest.fixture(autouse=True)
+def gmail_list_messages():
+    @register_mds_tool(name="gmail_list_messages", params_model=_ListParams, description="Lists messages")
+    async def gmail_list_messages(ctx, label: str) -> Dict[str, Any]:
+        return {"count": 3}
+
+    yield
+    MANAGED_TOOLS.pop("gmail_list_messages", None)
+
+
+@pytest.fixture
+def repository() -> _Repository:
+    return _Repository()
+
+
+@pytest.fixture
+def tool_service() -> _ToolService:
+    return _ToolService()
+
+
+@pytest.fixture
+def service(repository, tool_service) -> CommunicationService:
+    return CommunicationService(repository=repository, tool_service=tool_service)
+
+
+def _chat(message: str, tool_calls=()) -> ChatRequest:
+    return ChatRequest(
+        user_id=USER_ID,
+        session_id=SESSION_ID,
+        payload={"message": message, "session_id": SESSION_ID, "tool_calls": list(tool_calls)},
+    )
+
+
+async def test_turn_events_arrive_before_persistence(service, repository, tool_service):
+    turn = await service.begin_chat_turn(
+        _chat("count my emails", [{"name": "gmail_list_messages", "arguments": {"label": "SENT"}}])
+    )
+
+    events = []
+    async for event in service.stream_chat_turn(turn):
+        events.append(event)
+        assert repository.appended == []
+
+    kinds = [event.event for event in events]
+    assert kinds[:3] == ["message_accepted", "tool_started", "tool_completed"]
+    assert set(kinds[3:-1]) == {"assistant_token"}
+    assert kinds[-1] == "completed"
+    assert events[2].data["result"] == {"count": 3}
+    tokens = "".join(event.data["token"] for event in events if event.event == "assistant_token")
+    assert tokens == turn.response.payload.message.content
+    assert events[-1].data["status"] == RequestStatus.COMPLETED.value
+    [tool_request] = tool_service.requests
+    assert tool_request.user_id == USER_ID
+    assert tool_request.payload.tool_name == "gmail_list_messages"
+    assert tool_request.payload.parameters == {"label": "SENT"}
+    assert tool_request.payload.session_request_id == f"{turn.client_session_request_id}:0"
+
+    await service.persist_chat_turn(turn)
+    await service.persist_chat_turn(turn)
+    assert len(repository.appended) == 1
+    assert [m["message_type"] for m in repository.appended[0]] == ["user", "assistant"]
+
+
+async def test_process_chat_request_still_returns_the_full_response(service, repository):
+    response = await service.process_chat_request(_chat("hello"))
+
+    assert response.status == RequestStatus.COMPLETED
+    assert response.payload.message.content.startswith("Received message: hello")
+    assert len(repository.appended) == 1
+
+
+@pytest.fixture
+def client(service) -> TestClient:
+    app = FastAPI()
+    app.include_router(chat_router.router)
+    app.dependency_overrides[chat_router.get_communication_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": USER_ID}
+    return TestClient(app)
+
+
+def test_stream_endpoint_sends_sse_then_persists(client, repository):
+    with client.stream(
+        "POST", f"/api/chat/sessions/{SESSION_ID}/messages/stream", json={"request": {"content": "hi"}}
+    ) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame for frame in response.iter_text() if frame]
+
+    body = "".join(frames)
+    assert body.startswith("event: message_accepted\ndata: ")
+    assert "event: assistant_token" in body
+    assert body.rstrip().splitlines()[-2] == "event: completed"
+    assert len(repository.appended) == 1
+
+
+def test_stream_endpoint_sends_ndjson_when_accepted(client):
+    response = client.post(
+        f"/api/chat/sessions/{SESSION_ID}/messages/stream",
+        json={"request": {"content": "hi"}, "trace_id": TRACE_ID},
+        headers={"Accept": "application/x-ndjson"},
+    )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[0]["event"] == "message_accepted"
+    assert lines[-1]["event"] == "completed"
+    assert lines[-1]["data"]["trace_id"] == TRACE_ID
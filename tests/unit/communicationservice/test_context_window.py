@@ -0,0 +1,96 @@
+from typing import Any, Dict, List
+
+from communicationservice.context_window import (
+    ContextAssembler,
+    ExtractiveSummarizer,
+    SummaryCache,
+    estimate_tokens,
+)
+
+SESSION_ID = "cs_251013_chat001"
+
+
+def _log(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "seq": seq,
+            "message_type": "user" if seq % 2 == 0 else "assistant",
+            "content": f"Message number {seq} about the Smith casefile. " + "detail " * 30,
+        }
+        for seq in range(count)
+    ]
+
+
+def _loader(log: List[Dict[str, Any]]):
+    loads = []
+
+    async def load_span(start: int, end: int) -> List[Dict[str, Any]]:
+        loads.append((start, end))
+        return log[start:end]
+
+    return load_span, loads
+
+
+async def test_window_stays_within_budget_as_chat_grows():
+    assembler = ContextAssembler(token_budget=2000)
+    log = _log(400)
+    load_span, _ = _loader(log)
+
+    sizes = {}
+    for length in range(1, 401):
+        window = await assembler.assemble(SESSION_ID, log[max(0, length - 50):length], load_span)
+        assert window.tokens <= assembler.token_budget
+        assert window.messages[-1]["seq"] == length - 1
+        sizes[length] = window.tokens
+
+    # Prompt size plateaus instead of growing with the conversation
+    assert abs(sizes[400] - sizes[200]) < assembler.summary_budget
+    prompt = window.to_prompt_messages()
+    assert prompt[0]["role"] == "system" and prompt[0]["content"].startswith("Summary of messages 0-")
+    assert [m["role"] for m in prompt[-2:]] == ["user", "assistant"]
+
+
+async def test_summaries_are_reused_between_turns():
+    assembler = ContextAssembler(token_budget=2000)
+    log = _log(300)
+    load_span, loads = _loader(log)
+
+    for length in range(1, 301):
+        await assembler.assemble(SESSION_ID, log[max(0, length - 50):length], load_span)
+
+    # One span summary and one fold each time a span leaves the verbatim part
+    spans_moved = assembler._windows[SESSION_ID].verbatim_from_seq // assembler.span_size
+    assert assembler.summarizer_calls <= 2 * spans_moved + 2
+    assert not loads
+
+    calls = assembler.summarizer_calls
+    await assembler.assemble(SESSION_ID, log[250:300], load_span)
+    assert assembler.summarizer_calls == calls
+
+
+async def test_cold_window_loads_older_spans_once_and_caches_them():
+    cache = SummaryCache()
+    log = _log(200)
+    load_span, loads = _loader(log)
+
+    first = await ContextAssembler(token_budget=2000, cache=cache).assemble(SESSION_ID, log[150:], load_span)
+    assert loads and all(end <= first.verbatim_from_seq for _, end in loads)
+
+    loads.clear()
+    fresh = ContextAssembler(token_budget=2000, cache=cache)
+    second = await fresh.assemble(SESSION_ID, log[150:], load_span)
+
+    assert loads == []
+    assert fresh.summarizer_calls == 0
+    assert second.summaries == first.summaries
+
+
+async def test_extractive_summarizer_is_deterministic_and_bounded():
+    summarizer = ExtractiveSummarizer()
+    texts = ["user: Find emails from Bob. Then file them.", "assistant: Found 3 emails. Filed."]
+
+    first = await summarizer.summarize(texts, max_tokens=20)
+
+    assert first == await summarizer.summarize(texts, max_tokens=20)
+    assert first == "user: Find emails from Bob assistant: Found 3 emails"
+    assert estimate_tokens(await summarizer.summarize(texts * 50, max_tokens=20)) <= 20
@@ -0,0 +1,358 @@
+"""
+Shared fixtures for unit tests.
+
+``db`` is an in-memory stand-in for the async Firestore client, keyed by
+document path ("sessions/ts_1/requests/req_1"), and ``firestore_pool`` hands
+it out like ``FirestorePool``. It covers what the repositories use: document
+get/set/update/delete, subcollections, filtered and ordered queries with
+cursors, count aggregations, write batches and the field transforms.
+
+Tests seed and inspect ``db.docs`` directly. ``db.reads`` lists every
+document read (gets and streamed results), ``db.writes`` every applied write
+as ``(kind, path, data)``, and ``db.commits`` the size of each batch.
+``latency`` makes gets, streams and commits yield to the event loop so
+concurrency can be observed through ``max_in_flight`` (per operation), and
+``db.failures`` queues errors per operation ("get", "set", "update", "commit",
+"stream"); a queued ``None`` lets one call through.
+Every write advances the document's ``update_time``, which snapshots carry
+and ``write_option(last_update_time=...)`` preconditions check.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition, NotFound
+from google.cloud.firestore_v1.transforms import DELETE_FIELD, ArrayRemove, ArrayUnion, Increment
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+}
+
+
+def _apply(target: Dict[str, Any], data: Dict[str, Any], dotted: bool = False, merge: bool = False) -> None:
+    """Write ``data`` into ``target``, resolving transforms.
+
+    ``dotted`` treats "a.b" keys as nested paths (update semantics); ``merge``
+    merges nested maps instead of replacing them (set with merge=True).
+    """
+    for key, value in data.items():
+        parent, name = target, key
+        if dotted and "." in key:
+            *parents, name = key.split(".")
+            for part in parents:
+                parent = parent.setdefault(part, {})
+        if value is DELETE_FIELD:
+            parent.pop(name, None)
+        elif isinstance(value, Increment):
+            parent[name] = parent.get(name, 0) + value.value
+        elif isinstance(value, ArrayUnion):
+            parent[name] = list(dict.fromkeys([*parent.get(name, []), *value.values]))
+        elif isinstance(value, ArrayRemove):
+            parent[name] = [item for item in parent.get(name, []) if item not in value.values]
+        elif merge and isinstance(value, dict) and isinstance(parent.get(name), dict):
+            _apply(parent[name], value, merge=True)
+        else:
+            parent[name] = value
+
+
+def _field(data: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(data, dict) or part not in data:
+            return None
+        data = data[part]
+    return data
+
+
+def _project(data: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    projected: Dict[str, Any] = {}
+    for path in fields:
+        value = _field(data, path)
+        if value is not None:
+            _apply(projected, {path: value}, dotted=True)
+    return projected
+
+
+class _Snapshot:
+    def __init__(self, reference: "_Doc", data: Optional[Dict[str, Any]]):
+        self.reference, self.id = reference, reference.id
+        self.exists = data is not None
+        self.update_time = reference.db.update_times.get(reference.path) if self.exists else None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return dict(self._data) if self._data is not None else None
+
+
+class _Doc:
+    def __init__(self, db: "_FakeFirestore", path: str):
+        self.db, self.path, self.id = db, path, path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str) -> "_Query":
+        return _Query(self.db, f"{self.path}/{name}")
+
+    async def collections(self):
+        prefix = self.path + "/"
+        for name in sorted({path[len(prefix):].split("/", 1)[0] for path in self.db.docs if path.startswith(prefix)}):
+            yield self.collection(name)
+
+    async def get(self, field_paths: Optional[List[str]] = None) -> _Snapshot:
+        async with self.db.operation("get"):
+            self.db.reads.append(self.path)
+            data = self.db.docs.get(self.path)
+        if data is not None and field_paths is not None:
+            data = _project(data, field_paths)
+        return _Snapshot(self, data)
+
+    async def create(self, data: Dict[str, Any]) -> None:
+        if self.path in self.db.docs:
+            raise AlreadyExists(f"Document already exists: {self.path}")
+        await self.set(data)
+
+    async def set(self, data: Dict[str, Any], merge: bool = False) -> None:
+        self.db.check("set")
+        self.db.write("set", self.path, data, merge=merge)
+
+    async def update(self, data: Dict[str, Any], option: Optional["_LastUpdate"] = None) -> None:
+        self.db.check("update")
+        if self.path not in self.db.docs:
+            raise NotFound(f"No document to update: {self.path}")
+        self.db.check_precondition(self.path, option)
+        self.db.write("update", self.path, data)
+
+    async def delete(self) -> None:
+        self.db.write("delete", self.path, None)
+
+
+class _Aggregation:
+    def __init__(self, query: "_Query"):
+        self.query = query
+
+    async def get(self):
+        self.query.db.aggregations += 1
+        count = len(self.query._rows())
+        return [[type("AggregationResult", (), {"value": count})()]]
+
+
+class _Query:
+    def __init__(self, db: "_FakeFirestore", path: str):
+        self.db, self.path = db, path
+        self.filters: Tuple[Tuple[str, str, Any], ...] = ()
+        self.orders: Tuple[Tuple[str, bool], ...] = ()
+        self.fields: Optional[List[str]] = None
+        self.size: Optional[int] = None
+        self.after: Optional[Dict[str, Any]] = None
+
+    def _copy(self, **changes: Any) -> "_Query":
+        query = _Query(self.db, self.path)
+        query.__dict__.update({**self.__dict__, **changes})
+        return query
+
+    def document(self, doc_id: str) -> _Doc:
+        return _Doc(self.db, f"{self.path}/{doc_id}")
+
+    def where(self, field_path: Optional[str] = None, op_string: Optional[str] = None, value: Any = None, *, filter=None) -> "_Query":
+        if filter is not None:
+            field_path, op_string, value = filter.field_path, filter.op_string, filter.value
+        return self._copy(filters=(*self.filters, (field_path, op_string, value)))
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> "_Query":
+        return self._copy(orders=(*self.orders, (field_path, direction == "DESCENDING")))
+
+    def select(self, field_paths: List[str]) -> "_Query":
+        return self._copy(fields=list(field_paths))
+
+    def limit(self, count: int) -> "_Query":
+        return self._copy(size=count)
+
+    def start_after(self, document_fields) -> "_Query":
+        if isinstance(document_fields, _Snapshot):
+            data = self.db.docs.get(document_fields.reference.path, {})
+            document_fields = {
+                **{field: _field(data, field) for field, _ in self.orders},
+                "__name__": document_fields.id,
+            }
+        return self._copy(after=document_fields)
+
+    def count(self, alias: Optional[str] = None) -> _Aggregation:
+        return _Aggregation(self)
+
+    def _key(self, doc_id: str, data: Dict[str, Any]) -> List[Tuple[Any, bool]]:
+        orders = [*self.orders]
+        if not any(field == "__name__" for field, _ in orders):
+            orders.append(("__name__", orders[-1][1] if orders else False))
+        return [(doc_id if field == "__name__" else _field(data, field), descending) for field, descending in orders]
+
+    def _is_after(self, key: List[Tuple[Any, bool]]) -> bool:
+        fields = [field for field, _ in self.orders] or ["__name__"]
+        if "__name__" not in fields:
+            fields.append("__name__")
+        for field, (value, descending) in zip(fields, key):
+            if field not in self.after:
+                return False
+            cursor = self.after[field]
+            if value != cursor:
+                return value < cursor if descending else value > cursor
+        return False
+
+    def _rows(self) -> List[Tuple[str, Dict[str, Any]]]:
+        prefix = self.path + "/"
+        rows = [
+            (path[len(prefix):], data) for path, data in self.db.docs.items()
+            if path.startswith(prefix) and "/" not in path[len(prefix):]
+            and all(_OPERATORS[op](_field(data, field), value) for field, op, value in self.filters)
+        ]
+        directions = [descending for _, descending in self._key("", {})]
+        for index in reversed(range(len(directions))):
+            rows.sort(key=lambda row: self._key(*row)[index][0], reverse=directions[index])
+        if self.after is not None:
+            rows = [row for row in rows if self._is_after(self._key(*row))]
+        return rows[:self.size]
+
+    async def stream(self):
+        async with self.db.operation("stream"):
+            self.db.queries += 1
+            rows = self._rows()
+        for doc_id, data in rows:
+            reference = self.document(doc_id)
+            self.db.reads.append(reference.path)
+            yield _Snapshot(reference, _project(data, self.fields) if self.fields is not None else dict(data))
+
+
+class _Batch:
+    def __init__(self, db: "_FakeFirestore"):
+        self.db, self.ops = db, []
+
+    def create(self, reference: _Doc, document_data: Dict[str, Any]) -> None:
+        self.ops.append(("create", reference.path, document_data, False, None))
+
+    def set(self, reference: _Doc, document_data: Dict[str, Any], merge: bool = False) -> None:
+        self.ops.append(("set", reference.path, document_data, merge, None))
+
+    def update(self, reference: _Doc, field_updates: Dict[str, Any], option: Optional["_LastUpdate"] = None) -> None:
+        self.ops.append(("update", reference.path, field_updates, False, option))
+
+    def delete(self, reference: _Doc) -> None:
+        self.ops.append(("delete", reference.path, None, False, None))
+
+    async def commit(self) -> None:
+        assert len(self.ops) <= 500
+        async with self.db.operation("commit"):
+            # All or nothing, like a real batch
+            for kind, path, _, _, option in self.ops:
+                if kind == "create" and path in self.db.docs:
+                    raise AlreadyExists(f"Document already exists: {path}")
+                if kind == "update" and path not in self.db.docs:
+                    raise NotFound(f"No document to update: {path}")
+                self.db.check_precondition(path, option)
+            for kind, path, data, merge, _ in self.ops:
+                self.db.write("set" if kind == "create" else kind, path, data, merge=merge)
+            self.db.commits.append(len(self.ops))
+
+
+class _LastUpdate:
+    def __init__(self, last_update_time: Any):
+        self.last_update_time = last_update_time
+
+
+class _InFlight:
+    def __init__(self, db: "_FakeFirestore", operation: str):
+        self.db, self.operation = db, operation
+
+    async def __aenter__(self) -> None:
+        self.db.check(self.operation)
+        in_flight = self.db.in_flight[self.operation] = self.db.in_flight.get(self.operation, 0) + 1
+        self.db.max_in_flight[self.operation] = max(self.db.max_in_flight.get(self.operation, 0), in_flight)
+        if self.db.latency:
+            try:
+                await asyncio.sleep(self.db.latency)
+            except asyncio.CancelledError:
+                self.db.in_flight[self.operation] -= 1
+                raise
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.db.in_flight[self.operation] -= 1
+
+
+class _FakeFirestore:
+    def __init__(self, latency: float = 0.0):
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.update_times: Dict[str, int] = {}
+        self.reads: List[str] = []
+        self.writes: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+        self.commits: List[int] = []
+        self.failures: Dict[str, List[Optional[Exception]]] = {}
+        self.latency = latency
+        self.queries = 0
+        self.aggregations = 0
+        self.in_flight: Dict[str, int] = {}
+        self.max_in_flight: Dict[str, int] = {}
+
+    def collection(self, collection_path: str) -> _Query:
+        return _Query(self, collection_path)
+
+    def document(self, document_path: str) -> _Doc:
+        return _Doc(self, document_path)
+
+    def batch(self) -> _Batch:
+        return _Batch(self)
+
+    @staticmethod
+    def write_option(last_update_time: Any) -> _LastUpdate:
+        return _LastUpdate(last_update_time)
+
+    def operation(self, name: str) -> _InFlight:
+        return _InFlight(self, name)
+
+    def check(self, operation: str) -> None:
+        """Raise the next queued failure for ``operation``, if any."""
+        if self.failures.get(operation):
+            failure = self.failures[operation].pop(0)
+            if failure is not None:
+                raise failure
+
+    def check_precondition(self, path: str, option: Optional[_LastUpdate]) -> None:
+        if option is not None and self.update_times.get(path) != option.last_update_time:
+            raise FailedPrecondition(f"Document changed since {option.last_update_time}: {path}")
+
+    def write(self, kind: str, path: str, data: Optional[Dict[str, Any]], merge: bool = False) -> None:
+        self.writes.append((kind, path, data))
+        if kind == "delete":
+            self.docs.pop(path, None)
+            self.update_times.pop(path, None)
+            return
+        self.update_times[path] = len(self.writes)
+        # Firestore's document size limit
+        assert len(json.dumps(data, default=str)) < 1048576
+        if kind == "set" and not merge:
+            self.docs[path] = {}
+        _apply(self.docs.setdefault(path, {}), data, dotted=kind == "update", merge=merge)
+
+
+class _FakePool:
+    def __init__(self, client: _FakeFirestore):
+        self.client = client
+        self.acquired = 0
+
+    async def acquire(self) -> _FakeFirestore:
+        self.acquired += 1
+        return self.client
+
+    async def release(self, client: _FakeFirestore) -> None:
+        return None
+
+
+@pytest.fixture
+def db() -> _FakeFirestore:
+    return _FakeFirestore()
+
+
+@pytest.fixture
+def firestore_pool(db) -> _FakePool:
+    return _FakePool(db)
@@ -4,8 +4,9 @@ from uuid import uuid4
 
 import pytest
 
+from coreservice import request_hub
 from coreservice.policy_patterns import PolicyPatternLoader
-from coreservice.request_hub import RequestHub
+from coreservice.request_hub import RequestHub, register_operation
 from coreservice.service_container import ServiceContainer, ServiceManager
 from pydantic_models.base.types import RequestStatus
 from pydantic_models.operations.casefile_ops import (
@@ -267,3 +268,94 @@ async def test_request_hub_composite_creates_casefile_and_session() -> None:
     stored_casefile = await casefile_service.repository.get_casefile(response.payload.casefile_id)
     assert stored_casefile is not None
     assert response.payload.session_id in stored_casefile.session_ids
+
+
+def _hub(casefile_service: _FakeCasefileService, **kwargs) -> RequestHub:
+    container = ServiceContainer()
+    container.register_service('casefile_service', lambda: casefile_service)
+    container.register_service('tool_session_service', lambda: _FakeToolSessionService())
+    container.register_service('communication_service', lambda: _FakeCommunicationService())
+    return RequestHub(service_manager=ServiceManager(container), **kwargs)
+
+
+def test_operations_are_compiled_into_the_routing_table() -> None:
+    assert set(request_hub.OPERATION_ROUTES) == {
+        "create_casefile", "workspace.casefile.create_casefile", "get_casefile", "update_casefile",
+        "list_casefiles", "delete_casefile", "add_session_to_casefile", "grant_permission",
+        "revoke_permission", "list_permissions", "check_permission", "store_gmail_messages",
+        "store_drive_files", "store_sheet_data", "create_session", "get_session", "list_sessions",
+        "close_session", "tool_execution", "process_tool_request", "create_chat_session",
+        "get_chat_session", "list_chat_sessions", "close_chat_session", "chat", "process_chat_request",
+        "workspace.casefile.create_casefile_with_session", "workspace.session.create_session_with_casefile",
+    }
+    assert request_hub.OPERATION_ROUTES["chat"] is request_hub.OPERATION_ROUTES["process_chat_request"]
+    with pytest.raises(ValueError):
+        register_operation("get_casefile", service="casefile_service", method="get_casefile")
+
+
+@pytest.mark.asyncio
+async def test_declared_operation_runs_the_standard_pipeline(monkeypatch) -> None:
+    monkeypatch.setattr(request_hub, "OPERATION_ROUTES", dict(request_hub.OPERATION_ROUTES))
+    casefile_service = _FakeCasefileService()
+    calls = []
+
+    async def archive(request, reason=None):
+        calls.append(reason)
+        return await casefile_service.create_casefile(request)
+
+    casefile_service.archive = archive
+    register_operation(
+        "workspace.casefile.archive",
+        service="casefile_service",
+        method="archive",
+        context={"casefile_id": lambda req, res: res.payload.casefile_id, "missing": lambda req, res: None},
+        call_kwargs=lambda req: {"reason": req.metadata["reason"]},
+    )
+    seen = []
+
+    async def capture(stage, request, context, response):
+        seen.append((stage, dict(context)))
+
+    hub = _hub(casefile_service, hook_handlers={"capture": capture})
+    request = CreateCasefileRequest(
+        user_id="user-3",
+        hooks=["capture"],
+        payload=CreateCasefilePayload(title="Archive me"),
+        metadata={"reason": "closed"},
+    )
+    request.operation = "workspace.casefile.archive"
+
+    response = await hub.dispatch(request)
+
+    assert calls == ["closed"]
+    assert [stage for stage, _ in seen] == ["pre", "post"]
+    post = seen[1][1]
+    assert post["casefile_id"] == response.payload.casefile_id
+    assert post["status"] == RequestStatus.COMPLETED.value
+    assert "missing" not in post
+
+
+@pytest.mark.asyncio
+async def test_policy_defaults_are_loaded_once_per_pattern() -> None:
+    class CountingLoader(PolicyPatternLoader):
+        loads = 0
+
+        def load(self, name):
+            CountingLoader.loads += 1
+            return super().load(name)
+
+    hub = _hub(_FakeCasefileService(), policy_loader=CountingLoader())
+    for _ in range(3):
+        await hub.dispatch(CreateCasefileRequest(user_id="user-4", payload=CreateCasefilePayload(title="t")))
+    response = await hub.dispatch(
+        CreateCasefileRequest(
+            user_id="user-4",
+            hooks=["metrics"],
+            policy_hints={"pattern": "tool_session_observer"},
+            payload=CreateCasefilePayload(title="t"),
+        )
+    )
+
+    assert CountingLoader.loads == 2
+    # Policy hooks and request hooks are merged without duplicates
+    assert {event["hook"] for event in response.metadata["hook_events"]} == {"metrics", "audit"}
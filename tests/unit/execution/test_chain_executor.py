@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import BaseModel, Field
+
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.execution import (
+    ChainCompilationError,
+    ChainDeadlineExceeded,
+    ChainExecutionError,
+    ChainExecutor,
+    RetryPolicy,
+    clear_chain_plan_cache,
+    compile_chain,
+)
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool
+
+
+class _FlakyParams(BaseModel):
+    fail_times: int = 0
+    error: str = "ConnectionError"
+
+
+class _SlowParams(BaseModel):
+    delay: float = 0.0
+    timeout_seconds: int = Field(default=30, ge=5, le=300)
+
+
+@pytest.fixture(autouse=True)
+def _tools():
+    calls: List[Dict[str, Any]] = []
+
+    @register_mds_tool(name="retry_test_flaky", params_model=_FlakyParams, description="Fails N times")
+    async def retry_test_flaky(ctx, fail_times: int, error: str) -> Dict[str, Any]:
+        calls.append({"tool": "retry_test_flaky"})
+        if sum(1 for c in calls if c["tool"] == "retry_test_flaky") <= fail_times:
+            raise {"ConnectionError": ConnectionError, "ValueError": ValueError}[error]("backend down")
+        return {"ok": True}
+
+    @register_mds_tool(name="retry_test_slow", params_model=_SlowParams, description="Sleeps")
+    async def retry_test_slow(ctx, delay: float, timeout_seconds: int) -> Dict[str, Any]:
+        calls.append({"tool": "retry_test_slow", "timeout_seconds": timeout_seconds})
+        await asyncio.sleep(delay)
+        return {"slept": delay}
+
+    clear_chain_plan_cache()
+    yield calls
+    clear_chain_plan_cache()
+    for name in ("retry_test_flaky", "retry_test_slow"):
+        MANAGED_TOOLS.pop(name, None)
+
+
+def _executor() -> ChainExecutor:
+    return ChainExecutor(MDSContext(user_id="user_1", session_id="ts_retry"))
+
+
+def _retry(**overrides: Any) -> Dict[str, Any]:
+    on_failure = {"action": "retry", "max_retries": 3, "backoff": {"initial_seconds": 0.001, "max_seconds": 0.01}}
+    on_failure.update(overrides)
+    return on_failure
+
+
+def test_retry_policy_backoff_is_exponential_capped_and_jittered():
+    policy = RetryPolicy.from_config(
+        {"max_retries": 5, "backoff": {"initial_seconds": 1, "max_seconds": 5, "multiplier": 2, "jitter": 0.5}}
+    )
+
+    assert [policy.delay_for(n, rng=lambda: 0.0) for n in range(1, 5)] == [1, 2, 4, 5]
+    assert policy.delay_for(2, rng=lambda: 1.0) == 1.0
+    assert policy.should_retry(ConnectionError(), 5)
+    assert not policy.should_retry(ConnectionError(), 6)
+
+
+def test_invalid_retry_policy_fails_compilation():
+    with pytest.raises(ChainCompilationError):
+        compile_chain([{"tool": "retry_test_flaky", "on_failure": {"action": "retry", "backoff": {"jitter": 2}}}])
+
+
+async def test_retry_recovers_without_touching_state(_tools):
+    result = await _executor().execute_chain(
+        [{"tool": "retry_test_flaky", "inputs": {"fail_times": 2}, "on_failure": _retry()}]
+    )
+
+    assert len(_tools) == 3
+    assert result["steps_succeeded"] == 1
+    assert result["execution_history"][-1]["attempt"] == 3
+    assert not any(key.endswith("_retry_count") for key in result["final_state"])
+
+
+async def test_retry_stops_on_exhaustion_and_non_retryable_errors(_tools):
+    with pytest.raises(ChainExecutionError, match="Max retries"):
+        await _executor().execute_chain(
+            [{"tool": "retry_test_flaky", "inputs": {"fail_times": 10}, "on_failure": _retry(max_retries=2)}]
+        )
+    assert len(_tools) == 3
+
+    _tools.clear()
+    with pytest.raises(ChainExecutionError, match="Non-retryable"):
+        await _executor().execute_chain(
+            [
+                {
+                    "tool": "retry_test_flaky",
+                    "inputs": {"fail_times": 10, "error": "ValueError"},
+                    "on_failure": _retry(retry_on=["ConnectionError", "TimeoutError"]),
+                }
+            ]
+        )
+    assert len(_tools) == 1
+
+
+async def test_deadline_caps_tool_timeout_and_cancels_slow_steps(_tools):
+    executor = _executor()
+
+    await executor.execute_chain([{"tool": "retry_test_slow", "inputs": {"timeout_seconds": 120}}], deadline_seconds=60)
+    assert _tools[0]["timeout_seconds"] == 60
+
+    await executor.execute_chain([{"tool": "retry_test_slow"}], deadline_seconds=1)
+    assert _tools[1]["timeout_seconds"] == 5  # clamped to the tool's minimum
+
+    with pytest.raises(ChainDeadlineExceeded):
+        await executor.execute_chain(
+            [{"tool": "retry_test_slow", "inputs": {"delay": 5}}, {"tool": "retry_test_flaky"}],
+            deadline_seconds=0.05,
+        )
+    assert [call["tool"] for call in _tools] == ["retry_test_slow"] * 3
@@ -0,0 +1,143 @@
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import BaseModel
+
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.execution import (
+    ChainCompilationError,
+    ChainExecutor,
+    ChainPlan,
+    TemplateAccessor,
+    clear_chain_plan_cache,
+    compile_chain,
+)
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool
+
+
+class _EchoParams(BaseModel):
+    value: Any = None
+
+
+class _CountParams(BaseModel):
+    items: List[Any] = []
+
+
+_TEST_TOOLS = ("chain_test_echo", "chain_test_count", "chain_test_fail")
+
+
+@pytest.fixture(autouse=True)
+def _chain_tools():
+    calls: List[Dict[str, Any]] = []
+
+    @register_mds_tool(name="chain_test_echo", params_model=_EchoParams, description="Echo a value")
+    async def chain_test_echo(ctx, value: Any = None) -> Dict[str, Any]:
+        calls.append({"tool": "chain_test_echo", "value": value})
+        return {"echo": value}
+
+    @register_mds_tool(name="chain_test_count", params_model=_CountParams, description="Count items")
+    async def chain_test_count(ctx, items: List[Any]) -> Dict[str, Any]:
+        calls.append({"tool": "chain_test_count", "items": items})
+        return {"count": len(items)}
+
+    @register_mds_tool(name="chain_test_fail", params_model=_EchoParams, description="Always fails")
+    async def chain_test_fail(ctx, value: Any = None) -> Dict[str, Any]:
+        calls.append({"tool": "chain_test_fail", "value": value})
+        raise RuntimeError("boom")
+
+    clear_chain_plan_cache()
+    yield calls
+    clear_chain_plan_cache()
+    for name in _TEST_TOOLS:
+        MANAGED_TOOLS.pop(name, None)
+
+
+def test_template_accessor_resolves_nested_paths():
+    state = {"a": {"b": [{"c": 1}, {"c": 2}]}, "query": "x", "spaced key": {"k": "v"}}
+
+    assert TemplateAccessor.parse("{{ state.a.b[1].c }}").resolve(state) == 2
+    assert TemplateAccessor.parse("{{ state.a.b[-1]['c'] }}").resolve(state) == 2
+    assert TemplateAccessor.parse("{{ query }}").resolve(state) == "x"
+    assert TemplateAccessor.parse("{{ state['spaced key'].k }}").resolve(state) == "v"
+    assert TemplateAccessor.parse("plain") is None
+
+
+def test_template_accessor_falls_back_to_raw_template_for_missing_paths():
+    accessor = TemplateAccessor.parse("{{ state.a.missing[0] }}")
+
+    assert accessor.resolve({"a": {}}) == "{{ state.a.missing[0] }}"
+    assert TemplateAccessor.parse("{{ state.items[5] }}").resolve({"items": [1]}) == "{{ state.items[5] }}"
+
+
+def test_compile_chain_resolves_named_branches_to_indices():
+    plan = compile_chain(
+        [
+            {"tool": "chain_test_echo", "on_success": {"next": "chain_test_count"}},
+            {"tool": "chain_test_fail", "on_failure": {"action": "continue", "next": "unknown_tool"}},
+            {"tool": "chain_test_count"},
+        ]
+    )
+
+    assert isinstance(plan, ChainPlan)
+    assert plan.find_step("chain_test_count") == 2
+    assert plan.steps[0].success_next == 2
+    assert plan.steps[1].failure_next == 2  # unknown target falls through sequentially
+    assert plan.steps[2].success_next == 3
+
+
+def test_compile_chain_rejects_unknown_tools_and_bad_templates():
+    with pytest.raises(ChainCompilationError) as exc_info:
+        compile_chain([{"tool": "chain_test_echo"}, {"tool": "not_registered"}])
+    assert exc_info.value.step_index == 1
+    assert exc_info.value.step_name == "not_registered"
+
+    with pytest.raises(ChainCompilationError):
+        compile_chain([{"inputs": {}}])
+
+    with pytest.raises(ChainCompilationError):
+        compile_chain([{"tool": "chain_test_echo", "inputs": {"value": "{{ state.a..b }}"}}])
+
+
+def test_named_plans_are_cached_until_steps_or_tools_change():
+    steps = [{"tool": "chain_test_echo", "inputs": {"value": "{{ state.v }}"}}]
+
+    plan = compile_chain(steps, chain_name="cached_chain")
+    assert compile_chain([dict(steps[0])], chain_name="cached_chain") is plan
+
+    changed = compile_chain([{"tool": "chain_test_echo", "inputs": {"value": 1}}], chain_name="cached_chain")
+    assert changed is not plan
+
+    @register_mds_tool(name="chain_test_echo", params_model=_EchoParams, description="Re-registered echo")
+    async def chain_test_echo(ctx, value: Any = None) -> Dict[str, Any]:
+        return {"echo": value}
+
+    reregistered = compile_chain([{"tool": "chain_test_echo", "inputs": {"value": 1}}], chain_name="cached_chain")
+    assert reregistered is not changed
+    assert reregistered.steps[0].tool_def is MANAGED_TOOLS["chain_test_echo"]
+
+
+async def test_execute_chain_uses_compiled_plan(_chain_tools):
+    ctx = MDSContext(user_id="user_1", session_id="ts_chain")
+    executor = ChainExecutor(ctx)
+    plan = compile_chain(
+        [
+            {
+                "tool": "chain_test_echo",
+                "inputs": {"value": "{{ state.payload.items[0] }}"},
+                "on_success": {"next": "chain_test_count", "map_outputs": {"echo": "first"}},
+            },
+            {"tool": "chain_test_fail", "inputs": {"value": "skipped"}},
+            {
+                "tool": "chain_test_count",
+                "inputs": {"items": ["{{ state.first }}", "{{ state.payload.items[-1] }}"]},
+                "on_success": {"map_outputs": {"count": "total"}},
+            },
+        ],
+        chain_name="compiled_e2e",
+    )
+
+    result = await executor.execute_chain(plan, initial_state={"payload": {"items": ["a", "b", "c"]}}, chain_name="compiled_e2e")
+
+    assert [call["tool"] for call in _chain_tools] == ["chain_test_echo", "chain_test_count"]
+    assert _chain_tools[1]["items"] == ["a", "c"]
+    assert result["final_state"]["total"] == 2
@@ -0,0 +1,181 @@
+from typing import Any, Dict
+
+import pytest
+
+from persistence.firestore.context_persistence import (
+    CHUNK_MANIFEST,
+    FirestorePersistenceProvider,
+    encode_field,
+    split_encoded,
+)
+
+SESSION_ID = "ts_251013_ctxstore01"
+
+
+def _context_data(events: int, messages: int) -> Dict[str, Any]:
+    return {
+        "session_id": SESSION_ID,
+        "user_id": "user@example.com",
+        "tool_events": [{"event_id": f"evt_{i:05d}", "tool_name": "search", "parameters": {"q": "é" * 40}} for i in range(events)],
+        "conversation_history": [{"role": "user", "content": "detail " * 30} for _ in range(messages)],
+        "persistent_state": {"big": "x" * 300_000},
+        "related_documents": [],
+    }
+
+
+def _chunk_count(main: Dict[str, Any]) -> int:
+    return sum(segment["count"] for entry in main[CHUNK_MANIFEST].values() for segment in entry["segments"])
+
+
+@pytest.fixture
+def db(db):
+    # Chunk loads overlap only if reads take a while
+    db.latency = 0.001
+    return db
+
+
+@pytest.fixture
+def provider(firestore_pool) -> FirestorePersistenceProvider:
+    return FirestorePersistenceProvider(firestore_pool, chunk_size=50_000, inline_limit=100_000, document_budget=200_000)
+
+
+def test_chunks_are_byte_bounded_and_cut_between_items():
+    encoded, boundaries = encode_field([{"n": i, "text": "ü" * 50} for i in range(200)])
+
+    chunks = split_encoded(encoded, boundaries, chunk_size=1000)
+
+    assert b"".join(chunks) == encoded
+    assert all(len(chunk) <= 1000 for chunk in chunks)
+    assert all(chunk.endswith(b"}") for chunk in chunks[:-1])
+    # An item larger than a chunk is cut anyway
+    encoded, boundaries = encode_field(["y" * 2500])
+    assert [len(chunk) for chunk in split_encoded(encoded, boundaries, 1000)] == [1000, 1000, 504]
+
+
+async def test_every_oversized_field_is_chunked_and_loaded_concurrently(db, provider):
+    data = _context_data(events=3000, messages=800)
+
+    assert await provider.save_context(SESSION_ID, data) is True
+
+    main = db.docs[f"mds_contexts/{SESSION_ID}"]
+    manifest = main[CHUNK_MANIFEST]
+    assert set(manifest) == {"tool_events", "conversation_history", "related_documents", "persistent_state"}
+    assert manifest["related_documents"]["segments"] == []
+    assert "tool_events" not in main and "session_id" in main
+    chunks = [path for path in db.docs if "/chunks/" in path]
+    assert len(chunks) == _chunk_count(main)
+    assert all(len(db.docs[path]["data"]) <= 50_000 for path in chunks)
+
+    db.reads.clear()
+    loaded = await provider.load_context(SESSION_ID)
+
+    assert {key: loaded[key] for key in data} == data
+    assert db.max_in_flight["get"] > 1 and len(db.reads) == len(chunks) + 1
+
+
+async def test_resave_replaces_previous_chunks(db, provider):
+    await provider.save_context(SESSION_ID, _context_data(events=3000, messages=0))
+    await provider.save_context(SESSION_ID, _context_data(events=500, messages=0))
+
+    main = db.docs[f"mds_contexts/{SESSION_ID}"]
+    chunks = [path for path in db.docs if "/chunks/" in path]
+    assert len(chunks) == _chunk_count(main)
+    assert len((await provider.load_context(SESSION_ID))["tool_events"]) == 500
+
+
+async def test_stream_field_yields_items_lazily(db, provider):
+    data = _context_data(events=3000, messages=10)
+    await provider.save_context(SESSION_ID, data)
+    count = _chunk_count(db.docs[f"mds_contexts/{SESSION_ID}"])
+
+    db.reads.clear()
+    stream = provider.stream_field(SESSION_ID, "tool_events")
+    first = []
+    async for item in stream:
+        first.append(item)
+        if len(first) == 5:
+            break
+    await stream.aclose()
+
+    assert first == data["tool_events"][:5]
+    assert len(db.reads) <= 1 + provider.max_concurrency + 1 < count
+
+    assert [item async for item in provider.stream_field(SESSION_ID, "tool_events")] == data["tool_events"]
+    assert [item async for item in provider.stream_field(SESSION_ID, "conversation_history")] == data["conversation_history"]
+
+
+async def test_legacy_documents_load_and_delete(db, provider):
+    db.docs[f"mds_contexts/{SESSION_ID}"] = {"session_id": SESSION_ID, "tool_events_chunked": True, "tool_events_count": 2}
+    db.docs[f"mds_contexts/{SESSION_ID}/tool_events_chunks/00000000"] = {"data": {"event_id": "evt_1"}, "index": 0}
+    db.docs[f"mds_contexts/{SESSION_ID}/tool_events_chunks/00000001"] = {"data": {"event_id": "evt_2"}, "index": 1}
+
+    loaded = await provider.load_context(SESSION_ID)
+
+    assert loaded == {"session_id": SESSION_ID, "tool_events": [{"event_id": "evt_1"}, {"event_id": "evt_2"}]}
+    assert await provider.delete_context(SESSION_ID) is True
+    assert db.docs == {}
+
+
+async def test_failed_save_is_reported_to_the_context_handler(db, provider):
+    db.failures["set"] = [RuntimeError("unavailable"), RuntimeError("unavailable")]
+
+    assert await provider.save_context(SESSION_ID, {"session_id": SESSION_ID}) is False
+    with pytest.raises(RuntimeError):
+        await provider.handler(SESSION_ID)({"session_id": SESSION_ID})
+
+
+async def test_appends_write_only_new_items_and_load_snapshot_plus_deltas(db, provider):
+    data = _context_data(events=3000, messages=5)
+    await provider.save_context(SESSION_ID, data)
+    before = {path for path in db.docs if "/chunks/" in path}
+
+    for turn in range(3):
+        data["tool_events"].extend({"event_id": f"evt_new_{turn}_{i}", "tool_name": "search"} for i in range(4))
+        data["conversation_history"].append({"role": "assistant", "content": f"turn {turn}"})
+        await provider.save_context(SESSION_ID, data)
+
+    added = {path for path in db.docs if "/chunks/" in path and "persistent_state" not in path} - before
+    manifest = db.docs[f"mds_contexts/{SESSION_ID}"][CHUNK_MANIFEST]
+    # One small chunk per field and turn; the 3000-event snapshot is untouched
+    assert len(added) == 6
+    assert {path for path in before if "tool_events" in path} <= set(db.docs)
+    assert [segment["items"] for segment in manifest["tool_events"]["segments"][1:]] == [4, 4, 4]
+    assert all(len(db.docs[path]["data"]) < 1000 for path in added)
+
+    loaded = await provider.load_context(SESSION_ID)
+    assert loaded["tool_events"] == data["tool_events"]
+    assert loaded["conversation_history"] == data["conversation_history"]
+    assert [item async for item in provider.stream_field(SESSION_ID, "tool_events")] == data["tool_events"]
+
+
+async def test_rewritten_history_replaces_the_log(db, provider):
+    data = _context_data(events=100, messages=0)
+    await provider.save_context(SESSION_ID, data)
+    data["tool_events"].append({"event_id": "evt_extra"})
+    await provider.save_context(SESSION_ID, data)
+
+    data["tool_events"] = data["tool_events"][:50]
+    await provider.save_context(SESSION_ID, data)
+
+    main = db.docs[f"mds_contexts/{SESSION_ID}"]
+    assert len(main[CHUNK_MANIFEST]["tool_events"]["segments"]) == 1
+    assert len([path for path in db.docs if "/chunks/" in path]) == _chunk_count(main)
+    assert (await provider.load_context(SESSION_ID))["tool_events"] == data["tool_events"]
+
+
+async def test_segments_are_compacted_into_a_snapshot(db, firestore_pool):
+    provider = FirestorePersistenceProvider(firestore_pool, max_segments=4)
+    data = _context_data(events=10, messages=0)
+    for turn in range(6):
+        data["tool_events"].append({"event_id": f"evt_turn_{turn}"})
+        await provider.save_context(SESSION_ID, data)
+
+    segments = db.docs[f"mds_contexts/{SESSION_ID}"][CHUNK_MANIFEST]["tool_events"]["segments"]
+    assert [segment["items"] for segment in segments] == [15, 1]
+
+    assert await provider.compact_context(SESSION_ID) is True
+
+    main = db.docs[f"mds_contexts/{SESSION_ID}"]
+    assert [segment["items"] for segment in main[CHUNK_MANIFEST]["tool_events"]["segments"]] == [16]
+    assert len([path for path in db.docs if "/chunks/" in path]) == _chunk_count(main)
+    assert (await provider.load_context(SESSION_ID))["tool_events"] == data["tool_events"]
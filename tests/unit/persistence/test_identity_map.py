@@ -0,0 +1,138 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+from pydantic import BaseModel
+
+from casefileservice.repository import CasefileRepository
+from coreservice.request_hub import RequestHub
+from coreservice.service_container import ServiceContainer, ServiceManager
+from persistence.base_repository import BaseRepository
+from persistence.identity_map import current_identity_map, identity_scope
+from pydantic_models.base.types import RequestStatus
+from pydantic_models.canonical.casefile import CasefileMetadata, CasefileModel
+from pydantic_models.operations.casefile_ops import (
+    CasefileDataPayload,
+    GetCasefilePayload,
+    GetCasefileRequest,
+    GetCasefileResponse,
+)
+
+
+class _Note(BaseModel):
+    id: str
+    text: str
+
+
+class _NoteRepository(BaseRepository[_Note]):
+    def __init__(self, pool):
+        super().__init__(collection_name="notes", firestore_pool=pool)
+
+    def _to_dict(self, model: _Note) -> Dict[str, Any]:
+        return {"text": model.text}
+
+    def _from_dict(self, doc_id: str, data: Dict[str, Any]) -> _Note:
+        return _Note(id=doc_id, text=data["text"])
+
+
+@pytest.fixture
+def db(db):
+    # Concurrent loads overlap only if reads take a while
+    db.latency = 0.001
+    db.docs["notes/n1"] = {"text": "first"}
+    return db
+
+
+async def test_documents_are_read_once_per_scope(db, firestore_pool):
+    notes = _NoteRepository(firestore_pool)
+
+    with identity_scope() as identity:
+        concurrent = await asyncio.gather(*(notes.get_by_id("n1") for _ in range(3)))
+        again = await notes.get_by_id("n1")
+        missing = await notes.get_by_id("n2"), await notes.get_by_id("n2")
+
+        assert db.reads == ["notes/n1", "notes/n2"]
+        assert all(note is again for note in concurrent) and missing == (None, None)
+        assert (identity.loads, identity.hits) == (2, 4)
+
+        # Nested scopes share the map
+        with identity_scope() as nested:
+            assert nested is identity
+
+    assert current_identity_map() is None
+    await notes.get_by_id("n1")
+    await notes.get_by_id("n1")
+    assert len(db.reads) == 4
+
+
+async def test_writes_in_scope_replace_the_mapped_document(db, firestore_pool):
+    notes = _NoteRepository(firestore_pool)
+
+    with identity_scope():
+        note = await notes.get_by_id("n1")
+        await notes.update("n1", _Note(id="n1", text="edited"))
+        assert (await notes.get_by_id("n1")).text == "edited" and note.text == "first"
+
+        await notes.create("n2", _Note(id="n2", text="new"))
+        assert (await notes.get_by_id("n2")).text == "new"
+
+        await notes.delete("n1")
+        assert await notes.get_by_id("n1") is None
+
+    assert db.reads == ["notes/n1"]
+
+
+async def test_failed_loads_are_not_remembered(db, firestore_pool):
+    notes = _NoteRepository(firestore_pool)
+    db.failures["get"] = [RuntimeError("unavailable")]
+
+    with identity_scope():
+        with pytest.raises(RuntimeError):
+            await notes.get_by_id("n1")
+        assert (await notes.get_by_id("n1")).text == "first"
+
+
+class _CasefileService:
+    def __init__(self, repository: CasefileRepository):
+        self.repository = repository
+
+    async def get_casefile(self, request: GetCasefileRequest) -> GetCasefileResponse:
+        casefile = await self.repository.get_casefile(request.payload.casefile_id)
+        return GetCasefileResponse(
+            request_id=request.request_id,
+            status=RequestStatus.COMPLETED,
+            payload=CasefileDataPayload(casefile=casefile),
+        )
+
+
+async def test_hub_hydration_and_handler_share_one_read(db, firestore_pool):
+    repository = CasefileRepository(firestore_pool)
+    casefile = CasefileModel(
+        metadata=CasefileMetadata(title="Smith v. Jones", description="Contract dispute", created_by="user@example.com"),
+        resources={"documents": []},
+    )
+    db.docs[f"casefiles/{casefile.id}"] = repository._to_dict(casefile)
+    container = ServiceContainer()
+    container.register_service("casefile_service", lambda: _CasefileService(repository))
+    hub = RequestHub(service_manager=ServiceManager(container))
+    seen = []
+
+    async def capture(stage, request, context, response):
+        seen.append(context.get("casefile"))
+
+    hub.hook_handlers["capture"] = capture
+    request = GetCasefileRequest(
+        user_id="user@example.com",
+        context_requirements=["casefile"],
+        hooks=["capture"],
+        payload=GetCasefilePayload(casefile_id=casefile.id),
+    )
+
+    response = await hub.dispatch(request)
+
+    assert db.reads == [f"casefiles/{casefile.id}"]
+    assert response.payload.casefile.metadata.title == "Smith v. Jones"
+    assert seen[0]["metadata"]["title"] == "Smith v. Jones"
+
+    await hub.dispatch(request)
+    assert len(db.reads) == 2
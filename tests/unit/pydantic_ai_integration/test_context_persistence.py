@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from typing import Any, Dict, List
+
+from pydantic_ai_integration.dependencies import MDSContext
+
+
+def _context() -> MDSContext:
+    return MDSContext(user_id="user@example.com", session_id="ts_251013_ctx001")
+
+
+def _run_chain(context: MDSContext, steps: int) -> None:
+    context.create_session_request("req_001")
+    context.plan_tool_chain([{"tool_name": f"tool_{i}"} for i in range(steps)], chain_name="triage")
+    for i in range(steps):
+        context.register_event(f"tool_{i}", {"step": i}, chain_context={"chain_name": "triage"})
+        context.add_conversation_message({"role": "assistant", "content": f"step {i} done"})
+        context.store_persistent_state("last_step", i)
+
+
+def test_new_context_is_clean_and_mutations_mark_fields():
+    context = _context()
+    assert context.dirty_fields == set()
+
+    context.add_conversation_message({"role": "user", "content": "hi"})
+    context.casefile_id = "cf_251013_abc123"
+
+    assert context.dirty_fields == {"conversation_history", "casefile_id"}
+
+
+async def test_chain_is_persisted_once_per_debounce_window():
+    saved: List[Dict[str, Any]] = []
+    context = _context()
+    context.set_persistence_handler(saved.append, auto_persist=True, debounce_seconds=0.02)
+
+    _run_chain(context, steps=10)
+    assert saved == []
+
+    await asyncio.sleep(0.1)
+
+    assert len(saved) == 1
+    assert len(saved[0]["tool_events"]) == 10
+    assert saved[0]["persistent_state"]["last_step"] == 9
+    assert context.dirty_fields == set()
+
+
+
+async def test_changes_made_during_a_debounced_write_are_persisted():
+    saved: List[Dict[str, Any]] = []
+    context = _context()
+
+    async def slow_handler(data: Dict[str, Any]) -> None:
+        if not saved:
+            # Mutation lands while the first write is in flight
+            context.add_conversation_message({"role": "user", "content": "late"})
+        await asyncio.sleep(0.01)
+        saved.append(data)
+
+    context.set_persistence_handler(slow_handler, auto_persist=True, debounce_seconds=0.01)
+    context.add_conversation_message({"role": "user", "content": "first"})
+
+    await asyncio.sleep(0.1)
+
+    assert len(saved) == 2
+    assert saved[-1]["conversation_history"][-1]["content"] == "late"
+    assert context.dirty_fields == set()
+
+async def test_flush_writes_pending_changes_off_the_event_loop():
+    threads: List[str] = []
+    context = _context()
+    context.set_persistence_handler(lambda data: threads.append(threading.current_thread().name), debounce_seconds=60)
+
+    assert await context.flush() is True
+    assert threads == []
+
+    _run_chain(context, steps=3)
+    assert await context.flush() is True
+    assert await context.flush() is True
+
+    assert len(threads) == 1
+    assert threads[0] != threading.current_thread().name
+
+
+async def test_async_handler_and_failed_flush_keeps_changes_pending():
+    saved: List[Dict[str, Any]] = []
+    failures = [RuntimeError("firestore unavailable")]
+
+    async def handler(data: Dict[str, Any]) -> None:
+        if failures:
+            raise failures.pop()
+        saved.append(data)
+
+    context = _context()
+    context.set_persistence_handler(handler)
+    context.link_related_document({"id": "doc_1"})
+
+    assert await context.flush() is False
+    assert context.dirty_fields == {"related_documents"}
+    assert await context.flush() is True
+    assert saved[0]["related_documents"][0]["id"] == "doc_1"
+
+
+def test_without_event_loop_changes_are_persisted_immediately():
+    saved: List[Dict[str, Any]] = []
+    context = _context()
+    context.set_persistence_handler(saved.append, auto_persist=True)
+
+    context.add_to_knowledge_graph("person", "p1", {"name": "Alice"})
+
+    assert len(saved) == 1
+    assert context.dirty_fields == set()
+
+
+def test_restored_context_is_clean():
+    source = _context()
+    _run_chain(source, steps=2)
+
+    restored = _context().from_persisted_state(source.model_dump())
+
+    assert len(restored.tool_events) == 2
+    assert restored.dirty_fields == set()
+
+
+def test_trusted_construction_round_trips_persisted_state():
+    source = _context()
+    _run_chain(source, steps=3)
+    state = source.model_dump(mode="json")
+
+    restored = MDSContext.from_trusted(state)
+
+    assert restored.model_dump(mode="json") == state
+    assert restored.tool_events[0].tool_name == "tool_0"
+    assert restored.dirty_fields == set()
+
+
+def test_serializability_is_checked_when_persisting_not_on_construction():
+    class Opaque:
+        def __str__(self) -> str:
+            return "opaque"
+
+    saved: List[Dict[str, Any]] = []
+    context = MDSContext(
+        user_id="user@example.com",
+        session_id="ts_251013_ctx001",
+        persistent_state={"handle": Opaque()},
+    )
+    assert isinstance(context.persistent_state["handle"], Opaque)
+
+    context.set_persistence_handler(saved.append)
+    assert context.persist() is True
+
+    assert saved[0]["persistent_state"] == {"handle": "opaque"}
+    assert context.persistent_state == {"handle": "opaque"}
@@ -0,0 +1,68 @@
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.event_index import ToolEventIndex
+from pydantic_models.canonical.tool_session import ToolEvent
+
+
+def _context() -> MDSContext:
+    return MDSContext(user_id="user@example.com", session_id="ts_251013_idx001")
+
+
+def _event(tool_name: str, timestamp: str, chain_id: str = None) -> ToolEvent:
+    return ToolEvent(event_type="tool_execution_completed", tool_name=tool_name, timestamp=timestamp, chain_id=chain_id)
+
+
+def test_chain_positions_and_history_come_from_the_index():
+    context = _context()
+    for i in range(300):
+        chain = "triage" if i % 3 else "filing"
+        context.register_event(f"tool_{i % 4}", {"step": i}, chain_context={"chain_name": chain})
+
+    triage_id = context.active_chains["triage"]["chain_id"]
+    triage = [event for event in context.tool_events if event.chain_id == triage_id]
+    assert [event.chain_position for event in triage] == list(range(1, 201))
+    assert context.event_index.chain_length(triage_id) == 200
+
+    history = context.get_relevant_history(tool_name="tool_1", chain_id=triage_id, limit=3)
+    expected = [e for e in triage if e.tool_name == "tool_1"][-3:]
+    assert [item["event_id"] for item in history] == [e.event_id for e in expected]
+
+    status = context.get_chain_status(chain_id=triage_id)
+    assert status["chain_id"] == triage_id and status["tools"][-1]["position"] == 200
+
+
+def test_events_appended_or_replaced_outside_the_context_are_indexed():
+    context = _context()
+    context.register_event("search", {}, chain_context={"chain_id": "c1"})
+    context.tool_events.append(_event("heavy_sum", "2025-10-13T12:00:00", chain_id="c1"))
+
+    assert context.register_event("search", {}, chain_context={"chain_id": "c1"})
+    assert context.tool_events[-1].chain_position == 3
+    assert [e["tool_name"] for e in context.get_relevant_history(tool_name="heavy_sum")] == ["heavy_sum"]
+
+    context.tool_events = [_event("other", "2025-10-13T12:00:00", chain_id="c1")]
+    assert context.event_index.chain_length("c1") == 1
+    assert context.get_relevant_history(tool_name="search") == []
+
+
+def test_time_range_queries():
+    index = ToolEventIndex()
+    events = [_event(f"t{i}", f"2025-10-13T12:{i:02d}:00") for i in range(10)]
+    index.sync(events)
+
+    assert [e.tool_name for e in index.between("2025-10-13T12:03:00", "2025-10-13T12:06:00")] == ["t3", "t4", "t5"]
+    assert len(index.between(start="2025-10-13T12:08:00")) == 2
+
+    # An out-of-order event falls back to a scan but stays correct
+    events.append(_event("late", "2025-10-13T12:04:30"))
+    index.sync(events)
+    assert [e.tool_name for e in index.between("2025-10-13T12:04:00", "2025-10-13T12:05:00")] == ["t4", "late"]
+
+
+def test_serialized_shape_is_unchanged():
+    context = _context()
+    context.register_event("search", {"q": "x"})
+
+    data = context.model_dump(mode="json")
+
+    assert set(data["tool_events"][0]) == set(ToolEvent.model_fields)
+    assert MDSContext.from_trusted(data).event_index.find(tool_name="search")[0].parameters == {"q": "x"}
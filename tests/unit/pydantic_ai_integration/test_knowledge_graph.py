@@ -0,0 +1,83 @@
+import pytest
+
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.knowledge_graph import KnowledgeGraph
+
+
+def _context() -> MDSContext:
+    return MDSContext(user_id="user@example.com", session_id="ts_251013_kg001")
+
+
+def _casefile_graph(context: MDSContext, people: int) -> None:
+    context.add_to_knowledge_graph("casefile", "cf_1", {"title": "Smith v. Jones"})
+    for i in range(people):
+        role = "witness" if i % 10 else "counsel"
+        context.add_to_knowledge_graph("person", f"p{i}", {"name": f"Person {i}", "role": role})
+        context.add_knowledge_relation(("person", f"p{i}"), "involved_in", ("casefile", "cf_1"))
+        if i:
+            context.add_knowledge_relation(("person", f"p{i}"), "knows", ("person", f"p{i - 1}"))
+
+
+def test_relations_are_stored_in_the_existing_dict_shape():
+    context = _context()
+    _casefile_graph(context, people=3)
+
+    graph = context.knowledge_graph
+    assert set(graph) == {"casefile", "person"}
+    assert graph["person"]["p1"]["_relations"] == [
+        {"relation": "involved_in", "target_type": "casefile", "target_id": "cf_1"},
+        {"relation": "knows", "target_type": "person", "target_id": "p0"},
+    ]
+    assert context.dirty_fields == {"knowledge_graph"}
+
+    # Updating an entity keeps the relations recorded for it
+    context.add_to_knowledge_graph("person", "p1", {"name": "Renamed"})
+    assert context.graph.neighbors(("person", "p1"), "knows") == [("person", "p0")]
+
+
+def test_neighbors_attribute_lookup_and_expansion():
+    context = _context()
+    _casefile_graph(context, people=2000)
+    graph = context.graph
+
+    assert len(graph.neighbors(("casefile", "cf_1"), "involved_in", direction="in")) == 2000
+    assert graph.neighbors(("person", "p5"), direction="both") == [("casefile", "cf_1"), ("person", "p4"), ("person", "p6")]
+    assert len(graph.entities("person", role="counsel")) == 200
+    assert graph.entities("person", role="counsel", name="Person 30") == [("person", "p30")]
+    assert graph.entities("person", limit=3) == [("person", "p0"), ("person", "p1"), ("person", "p2")]
+
+    expanded = graph.expand(("person", "p10"), hops=3, relation="knows")
+    assert expanded == {("person", "p10"): 0, ("person", "p9"): 1, ("person", "p8"): 2, ("person", "p7"): 3}
+    assert len(graph.expand(("casefile", "cf_1"), hops=2, direction="both", limit=50)) == 50
+    assert len(graph.edges("knows")) == 1999
+
+    with pytest.raises(ValueError):
+        graph.neighbors(("person", "p1"), direction="sideways")
+
+
+def test_attribute_index_follows_updates():
+    context = _context()
+    _casefile_graph(context, people=20)
+    assert len(context.graph.entities("person", role="counsel")) == 2
+
+    context.add_to_knowledge_graph("person", "p3", {"name": "Person 3", "role": "counsel"})
+    context.add_to_knowledge_graph("person", "p0", {"name": "Person 0", "role": "witness"})
+
+    assert sorted(context.graph.entities("person", role="counsel")) == [("person", "p10"), ("person", "p3")]
+
+
+def test_graph_survives_persistence_round_trip():
+    context = _context()
+    _casefile_graph(context, people=50)
+    saved = []
+    context.set_persistence_handler(saved.append)
+    context.persist()
+
+    # Normalization at persist time keeps the indexes usable
+    assert context.graph.neighbors(("person", "p2"), "knows") == [("person", "p1")]
+
+    restored = MDSContext.from_trusted(saved[0])
+    assert restored.graph.expand(("person", "p49"), hops=2, relation="knows") == {
+        ("person", "p49"): 0, ("person", "p48"): 1, ("person", "p47"): 2,
+    }
+    assert KnowledgeGraph.from_dict(saved[0]["knowledge_graph"]).to_dict() is saved[0]["knowledge_graph"]
@@ -0,0 +1,116 @@
+"""
+Tests for the LazyResult tool result envelope.
+
+Verifies that results are serialized once and reused, and that envelopes
+holding a LazyResult dump the same data as before.
+"""
+
+import copy
+from datetime import datetime
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+from pydantic_models.base.lazy_result import LazyResult
+from pydantic_models.base.types import RequestStatus
+from pydantic_models.canonical.tool_session import ToolEvent
+from pydantic_models.operations.tool_execution_ops import ToolResponse, ToolResponsePayload
+
+
+class CountingModel(BaseModel):
+    casefile_id: str
+    created_at: datetime
+
+    def model_dump(self, *args, **kwargs):
+        type(self).dumps += 1
+        return super().model_dump(*args, **kwargs)
+
+
+CountingModel.dumps = 0
+
+
+def _response(result: Any) -> ToolResponse:
+    return ToolResponse(
+        request_id="123e4567-e89b-12d3-a456-426614174000",
+        status=RequestStatus.COMPLETED,
+        payload=ToolResponsePayload(result=result),
+    )
+
+
+def test_mapping_access_and_equality():
+    lazy = LazyResult({"status": "success", "count": 2})
+
+    assert lazy["status"] == "success"
+    assert lazy.get("missing") is None
+    assert len(lazy) == 2
+    assert lazy == {"status": "success", "count": 2}
+
+
+def test_wrap_is_idempotent_and_handles_scalars():
+    lazy = LazyResult.wrap({"a": 1})
+
+    assert LazyResult.wrap(lazy) is lazy
+    assert LazyResult.wrap(42) == {"value": 42}
+    assert LazyResult.wrap(None) == {}
+
+
+def test_model_source_dumped_once_per_mode():
+    CountingModel.dumps = 0
+    lazy = LazyResult(CountingModel(casefile_id="cf_1", created_at=datetime(2025, 1, 1)))
+    response = _response(lazy)
+
+    first = response.model_dump(mode="json")
+    second = response.model_dump(mode="json")
+    response.model_dump_json()
+
+    assert first == second
+    assert first["payload"]["result"] == {"casefile_id": "cf_1", "created_at": "2025-01-01T00:00:00"}
+    assert CountingModel.dumps == 1
+
+    assert response.model_dump()["payload"]["result"]["created_at"] == datetime(2025, 1, 1)
+    assert CountingModel.dumps == 2
+
+
+def test_nested_lazy_result_serializes_inside_plain_dicts():
+    inner = LazyResult(CountingModel(casefile_id="cf_2", created_at=datetime(2025, 1, 2)))
+    response = _response({"status": "success", "result": inner})
+
+    dumped = response.model_dump(mode="json")
+
+    assert dumped["payload"]["result"]["result"]["created_at"] == "2025-01-02T00:00:00"
+    assert response.payload.result["result"] is inner
+
+
+def test_payload_accepts_plain_dict_and_deep_copies_do_not_share_source():
+    response = _response({"count": 0, "items": ["a"]})
+    clone = copy.deepcopy(response)
+    clone.payload.result.source["items"].append("b")
+
+    assert isinstance(response.payload.result, LazyResult)
+    assert clone.payload.result is not response.payload.result
+    assert response.payload.result == {"count": 0, "items": ["a"]}
+    assert copy.copy(response.payload.result) is response.payload.result
+    assert ToolResponse.model_validate(response.model_dump(mode="json")).payload.result == response.payload.result
+
+
+def test_deep_copies_reuse_cached_serialized_forms():
+    CountingModel.dumps = 0
+    lazy = LazyResult(CountingModel(casefile_id="cf_2", created_at=datetime(2025, 1, 2)))
+    lazy.to_python(), lazy.to_json()
+    clone = copy.deepcopy(lazy)
+
+    assert clone.source is not lazy.source and clone.source == lazy.source
+    assert clone.to_json() is lazy.to_json() and clone.to_python() is lazy.to_python()
+    assert CountingModel.dumps == 2
+
+
+def test_tool_event_reuses_cached_json_form():
+    inner = LazyResult(CountingModel(casefile_id="cf_3", created_at=datetime(2025, 1, 3)))
+    event = ToolEvent(
+        event_type="tool_execution_completed",
+        tool_name="get_casefile",
+        result_summary={"result": inner},
+    )
+
+    summary: Dict[str, Any] = event.result_summary
+    assert summary["result"] is inner.to_json()
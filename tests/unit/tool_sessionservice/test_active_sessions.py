@@ -0,0 +1,149 @@
+from typing import Dict, List, Optional
+
+import pytest
+
+from pydantic_ai_integration.session_manager import SessionManager
+from pydantic_models.canonical.tool_session import ToolSession
+from pydantic_models.operations.tool_session_ops import CloseSessionRequest, CreateSessionRequest
+from tool_sessionservice import active_sessions
+from tool_sessionservice.active_sessions import ActiveSessionIndex, configure_active_session_index
+from tool_sessionservice.service import ToolSessionService
+
+USER_ID = "user@example.com"
+CASEFILE_ID = "cf_251013_abc123"
+
+
+class _FakeRepository:
+    def __init__(self):
+        self.sessions: Dict[str, ToolSession] = {}
+        self.list_calls = 0
+        self.get_calls = 0
+
+    async def create_session(self, session: ToolSession) -> None:
+        self.sessions[session.session_id] = session.model_copy()
+
+    async def get_session(self, session_id: str) -> Optional[ToolSession]:
+        self.get_calls += 1
+        session = self.sessions.get(session_id)
+        return session.model_copy() if session else None
+
+    async def update_session(self, session: ToolSession) -> None:
+        self.sessions[session.session_id] = session.model_copy()
+
+    async def list_sessions(self, user_id: Optional[str] = None, casefile_id: Optional[str] = None) -> List[ToolSession]:
+        self.list_calls += 1
+        return [s.model_copy() for s in self.sessions.values() if s.user_id == user_id]
+
+    async def get_session_counts(self, session: ToolSession):
+        return session.request_count, session.event_count
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        self.values[key] = value
+        return True
+
+    async def delete(self, key: str) -> bool:
+        return self.values.pop(key, None) is not None
+
+
+@pytest.fixture
+def repository() -> _FakeRepository:
+    return _FakeRepository()
+
+
+@pytest.fixture
+def service(repository) -> ToolSessionService:
+    return ToolSessionService(repository=repository, active_sessions=ActiveSessionIndex())
+
+
+@pytest.fixture
+def manager(service) -> SessionManager:
+    return SessionManager(session_service=service)
+
+
+async def test_resume_is_a_single_lookup_without_listing(service, manager, repository):
+    created = await service.create_session(CreateSessionRequest(user_id=USER_ID, payload={}))
+    session_id = created.payload.session_id
+
+    for _ in range(3):
+        context, was_created = await manager.ensure_session_context(USER_ID)
+        assert context.session_id == session_id
+        assert was_created is False
+
+    assert repository.list_calls == 0
+    assert repository.get_calls == 3
+
+
+async def test_closed_session_is_not_resumed(service, manager, repository):
+    created = await service.create_session(CreateSessionRequest(user_id=USER_ID, payload={}))
+    session_id = created.payload.session_id
+    await service.close_session(CloseSessionRequest(user_id=USER_ID, payload={"session_id": session_id}))
+
+    assert await service.active_sessions.get(USER_ID, None) is None
+    assert await manager._find_existing_session(USER_ID) is None
+
+
+async def test_stale_entry_is_dropped(service, repository):
+    created = await service.create_session(CreateSessionRequest(user_id=USER_ID, payload={}))
+    session_id = created.payload.session_id
+    repository.sessions[session_id].active = False  # closed by another instance
+
+    assert await service.find_active_session(USER_ID) is None
+    assert await service.active_sessions.get(USER_ID, None) is None
+
+
+async def test_stale_entry_falls_back_to_an_older_active_session(service, repository):
+    older = ToolSession(session_id="ts_old", user_id=USER_ID, created_at="2025-10-01T10:00:00")
+    await repository.create_session(older)
+    created = await service.create_session(CreateSessionRequest(user_id=USER_ID, payload={}))
+    repository.sessions[created.payload.session_id].active = False  # closed by another instance
+
+    assert (await service.find_active_session(USER_ID)).session_id == "ts_old"
+    assert await service.active_sessions.get(USER_ID, None) == "ts_old"
+    assert repository.list_calls == 1
+
+
+async def test_index_miss_falls_back_to_scan_once(service, repository):
+    older = ToolSession(session_id="ts_old", user_id=USER_ID, casefile_id=CASEFILE_ID, created_at="2025-10-01T10:00:00")
+    newer = ToolSession(session_id="ts_new", user_id=USER_ID, casefile_id=CASEFILE_ID, created_at="2025-10-02T10:00:00")
+    other = ToolSession(session_id="ts_user_only", user_id=USER_ID, created_at="2025-10-03T10:00:00")
+    for session in (older, newer, other):
+        await repository.create_session(session)
+
+    assert (await service.find_active_session(USER_ID, CASEFILE_ID)).session_id == "ts_new"
+    assert (await service.find_active_session(USER_ID, CASEFILE_ID)).session_id == "ts_new"
+    assert repository.list_calls == 1
+
+
+async def test_discard_keeps_newer_session():
+    index = ActiveSessionIndex()
+    await index.put(USER_ID, CASEFILE_ID, "ts_1")
+    await index.put(USER_ID, CASEFILE_ID, "ts_2")
+
+    await index.discard(USER_ID, CASEFILE_ID, "ts_1")
+
+    assert await index.get(USER_ID, CASEFILE_ID) == "ts_2"
+
+
+async def test_redis_backed_index_is_shared_between_workers(repository, monkeypatch):
+    monkeypatch.setattr(active_sessions, "_active_session_index", None)
+    redis = _FakeRedis()
+    configured = configure_active_session_index(redis)
+    worker_a = ToolSessionService(repository=repository)
+    worker_b = ToolSessionService(repository=repository, active_sessions=ActiveSessionIndex(redis_cache=redis))
+    assert worker_a.active_sessions is configured
+
+    created = await worker_a.create_session(CreateSessionRequest(user_id=USER_ID, payload={}))
+    session_id = created.payload.session_id
+    assert await worker_b.active_sessions.get(USER_ID, None) == session_id
+
+    # A close (e.g. by the expiry sweeper) in one worker is seen by the other
+    await worker_b.active_sessions.discard(USER_ID, None, session_id)
+    assert await worker_a.active_sessions.get(USER_ID, None) is None
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from coreservice.id_service import get_id_service
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool
+from pydantic_models.base.types import RequestStatus
+from pydantic_models.canonical.tool_session import ToolSession
+from pydantic_models.operations.tool_execution_ops import ToolRequest, ToolResponse
+from tool_sessionservice.idempotency import IdempotencyStore
+from tool_sessionservice.service import ToolSessionService
+
+USER_ID = "user@example.com"
+
+
+class _FakeToolSessionRepository:
+    def __init__(self, session: ToolSession) -> None:
+        self.sessions: Dict[str, ToolSession] = {session.session_id: session}
+        self.requests: List[str] = []
+        self.responses: Dict[str, ToolResponse] = {}
+
+    async def get_session(self, session_id: str) -> Optional[ToolSession]:
+        return self.sessions.get(session_id)
+
+    async def update_session(self, session: ToolSession) -> None:
+        self.sessions[session.session_id] = session
+
+    async def add_request_to_session(
+        self, session_id: str, request: ToolRequest, trim_request_ids: bool = False
+    ) -> None:
+        self.requests.append(str(request.request_id))
+
+    async def add_event_to_request(self, session_id: str, request_id: str, event: Any) -> None:
+        return None
+
+    async def update_request_response(self, session_id: str, request_id: str, response: ToolResponse) -> None:
+        self.responses[request_id] = response
+
+    async def update_activity(self, session_id: str) -> None:
+        return None
+
+
+class _SlowParams(BaseModel):
+    value: int = 0
+
+
+@pytest.fixture
+def executions():
+    calls: List[int] = []
+    gate = asyncio.Event()
+
+    @register_mds_tool(name="idempotency_test_tool", params_model=_SlowParams, description="Counts executions")
+    async def idempotency_test_tool(ctx, value: int) -> Dict[str, Any]:
+        calls.append(value)
+        await gate.wait()
+        if value < 0:
+            raise RuntimeError("negative")
+        return {"value": value, "execution": len(calls)}
+
+    yield calls, gate
+    MANAGED_TOOLS.pop("idempotency_test_tool", None)
+
+
+@pytest.fixture
+def service():
+    session = ToolSession(session_id=get_id_service().new_tool_session_id(USER_ID, None), user_id=USER_ID)
+    repository = _FakeToolSessionRepository(session)
+    return ToolSessionService(repository=repository, idempotency_store=IdempotencyStore(ttl_seconds=60)), session
+
+
+def _request(session_id: str, client_request_id: Optional[str], value: int = 1) -> ToolRequest:
+    return ToolRequest(
+        user_id=USER_ID,
+        session_id=session_id,
+        payload={
+            "tool_name": "idempotency_test_tool",
+            "parameters": {"value": value},
+            "session_request_id": client_request_id,
+        },
+    )
+
+
+async def test_duplicate_requests_return_stored_response(service, executions):
+    svc, session = service
+    calls, gate = executions
+    gate.set()
+
+    first = await svc.process_tool_request(_request(session.session_id, "req_001"))
+    retry = await svc.process_tool_request(_request(session.session_id, "req_001"))
+
+    assert calls == [1]
+    assert retry.payload.result == first.payload.result
+    assert retry.metadata["idempotent_replay"] is True
+    assert len(svc.repository.requests) == 1
+
+
+async def test_in_flight_duplicates_share_one_execution(service, executions):
+    svc, session = service
+    calls, gate = executions
+
+    tasks = [asyncio.create_task(svc.process_tool_request(_request(session.session_id, "req_002"))) for _ in range(3)]
+    await asyncio.sleep(0)
+    gate.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert calls == [1]
+    assert {r.payload.result["execution"] for r in responses} == {1}
+    assert sum(1 for r in responses if r.metadata.get("idempotent_replay")) == 2
+
+
+async def test_requests_without_client_id_or_failures_are_not_deduplicated(service, executions):
+    svc, session = service
+    calls, gate = executions
+    gate.set()
+
+    await svc.process_tool_request(_request(session.session_id, None))
+    await svc.process_tool_request(_request(session.session_id, None))
+    failed = await svc.process_tool_request(_request(session.session_id, "req_003", value=-1))
+    retried = await svc.process_tool_request(_request(session.session_id, "req_003", value=-1))
+
+    assert len(calls) == 4
+    assert failed.status == RequestStatus.FAILED
+    assert "idempotent_replay" not in retried.metadata
+
+
+async def test_store_records_expire():
+    store = IdempotencyStore(ttl_seconds=0)
+    response = ToolResponse(
+        request_id="00000000-0000-0000-0000-000000000001",
+        status=RequestStatus.COMPLETED,
+        payload={"result": {}},
+    )
+    await store.put("ts_x:req", response)
+
+    assert await store.get("ts_x:req") is None
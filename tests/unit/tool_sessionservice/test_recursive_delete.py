@@ -0,0 +1,102 @@
+from typing import List
+
+import pytest
+
+from persistence.recursive_delete import DeleteProgress, RecursiveDeleter
+from tool_sessionservice.repository import ToolSessionRepository
+
+SESSION_ID = "ts_251013_del001"
+
+
+def _session_tree(db, requests: int, events_per_request: int) -> None:
+    db.docs[f"sessions/{SESSION_ID}"] = {"session_id": SESSION_ID}
+    for r in range(requests):
+        db.docs[f"sessions/{SESSION_ID}/requests/req{r:05d}"] = {}
+        for e in range(events_per_request):
+            db.docs[f"sessions/{SESSION_ID}/requests/req{r:05d}/events/evt{e}"] = {}
+    db.docs["sessions/ts_other"] = {"session_id": "ts_other"}
+
+
+@pytest.fixture
+def db(db):
+    # Commits overlap only if they take a while
+    db.latency = 0.01
+    return db
+
+
+async def test_session_tree_is_deleted_in_concurrent_full_batches(db, firestore_pool):
+    _session_tree(db, requests=1000, events_per_request=5)
+    repository = ToolSessionRepository(firestore_pool=firestore_pool)
+    reported: List[int] = []
+    repository.deleter.on_progress = lambda progress: reported.append(progress.documents_deleted)
+
+    progress = await repository.delete_session(SESSION_ID)
+
+    assert list(db.docs) == ["sessions/ts_other"]
+    assert progress.documents_deleted == 6001
+    assert progress.batches_committed == 12
+    assert db.commits == [500] * 12
+    assert 1 < db.max_in_flight["commit"] <= repository.deleter.max_concurrency
+    assert reported == sorted(reported) and reported[-1] == 6000
+    assert repository.firestore_pool.acquired == 2
+
+
+async def test_subcollections_are_discovered_when_no_tree_is_given(db):
+    db.docs["casefiles/cf_1"] = {}
+    db.docs["casefiles/cf_1/notes/n1"] = {}
+    db.docs["casefiles/cf_1/notes/n1/comments/c1"] = {}
+    db.docs["casefiles/cf_1/files/f1"] = {}
+    db.docs["casefiles/cf_2/notes/n1"] = {}
+
+    progress = await RecursiveDeleter(batch_size=2).delete_document(db, db.document("casefiles/cf_1"))
+
+    assert list(db.docs) == ["casefiles/cf_2/notes/n1"]
+    assert progress == DeleteProgress(documents_deleted=4, batches_committed=2, collections_scanned=3)
+
+
+async def test_listing_pages_through_large_collections(db):
+    for r in range(26):
+        db.docs[f"root/items/i{r:03d}"] = {}
+    deleter = RecursiveDeleter(batch_size=10, page_size=10)
+
+    progress = await deleter.delete_subcollections(db, db.document("root"), {"items": {}})
+
+    assert progress.documents_deleted == 26
+    assert sorted(db.commits) == [6, 10, 10]
+    assert db.docs == {}
+    # The short third page ends the listing
+    assert db.queries == 3
+
+
+async def test_failed_commit_stops_the_walk(db):
+    for r in range(100):
+        db.docs[f"root/items/i{r:03d}"] = {}
+    db.failures["commit"] = [RuntimeError("unavailable")]
+    deleter = RecursiveDeleter(batch_size=10, page_size=10, max_concurrency=2)
+
+    with pytest.raises(RuntimeError):
+        await deleter.delete_subcollections(db, db.document("root"), {"items": {}})
+
+    assert db.queries < 10
+    assert len(db.docs) > 50
+    assert db.in_flight.get("commit", 0) == 0
+
+
+async def test_failed_listing_cancels_commits_in_flight(db):
+    for r in range(20):
+        db.docs[f"root/items/i{r:03d}"] = {}
+    db.failures["stream"] = [None, RuntimeError("unavailable")]
+    deleter = RecursiveDeleter(batch_size=10, page_size=10)
+
+    with pytest.raises(RuntimeError):
+        await deleter.delete_subcollections(db, db.document("root"), {"items": {}})
+
+    # The first page's commit was started, then cancelled before it applied
+    assert db.max_in_flight["commit"] == 1
+    assert db.in_flight["commit"] == 0
+    assert len(db.docs) == 20
+
+
+def test_batch_size_is_limited_to_firestore_maximum():
+    with pytest.raises(ValueError):
+        RecursiveDeleter(batch_size=501)
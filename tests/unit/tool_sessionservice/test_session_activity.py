@@ -0,0 +1,90 @@
+import asyncio
+from typing import Dict, List
+
+from tool_sessionservice.activity import SessionActivityTracker, flush_session_activity
+from tool_sessionservice.repository import ToolSessionRepository
+
+
+class _Recorder:
+    def __init__(self, fail: int = 0):
+        self.batches: List[Dict[str, str]] = []
+        self.fail = fail
+
+    async def __call__(self, updates: Dict[str, str]) -> None:
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("firestore unavailable")
+        self.batches.append(dict(updates))
+
+
+async def test_chatty_sessions_get_one_write_per_interval():
+    write = _Recorder()
+    tracker = SessionActivityTracker(write, interval_seconds=0.05)
+
+    for i in range(50):
+        tracker.touch("ts_a", at=f"2025-10-13T10:00:{i:02d}")
+        tracker.touch("ts_b")
+    assert write.batches == []
+
+    await asyncio.sleep(0.1)
+
+    assert len(write.batches) == 1
+    assert set(write.batches[0]) == {"ts_a", "ts_b"}
+    assert write.batches[0]["ts_a"] == "2025-10-13T10:00:49"
+    assert tracker.pending == {}
+    await tracker.close()
+
+
+async def test_failed_flush_is_requeued():
+    write = _Recorder(fail=1)
+    tracker = SessionActivityTracker(write, interval_seconds=60)
+    tracker.touch("ts_a", at="2025-10-13T10:00:00")
+
+    assert await tracker.flush() == 0
+    assert tracker.last_seen("ts_a") == "2025-10-13T10:00:00"
+    assert await tracker.flush() == 1
+    assert write.batches == [{"ts_a": "2025-10-13T10:00:00"}]
+
+
+async def test_pending_activity_is_written_on_shutdown():
+    write = _Recorder()
+    tracker = SessionActivityTracker(write, interval_seconds=60)
+    tracker.touch("ts_a")
+
+    await flush_session_activity()
+
+    assert list(write.batches[0]) == ["ts_a"]
+
+
+def _activity_writes(db) -> List[str]:
+    return sorted(path for kind, path, data in db.writes if kind == "update" and set(data) == {"updated_at"})
+
+
+async def test_repository_batches_activity_updates(db, firestore_pool):
+    repository = ToolSessionRepository(firestore_pool=firestore_pool, activity_flush_seconds=60)
+    for session_id in ("ts_a", "ts_b", "ts_c"):
+        db.docs[f"sessions/{session_id}"] = {"session_id": session_id}
+
+    for _ in range(10):
+        for session_id in ("ts_a", "ts_b", "ts_c"):
+            await repository.update_activity(session_id)
+    assert db.commits == []
+
+    await repository.activity.close()
+
+    assert db.commits == [3]
+    assert _activity_writes(db) == ["sessions/ts_a", "sessions/ts_b", "sessions/ts_c"]
+
+
+async def test_deleted_session_does_not_block_the_batch(db, firestore_pool):
+    repository = ToolSessionRepository(firestore_pool=firestore_pool, activity_flush_seconds=60)
+    for session_id in ("ts_a", "ts_b"):
+        db.docs[f"sessions/{session_id}"] = {"session_id": session_id}
+    for session_id in ("ts_a", "ts_gone", "ts_b"):
+        await repository.update_activity(session_id)
+
+    assert await repository.activity.flush() == 3
+
+    assert db.commits == [2]
+    assert _activity_writes(db) == ["sessions/ts_a", "sessions/ts_b"]
+    assert repository.activity.pending == {}
@@ -0,0 +1,139 @@
+from typing import Optional
+
+import pytest
+
+from coreservice.id_service import get_id_service
+from pydantic_models.canonical.tool_session import RECENT_REQUEST_IDS_LIMIT, ToolEvent, ToolSession
+from pydantic_models.operations.tool_execution_ops import ToolRequest
+from tool_sessionservice.repository import ToolSessionRepository
+
+USER_ID = "user@example.com"
+
+
+@pytest.fixture
+def repository(firestore_pool) -> ToolSessionRepository:
+    return ToolSessionRepository(firestore_pool=firestore_pool)
+
+
+def _request(session_id: str, timestamp: Optional[str] = None) -> ToolRequest:
+    request = ToolRequest(
+        user_id=USER_ID,
+        session_id=session_id,
+        payload={"tool_name": "get_casefile_tool", "parameters": {}},
+    )
+    if timestamp:
+        request.timestamp = timestamp
+    return request
+
+
+async def test_counters_maintained_on_writes_and_read_from_session_document(repository, db):
+    session = ToolSession(session_id=get_id_service().new_tool_session_id(USER_ID, None), user_id=USER_ID)
+    db.docs[f"sessions/{session.session_id}"] = repository._to_dict(session)
+
+    for _ in range(3):
+        request = _request(session.session_id)
+        session.request_ids.append(str(request.request_id))
+        await repository.update_session(session)
+        await repository.add_request_to_session(session.session_id, request)
+        for event_type in ("tool_request_received", "tool_response_sent"):
+            event = ToolEvent(event_type=event_type, tool_name="get_casefile_tool")
+            await repository.add_event_to_request(session.session_id, str(request.request_id), event)
+    # Whole-document updates must not reset the counters
+    await repository.update_session(session)
+
+    db.reads.clear()
+    stored = await repository.get_session(session.session_id)
+    counts = await repository.get_session_counts(stored)
+
+    assert counts == (3, 6)
+    assert len(db.reads) == 1
+    assert db.aggregations == 0
+
+
+async def test_legacy_session_counts_are_aggregated_once_and_backfilled(repository, db):
+    session_id = get_id_service().new_tool_session_id(USER_ID, None)
+    request_ids = ["req_a", "req_b"]
+    db.docs[f"sessions/{session_id}"] = {
+        "session_id": session_id,
+        "user_id": USER_ID,
+        "request_ids": request_ids,
+    }
+    for request_id, events in zip(request_ids, (2, 3)):
+        db.docs[f"sessions/{session_id}/requests/{request_id}"] = {"event_ids": []}
+        for index in range(events):
+            db.docs[f"sessions/{session_id}/requests/{request_id}/events/e{index}"] = {}
+
+    legacy = await repository.get_session(session_id)
+    assert await repository.get_session_counts(legacy) == (2, 5)
+    assert db.aggregations == 3
+
+    backfilled = await repository.get_session(session_id)
+    assert await repository.get_session_counts(backfilled) == (2, 5)
+    assert db.aggregations == 3
+
+
+async def test_session_document_keeps_recent_ids_and_history_pages_newest_first(repository, db):
+    session = ToolSession(session_id=get_id_service().new_tool_session_id(USER_ID, None), user_id=USER_ID)
+    db.docs[f"sessions/{session.session_id}"] = repository._to_dict(session)
+
+    request_ids = []
+    for index in range(45):
+        request = _request(session.session_id, timestamp=f"2025-10-13T10:{index // 60:02d}:{index % 60:02d}")
+        request_ids.append(str(request.request_id))
+        session.record_request(str(request.request_id))
+        await repository.add_request_to_session(
+            session.session_id, request, trim_request_ids=len(session.request_ids) >= RECENT_REQUEST_IDS_LIMIT
+        )
+
+    stored = await repository.get_session(session.session_id)
+    assert stored.request_ids == request_ids[-RECENT_REQUEST_IDS_LIMIT:]
+    assert await repository.get_session_counts(stored) == (45, 0)
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = await repository.list_requests(session.session_id, limit=20, before=cursor)
+        pages.append([entry["request_id"] for entry in page])
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [20, 20, 5]
+    assert [request_id for page in pages for request_id in page] == request_ids[::-1]
+    assert pages[0][0] == request_ids[-1]
+
+
+async def test_concurrent_requests_keep_every_id_in_the_window(repository, db):
+    session = ToolSession(session_id=get_id_service().new_tool_session_id(USER_ID, None), user_id=USER_ID)
+    db.docs[f"sessions/{session.session_id}"] = repository._to_dict(session)
+    first, second = _request(session.session_id), _request(session.session_id)
+
+    # Both callers hold the same (empty) snapshot of the session
+    for request in (first, second):
+        await repository.add_request_to_session(session.session_id, request)
+
+    stored = await repository.get_session(session.session_id)
+    assert stored.request_ids == [str(first.request_id), str(second.request_id)]
+
+    requests = [_request(session.session_id) for _ in range(RECENT_REQUEST_IDS_LIMIT + 5)]
+    for request in requests:
+        await repository.add_request_to_session(session.session_id, request)
+    await repository.add_request_to_session(session.session_id, _request(session.session_id), trim_request_ids=True)
+
+    stored = await repository.get_session(session.session_id)
+    assert len(stored.request_ids) == RECENT_REQUEST_IDS_LIMIT
+    assert stored.request_ids[-2] == str(requests[-1].request_id)
+
+
+async def test_history_pages_do_not_skip_requests_sharing_a_timestamp(repository, db):
+    session = ToolSession(session_id=get_id_service().new_tool_session_id(USER_ID, None), user_id=USER_ID)
+    db.docs[f"sessions/{session.session_id}"] = repository._to_dict(session)
+    for _ in range(7):
+        await repository.add_request_to_session(session.session_id, _request(session.session_id, "2025-10-13T10:00:00"))
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await repository.list_requests(session.session_id, limit=3, before=cursor)
+        seen.extend(entry["request_id"] for entry in page)
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 7
@@ -0,0 +1,116 @@
+from datetime import UTC, datetime, timedelta
+from typing import List
+
+import pytest
+
+from tool_sessionservice import expiry
+from tool_sessionservice.active_sessions import ActiveSessionIndex
+from tool_sessionservice.expiry import SessionExpirySweeper
+from tool_sessionservice.repository import ToolSessionRepository
+
+NOW = datetime.now(UTC)
+
+
+@pytest.fixture
+def repository(firestore_pool) -> ToolSessionRepository:
+    return ToolSessionRepository(firestore_pool=firestore_pool, activity_flush_seconds=60)
+
+
+def _session(db, session_id: str, idle_minutes: int, active: bool = True, casefile_id=None) -> None:
+    db.docs[f"sessions/{session_id}"] = {
+        "user_id": "user@example.com",
+        "casefile_id": casefile_id,
+        "active": active,
+        "updated_at": NOW - timedelta(minutes=idle_minutes),
+    }
+
+
+async def test_sweep_closes_idle_sessions_and_updates_resume_index(db, repository):
+    _session(db, "ts_idle", idle_minutes=120, casefile_id="cf_1")
+    _session(db, "ts_recent", idle_minutes=5, casefile_id="cf_2")
+    _session(db, "ts_closed", idle_minutes=300, active=False)
+    index = ActiveSessionIndex()
+    await index.put("user@example.com", "cf_1", "ts_idle")
+    await index.put("user@example.com", "cf_2", "ts_recent")
+
+    closed = await SessionExpirySweeper(repository, active_sessions=index, idle_ttl_seconds=3600).sweep_once()
+
+    assert closed == 1
+    assert db.docs["sessions/ts_idle"]["active"] is False
+    assert db.docs["sessions/ts_recent"]["active"] is True
+    assert await index.get("user@example.com", "cf_1") is None
+    assert await index.get("user@example.com", "cf_2") == "ts_recent"
+
+
+async def test_sessions_with_pending_activity_are_kept(db, repository):
+    _session(db, "ts_a", idle_minutes=120)
+    _session(db, "ts_b", idle_minutes=120)
+    await repository.update_activity("ts_b")
+
+    closed = await SessionExpirySweeper(repository, active_sessions=ActiveSessionIndex()).sweep_once()
+
+    assert closed == 1
+    assert db.docs["sessions/ts_b"]["active"] is True
+    await repository.activity.close()
+
+
+async def test_sweep_pages_past_sessions_with_pending_activity(db, repository):
+    # The oldest full page is all pending; the newer idle sessions are still closed
+    for i, session_id in enumerate(["ts_a", "ts_b", "ts_c", "ts_d", "ts_e"]):
+        _session(db, session_id, idle_minutes=200 - i)
+    await repository.update_activity("ts_a")
+    await repository.update_activity("ts_b")
+
+    closed = await SessionExpirySweeper(repository, active_sessions=ActiveSessionIndex(), batch_size=2).sweep_once()
+
+    assert closed == 3
+    assert [db.docs[f"sessions/{session_id}"]["active"] for session_id in ("ts_a", "ts_b", "ts_c", "ts_d", "ts_e")] == [
+        True, True, False, False, False
+    ]
+    await repository.activity.close()
+
+
+async def test_session_written_after_listing_is_not_closed(db, repository, monkeypatch):
+    _session(db, "ts_a", idle_minutes=120, casefile_id="cf_1")
+    _session(db, "ts_b", idle_minutes=110, casefile_id="cf_2")
+    index = ActiveSessionIndex()
+    await index.put("user@example.com", "cf_2", "ts_b")
+    list_idle_sessions = repository.list_idle_sessions
+
+    async def list_then_touch(*args, **kwargs):
+        sessions = await list_idle_sessions(*args, **kwargs)
+        await db.document("sessions/ts_b").update({"updated_at": datetime.now(UTC)})
+        return sessions
+
+    monkeypatch.setattr(repository, "list_idle_sessions", list_then_touch)
+
+    closed = await SessionExpirySweeper(repository, active_sessions=index).sweep_once()
+
+    assert closed == 1
+    assert db.docs["sessions/ts_a"]["active"] is False
+    assert db.docs["sessions/ts_b"]["active"] is True
+    assert await index.get("user@example.com", "cf_2") == "ts_b"
+
+
+async def test_backlog_is_closed_in_paced_batches(db, repository, monkeypatch):
+    for i in range(7):
+        _session(db, f"ts_{i}", idle_minutes=120 + i)
+    pauses: List[float] = []
+
+    async def record_pause(seconds: float) -> None:
+        pauses.append(seconds)
+
+    monkeypatch.setattr(expiry.asyncio, "sleep", record_pause)
+    sweeper = SessionExpirySweeper(
+        repository, active_sessions=ActiveSessionIndex(), batch_size=3, max_closes_per_second=6
+    )
+
+    assert await sweeper.sweep_once() == 7
+    assert db.commits == [3, 3, 1]
+    assert pauses == [0.5, 0.5]
+    assert not any(session["active"] for session in db.docs.values())
+
+
+def test_batch_size_is_limited_to_firestore_maximum(repository):
+    with pytest.raises(ValueError):
+        SessionExpirySweeper(repository, batch_size=501)
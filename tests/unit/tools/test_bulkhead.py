@@ -0,0 +1,198 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import BaseModel
+
+from coreservice.id_service import get_id_service
+from pydantic_ai_integration.bulkhead import BulkheadRejected, tool_bulkheads
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool
+from pydantic_ai_integration.tool_definition import ToolConcurrencyPolicy
+from pydantic_ai_integration.tool_result_cache import tool_result_cache
+from pydantic_models.canonical.tool_session import ToolSession
+from pydantic_models.operations.tool_execution_ops import ToolRequest
+from tool_sessionservice.repository import ToolSessionRepository
+from tool_sessionservice.service import ToolSessionService
+
+
+class _StoreParams(BaseModel):
+    item: str
+
+
+@pytest.fixture(autouse=True)
+def _reset_bulkheads():
+    tool_bulkheads.reset()
+    yield
+    tool_bulkheads.reset()
+    MANAGED_TOOLS.pop("bulkhead_test_store", None)
+    MANAGED_TOOLS.pop("bulkhead_test_read", None)
+
+
+def _register(gate: asyncio.Event, running: List[str], **limits: Any):
+    @register_mds_tool(
+        name="bulkhead_test_store",
+        params_model=_StoreParams,
+        description="Slow store",
+        **limits,
+    )
+    async def bulkhead_test_store(ctx, item: str) -> Dict[str, Any]:
+        running.append(item)
+        await gate.wait()
+        return {"item": item}
+
+    return MANAGED_TOOLS["bulkhead_test_store"]
+
+
+def _ctx(user_id: str) -> MDSContext:
+    return MDSContext(user_id=user_id, session_id="ts_bulkhead")
+
+
+async def test_per_user_limit_queues_then_rejects_with_retry_after():
+    gate, running = asyncio.Event(), []
+    tool_def = _register(gate, running, per_user_max_concurrency=1, max_queue_depth=1)
+
+    first = asyncio.create_task(tool_def.implementation(_ctx("user_a"), item="a1"))
+    queued = asyncio.create_task(tool_def.implementation(_ctx("user_a"), item="a2"))
+    other_user = asyncio.create_task(tool_def.implementation(_ctx("user_b"), item="b1"))
+    await asyncio.sleep(0.01)
+
+    assert running == ["a1", "b1"]
+    with pytest.raises(BulkheadRejected) as rejected:
+        await tool_def.implementation(_ctx("user_a"), item="a3")
+    assert rejected.value.scope == "user"
+    assert rejected.value.retry_after_seconds >= 1
+
+    gate.set()
+    results = await asyncio.gather(first, queued, other_user)
+    assert [r["item"] for r in results] == ["a1", "a2", "b1"]
+    assert tool_bulkheads.rejections == {"bulkhead_test_store": 1}
+
+
+async def test_tool_limit_hands_slots_to_waiters_in_order():
+    gate, running = asyncio.Event(), []
+    tool_def = _register(gate, running, max_concurrency=2, max_queue_depth=5)
+
+    tasks = [
+        asyncio.create_task(tool_def.implementation(_ctx(f"user_{i}"), item=str(i)))
+        for i in range(5)
+    ]
+    await asyncio.sleep(0.01)
+    assert running == ["0", "1"]
+    assert tool_bulkheads.get_stats()["bulkhead_test_store"]["queued"] == 3
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert running == ["0", "1", "2", "3", "4"]
+    assert tool_bulkheads.get_stats()["bulkhead_test_store"]["in_flight"] == 0
+
+
+async def test_queue_timeout_rejects_and_frees_queue_slot():
+    policy = ToolConcurrencyPolicy(max_concurrency=1, max_queue_depth=1, queue_timeout_seconds=0.05)
+    release = asyncio.Event()
+
+    async def hold():
+        async with tool_bulkheads.admit("slow_tool", policy, "user_a"):
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(BulkheadRejected):
+        async with tool_bulkheads.admit("slow_tool", policy, "user_b"):
+            pass
+
+    release.set()
+    await holder
+    async with tool_bulkheads.admit("slow_tool", policy, "user_b"):
+        assert tool_bulkheads.get_stats()["slow_tool"]["in_flight"] == 1
+
+
+async def test_nested_admission_does_not_take_second_slot():
+    policy = ToolConcurrencyPolicy(max_concurrency=1)
+
+    async with tool_bulkheads.admit("outer_tool", policy, "user_a"):
+        async with tool_bulkheads.admit("outer_tool", policy, "user_a"):
+            assert tool_bulkheads.get_stats()["outer_tool"]["in_flight"] == 1
+
+
+@pytest.fixture
+async def session_service(db, firestore_pool):
+    repository = ToolSessionRepository(firestore_pool=firestore_pool, activity_flush_seconds=60)
+    session = ToolSession(session_id=get_id_service().new_tool_session_id("user_a", None), user_id="user_a")
+    db.docs[f"sessions/{session.session_id}"] = repository._to_dict(session)
+    await tool_result_cache.clear()
+    yield ToolSessionService(repository=repository), session.session_id
+    await repository.activity.close()
+    await tool_result_cache.clear()
+
+
+def _tool_request(session_id: str, tool_name: str, item: str) -> ToolRequest:
+    return ToolRequest(
+        user_id="user_a",
+        session_id=session_id,
+        payload={"tool_name": tool_name, "parameters": {"item": item}},
+    )
+
+
+async def test_session_bookkeeping_does_not_hold_a_slot(session_service):
+    service, session_id = session_service
+    gate, running = asyncio.Event(), []
+    gate.set()
+    _register(gate, running, max_concurrency=1, max_queue_depth=0)
+    persisting = asyncio.Event()
+    original = service.repository.update_request_response
+
+    async def slow_update(*args: Any) -> None:
+        if not persisting.is_set():
+            persisting.set()
+            await asyncio.sleep(0.05)
+        await original(*args)
+
+    service.repository.update_request_response = slow_update
+    first = asyncio.create_task(service.process_tool_request(_tool_request(session_id, "bulkhead_test_store", "a1")))
+    await persisting.wait()
+
+    # The first call is still persisting its response but no longer holds the tool's only slot
+    second = await service.process_tool_request(_tool_request(session_id, "bulkhead_test_store", "a2"))
+
+    assert second.payload.result["item"] == "a2"
+    assert (await first).payload.result["item"] == "a1"
+    assert tool_bulkheads.rejections == {}
+
+
+async def test_cache_hits_skip_admission_and_rejections_are_recorded(session_service, db):
+    service, session_id = session_service
+    reads: List[str] = []
+    @register_mds_tool(
+        name="bulkhead_test_read",
+        params_model=_StoreParams,
+        description="Cached read",
+        cacheable=True,
+        max_concurrency=1,
+        max_queue_depth=0,
+    )
+    async def bulkhead_test_read(ctx, item: str) -> Dict[str, Any]:
+        reads.append(item)
+        return {"item": item}
+
+    await service.process_tool_request(_tool_request(session_id, "bulkhead_test_read", "r1"))
+    policy = MANAGED_TOOLS["bulkhead_test_read"].concurrency_policy
+    release = asyncio.Event()
+
+    async def hold():
+        async with tool_bulkheads.admit("bulkhead_test_read", policy, "someone_else"):
+            await release.wait()
+
+    # Another caller holds the tool's only slot
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    hit = await service.process_tool_request(_tool_request(session_id, "bulkhead_test_read", "r1"))
+    with pytest.raises(BulkheadRejected):
+        await service.process_tool_request(_tool_request(session_id, "bulkhead_test_read", "r2"))
+    release.set()
+    await holder
+
+    assert hit.payload.result["item"] == "r1" and reads == ["r1"]
+    responses = [data["response"] for path, data in db.docs.items() if "/requests/" in path and "/events/" not in path]
+    assert sorted(response["status"] for response in responses) == ["completed", "completed", "failed"]
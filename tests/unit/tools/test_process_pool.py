@@ -0,0 +1,161 @@
+import asyncio
+import inspect
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+import yaml
+from pydantic import BaseModel
+
+from persistence.entity_versions import entity_versions
+from pydantic_ai_integration import process_pool, tool_decorator
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.process_pool import ToolProcessPool, ToolTarget
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool, register_tools_from_yaml
+from pydantic_ai_integration.tool_definition import ToolExecutionMode
+from pydantic_models.canonical.tool_session import ToolEvent
+
+# fork keeps the test fast (spawned workers re-import the package); pytest runs threads
+pytestmark = pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning")
+
+
+class _HeavyParams(BaseModel):
+    n: int
+    timeout_seconds: int = 30
+
+
+async def heavy_sum(ctx, n: int, **_: Any) -> Dict[str, Any]:
+    total = sum(i * i for i in range(n))
+    ctx.tool_events.append(ToolEvent(event_type="tool_execution_completed", tool_name="heavy_sum"))
+    return {"total": total, "pid": os.getpid(), "user_id": ctx.user_id}
+
+
+def write_casefile(casefile_id: str) -> str:
+    entity_versions.bump("casefiles", casefile_id)
+    return casefile_id
+
+
+def busy_wait(seconds: float) -> int:
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+    return os.getpid()
+
+
+@pytest.fixture
+async def pool(monkeypatch):
+    pool = ToolProcessPool(max_workers=2, start_method="fork")
+    monkeypatch.setattr(process_pool, "_tool_process_pool", pool)
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def _ctx() -> MDSContext:
+    return MDSContext(user_id="user_pp", session_id="ts_pp", casefile_id="cf_251013_abc123")
+
+
+async def test_registered_tool_runs_in_worker_and_returns_events(pool):
+    register_mds_tool(
+        name="process_pool_heavy_sum",
+        params_model=_HeavyParams,
+        description="CPU-heavy test tool",
+        execution="process_pool",
+    )(heavy_sum)
+    try:
+        tool_def = MANAGED_TOOLS["process_pool_heavy_sum"]
+        ctx = _ctx()
+
+        result = await tool_def.implementation(ctx, n=1000, timeout_seconds=10)
+
+        assert tool_def.execution is ToolExecutionMode.PROCESS_POOL
+        assert result["total"] == sum(i * i for i in range(1000))
+        assert result["user_id"] == "user_pp"
+        assert result["pid"] != os.getpid()
+        assert [event.tool_name for event in ctx.tool_events] == ["heavy_sum"]
+    finally:
+        MANAGED_TOOLS.pop("process_pool_heavy_sum", None)
+
+
+async def test_event_loop_stays_responsive(pool):
+    pool.start(warm=True)
+    task = asyncio.create_task(pool.run_callable(busy_wait, 0.5, timeout=10))
+
+    max_lag = 0.0
+    while not task.done():
+        before = time.monotonic()
+        await asyncio.sleep(0.01)
+        max_lag = max(max_lag, time.monotonic() - before - 0.01)
+
+    assert await task != os.getpid()
+    assert max_lag < 0.2
+
+
+async def test_timeout_recycles_pool(pool):
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.run_callable(busy_wait, 5, timeout=0.2)
+
+    assert pool.restarts == 1
+    assert await pool.run_callable(busy_wait, 0, timeout=10) != os.getpid()
+
+
+def test_closures_are_rejected():
+    async def local_tool(ctx):
+        return {}
+
+    with pytest.raises(ValueError, match="module level"):
+        ToolTarget.from_function(local_tool)
+
+
+def test_target_unwraps_decorated_function():
+    target = ToolTarget.from_function(heavy_sum)
+
+    assert target.resolve() is heavy_sum
+
+
+async def test_worker_writes_bump_the_callers_entity_versions(pool):
+    before = entity_versions.get("casefiles", "cf_251013_pooled")
+
+    assert await pool.run_callable(write_casefile, "cf_251013_pooled", timeout=10) == "cf_251013_pooled"
+
+    assert entity_versions.get("casefiles", "cf_251013_pooled") == before + 1
+
+
+async def test_yaml_tool_routes_on_its_registered_mode_not_on_params(monkeypatch, tmp_path):
+    source = Path(__file__).resolve().parents[3] / "config" / "methodtools_v1" / "casefile_get_casefile_tool.yaml"
+    for name, mode in (("pool_routing_heavy", "process_pool"), ("pool_routing_light", "inline")):
+        config = yaml.safe_load(source.read_text())
+        config["name"] = name
+        config["implementation"]["execution"] = mode
+        (tmp_path / f"{name}.yaml").write_text(yaml.safe_dump(config))
+
+    pooled, inline = [], []
+
+    async def get_casefile(request_dto):
+        inline.append(request_dto)
+        return {"ok": True}
+
+    async def run_callable(func, *args, timeout=None):
+        pooled.append(args[:2])
+        return {"ok": True}
+
+    monkeypatch.setattr(tool_decorator, "get_tool_process_pool", lambda: SimpleNamespace(run_callable=run_callable))
+    monkeypatch.setattr(tool_decorator, "_instantiate_service", lambda service, method: SimpleNamespace(get_casefile=get_casefile))
+    monkeypatch.setattr(tool_decorator, "_build_request_dto", lambda **kwargs: {"casefile_id": "cf_251013_abc123"})
+    register_tools_from_yaml(str(tmp_path))
+    try:
+        heavy = inspect.unwrap(MANAGED_TOOLS["pool_routing_heavy"].implementation)
+        light = inspect.unwrap(MANAGED_TOOLS["pool_routing_light"].implementation)
+
+        # A client-supplied implementation_config cannot move a tool between tiers
+        await heavy(_ctx(), casefile_id="cf_251013_abc123", implementation_config={"execution": "inline"})
+        assert (len(pooled), len(inline)) == (1, 0)
+
+        await light(_ctx(), casefile_id="cf_251013_abc123", implementation_config={"execution": "process_pool"})
+        assert (len(pooled), len(inline)) == (1, 1)
+        assert MANAGED_TOOLS["pool_routing_heavy"].execution is ToolExecutionMode.PROCESS_POOL
+    finally:
+        MANAGED_TOOLS.pop("pool_routing_heavy", None)
+        MANAGED_TOOLS.pop("pool_routing_light", None)
@@ -0,0 +1,152 @@
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import BaseModel
+
+from coreservice.id_service import get_id_service
+from persistence.entity_versions import entity_versions
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool
+from pydantic_ai_integration.tool_result_cache import tool_result_cache
+from pydantic_models.canonical.tool_session import ToolSession
+from pydantic_models.operations.tool_execution_ops import ToolRequest
+from tool_sessionservice.repository import ToolSessionRepository
+from tool_sessionservice.service import ToolSessionService
+
+
+class _ReadParams(BaseModel):
+    casefile_id: str
+    dry_run: bool = False
+    timeout_seconds: int = 30
+
+
+class _ListParams(BaseModel):
+    limit: int = 10
+
+
+@pytest.fixture(autouse=True)
+async def _cache_tools():
+    calls: List[Dict[str, Any]] = []
+
+    @register_mds_tool(
+        name="cache_test_read",
+        params_model=_ReadParams,
+        description="Cached read",
+        cacheable=True,
+        cache_ttl_seconds=60,
+        cache_key_fields=["casefile_id"],
+    )
+    async def cache_test_read(ctx, casefile_id: str, **_: Any) -> Dict[str, Any]:
+        calls.append({"tool": "cache_test_read", "casefile_id": casefile_id})
+        return {"casefile_id": casefile_id, "reads": len(calls)}
+
+    @register_mds_tool(
+        name="cache_test_list",
+        params_model=_ListParams,
+        description="Cached list",
+        cacheable=True,
+        cache_collections=["casefiles"],
+    )
+    async def cache_test_list(ctx, limit: int) -> Dict[str, Any]:
+        calls.append({"tool": "cache_test_list", "limit": limit})
+        return {"items": [], "reads": len(calls)}
+
+    await tool_result_cache.clear()
+    entity_versions.reset()
+    yield calls
+    await tool_result_cache.clear()
+    entity_versions.reset()
+    for name in ("cache_test_read", "cache_test_list"):
+        MANAGED_TOOLS.pop(name, None)
+
+
+def _ctx(user_id: str = "user_a") -> MDSContext:
+    return MDSContext(user_id=user_id, session_id="ts_cache")
+
+
+async def test_repeated_reads_are_cache_hits(_cache_tools):
+    implementation = MANAGED_TOOLS["cache_test_read"].implementation
+
+    first = await implementation(_ctx(), casefile_id="cf_1", dry_run=False, timeout_seconds=30)
+    second = await implementation(_ctx(), casefile_id="cf_1", dry_run=False, timeout_seconds=90)
+
+    assert first == second
+    assert len(_cache_tools) == 1
+    assert tool_result_cache.get_stats() == {"hits": 1, "misses": 1}
+    assert MANAGED_TOOLS["cache_test_read"].cache_policy.key_fields == ["casefile_id"]
+
+
+async def test_repeated_reads_through_the_session_service_are_cache_hits(_cache_tools, db, firestore_pool):
+    repository = ToolSessionRepository(firestore_pool=firestore_pool, activity_flush_seconds=60)
+    service = ToolSessionService(repository=repository)
+    session = ToolSession(session_id=get_id_service().new_tool_session_id("user_a", None), user_id="user_a")
+    db.docs[f"sessions/{session.session_id}"] = repository._to_dict(session)
+    request = ToolRequest(
+        user_id="user_a",
+        session_id=session.session_id,
+        payload={"tool_name": "cache_test_read", "parameters": {"casefile_id": "cf_1"}},
+    )
+
+    # The request log, counters and events written around each call leave the entry valid
+    responses = [await service.process_tool_request(request) for _ in range(3)]
+
+    assert len(_cache_tools) == 1
+    assert tool_result_cache.get_stats() == {"hits": 2, "misses": 1}
+    assert [response.payload.result["reads"] for response in responses] == [1, 1, 1]
+    assert db.docs[f"sessions/{session.session_id}"]["request_count"] == 3
+
+    # A change to the session itself still invalidates
+    session = await repository.get_session(session.session_id)
+    await repository.update_session(session)
+    await service.process_tool_request(request)
+    assert len(_cache_tools) == 2
+    await repository.activity.close()
+
+
+async def test_cache_is_scoped_per_user_and_params(_cache_tools):
+    implementation = MANAGED_TOOLS["cache_test_read"].implementation
+
+    await implementation(_ctx("user_a"), casefile_id="cf_1")
+    await implementation(_ctx("user_b"), casefile_id="cf_1")
+    await implementation(_ctx("user_a"), casefile_id="cf_2")
+
+    assert len(_cache_tools) == 3
+
+
+async def test_writes_to_the_entity_invalidate_results(_cache_tools):
+    implementation = MANAGED_TOOLS["cache_test_read"].implementation
+
+    await implementation(_ctx(), casefile_id="cf_1")
+    entity_versions.bump("casefiles", "cf_2")
+    await implementation(_ctx(), casefile_id="cf_1")
+    assert len(_cache_tools) == 1
+
+    entity_versions.bump("casefiles", "cf_1")
+    result = await implementation(_ctx(), casefile_id="cf_1")
+    assert len(_cache_tools) == 2
+    assert result["reads"] == 2
+
+
+async def test_collection_reads_invalidate_on_any_write(_cache_tools):
+    implementation = MANAGED_TOOLS["cache_test_list"].implementation
+
+    await implementation(_ctx(), limit=10)
+    await implementation(_ctx(), limit=10)
+    entity_versions.bump("casefiles", "cf_new")
+    await implementation(_ctx(), limit=10)
+
+    assert len(_cache_tools) == 2
+
+
+async def test_dry_runs_and_error_results_are_not_cached(_cache_tools):
+    @register_mds_tool(name="cache_test_read", params_model=_ReadParams, description="Failing read", cacheable=True)
+    async def failing_read(ctx, casefile_id: str, **_: Any) -> Dict[str, Any]:
+        _cache_tools.append({"tool": "failing_read"})
+        return {"status": "error", "error_message": "denied"}
+
+    implementation = MANAGED_TOOLS["cache_test_read"].implementation
+    await implementation(_ctx(), casefile_id="cf_1")
+    await implementation(_ctx(), casefile_id="cf_1")
+    await implementation(_ctx(), casefile_id="cf_1", dry_run=True)
+
+    assert len(_cache_tools) == 3
@@ -0,0 +1,78 @@
+from typing import Any, Dict
+
+import pytest
+from pydantic import BaseModel, ValidationError, model_validator
+
+from pydantic_ai_integration.dependencies import MDSContext
+from pydantic_ai_integration.tool_decorator import MANAGED_TOOLS, register_mds_tool
+from pydantic_ai_integration.validation import (
+    ValidatedParams,
+    get_type_adapter,
+    take_validated,
+    validate_params,
+    validated_scope,
+)
+
+VALIDATIONS = {"count": 0}
+
+
+class _CountingParams(BaseModel):
+    value: int
+
+    @model_validator(mode="before")
+    @classmethod
+    def _count(cls, data: Any) -> Any:
+        VALIDATIONS["count"] += 1
+        return data
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    VALIDATIONS["count"] = 0
+    yield
+    MANAGED_TOOLS.pop("validation_test_tool", None)
+
+
+def test_validate_params_passes_tokens_and_models_through():
+    token = validate_params(_CountingParams, {"value": "3"})
+
+    assert isinstance(token, ValidatedParams)
+    assert token.values == {"value": 3}
+    assert validate_params(_CountingParams, token) is token
+    assert validate_params(_CountingParams, token.model).values == {"value": 3}
+    assert VALIDATIONS["count"] == 1
+
+    with pytest.raises(ValidationError):
+        validate_params(_CountingParams, {"value": "x"})
+
+
+def test_take_validated_only_matches_same_model_and_kwargs():
+    token = validate_params(_CountingParams, {"value": 1})
+
+    assert take_validated(_CountingParams, {"value": 1}) is None
+    with validated_scope(token):
+        assert take_validated(_CountingParams, {"value": 1}) is token
+        assert take_validated(_CountingParams, {"value": 2}) is None
+    assert take_validated(_CountingParams, {"value": 1}) is None
+
+
+async def test_validated_wrapper_skips_revalidation_inside_scope():
+    @register_mds_tool(name="validation_test_tool", params_model=_CountingParams, description="Counts validations")
+    async def validation_test_tool(ctx, value: int) -> Dict[str, Any]:
+        return {"value": value}
+
+    ctx = MDSContext(user_id="user_1", session_id="ts_validation")
+    token = MANAGED_TOOLS["validation_test_tool"].prepare_params({"value": 5})
+    assert VALIDATIONS["count"] == 1
+
+    with validated_scope(token):
+        response = await validation_test_tool(ctx, **token.values)
+    assert response["payload"]["result"] == {"value": 5}
+    assert VALIDATIONS["count"] == 1
+
+    await validation_test_tool(ctx, value=6)
+    assert VALIDATIONS["count"] == 2
+
+
+def test_type_adapters_are_cached():
+    assert get_type_adapter(_CountingParams) is get_type_adapter(_CountingParams)